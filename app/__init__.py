@@ -31,6 +31,18 @@ def create_app(config_class=Config):
 
     app.register_blueprint(graduation_blueprint, url_prefix="/graduation")
 
+    if app.config["PRELOAD_DATA"]:
+        import app.scripts.utils as utils
+
+        utils.refresh_registries()
+
+    if app.config["PRELOAD_THUMBNAILS"]:
+        import threading
+
+        import app.scripts.photo_thumbnails as photo_thumbnails
+
+        threading.Thread(target=photo_thumbnails.update_thumbnails, daemon=True).start()
+
     return app
     with app.app_context():
         from app.scripts.attendance.dashboards.overall_daily import create_dashboard
@@ -0,0 +1,19 @@
+from flask import jsonify, request
+
+import app.scripts.gsheets_gateway as gsheets_gateway
+import app.scripts.utils as utils
+from app.api_1_0 import api
+
+
+@api.route("/debug/cache")
+def return_dataframe_cache_stats():
+    if request.args.get("clear"):
+        utils.dataframe_cache.invalidate()
+    return jsonify(utils.dataframe_cache.return_stats())
+
+
+@api.route("/debug/gsheets")
+def return_gsheets_gateway_stats():
+    if request.args.get("clear"):
+        gsheets_gateway.gateway.invalidate()
+    return jsonify(gsheets_gateway.gateway.return_stats())
@@ -1,10 +1,11 @@
 from flask import jsonify, request
 
 import app.scripts.utils as utils
-from app.api_1_0 import api, files_df
+from app.api_1_0 import api
 
 @api.route("/classes")
 def return_classes():
+    files_df = utils.return_files_df()
     year_and_semester = request.args.get('year_and_semester')
     if year_and_semester:
         cr_1_01_filename = utils.return_most_recent_report_by_semester(
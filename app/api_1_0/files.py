@@ -1,13 +1,13 @@
 from flask import jsonify, request
 
 import app.scripts.utils as utils
-from app.api_1_0 import api, files_df
+from app.api_1_0 import api
 
 @api.route("/files")
 def return_files():
     year_and_semester = request.args.get('year_and_semester')
     report = request.args.get("report")
-    files_dff = files_df
+    files_dff = utils.return_files_df()
     if year_and_semester:
         files_dff = files_dff[files_dff["year_and_semester"] == year_and_semester]
     if report:
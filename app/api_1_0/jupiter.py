@@ -1,10 +1,11 @@
 from flask import jsonify, request, session
 
 import app.scripts.utils as utils
-from app.api_1_0 import api, files_df
+from app.api_1_0 import api
 
 @api.route("/jupiter/classes")
 def return_jupiter_classes():
+    files_df = utils.return_files_df()
     report = "rosters_and_grades"
     filename = utils.return_most_recent_report(files_df, report)
 
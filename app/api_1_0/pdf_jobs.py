@@ -0,0 +1,12 @@
+from flask import abort, jsonify
+
+import app.scripts.sharded_pdf as sharded_pdf
+from app.api_1_0 import api
+
+
+@api.route("/pdf_jobs/<job_id>")
+def return_pdf_job_progress(job_id):
+    progress = sharded_pdf.return_progress(job_id)
+    if progress is None:
+        abort(404)
+    return jsonify(progress)
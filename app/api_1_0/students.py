@@ -1,11 +1,12 @@
 from flask import jsonify, request
 
 import app.scripts.utils as utils
-from app.api_1_0 import api, files_df
+from app.api_1_0 import api
 
 
 @api.route("/students")
 def return_students():
+    files_df = utils.return_files_df()
     year_and_semester = request.args.get("year_and_semester")
     if year_and_semester:
         cr_3_07_filename = utils.return_most_recent_report_by_semester(
@@ -23,6 +24,7 @@ def return_students():
 
 @api.route("/students/<StudentID>")
 def return_student_info(StudentID):
+    files_df = utils.return_files_df()
     year_and_semester = request.args.get("year_and_semester")
     if year_and_semester:
         cr_3_07_filename = utils.return_most_recent_report_by_semester(
@@ -2,4 +2,8 @@ import os
 
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY")
+    ## build files_df, photos_df and gsheets_df at startup instead of on first use
+    PRELOAD_DATA = os.getenv("PRELOAD_DATA") == "1"
+    ## make any missing student photo thumbnails in the background at startup
+    PRELOAD_THUMBNAILS = os.getenv("PRELOAD_THUMBNAILS") == "1"
     # EXPLAIN_TEMPLATE_LOADING = True
@@ -15,12 +15,9 @@ from werkzeug.utils import secure_filename
 import app.main.forms as report_forms
 
 import app.scripts.utils as utils
+import app.scripts.report_sidecars as report_sidecars
 import app.scripts.update_from_jupiter as update_from_jupiter
 
-files_df = utils.return_dataframe_of_files()
-photos_df = utils.return_dataframe_of_photos()
-gsheets_df = utils.return_dataframe_of_gsheets()
-
 main = Blueprint("main", __name__, template_folder="templates", static_folder="static")
 
 
@@ -55,11 +52,11 @@ def view_all_reports():
     data = {
         "reports": [
             {
-                "html": files_df.to_html(classes=["table", "table-sm"]),
+                "html": utils.return_files_df().to_html(classes=["table", "table-sm"]),
                 "title": "View Files",
             },
             {
-                "html": gsheets_df.to_html(classes=["table", "table-sm"]),
+                "html": utils.return_gsheets_df().to_html(classes=["table", "table-sm"]),
                 "title": "View Gsheets",
             },
         ]
@@ -69,7 +66,7 @@ def view_all_reports():
 
 @main.route("/view/<report>")
 def view_most_recent_report(report):
-    report_path = utils.return_most_recent_report(files_df, report)
+    report_path = utils.return_most_recent_report(utils.return_files_df(), report)
     report_df = utils.return_file_as_df(report_path)
     report_html = report_df.to_html(classes=["table", "table-sm"])
     return render_template("viewReport.html", report_html=report_html)
@@ -136,6 +133,8 @@ def upload_gsheet():
             # Close the file object
             f_object.close()
 
+        utils.gsheets_registry.invalidate()
+
         flash(f"{gsheet_category} successfully uploaded", category="success")
         return redirect(url_for("main.upload_gsheet"))
 
@@ -185,9 +184,9 @@ def upload_files():
         if not isExist:
             os.makedirs(path)
         f.save(os.path.join(path, filename))
+        report_sidecars.write_sidecar(os.path.join(path, filename))
+        utils.invalidate_report_registry()
         flash(f"{filename} successfully uploaded", category="success")
-        global files_df
-        files_df = utils.return_dataframe_of_files()
         return redirect(url_for("main.upload_files"))
 
     return render_template("upload.html", form=form)
@@ -3,9 +3,6 @@ from flask import Blueprint
 import app.scripts.utils as utils
 
 scripts = Blueprint("scripts", __name__, template_folder="")
-files_df = utils.return_dataframe_of_files()
-photos_df = utils.return_dataframe_of_photos()
-gsheets_df = utils.return_dataframe_of_gsheets()
 
 
 from app.scripts.assignments import routes
@@ -0,0 +1,211 @@
+"""
+Clean Assignments
+
+Shared cleaning stage for the Jupiter assignments export (one row per
+student, assignment and objective). Every row is kept and gains:
+
+    Percent%             the mark as a fraction; the standard marks and
+                         anything strictly between 45 and 100 as entered,
+                         0 as 50, otherwise the RawScore's correction
+    AdjustedWorthPoints  WorthPoints split across the assignment's
+                         objectives: divided by the number of objectives
+                         when they are all worth the same, otherwise by
+                         their total
+    Dept                 department of the course
+    IsNotGraded          no mark yet: blank, NG or a checkmark
+    IsExcused            excused marks
+    IsSpecialMark        the 0! to 5! marks
+    IsCounted            counts toward the grade: has a course, is worth
+                         points, is graded and not excused
+    IsFailing            Percent below 65
+
+Percent% and AdjustedWorthPoints are only filled in for counted rows.
+Everything is computed column-wise; the table is built once per version of
+an export and memoized in-process, so each analysis starts from a copy
+instead of re-parsing and re-cleaning the export.
+"""
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.utils as utils
+from app.scripts.dataframe_cache import DataFrameCache
+
+NOT_GRADED_MARKS = ["NG", "Ng", "ng", "", "✓"]
+EXCUSED_MARKS = ["EX", "Ex", "ex", "es", "eng"]
+SPECIAL_MARKS = ["0!", "1!", "2!", "3!", "4!", "5!"]
+STANDARD_PERCENTS = [100, 95, 85, 75, 65, 50, 45]
+FAILING_PERCENT = 65
+
+## Percent for marks Jupiter could not convert, by RawScore
+RAW_SCORE_PERCENTS = {
+    "6!": 100,
+    "61": 100,
+    "5%": 100,
+    "5’": 100,
+    "5!;": 100,
+    "5": 100,
+    "5!,3!": 100,
+    "5!,1!": 100,
+    "5!,5!": 100,
+    "05!": 100,
+    "51": 100,
+    "!5": 100,
+    "5!5!": 100,
+    "5!,4!": 100,
+    "5!!": 100,
+    "5!`": 100,
+    "9!": 50,
+    "3!!": 85,
+    "3!": 85,
+    "31": 85,
+    "1": 65,
+    "11": 65,
+    "$1": 65,
+    "41": 95,
+    "4%": 95,
+    "4!,1!": 95,
+    "4!,3!": 95,
+    "4!,4!": 95,
+    "4!,5!": 95,
+    "4": 95,
+    "4!;": 95,
+    "4!/": 95,
+    "4+": 95,
+    "3!,2!": 85,
+    "3!,4!": 85,
+    "3!,3!": 85,
+    "21": 75,
+    "!2": 75,
+    "2": 75,
+    "2!,1!": 75,
+    "2!,3!": 75,
+    "1!,1!": 65,
+    "01": 50,
+    "01%": 50,
+    "-!": 50,
+    "!": 50,
+    "-.": 45,
+    "-": 45,
+    "/3!": 85,
+    "23%": 23,
+    "21%": 21,
+    "inc": 45,
+    "/,/": 45,
+}
+
+ASSIGNMENT_COLS = ["Teacher", "Assignment", "Course", "DueDate"]
+
+MAX_CACHED_EXPORTS = 4
+
+
+def return_clean_assignments(assignments_df):
+    df = assignments_df.reset_index(drop=True)
+
+    raw_score = df["RawScore"]
+    df["IsNotGraded"] = raw_score.isna() | raw_score.isin(NOT_GRADED_MARKS)
+    df["IsExcused"] = raw_score.isin(EXCUSED_MARKS)
+    df["IsSpecialMark"] = raw_score.isin(SPECIAL_MARKS)
+    df["IsCounted"] = (
+        (df["Course"] != "")
+        & (df["WorthPoints"] != 0)
+        & ~df["IsNotGraded"]
+        & ~df["IsExcused"]
+    )
+    df["IsFailing"] = pd.to_numeric(df["Percent"], errors="coerce") < FAILING_PERCENT
+    df["Dept"] = return_departments(df["Course"])
+
+    counted_df = df[df["IsCounted"]]
+    df["Percent%"] = np.nan
+    df.loc[counted_df.index, "Percent%"] = return_percents(
+        counted_df["Percent"], counted_df["RawScore"]
+    )
+    df["AdjustedWorthPoints"] = np.nan
+    df.loc[counted_df.index, "AdjustedWorthPoints"] = return_adjusted_worth_points(counted_df)
+    return df
+
+
+def return_percents(percent, raw_score):
+    percent = pd.to_numeric(percent, errors="coerce").to_numpy(dtype=float)
+    corrected = raw_score.map(RAW_SCORE_PERCENTS).to_numpy(dtype=float)
+
+    as_entered = np.isin(percent, STANDARD_PERCENTS) | ((percent > 45) & (percent < 100))
+    is_zero = percent == 0
+    is_unknown = ~as_entered & ~is_zero & np.isnan(corrected)
+    if is_unknown.any():
+        print(f"No percent for RawScore {sorted(raw_score[is_unknown].astype(str).unique())}")
+
+    return np.select([as_entered, is_zero], [percent, 50], default=corrected) / 100
+
+
+def return_adjusted_worth_points(df):
+    objectives_df = df.drop_duplicates(subset=ASSIGNMENT_COLS + ["Objective"])
+    stats_df = objectives_df.groupby(ASSIGNMENT_COLS).agg(
+        WorthPointsMin=("WorthPoints", "min"),
+        WorthPointsMax=("WorthPoints", "max"),
+        WorthPointsSum=("WorthPoints", "sum"),
+        ObjectivesCount=("Objective", "nunique"),
+    )
+    stats_df = df[ASSIGNMENT_COLS].merge(
+        stats_df, left_on=ASSIGNMENT_COLS, right_index=True, how="left"
+    )
+
+    worth_points = df["WorthPoints"].to_numpy(dtype=float)
+    objectives_count = stats_df["ObjectivesCount"].to_numpy(dtype=float)
+    same_worth = (
+        stats_df["WorthPointsMin"].to_numpy(dtype=float)
+        == stats_df["WorthPointsMax"].to_numpy(dtype=float)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.select(
+            [objectives_count == 0, same_worth],
+            [worth_points, worth_points / objectives_count],
+            default=worth_points / stats_df["WorthPointsSum"].to_numpy(dtype=float),
+        )
+
+
+def return_departments(courses):
+    """Department of each course code, worked out once per distinct code."""
+    course_codes = pd.Series(courses.dropna().unique(), dtype=object)
+    course_codes = course_codes[course_codes.map(type) == str]
+    first, first_two = course_codes.str[0], course_codes.str[0:2]
+    conditions_and_depts = [
+        ((course_codes.str[1] == "K") & (first != "B"), "CTE-SD"),
+        (first_two == "TQ", "CTE-SD"),
+        (first == "S", "Science"),
+        (first == "M", "Math"),
+        (first == "E", "ELA"),
+        (first == "F", "LOTE"),
+        (first == "H", "SS"),
+        (first_two == "PP", "PE"),
+        (first_two == "PH", "Health"),
+        (first_two == "AH", "SS"),
+        (first_two == "AF", "CTE-FD"),
+        (first == "B", "CTE-FMM"),
+        (first_two == "TU", "CTE-FMM"),
+        (first_two == "AC", "CTE-Photo"),
+        (course_codes == "ALS21TP", "CTE-Photo"),
+        (course_codes == "ABS11", "CTE-FMM"),
+        (first == "A", "CTE-AD"),
+    ]
+    depts = np.select(
+        [condition.fillna(False).to_numpy(dtype=bool) for condition, _ in conditions_and_depts],
+        [dept for _, dept in conditions_and_depts],
+        default="check",
+    )
+    dept_by_course = dict(zip(course_codes, depts))
+    return courses.map(dept_by_course).fillna("check")
+
+
+## clean tables sit on top of utils' parsed-file cache, keyed the same way
+clean_assignments_cache = DataFrameCache(max_entries=MAX_CACHED_EXPORTS)
+
+
+def read_clean_assignments_df(filename):
+    return return_clean_assignments(utils.return_file_as_df(filename))
+
+
+def return_clean_assignments_df(filename):
+    """Clean table for an assignments export, built once per version of the
+    file."""
+    return clean_assignments_cache.get_or_load(filename, read_clean_assignments_df)
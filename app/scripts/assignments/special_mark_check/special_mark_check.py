@@ -5,10 +5,11 @@ import pandas as pd
 from io import BytesIO
 import datetime as dt
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
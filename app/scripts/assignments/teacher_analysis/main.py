@@ -7,7 +7,7 @@ import pandas as pd
 import numpy as np
 from io import BytesIO
 import datetime as dt
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 from app.scripts.date_to_marking_period import return_mp_from_date
 from app.scripts.assignments.teacher_analysis.utils import (
@@ -33,6 +33,7 @@ def generate_gradebook_report(output_format="excel", report_scope="school", sele
     Returns:
         tuple: (file_object, filename)
     """
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
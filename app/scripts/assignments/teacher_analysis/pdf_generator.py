@@ -8,8 +8,9 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
-import plotly.graph_objects as go
-import plotly.express as px
+from app.scripts.lazy import lazy_import
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
 from io import BytesIO
 import pandas as pd
 
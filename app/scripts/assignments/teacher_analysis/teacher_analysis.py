@@ -5,10 +5,12 @@ import pandas as pd
 from io import BytesIO
 import datetime as dt
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
+from app.scripts.assignments import clean_assignments
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -35,16 +37,14 @@ def main():
     filename = utils.return_most_recent_report_by_semester(
         files_df, "assignments", year_and_semester=year_and_semester
     )
-    assignments_df = utils.return_file_as_df(filename)
+    assignments_df = clean_assignments.return_clean_assignments_df(filename)
 
-    assignments_df = assignments_df[assignments_df["Course"] != ""]
-
-    # drop assignments worth zero
-    assignments_df = assignments_df.dropna(subset=["RawScore"])
-    assignments_df = assignments_df[assignments_df["WorthPoints"] != 0]
-
-    marks_to_keep = ["0!", "1!", "2!", "3!", "4!", "5!"]
-    assignments_df = assignments_df[assignments_df["RawScore"].isin(marks_to_keep)]
+    ## keep the 0! to 5! marks on assignments worth points
+    assignments_df = assignments_df[
+        assignments_df["IsSpecialMark"]
+        & (assignments_df["WorthPoints"] != 0)
+        & (assignments_df["Course"] != "")
+    ]
 
     ##drop non-credit bearing classes
     assignments_df = assignments_df[assignments_df["Course"].str[0] != "G"]
@@ -80,22 +80,8 @@ def main():
         cuts_by_students_by_class_df, on=["StudentID", "Course", "Section"], how="left"
     ).fillna(0)
 
-    ##Add Dept
-    dept_dict = {
-        "R": "CTE",
-        "F": "LOTE",
-        "P": "PE",
-        "B": "CTE",
-        "A": "CTE",
-        "M": "Math",
-        "E": "ELA",
-        "T": "CTE",
-        "S": "Sci",
-        "H": "SS",
-    }
-    assignments_df["Dept"] = assignments_df["Course"].apply(return_department)
-
     # prep lists
+    dept_by_course = dict(zip(assignments_df["Course"], assignments_df["Dept"]))
     lst_of_dept = assignments_df["Dept"].unique()
     lst_of_courses = assignments_df["Course"].unique()
     lst_of_teachers = assignments_df["Teacher"].unique()
@@ -130,7 +116,7 @@ def main():
         )
 
     for course in lst_of_courses:
-        dept = return_department(course)
+        dept = dept_by_course[course]
         teacher_pvt.loc[("SchoolWide", course, dept), :] = (
             teacher_pvt.query(f"Course == '{course}' ").sum().values
         )
@@ -148,12 +134,8 @@ def main():
 
     teacher_pvt = teacher_pvt * 100
 
-    teacher_pvt[("Practice", "WeightedAvg")] = teacher_pvt["Practice"].apply(
-        weighted_average, axis=1
-    )
-    teacher_pvt[("Performance", "WeightedAvg")] = teacher_pvt["Performance"].apply(
-        weighted_average, axis=1
-    )
+    teacher_pvt[("Practice", "WeightedAvg")] = return_weighted_averages(teacher_pvt["Practice"])
+    teacher_pvt[("Performance", "WeightedAvg")] = return_weighted_averages(teacher_pvt["Performance"])
 
     #### with cuts pvt
 
@@ -187,7 +169,7 @@ def main():
             )
 
     for course in lst_of_courses:
-        dept = return_department(course)
+        dept = dept_by_course[course]
         cuts_pvt.loc[("SchoolWide", course, dept, "SchoolWide"), :] = (
             cuts_pvt.query(f"Course == '{course}' ").sum().values
         )
@@ -216,12 +198,8 @@ def main():
 
     cuts_pvt = cuts_pvt * 100
 
-    cuts_pvt[("Practice", "WeightedAvg")] = cuts_pvt["Practice"].apply(
-        weighted_average, axis=1
-    )
-    cuts_pvt[("Performance", "WeightedAvg")] = cuts_pvt["Performance"].apply(
-        weighted_average, axis=1
-    )
+    cuts_pvt[("Practice", "WeightedAvg")] = return_weighted_averages(cuts_pvt["Practice"])
+    cuts_pvt[("Performance", "WeightedAvg")] = return_weighted_averages(cuts_pvt["Performance"])
 
     flowables = []
 
@@ -303,48 +281,10 @@ def main():
         return f, "JupiterAssignmentsAnalysis.xlsx"
 
 
-def return_department(course_code):
-    if course_code[1] == "K" and course_code[0] != "B":
-        return "CTE-SD"
-    if course_code[0:2] == "TQ":
-        return "CTE-SD"
-    if course_code[0] == "S":
-        return "Science"
-    if course_code[0] == "M":
-        return "Math"
-    if course_code[0] == "E":
-        return "ELA"
-    if course_code[0] == "F":
-        return "LOTE"
-    if course_code[0] == "H":
-        return "SS"
-    if course_code[0:2] == "PP":
-        return "PE"
-    if course_code[0:2] == "PH":
-        return "Health"    
-    if course_code[0:2] == "AH":
-        return "SS"
-    if course_code[0:2] == "AF":
-        return "CTE-FD"
-    if course_code[0] == "B":
-        return "CTE-FMM"
-    if course_code[0:2] == "TU":
-        return "CTE-FMM"
-    if course_code[0:2] == "AC":
-        return "CTE-Photo"
-    if course_code == "ALS21TP":
-        return "CTE-Photo"
-    if course_code == "ABS11":
-        return "CTE-FMM"
-    if course_code[0] == "A":
-        return "CTE-AD"
-    else:
-        return "check"
-
-
-import plotly.express as px
-import plotly.io as pio
-import plotly.graph_objects as go
+from app.scripts.lazy import lazy_import
+px = lazy_import("plotly.express")
+pio = lazy_import("plotly.io")
+go = lazy_import("plotly.graph_objects")
 from reportlab.platypus import Image, PageBreak
 
 
@@ -501,15 +441,8 @@ def build_letters(flowables):
     return f
 
 
-def weighted_average(row):
-    sum_of_weights = (
-        row["0!"] + row["1!"] + row["2!"] + row["3!"] + row["4!"] + row["5!"]
-    )
-    return (
-        0 * row["0!"]
-        + 1 * row["1!"]
-        + 2 * row["2!"]
-        + 3 * row["3!"]
-        + 4 * row["4!"]
-        + 5 * row["5!"]
-    ) / sum_of_weights
+def return_weighted_averages(df):
+    """Average mark (0 to 5) of each row of 0! to 5! shares."""
+    marks_df = df.reindex(columns=clean_assignments.SPECIAL_MARKS, fill_value=0)
+    weights = range(len(clean_assignments.SPECIAL_MARKS))
+    return (marks_df * weights).sum(axis=1) / marks_df.sum(axis=1)
@@ -8,8 +8,9 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from app.scripts.lazy import lazy_import
+go = lazy_import("plotly.graph_objects")
+make_subplots = lazy_import("plotly.subplots", "make_subplots")
 from io import BytesIO
 import pandas as pd
 import numpy as np
@@ -4,10 +4,11 @@ import datetime as dt
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     f = BytesIO()
 
     school_year = session["school_year"]
@@ -4,7 +4,7 @@ import datetime as dt
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 
 def main(form, request):
@@ -1,15 +1,49 @@
+import numpy as np
 import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from io import BytesIO
 import datetime as dt 
 
+from app.scripts import bell_schedule
 from app.scripts.attendance.jupiter.process import main as process_jupiter
 
+## CAASS compares swipes against when instruction starts, so these start times
+## differ from the bell schedule's
+CAASS_MONDAY_SCHEDULE = [
+    (1, dt.time(9, 45), dt.time(10, 20)),
+    (2, dt.time(10, 25), dt.time(11, 00)),
+    (3, dt.time(11, 5), dt.time(11, 40)),
+    (4, dt.time(11, 45), dt.time(12, 20)),
+    (5, dt.time(12, 25), dt.time(13, 00)),
+    (6, dt.time(13, 5), dt.time(13, 40)),
+    (7, dt.time(13, 45), dt.time(14, 20)),
+    (8, dt.time(14, 25), dt.time(15, 00)),
+    (9, dt.time(15, 5), dt.time(15, 40)),
+]
+
+CAASS_REGULAR_SCHEDULE = [
+    (1, dt.time(8, 10), dt.time(8, 55)),
+    (2, dt.time(9, 00), dt.time(9, 45)),
+    (3, dt.time(9, 50), dt.time(10, 40)),
+    (4, dt.time(10, 45), dt.time(11, 30)),
+    (5, dt.time(11, 35), dt.time(12, 20)),
+    (6, dt.time(12, 20), dt.time(13, 10)),
+    (7, dt.time(13, 15), dt.time(14, 00)),
+    (8, dt.time(14, 5), dt.time(15, 50)),
+    (9, dt.time(14, 55), dt.time(15, 40)),
+]
+
+CAASS_WEEKDAY_SCHEDULES = {
+    0: CAASS_MONDAY_SCHEDULE,
+    **{weekday: CAASS_REGULAR_SCHEDULE for weekday in range(1, 7)},
+}
+
 def process_CAASS():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -55,11 +89,18 @@ def process_CAASS():
     ## merge RATR_df with CAASS
     df = jupiter_df.merge(df, on=["StudentID", "Date"], how="left").dropna()
     
-    df['period_start_time'] = df.apply(return_class_start_time, axis=1)
-    df['period_end_time'] = df.apply(return_class_end_time, axis=1)
-    df['arrived_before_class_started_flag'] = df.apply(arrived_before_class_started_flag, axis=1)
-    df['arrived_before_class_ended_flag'] = df.apply(arrived_before_class_ended_flag, axis=1)
-    
+    period_bounds_df = bell_schedule.return_period_bounds_df(
+        df["Date"], df["Pd"], CAASS_WEEKDAY_SCHEDULES
+    )
+    df['period_start_time'] = period_bounds_df["period_start_time"]
+    df['period_end_time'] = period_bounds_df["period_end_time"]
+    scan_time_ns = bell_schedule.return_time_of_day_ns(df['Entry Datetime'])
+    for flag, time_col in [
+        ('arrived_before_class_started_flag', 'period_start_time'),
+        ('arrived_before_class_ended_flag', 'period_end_time'),
+    ]:
+        time_ns = df[time_col].map(bell_schedule.return_time_ns, na_action="ignore")
+        df[flag] = scan_time_ns < time_ns.to_numpy(dtype=float, na_value=np.nan)
 
     ## arrived before class ended up was absent from class
 
@@ -78,79 +119,3 @@ def process_CAASS():
 
     download_name = 'processed_caass.xlsx'
     return f, download_name
-
-
-def arrived_before_class_started_flag(row):
-    period_start_time = row['period_start_time']
-    scan_datetime = row['Entry Datetime']
-    scan_time = scan_datetime.time()
-    return scan_time < period_start_time
-
-def arrived_before_class_ended_flag(row):
-    period_start_time = row['period_end_time']
-    scan_datetime = row['Entry Datetime']
-    scan_time = scan_datetime.time()
-    return scan_time < period_start_time
-
-def return_class_start_time(row):
-    weekday = row['Weekday']
-    period = row['Pd']
-
-    if weekday == 0:
-        period_end_time_dict = {
-            1:dt.time(9, 45),
-            2:dt.time(10, 25),
-            3:dt.time(11, 5),
-            4:dt.time(11, 45),
-            5:dt.time(12, 25),
-            6:dt.time(13, 5),
-            7:dt.time(13, 45),
-            8:dt.time(14, 25),
-            9:dt.time(15, 5),
-        }
-    else:
-        period_end_time_dict = {
-            1:dt.time(8, 10),
-            2:dt.time(9, 00),
-            3:dt.time(9, 50),
-            4:dt.time(10, 45),
-            5:dt.time(11, 35),
-            6:dt.time(12, 20),
-            7:dt.time(13, 15),
-            8:dt.time(14, 5),
-            9:dt.time(14, 55),
-        }
-    
-    return period_end_time_dict.get(period)
-
-
-def return_class_end_time(row):
-    weekday = row['Weekday']
-    period = row['Pd']
-
-    if weekday == 0:
-        period_end_time_dict = {
-            1:dt.time(10, 20),
-            2:dt.time(11, 00),
-            3:dt.time(11, 40),
-            4:dt.time(12, 20),
-            5:dt.time(13, 00),
-            6:dt.time(13, 40),
-            7:dt.time(14, 20),
-            8:dt.time(15, 00),
-            9:dt.time(15, 40),
-        }
-    else:
-        period_end_time_dict = {
-            1:dt.time(8, 55),
-            2:dt.time(9, 45),
-            3:dt.time(10, 40),
-            4:dt.time(11, 30),
-            5:dt.time(12, 20),
-            6:dt.time(13, 10),
-            7:dt.time(14, 00),
-            8:dt.time(15, 50),
-            9:dt.time(15, 40),
-        }
-    
-    return period_end_time_dict.get(period)
@@ -9,7 +9,7 @@ from flask import render_template, request, send_file, session
 import app.scripts.utils as utils
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.attendance.attendance_tiers as attendance_tiers
 import app.scripts.attendance.process_RATR as process_RATR
 import app.scripts.attendance.jupiter_attd_by_teacher as jupiter_attd_by_teacher
@@ -125,6 +125,7 @@ def return_attendance_reports():
 
 @scripts.route("/attendance/tiers", methods=["GET", "POST"])
 def return_attd_tiers_from_RATR():
+    files_df = utils.return_files_df()
     RATR_filename = utils.return_most_recent_report(files_df, "RATR")
     RATR_df = utils.return_file_as_df(RATR_filename)
     df_dict = attendance_tiers.main(RATR_df)
@@ -187,6 +188,7 @@ def return_teacher_jupiter_attd():
 
 @scripts.route("/attendance/daily_attd_predictor")
 def return_daily_attd_predictor():
+    files_df = utils.return_files_df()
     RATR_filename = utils.return_most_recent_report(files_df, "RATR")
     RATR_df = utils.return_file_as_df(RATR_filename)
 
@@ -207,6 +209,7 @@ def return_daily_attd_predictor():
 
 @scripts.route("/attendance/RATR_analysis")
 def return_RATR_analysis():
+    files_df = utils.return_files_df()
     RATR_filename = utils.return_most_recent_report(files_df, "RATR")
     RATR_df = utils.return_file_as_df(RATR_filename)
     RATR_df = process_RATR.clean(RATR_df)
@@ -1,16 +1,16 @@
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
+import app.scripts.trends as trends
 
 import random
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
-from itertools import pairwise
-
 from flask import session
 
 
 def main(RATR_df):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -38,103 +38,169 @@ def main(RATR_df):
 
     RATR_df = RATR_df.merge(calendar_df, on="Date", how="left")
 
+    output_dict = return_output_dict(RATR_df, students_df)
+
+    ## run stats on ytd
+    ytd_df = output_dict['ytd']
+    attendance_metric_by_cohort = pd.pivot_table(ytd_df, index='year_in_hs', values='AttdMetric',aggfunc='mean')
+    attendance_metric_by_cohort = attendance_metric_by_cohort.reset_index()
+    output_dict['attd_metric_by_cohort'] = attendance_metric_by_cohort         
+
+    return output_dict
+
+
+def return_output_dict(RATR_df, students_df):
+    """One tiers sheet per month (counting from the start of the year) and
+    one for the year to date.
+
+    Every sheet only differs by how many months it counts, so the day
+    counts, rolling averages and consecutive absences are computed once
+    for the year and each sheet reads its running totals."""
     MONTHS_lst = RATR_df["Month"].unique().tolist()
     MONTHS_lst.pop(0)
     MONTHS_lst.insert(0, "ytd")
+    last_month = RATR_df["Month"].max()
+
+    student_running_counts = return_running_counts(RATR_df)
+    month_counts = return_counts(RATR_df, "Month")
+    running_counts = {
+        subcolumn: return_running_counts(RATR_df, subcolumn)
+        for subcolumn in ["Term", "Weekday", "DaysBeforeBreak", "DaysAfterBreak"]
+    }
+    rolling_attd_df = return_rolling_attd(RATR_df)
+    multiple_day_counts = return_multiple_day_counts(RATR_df)
+    student_attd_correl_df = return_student_correlation_to_overall(RATR_df)
 
     output_dict = {}
     for month in MONTHS_lst:
-        if month != "ytd":
-            RATR_dff = RATR_df[RATR_df["Month"] <= month]
-        else:
-            RATR_dff = RATR_df
-
-        student_attd_df = return_student_attd(RATR_dff)
-        student_rolling_attd_df = return_student_rolling_attd(RATR_dff)
-        
-
-        student_attd_by_month_df = return_student_pvt_by_subcolumn(RATR_dff, "Month")
+        through_month = last_month if month == "ytd" else month
 
-        student_attd_by_term_df = return_student_pvt_by_subcolumn(RATR_dff, "Term")
+        student_attd_df = return_counts_through(student_running_counts, through_month)
+        student_attd_df = (
+            (student_attd_df["A"] / student_attd_df.sum(axis=1))
+            .rename("ytd_absence_%")
+            .reset_index()
+        )
+        student_rolling_attd_df = return_rolling_attd_sparkline_df(
+            rolling_attd_df[rolling_attd_df["Month"] <= through_month]
+        )
 
-        student_attd_by_day_of_week_df = return_student_pvt_by_subcolumn(
-            RATR_dff, "Weekday"
+        student_attd_by_month_df = return_student_pvt_from_counts(
+            month_counts[month_counts.index.get_level_values("Month") <= through_month]
         )
-        student_attd_by_days_before_break_df = return_student_pvt_by_subcolumn(
-            RATR_dff, "DaysBeforeBreak"
+        student_attd_by_term_df = return_student_pvt_from_counts(
+            return_counts_through(running_counts["Term"], through_month)
         )
-        
-        
-        student_attd_by_days_after_break = return_student_pvt_by_subcolumn(
-            RATR_dff, "DaysAfterBreak"
+        student_attd_by_day_of_week_df = return_student_pvt_from_counts(
+            return_counts_through(running_counts["Weekday"], through_month)
         )
-        
-
-        multiple_day_df = return_multiple_day_df(RATR_dff)
-
-        output_df = students_df
-        
-        student_attd_df = student_attd_df[["StudentID", "ytd_absence_%"]]
-        
-        month_df = student_attd_by_month_df.pivot(
-            index="StudentID", columns="Month", values="absence_%"
+        student_attd_by_days_before_break_df = return_student_pvt_from_counts(
+            return_counts_through(running_counts["DaysBeforeBreak"], through_month)
         )
-        month_df["MonthlySparkline"] = month_df.apply(return_sparkline_formula, axis=1)
-        monthly_trend_df = return_trend_df(student_attd_by_month_df)
-        month_df = month_df.merge(monthly_trend_df, on=["StudentID"], how="left")
-
-        term_df = student_attd_by_term_df.pivot(
-            index="StudentID", columns="Term", values="absence_%"
+        student_attd_by_days_after_break = return_student_pvt_from_counts(
+            return_counts_through(running_counts["DaysAfterBreak"], through_month)
         )
-        term_df["MarkingPeriodSparkline"] = term_df.apply(
-            return_sparkline_formula, axis=1
+
+        multiple_day_df = return_multiple_day_df_from_counts(
+            multiple_day_counts[
+                multiple_day_counts.index.get_level_values("Month") <= through_month
+            ]
         )
-        term_trend_df = return_trend_df(student_attd_by_term_df)
-        term_df = term_df.merge(term_trend_df, on=["StudentID"], how="left")
 
-        vacation_extender_df = return_vacation_extender_df(
-            student_attd_by_days_before_break_df, student_attd_by_days_after_break
+        output_dict[month] = return_tiers_df(
+            students_df,
+            student_attd_df,
+            student_rolling_attd_df,
+            student_attd_correl_df,
+            student_attd_by_month_df,
+            student_attd_by_term_df,
+            student_attd_by_day_of_week_df,
+            student_attd_by_days_before_break_df,
+            student_attd_by_days_after_break,
+            multiple_day_df,
         )
 
-        day_of_week_df = return_day_of_week_df(student_attd_by_day_of_week_df)
+    return output_dict
+
 
-        student_attd_correl_df = return_student_correlation_to_overall(RATR_df)
+def return_tiers_df(
+    students_df,
+    student_attd_df,
+    student_rolling_attd_df,
+    student_attd_correl_df,
+    student_attd_by_month_df,
+    student_attd_by_term_df,
+    student_attd_by_day_of_week_df,
+    student_attd_by_days_before_break_df,
+    student_attd_by_days_after_break,
+    multiple_day_df,
+):
+    output_df = students_df
 
-        output_df = output_df.merge(student_attd_df, on="StudentID")
-        output_df = output_df.merge(student_rolling_attd_df, on="StudentID")
-        output_df = output_df.merge(student_attd_correl_df, on="StudentID")
-        
-        
-        output_df = output_df.merge(month_df, on="StudentID")
-        
-        output_df = output_df.merge(term_df, on="StudentID")
-        
-        output_df = output_df.merge(vacation_extender_df, on="StudentID")
-        
-        output_df = output_df.merge(day_of_week_df, on="StudentID")
-        output_df = output_df.merge(multiple_day_df, on="StudentID")
+    month_df = student_attd_by_month_df.pivot(
+        index="StudentID", columns="Month", values="absence_%"
+    )
+    month_df["MonthlySparkline"] = return_sparkline_column(month_df)
+    monthly_trend_df = return_trend_df(student_attd_by_month_df)
+    month_df = month_df.merge(monthly_trend_df, on=["StudentID"], how="left")
 
-        output_df["AttdTier"] = output_df["ytd_absence_%"].apply(return_attd_tier)
-        output_df["AttdMetric"] = output_df["ytd_absence_%"].apply(return_attd_multiplier)
-        output_df = output_df.sort_values(by=["year_in_hs", "LastName", "FirstName"])
-        
-        output_dict[month] = output_df.copy()
+    term_df = student_attd_by_term_df.pivot(
+        index="StudentID", columns="Term", values="absence_%"
+    )
+    term_df["MarkingPeriodSparkline"] = return_sparkline_column(term_df)
+    term_trend_df = return_trend_df(student_attd_by_term_df)
+    term_df = term_df.merge(term_trend_df, on=["StudentID"], how="left")
 
+    vacation_extender_df = return_vacation_extender_df(
+        student_attd_by_days_before_break_df, student_attd_by_days_after_break
+    )
 
-    ## run stats on ytd
-    ytd_df = output_dict['ytd']
-    attendance_metric_by_cohort = pd.pivot_table(ytd_df, index='year_in_hs', values='AttdMetric',aggfunc='mean')
-    attendance_metric_by_cohort = attendance_metric_by_cohort.reset_index()
-    output_dict['attd_metric_by_cohort'] = attendance_metric_by_cohort         
+    day_of_week_df = return_day_of_week_df(student_attd_by_day_of_week_df)
 
-    return output_dict
+    output_df = output_df.merge(student_attd_df, on="StudentID")
+    output_df = output_df.merge(student_rolling_attd_df, on="StudentID")
+    output_df = output_df.merge(student_attd_correl_df, on="StudentID")
+    output_df = output_df.merge(month_df, on="StudentID")
+    output_df = output_df.merge(term_df, on="StudentID")
+    output_df = output_df.merge(vacation_extender_df, on="StudentID")
+    output_df = output_df.merge(day_of_week_df, on="StudentID")
+    output_df = output_df.merge(multiple_day_df, on="StudentID")
+
+    output_df["AttdTier"] = output_df["ytd_absence_%"].apply(return_attd_tier)
+    output_df["AttdMetric"] = output_df["ytd_absence_%"].apply(return_attd_multiplier)
+    output_df = output_df.sort_values(by=["year_in_hs", "LastName", "FirstName"])
+    return output_df
+
+
+def return_counts(RATR_df, subcolumn):
+    """Days per (StudentID, subcolumn) with one column per ATTD code."""
+    return (
+        RATR_df.groupby(["StudentID", subcolumn, "ATTD"])
+        .size()
+        .unstack("ATTD", fill_value=0)
+    )
+
+
+def return_running_counts(RATR_df, subcolumn=None):
+    """Days per StudentID (and subcolumn) and ATTD code with one column per
+    month, each holding the count from the start of the year through that
+    month."""
+    keys = ["StudentID"] + ([subcolumn] if subcolumn else []) + ["ATTD"]
+    months = sorted(RATR_df["Month"].unique())
+    counts = RATR_df.groupby(keys + ["Month"]).size().unstack("Month", fill_value=0)
+    return counts.reindex(columns=months, fill_value=0).cumsum(axis=1)
+
+
+def return_counts_through(running_counts, month):
+    """return_counts for the days through month."""
+    counts_df = running_counts[month].unstack("ATTD", fill_value=0)
+    return counts_df[counts_df.sum(axis=1) > 0]
 
 
 def return_trend_df(student_attd_by_month_df):
     metric = "absence_%"
     df = (
-        student_attd_by_month_df.groupby(["StudentID"])[metric]
-        .apply(determine_weighted_slope)
+        trends.return_weighted_slopes(student_attd_by_month_df, "StudentID", metric)
         .reset_index()
         .rename(columns={metric: f"{metric}_trend"})
     )
@@ -146,51 +212,41 @@ def return_trend_df(student_attd_by_month_df):
     return df
 
 
-def determine_weighted_slope(data):
-    df = pd.DataFrame(list(data), columns=["absence_%"])
-    df["X"] = df.index + 1
-    df["sample_weights"] = df.index + 1
+def return_multiple_day_df(RATR_df):
+    return return_multiple_day_df_from_counts(return_multiple_day_counts(RATR_df))
 
-    regr = LinearRegression()
-    regr.fit(df[["X"]], df[["absence_%"]], df["sample_weights"])
 
-    return regr.coef_[0][0]
+def return_multiple_day_counts(RATR_df):
+    """Days absent and back-to-back absences (two absences in a row for a
+    student, ignoring I) per (StudentID, Month)."""
+    df = RATR_df.loc[RATR_df["ATTD"] != "I", ["StudentID", "Date", "Month", "ATTD"]]
+    df = df.sort_values(by=["StudentID", "Date"], kind="stable")
 
+    is_absent = df["ATTD"].eq("A")
+    df = df.assign(
+        days_absent=is_absent,
+        consecutive_pairs=is_absent
+        & is_absent.groupby(df["StudentID"]).shift(fill_value=False),
+    )
+    return df.groupby(["StudentID", "Month"])[["days_absent", "consecutive_pairs"]].sum()
+
+
+def return_multiple_day_df_from_counts(multiple_day_counts):
+    df = multiple_day_counts.groupby("StudentID").sum()
+
+    ## the first back-to-back pair covers two days, every later one adds a day
+    consecutive_days_absent = (df["consecutive_pairs"] + 1).where(df["consecutive_pairs"] > 0, 0)
+    consecutive_days_absent_metric = (
+        consecutive_days_absent / df["days_absent"].where(df["days_absent"] > 0)
+    ).fillna(0)
+
+    df["consecutive_day_pattern"] = np.select(
+        [consecutive_days_absent_metric <= 0, consecutive_days_absent_metric <= 0.25],
+        ["Single", "None"],
+        "Multiple",
+    )
+    return df.reset_index()[["StudentID", "consecutive_day_pattern"]]
 
-def return_multiple_day_df(RATR_df):
-    df = RATR_df[["StudentID", "Date", "ATTD"]]
-    df = df[df["ATTD"] != "I"]
-
-    output_lst = []
-    for StudentID, student_attd_df in df.groupby("StudentID"):
-        consecutive_days_absent = 0
-        possible_pairs = 0
-        attd_list = student_attd_df["ATTD"].to_list()
-        total_days_absent = attd_list.count("A")
-        for i, j in list(pairwise(attd_list)):
-            possible_pairs += 1
-            if i == "A" and j == "A":
-                if consecutive_days_absent == 0:
-                    consecutive_days_absent += 2
-                else:
-                    consecutive_days_absent += 1
-
-        if total_days_absent == 0:
-            consecutive_days_absent_metric = 0
-        else:
-            consecutive_days_absent_metric = consecutive_days_absent / total_days_absent
-
-        temp_dict = {
-            "StudentID": StudentID,
-            "consecutive_day_pattern": return_consecutive_days_absent_flag(
-                consecutive_days_absent_metric
-            ),
-        }
-        output_lst.append(temp_dict)
-
-
-
-    return pd.DataFrame(output_lst)
 
 def return_attd_multiplier(absence_rate):
     if absence_rate <= 0.05:
@@ -217,16 +273,6 @@ def return_attd_tier(absence_rate):
     return "Tier3"
 
 
-def return_consecutive_days_absent_flag(consecutive_days_absent_metric):
-    if consecutive_days_absent_metric <= 0:
-        return "Single"
-
-    if consecutive_days_absent_metric <= 0.25:
-        return "None"
-
-    return "Multiple"
-
-
 def return_day_of_week_df(student_attd_by_day_of_week_df):
 
     dff = pd.pivot_table(
@@ -245,7 +291,7 @@ def return_day_of_week_df(student_attd_by_day_of_week_df):
             "Friday",
         ]
     ]
-    dff["WeekdaySparkline"] = dff.apply(return_sparkline_formula, axis=1)
+    dff["WeekdaySparkline"] = return_sparkline_column(dff)
     dff = dff.reset_index()
 
     df = student_attd_by_day_of_week_df.sort_values("z_score")
@@ -280,36 +326,25 @@ def return_vacation_extender_df(
         student_attd_by_days_after_break["DaysAfterBreak"] == 1
     ]
     df = day_after_df.merge(day_before_df, on=["StudentID"], how='left')
-    df["Holiday Pattern"] = df.apply(return_vacation_extender_flag, axis=1)
-    df["Holiday Pattern %"] = df.apply(return_vacation_extender_pct, axis=1)
+    df["Holiday Pattern"] = return_vacation_extender_flag(df["z_score_x"], df["z_score_y"])
+    df["Holiday Pattern %"] = 0.5 * df["absence_%_x"] + 0.5 * df["absence_%_y"]
 
     df = df[["StudentID", "Holiday Pattern","Holiday Pattern %"]]
     return df
 
-def return_vacation_extender_pct(student_row):
-    before_z_score = student_row["absence_%_x"]
-    after_z_score = student_row["absence_%_y"]
-    return 0.5*before_z_score+0.5*after_z_score
-    
-def return_vacation_extender_flag(student_row):
-    
-    before_z_score = student_row["z_score_x"]
-    after_z_score = student_row["z_score_y"]
-
-    if before_z_score < 0.25 and after_z_score < 0.25:
-        return "No"
-
-    if before_z_score > 1.25 and after_z_score > 1.25:
-        return "Yes-High"
-    if before_z_score > 0.75 and after_z_score > 0.75:
-        return "Yes-Medium"
-    if before_z_score > 0.25 and after_z_score > 0.25:
-        return "Yes-Low"
-
-    if before_z_score > 0.25:
-        return "Yes-Before"
-    if after_z_score > 0.25:
-        return "Yes-After"
+def return_vacation_extender_flag(before_z_score, after_z_score):
+    return np.select(
+        [
+            (before_z_score < 0.25) & (after_z_score < 0.25),
+            (before_z_score > 1.25) & (after_z_score > 1.25),
+            (before_z_score > 0.75) & (after_z_score > 0.75),
+            (before_z_score > 0.25) & (after_z_score > 0.25),
+            before_z_score > 0.25,
+            after_z_score > 0.25,
+        ],
+        ["No", "Yes-High", "Yes-Medium", "Yes-Low", "Yes-Before", "Yes-After"],
+        None,
+    )
 
 
 def return_overall_attd_by_date(RATR_df):
@@ -365,9 +400,13 @@ def return_student_attd(RATR_df):
     return pvt_tbl
 
 
+def return_sparkline_column(df):
+    ## plain rows instead of apply(axis=1), which builds a Series per student
+    return [return_sparkline_formula(row) for row in df.to_numpy().tolist()]
+
+
 def return_sparkline_formula(lst):
-    lst = lst.dropna()
-    lst = [str(x) for x in lst]
+    lst = [str(x) for x in lst if pd.notna(x)]
     data_lst = ", ".join(lst)
     data_lst = "{" + data_lst + "}"
     options = '{"charttype","column";"ymin",0;"ymax",1;"color","red"}'
@@ -375,43 +414,19 @@ def return_sparkline_formula(lst):
 
 
 def return_student_pvt_by_subcolumn(RATR_df, subcolumn):
+    return return_student_pvt_from_counts(return_counts(RATR_df, subcolumn))
 
-    pvt_tbl = pd.pivot_table(
-        RATR_df,
-        index=["StudentID", subcolumn],
-        columns="ATTD",
-        values="Date",
-        aggfunc="count",
-    ).fillna(0)
-    pvt_tbl["total"] = pvt_tbl.sum(axis=1)
-    pvt_tbl["late_%"] = pvt_tbl["L"] / (pvt_tbl["P"] + pvt_tbl["L"])
-    pvt_tbl["absence_%"] = pvt_tbl["A"] / pvt_tbl["total"]
-
-    pvt_tbl = pvt_tbl.reset_index()
-
-    student_avg_and_std_dev = pd.pivot_table(
-        pvt_tbl,
-        index="StudentID",
-        values="absence_%",
-        aggfunc=["mean", "std"],
-    ).reset_index()
-    
-    
-    if len(student_avg_and_std_dev.columns) == 2:
-        student_avg_and_std_dev['Std'] = 0        
-
-    student_avg_and_std_dev.columns = ["StudentID", "Avg", "Std"]
 
-    output_df = pvt_tbl[["StudentID", subcolumn, "absence_%"]].merge(
-        student_avg_and_std_dev, on=["StudentID"], how="left"
-    )
+def return_student_pvt_from_counts(counts_df):
+    """absence_% per (StudentID, subcolumn) row of return_counts, and its
+    z_score against the student's own rows."""
+    output_df = (counts_df["A"] / counts_df.sum(axis=1)).rename("absence_%").reset_index()
 
-    output_df[f"z_score"] = (output_df["absence_%"] - output_df["Avg"]) / output_df[
-        "Std"
-    ]
+    student_absence_pct = output_df.groupby("StudentID")["absence_%"]
+    output_df["z_score"] = (
+        output_df["absence_%"] - student_absence_pct.transform("mean")
+    ) / student_absence_pct.transform("std")
 
-    output_df = output_df.drop(columns=["Avg", "Std"])
- 
     return output_df
 
 
@@ -432,23 +447,29 @@ def clean(RATR_df):
 
 
 def return_student_rolling_attd(df):
-    
-    df = df[['StudentID','Date','Attd']]
+    return return_rolling_attd_sparkline_df(return_rolling_attd(df))
+
+
+def return_rolling_attd(df):
+    """20 school day rolling absence rate for every student and date, as
+    text. Each value only looks back, so the rows through a month are that
+    month's rolling averages."""
+    df = df[['StudentID','Date','Month','Attd']]
     df = df.sort_values(by=['StudentID','Date'])
 
     df['rolling_20d_avg'] = (df.groupby('StudentID')['Attd']
-                            .transform(lambda x: x.rolling(window=20, min_periods=1).mean()))
-
-    wide_df = df.groupby('StudentID').agg({
-            'rolling_20d_avg': list,           
-        }).reset_index()  
-
-    def return_sparkline_formula(lst):
-        lst = [str(x) for x in lst]
-        data_lst = ", ".join(lst)
-        data_lst = "{" + data_lst + "}"
-        options = '{"charttype","line";"ymin",0;"ymax",1;"color","red"}'
-        return f"=sparkline({data_lst},{options})"    
-    
-    wide_df["rolling_20d_avg"] = wide_df['rolling_20d_avg'].apply(return_sparkline_formula)    
-    return wide_df  
\ No newline at end of file
+                            .rolling(window=20, min_periods=1).mean()
+                            .droplevel(0))
+    ## only used in the sparkline, so format once for every sheet
+    df['rolling_20d_avg'] = df['rolling_20d_avg'].astype(str)
+    return df
+
+
+def return_rolling_attd_sparkline_df(df):
+    wide_df = (
+        df["rolling_20d_avg"].groupby(df["StudentID"]).agg(", ".join)
+        .reset_index()
+    )
+    options = '{"charttype","line";"ymin",0;"ymax",1;"color","red"}'
+    wide_df["rolling_20d_avg"] = "=sparkline({" + wide_df["rolling_20d_avg"] + "}," + options + ")"
+    return wide_df
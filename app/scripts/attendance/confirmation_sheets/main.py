@@ -4,7 +4,7 @@ import os
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 from werkzeug.utils import secure_filename
@@ -26,6 +26,7 @@ from reportlab.lib.pagesizes import letter, landscape
 
 def main(form, request):
 
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -2,7 +2,7 @@ import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from io import BytesIO
 import datetime as dt 
@@ -11,7 +11,7 @@ from wtforms.validators import DataRequired, Regexp, InputRequired
 from wtforms.widgets import TextArea
 
 import datetime as dt
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 import pandas as pd
 
@@ -50,6 +50,7 @@ class AttendanceWeekOfForm(FlaskForm):
     )
 
     def __init__(self, *args, **kwargs):
+        files_df = utils.return_files_df()
         super(AttendanceWeekOfForm, self).__init__(*args, **kwargs)
 
         school_year = session["school_year"]
@@ -76,6 +77,7 @@ class AttendanceDayOfForm(FlaskForm):
     )
 
     def __init__(self, *args, **kwargs):
+        files_df = utils.return_files_df()
         super(AttendanceDayOfForm, self).__init__(*args, **kwargs)
 
         school_year = session["school_year"]
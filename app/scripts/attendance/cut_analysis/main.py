@@ -2,11 +2,12 @@ import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from io import BytesIO
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
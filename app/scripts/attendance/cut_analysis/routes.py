@@ -9,7 +9,7 @@ from flask import render_template, request, send_file
 import app.scripts.utils as utils
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 @scripts.route("/attendance/cut_analysis")
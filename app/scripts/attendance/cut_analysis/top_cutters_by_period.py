@@ -4,7 +4,8 @@ import datetime as dt
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+from app.scripts import scripts
 
 
 def main():
@@ -21,7 +22,7 @@ def main():
         aggfunc="sum",
     )
 
-    attd_by_student = attd_by_student.merge(photos_df, on=["StudentID"], how="left")
+    attd_by_student = attd_by_student.merge(utils.return_photos_df(), on=["StudentID"], how="left")
     flowables = []
     for period in [2, 3, 4, 5, 6, 7, 8, 9]:
         page_header = f"Top Cuts by Period {period}"
@@ -37,7 +38,7 @@ def main():
 
     total_cuts_by_student = total_cuts_by_student.reset_index()
     total_cuts_by_student = total_cuts_by_student.merge(
-        photos_df, on=["StudentID"], how="left"
+        utils.return_photos_df(), on=["StudentID"], how="left"
     )
     page_header = f"Top Cuts Overall"
     top_27_cuts = (
@@ -66,6 +67,7 @@ def main():
 
 
 def process_jupiter_attendance():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -258,7 +260,7 @@ def return_photo_roster_pdf(page_header, students_df):
         Teacher = student["Teacher1"]
 
         try:
-            I = Image(photo_path)
+            I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, image_dim))
             I.drawHeight = image_dim * inch
             I.drawWidth = image_dim * inch
             I.hAlign = "CENTER"
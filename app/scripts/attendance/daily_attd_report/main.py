@@ -3,12 +3,12 @@ import pandas as pd
 from app.scripts.attendance.jupiter import process as jupiter_process
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from io import BytesIO
 
 def main(form, request):
 
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
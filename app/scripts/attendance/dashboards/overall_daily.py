@@ -22,11 +22,12 @@ from app.scripts.attendance.process_RATR import main as process_RATR
 import app.scripts.utils as utils
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 def create_dashboard(server):
     """Create a Plotly Dash dashboard."""
+    files_df = utils.return_files_df()
     dash_app = dash.Dash(
         server=server,
         routes_pathname_prefix="/dashapp/attendance/overall/",
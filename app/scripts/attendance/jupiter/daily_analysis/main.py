@@ -1,6 +1,6 @@
 from io import BytesIO
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 import pandas as pd
 from flask import session 
@@ -9,6 +9,7 @@ from app.scripts.attendance.jupiter.process import process_local_file as process
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     day_of = form.day_of.data
     school_year = session["school_year"]
     term = session["term"]
@@ -13,7 +13,7 @@ from reportlab.platypus import Paragraph, PageBreak, Spacer, Image, Table, Table
 from reportlab.platypus import SimpleDocTemplate
 import PyPDF2
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 import pandas as pd
 
@@ -21,6 +21,7 @@ from app.scripts.attendance.jupiter.process import process_local_file as process
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     week_number = form.week_of.data
 
     student_period_attendance_df = process_jupiter(week_number)
@@ -0,0 +1,206 @@
+"""
+Processed Attendance Fact Table
+
+Keeps the flagged output of process.flag_attendance for every row of a
+jupiter_period_attendance export, partitioned by Date, together with daily
+per-student totals (cuts, late to school, absent).
+
+When a new export replaces the file, each Date's raw rows are hashed and only
+new or changed dates are flagged again. Requests for one week or one day
+concatenate just those partitions and sum their daily totals, so a week-N
+report costs one week of rows rather than the whole semester.
+
+The table is memoized per export in-process and pickled next to the export's
+report sidecar (see report_sidecars), so a restart reloads it instead of
+reprocessing the semester.
+"""
+
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+import app.scripts.report_sidecars as report_sidecars
+import app.scripts.utils as utils
+from app.scripts.attendance.jupiter import process
+
+FACT_TABLE_EXTENSION = ".facts.pkl"
+FACT_TABLE_VERSION = 1
+
+
+def return_fact_table_path(filename):
+    sidecar_path = report_sidecars.return_sidecar_path(filename)
+    return sidecar_path[: -len(report_sidecars.SIDECAR_EXTENSION)] + FACT_TABLE_EXTENSION
+
+
+def return_date_hashes(jupiter_attd_df):
+    row_hashes = pd.util.hash_pandas_object(jupiter_attd_df, index=False)
+    return row_hashes.groupby(jupiter_attd_df["Date"].to_numpy()).sum().to_dict()
+
+
+class AttendanceFactTable:
+    def __init__(self, filename):
+        self.filename = filename
+        self.source_mtime_ns = None
+        self.date_hashes = {}
+        self.facts_by_date = {}
+        self.daily_totals_by_date = {}
+        self.dates_processed_on_last_refresh = []
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with self._lock:
+            source_mtime_ns = os.stat(self.filename).st_mtime_ns
+            if source_mtime_ns == self.source_mtime_ns:
+                self.dates_processed_on_last_refresh = []
+                return self
+            if self.source_mtime_ns is None:
+                self._load()
+                if source_mtime_ns == self.source_mtime_ns:
+                    return self
+
+            jupiter_attd_df = utils.return_file_as_df(self.filename)
+            self.update(jupiter_attd_df)
+            self.source_mtime_ns = source_mtime_ns
+            self._save()
+        return self
+
+    def update(self, jupiter_attd_df):
+        date_hashes = return_date_hashes(jupiter_attd_df)
+        dates_to_process = [
+            date
+            for date, date_hash in date_hashes.items()
+            if self.date_hashes.get(date) != date_hash
+        ]
+        for date in set(self.date_hashes) - set(date_hashes):
+            self.facts_by_date.pop(date, None)
+            self.daily_totals_by_date.pop(date, None)
+
+        if dates_to_process:
+            new_rows_df = jupiter_attd_df[jupiter_attd_df["Date"].isin(dates_to_process)]
+            new_rows_df = process.add_week_number(new_rows_df.copy())
+            flagged_df = process.flag_attendance(new_rows_df)
+            daily_totals_df = process.return_daily_totals_df(flagged_df)
+            for date, df in flagged_df.groupby("Date", sort=False):
+                self.facts_by_date[date] = df
+            for date, df in daily_totals_df.groupby("Date", sort=False):
+                self.daily_totals_by_date[date] = df
+
+        self.date_hashes = date_hashes
+        self.dates_processed_on_last_refresh = dates_to_process
+
+    def return_dates(self, week_number=None, day_of=None):
+        dates = sorted(self.facts_by_date)
+        if week_number:
+            dates = [
+                date
+                for date in dates
+                if self.facts_by_date[date]["week_number"].iloc[0] == int(week_number)
+            ]
+        if day_of:
+            dates = [date for date in dates if date == day_of]
+        return dates
+
+    def return_flagged_df(self, dates):
+        if not dates:
+            return pd.DataFrame(columns=self._return_columns())
+        flagged_df = pd.concat([self.facts_by_date[date] for date in dates], ignore_index=True)
+        return flagged_df.sort_values(by=["StudentID", "Date", "Pd"], kind="stable", ignore_index=True)
+
+    def return_totals_df(self, dates):
+        if not dates:
+            return pd.DataFrame(
+                columns=["StudentID", "num_of_cuts", "num_of_late_to_school", "num_of_days_absent"]
+            )
+        daily_totals_df = pd.concat([self.daily_totals_by_date[date] for date in dates])
+        return (
+            daily_totals_df.drop(columns=["Date"]).groupby("StudentID").sum().reset_index()
+        )
+
+    def return_weekly_totals_df(self):
+        """Materialized per-student totals for every week_number."""
+        lst = []
+        for date, daily_totals_df in self.daily_totals_by_date.items():
+            daily_totals_df = daily_totals_df.copy()
+            daily_totals_df["week_number"] = self.facts_by_date[date]["week_number"].iloc[0]
+            lst.append(daily_totals_df)
+        if not lst:
+            return pd.DataFrame()
+        return (
+            pd.concat(lst)
+            .drop(columns=["Date"])
+            .groupby(["week_number", "StudentID"])
+            .sum()
+            .reset_index()
+        )
+
+    def _return_columns(self):
+        for df in self.facts_by_date.values():
+            return df.columns
+        return []
+
+    def _load(self):
+        fact_table_path = return_fact_table_path(self.filename)
+        try:
+            with open(fact_table_path, "rb") as f:
+                state = pickle.load(f)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            return
+        if state.get("version") != FACT_TABLE_VERSION:
+            return
+        self.source_mtime_ns = state["source_mtime_ns"]
+        self.date_hashes = state["date_hashes"]
+        self.facts_by_date = state["facts_by_date"]
+        self.daily_totals_by_date = state["daily_totals_by_date"]
+
+    def _save(self):
+        fact_table_path = return_fact_table_path(self.filename)
+        state = {
+            "version": FACT_TABLE_VERSION,
+            "source_mtime_ns": self.source_mtime_ns,
+            "date_hashes": self.date_hashes,
+            "facts_by_date": self.facts_by_date,
+            "daily_totals_by_date": self.daily_totals_by_date,
+        }
+        try:
+            os.makedirs(os.path.dirname(fact_table_path), exist_ok=True)
+            temp_path = fact_table_path + ".tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, fact_table_path)
+        except OSError as e:
+            print(f"Unable to save attendance fact table for {self.filename}: {e}")
+
+
+fact_tables = {}
+fact_tables_lock = threading.Lock()
+
+
+def return_fact_table(filename):
+    with fact_tables_lock:
+        fact_table = fact_tables.get(filename)
+        if fact_table is None:
+            fact_table = AttendanceFactTable(filename)
+            fact_tables[filename] = fact_table
+    return fact_table.refresh()
+
+
+def return_processed_attendance(
+    filename, students_df, jupiter_rosters_df, week_number=None, day_of=None
+):
+    """Same frame as process.process_attendance on the file's contents, built
+    from the fact table."""
+    fact_table = return_fact_table(filename)
+    dates = fact_table.return_dates(week_number=week_number, day_of=day_of)
+
+    jupiter_attd_df = fact_table.return_flagged_df(dates)
+    ## only keep students still on register
+    jupiter_attd_df = jupiter_attd_df[
+        jupiter_attd_df["StudentID"].isin(students_df["StudentID"])
+    ]
+    totals_df = fact_table.return_totals_df(dates)
+
+    return process.attach_attendance_totals(
+        jupiter_attd_df, students_df, jupiter_rosters_df, totals_df=totals_df
+    )
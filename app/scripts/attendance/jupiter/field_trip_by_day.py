@@ -13,7 +13,7 @@ from reportlab.platypus import Paragraph, PageBreak, Spacer, Image, Table, Table
 from reportlab.platypus import SimpleDocTemplate
 import PyPDF2
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 import pandas as pd
 from flask import session 
@@ -22,6 +22,7 @@ from app.scripts.attendance.jupiter.process import process_local_file as process
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     day_of = form.day_of.data
     
     school_year = session["school_year"]
@@ -6,12 +6,13 @@ from io import BytesIO
 from flask import session, current_app
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 from app.scripts.attendance.jupiter.process import process_uploaded_file as process_jupiter
 
 def main(request, form):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
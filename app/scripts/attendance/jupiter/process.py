@@ -1,8 +1,8 @@
+import numpy as np
 import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 import re
 
@@ -14,6 +14,7 @@ def process_uploaded_file(jupiter_attd_df, week_number=None, day_of=None):
 
 
 def process_local_file(week_number=None, day_of=None):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
@@ -22,17 +23,43 @@ def process_local_file(week_number=None, day_of=None):
     jupiter_attd_filename = utils.return_most_recent_report_by_semester(
         files_df, "jupiter_period_attendance", year_and_semester=year_and_semester
     )
-    jupiter_attd_df = utils.return_file_as_df(jupiter_attd_filename)
-    return main(jupiter_attd_df, week_number=week_number, day_of=day_of)
+    students_df = return_students_df(year_and_semester, school_year)
+    jupiter_rosters_df = return_jupiter_rosters_df(year_and_semester)
+
+    ## reuses the flagged rows of dates already processed for this export
+    from app.scripts.attendance.jupiter.fact_table import return_processed_attendance
+
+    return return_processed_attendance(
+        jupiter_attd_filename,
+        students_df,
+        jupiter_rosters_df,
+        week_number=week_number,
+        day_of=day_of,
+    )
 
 
-def main(jupiter_attd_df, week_number=None, day_of=None):
+def main(jupiter_attd_df, week_number=None, day_of=None, vectorized=True):
     school_year = session["school_year"]
     term = session["term"]
 
     year_and_semester = f"{school_year}-{term}"
 
+    students_df = return_students_df(year_and_semester, school_year)
+    jupiter_rosters_df = return_jupiter_rosters_df(year_and_semester)
+
+    return process_attendance(
+        jupiter_attd_df,
+        students_df,
+        jupiter_rosters_df,
+        week_number=week_number,
+        day_of=day_of,
+        vectorized=vectorized,
+    )
+
+
+def return_students_df(year_and_semester, school_year):
     ## student_info
+    files_df = utils.return_files_df()
     cr_3_07_filename = utils.return_most_recent_report_by_semester(
         files_df, "3_07", year_and_semester=year_and_semester
     )
@@ -51,12 +78,53 @@ def main(jupiter_attd_df, week_number=None, day_of=None):
     students_df = students_df.merge(
         cr_1_49_df[["StudentID", "Counselor"]], on=["StudentID"], how="left"
     ).fillna("")
+    return students_df
+
+
+def return_jupiter_rosters_df(year_and_semester):
+    ## attach current grade
+    files_df = utils.return_files_df()
+    jupiter_rosters_df = utils.return_most_recent_report_by_semester(files_df, "rosters_and_grades", year_and_semester=year_and_semester)
+    jupiter_rosters_df = utils.return_file_as_df(jupiter_rosters_df).drop_duplicates(subset=['StudentID','Course','Section'])[['StudentID','Course','Section','Pct']]
+    jupiter_rosters_df = jupiter_rosters_df.rename(columns={'Pct':'ClassGrade'})
+    return jupiter_rosters_df
+
+
+def process_attendance(
+    jupiter_attd_df,
+    students_df,
+    jupiter_rosters_df,
+    week_number=None,
+    day_of=None,
+    vectorized=True,
+):
+    """Flags every period-attendance row (cuts, late to school, possible
+    attendance errors) and attaches per-student totals.
+
+    vectorized=False runs the original row-wise DataFrame.apply version of
+    each step; it is kept as the reference implementation for
+    benchmarks/jupiter_attendance.py, which checks both produce the same frame.
+    """
+    jupiter_attd_df = select_attendance(
+        jupiter_attd_df, students_df, week_number=week_number, day_of=day_of
+    )
+    jupiter_attd_df = flag_attendance(jupiter_attd_df, vectorized=vectorized)
+    return attach_attendance_totals(
+        jupiter_attd_df, students_df, jupiter_rosters_df, vectorized=vectorized
+    )
 
+
+def add_week_number(jupiter_attd_df):
     jupiter_attd_df["week_number"] = pd.to_datetime(jupiter_attd_df["Date"])
     jupiter_attd_df["week_number"] = (
         jupiter_attd_df["week_number"].dt.isocalendar().week
     )
     jupiter_attd_df['week_id'] = jupiter_attd_df["week_number"] 
+    return jupiter_attd_df
+
+
+def select_attendance(jupiter_attd_df, students_df, week_number=None, day_of=None):
+    jupiter_attd_df = add_week_number(jupiter_attd_df)
 
     if week_number:
         jupiter_attd_df = jupiter_attd_df[
@@ -70,23 +138,26 @@ def main(jupiter_attd_df, week_number=None, day_of=None):
     jupiter_attd_df = jupiter_attd_df[
         jupiter_attd_df["StudentID"].isin(students_df["StudentID"])
     ]
-
-    jupiter_attd_df["Pd"] = jupiter_attd_df["Period"].apply(period_to_pd)
-    jupiter_attd_df['present_in_period_3'] = jupiter_attd_df.apply(
-    lambda row: (row['Period'] == 3) and (row['Type'] in ['present', 'tardy']),
-    axis=1
-)
-
-    jupiter_attd_df = jupiter_attd_df.sort_values(by=["StudentID", "Date", "Pd"])
+    return jupiter_attd_df
 
 
-    ## attach current grade
-    jupiter_rosters_df = utils.return_most_recent_report_by_semester(files_df, "rosters_and_grades", year_and_semester=year_and_semester)
-    jupiter_rosters_df = utils.return_file_as_df(jupiter_rosters_df).drop_duplicates(subset=['StudentID','Course','Section'])[['StudentID','Course','Section','Pct']]
-    jupiter_rosters_df = jupiter_rosters_df.rename(columns={'Pct':'ClassGrade'})
+def flag_attendance(jupiter_attd_df, vectorized=True):
+    """Row-level flags; every value depends only on the student's own rows
+    for that Date, so any subset of dates can be flagged independently."""
+    if vectorized:
+        jupiter_attd_df["Pd"] = return_pd_column(jupiter_attd_df["Period"])
+        jupiter_attd_df["present_in_period_3"] = (
+            jupiter_attd_df["Period"] == 3
+        ) & jupiter_attd_df["Type"].isin(["present", "tardy"])
+    else:
+        jupiter_attd_df["Pd"] = jupiter_attd_df["Period"].apply(period_to_pd)
+        jupiter_attd_df['present_in_period_3'] = jupiter_attd_df.apply(
+        lambda row: (row['Period'] == 3) and (row['Type'] in ['present', 'tardy']),
+        axis=1
+    )
 
+    jupiter_attd_df = jupiter_attd_df.sort_values(by=["StudentID", "Date", "Pd"])
 
-    
 
     attd_by_date_by_student = pd.pivot_table(
         jupiter_attd_df,
@@ -105,17 +176,33 @@ def main(jupiter_attd_df, week_number=None, day_of=None):
         'Period_unexcused': 'unexcused',
         'present_in_period_3_present': 'p3_flag'  # or similar
     })
+    ## a single day or week may not contain every attendance Type
+    for col in ["present", "tardy", "excused", "unexcused", "p3_flag"]:
+        if col not in attd_by_date_by_student.columns:
+            attd_by_date_by_student[col] = 0
     
 
-    attd_by_date_by_student["in_school?"] = attd_by_date_by_student.apply(
-        in_school, axis=1
-    )
-    attd_by_date_by_student["num_of_periods_in_class"] = attd_by_date_by_student.apply(
-        return_number_of_periods_present, axis=1
-    )
-    attd_by_date_by_student["only_present_one_period"] = attd_by_date_by_student.apply(
-        return_only_present_one_period, axis=1
-    )
+    if vectorized:
+        num_of_periods_in_class = (
+            attd_by_date_by_student["present"] + attd_by_date_by_student["tardy"]
+        )
+        attd_by_date_by_student["in_school?"] = (num_of_periods_in_class >= 2) | (
+            attd_by_date_by_student["p3_flag"].astype(bool)
+        )
+        attd_by_date_by_student["num_of_periods_in_class"] = num_of_periods_in_class
+        attd_by_date_by_student["only_present_one_period"] = (
+            num_of_periods_in_class == 1
+        )
+    else:
+        attd_by_date_by_student["in_school?"] = attd_by_date_by_student.apply(
+            in_school, axis=1
+        )
+        attd_by_date_by_student["num_of_periods_in_class"] = attd_by_date_by_student.apply(
+            return_number_of_periods_present, axis=1
+        )
+        attd_by_date_by_student["only_present_one_period"] = attd_by_date_by_student.apply(
+            return_only_present_one_period, axis=1
+        )
 
     # Merge in overall school absent/present
     jupiter_attd_df = jupiter_attd_df.merge(
@@ -146,7 +233,10 @@ def main(jupiter_attd_df, week_number=None, day_of=None):
     ).fillna(-1)
 
     df = jupiter_attd_df.drop_duplicates(subset=["StudentID", "Date"])
-    df["num_of_periods_late"] = df.apply(num_of_periods_late, axis=1)
+    if vectorized:
+        df["num_of_periods_late"] = return_num_of_periods_late_column(df)
+    else:
+        df["num_of_periods_late"] = df.apply(num_of_periods_late, axis=1)
 
     jupiter_attd_df = jupiter_attd_df.merge(
         df[["StudentID", "Date", "num_of_periods_late"]],
@@ -154,12 +244,67 @@ def main(jupiter_attd_df, week_number=None, day_of=None):
         how="left",
     ).fillna(-1)
 
-    # determine if cutting
-    jupiter_attd_df["cutting?"] = jupiter_attd_df.apply(is_cutting, axis=1)
-    # determine if late to school
-    jupiter_attd_df["late_to_school?"] = jupiter_attd_df.apply(
-        is_late_to_school, axis=1
+    if vectorized:
+        Type = jupiter_attd_df["Type"]
+        is_in_school = jupiter_attd_df["in_school?"].astype(bool)
+        class_period = jupiter_attd_df["Pd"]
+        first_period_present = jupiter_attd_df["first_period_present"]
+        # determine if cutting
+        jupiter_attd_df["cutting?"] = (jupiter_attd_df["Attendance"] == "C") | (
+            (Type == "unexcused") & (class_period >= first_period_present) & is_in_school
+        )
+        # determine if late to school
+        jupiter_attd_df["late_to_school?"] = (
+            Type.isin(["unexcused", "tardy"])
+            & (class_period <= first_period_present)
+            & is_in_school
+        )
+    else:
+        # determine if cutting
+        jupiter_attd_df["cutting?"] = jupiter_attd_df.apply(is_cutting, axis=1)
+        # determine if late to school
+        jupiter_attd_df["late_to_school?"] = jupiter_attd_df.apply(
+            is_late_to_school, axis=1
+        )
+    return jupiter_attd_df
+
+
+def return_daily_totals_df(jupiter_attd_df):
+    """Per StudentID and Date: cut periods, late to school (0/1) and absent (0/1).
+    Summing these over any set of dates gives the same totals as
+    attach_attendance_totals computes from the flagged rows."""
+    df = jupiter_attd_df[["StudentID", "Date", "cutting?", "late_to_school?", "in_school?"]]
+    daily_totals_df = df.groupby(["StudentID", "Date"], sort=False).agg(
+        num_of_cuts=("cutting?", "sum"),
+        num_of_late_to_school=("late_to_school?", "max"),
+        in_school=("in_school?", "max"),
     )
+    daily_totals_df["num_of_late_to_school"] = daily_totals_df[
+        "num_of_late_to_school"
+    ].astype(int)
+    daily_totals_df["num_of_days_absent"] = (~daily_totals_df["in_school"].astype(bool)).astype(int)
+    return daily_totals_df.drop(columns=["in_school"]).reset_index()
+
+
+def attach_attendance_totals(
+    jupiter_attd_df, students_df, jupiter_rosters_df, totals_df=None, vectorized=True
+):
+    """totals_df (StudentID, num_of_cuts, num_of_late_to_school,
+    num_of_days_absent) can be passed in when the totals were already
+    aggregated, e.g. summed from the fact table's daily totals."""
+    if totals_df is not None:
+        jupiter_attd_df = jupiter_attd_df.merge(
+            totals_df[["StudentID", "num_of_cuts"]], on=["StudentID"], how="left"
+        ).fillna(0)
+        jupiter_attd_df = jupiter_attd_df.merge(
+            totals_df[["StudentID", "num_of_late_to_school"]], on=["StudentID"], how="left"
+        ).fillna(0)
+        jupiter_attd_df = jupiter_attd_df.merge(
+            totals_df[["StudentID", "num_of_days_absent"]], on=["StudentID"], how="left"
+        ).fillna(0)
+        return attach_student_info(
+            jupiter_attd_df, students_df, jupiter_rosters_df, vectorized=vectorized
+        )
 
     number_of_cuts_df = (
         pd.pivot_table(
@@ -211,14 +356,27 @@ def main(jupiter_attd_df, week_number=None, day_of=None):
     jupiter_attd_df = jupiter_attd_df.merge(
         number_of_days_absent_df, on=["StudentID"], how="left"
     ).fillna(0)
+    return attach_student_info(
+        jupiter_attd_df, students_df, jupiter_rosters_df, vectorized=vectorized
+    )
+
 
-    jupiter_attd_df["attd_error"] = jupiter_attd_df.apply(detect_attd_error, axis=1)
+def attach_student_info(jupiter_attd_df, students_df, jupiter_rosters_df, vectorized=True):
+    if vectorized:
+        jupiter_attd_df["attd_error"] = jupiter_attd_df[
+            "only_present_one_period"
+        ].astype(bool) & jupiter_attd_df["Type"].isin(["present", "tardy"])
+    else:
+        jupiter_attd_df["attd_error"] = jupiter_attd_df.apply(detect_attd_error, axis=1)
 
     jupiter_attd_df = jupiter_attd_df.merge(students_df, on=["StudentID"], how="left")
 
-    jupiter_attd_df["enhanced_mark"] = jupiter_attd_df.apply(
-        return_enhanced_mark, axis=1
-    )
+    if vectorized:
+        jupiter_attd_df["enhanced_mark"] = return_enhanced_mark_column(jupiter_attd_df)
+    else:
+        jupiter_attd_df["enhanced_mark"] = jupiter_attd_df.apply(
+            return_enhanced_mark, axis=1
+        )
 
     overall_late_df = jupiter_attd_df[['StudentID','late_to_school?']].drop_duplicates(subset=['StudentID'], keep='first')
     overall_late_df = overall_late_df.rename(columns={'late_to_school?':'overall_late_to_school'})
@@ -229,6 +387,48 @@ def main(jupiter_attd_df, week_number=None, day_of=None):
     return jupiter_attd_df
 
 
+def return_pd_column(Period):
+    ## a semester has only a handful of distinct Period labels, so parse those
+    codes, uniques = pd.factorize(Period, use_na_sentinel=False)
+    Pds = pd.Series(uniques).astype(str).str.extract(r"(\d+)", expand=False)
+    return pd.Series(
+        Pds.astype("int64").to_numpy()[codes], index=Period.index, name=Period.name
+    )
+
+
+def return_num_of_periods_late_column(df):
+    Pd = df["Pd"]
+    first_period_present = df["first_period_present"]
+    is_tardy = (df["first_period_attd_type"] == "tardy") & (first_period_present != -1)
+
+    num_of_periods_late = (first_period_present - Pd).astype(float)
+    num_of_periods_late = num_of_periods_late.where(~is_tardy, num_of_periods_late + 0.5)
+    num_of_periods_late = num_of_periods_late.where(first_period_present != -1, -1)
+
+    ## the row-wise version only produces floats when a tardy offset or a float
+    ## first_period_present is involved
+    if (
+        pd.api.types.is_integer_dtype(first_period_present)
+        and pd.api.types.is_integer_dtype(Pd)
+        and not is_tardy.any()
+    ):
+        num_of_periods_late = num_of_periods_late.astype("int64")
+    return num_of_periods_late
+
+
+def return_enhanced_mark_column(df):
+    flag = np.select(
+        [
+            df["cutting?"].astype(bool),
+            df["late_to_school?"].astype(bool),
+            df["attd_error"].astype(bool),
+        ],
+        [" - potential cut", " - potential late to school", " - Possible Attd Err"],
+        default="",
+    )
+    return df["Type"].astype(str) + " " + flag
+
+
 def return_enhanced_mark(student_row):
     attd_type = student_row["Type"]
     attd_error = student_row["attd_error"]
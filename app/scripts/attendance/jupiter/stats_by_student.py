@@ -2,7 +2,6 @@ import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from app.scripts.attendance.jupiter.process import process_local_file as process_jupiter_data
 
@@ -2,7 +2,6 @@ import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from app.scripts.attendance.jupiter import process as process_jupiter_data
 
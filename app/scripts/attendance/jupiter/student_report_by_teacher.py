@@ -3,12 +3,12 @@ from flask import session
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from app.scripts.attendance.jupiter import process as process_jupiter_data
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
@@ -3,8 +3,10 @@ Excel formatting utilities for attendance analysis
 Handles styling, conditional formatting, and visual presentation
 """
 
+from functools import lru_cache
+
 import pandas as pd  # ✓ FIXED: Moved to top
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.formatting.rule import CellIsRule
 
@@ -32,24 +34,55 @@ COLORS = {
 }
 
 
-def apply_header_style(ws, row_num, num_cols):
-    """Apply consistent header styling to a row"""
+## Styles are built once and shared; openpyxl only keeps one copy of each
+## in the workbook, so constructing them per cell just costs time
+THIN_SIDE = Side(style='thin')
+THIN_BORDER = Border(left=THIN_SIDE, right=THIN_SIDE, top=THIN_SIDE, bottom=THIN_SIDE)
+HEADER_FONT = Font(bold=True, size=11)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center', wrap_text=True)
+DATA_ROW_ALIGNMENT = Alignment(horizontal='left', vertical='center')
+
+
+@lru_cache(maxsize=None)
+def return_fill(color):
+    """Solid PatternFill of color, shared between cells"""
+    return PatternFill(start_color=color, end_color=color, fill_type='solid')
+
+
+def return_named_style(ws, name, **style_kwargs):
+    """
+    Register a NamedStyle with the worksheet's workbook the first time it is
+    used and return its name. Setting cell.style to the name copies the
+    workbook's style ids in one step instead of registering a font, fill,
+    alignment and border per cell.
+    """
+    wb = ws.parent
+    if name not in wb.named_styles:
+        wb.add_named_style(NamedStyle(name=name, **style_kwargs))
+    return name
+
+
+def apply_named_style(ws, row_num, num_cols, style_name):
     for col in range(1, num_cols + 1):
         cell = ws.cell(row=row_num, column=col)
-        cell.font = Font(bold=True, size=11)
-        cell.fill = PatternFill(start_color=COLORS['header'], 
-                               end_color=COLORS['header'], 
-                               fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        
-        # Add borders
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        cell.border = thin_border
+        ## the named style would reset dates written with a date format
+        number_format = cell.number_format
+        cell.style = style_name
+        if number_format != 'General':
+            cell.number_format = number_format
+
+
+def apply_header_style(ws, row_num, num_cols):
+    """Apply consistent header styling to a row"""
+    style_name = return_named_style(
+        ws,
+        'attendance_header',
+        font=HEADER_FONT,
+        fill=return_fill(COLORS['header']),
+        alignment=HEADER_ALIGNMENT,
+        border=THIN_BORDER,
+    )
+    apply_named_style(ws, row_num, num_cols, style_name)
 
 
 def apply_data_row_style(ws, row_num, num_cols, issue_type=None):
@@ -64,51 +97,38 @@ def apply_data_row_style(ws, row_num, num_cols, issue_type=None):
                     'attendance_error', 'declining_trend', etc.
     """
     fill_color = COLORS.get(issue_type, 'FFFFFF')
-    
-    for col in range(1, num_cols + 1):
-        cell = ws.cell(row=row_num, column=col)
-        cell.fill = PatternFill(start_color=fill_color, 
-                               end_color=fill_color, 
-                               fill_type='solid')
-        cell.alignment = Alignment(horizontal='left', vertical='center')
-        
-        # Add borders
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        cell.border = thin_border
+    style_name = return_named_style(
+        ws,
+        f"attendance_{issue_type or 'default'}",
+        fill=return_fill(fill_color),
+        alignment=DATA_ROW_ALIGNMENT,
+        border=THIN_BORDER,
+    )
+    apply_named_style(ws, row_num, num_cols, style_name)
 
 
 def apply_alternating_rows(ws, start_row, end_row, num_cols, color1='FFFFFF', color2='F8F8F8'):
     """Apply alternating row colors for readability"""
     for row in range(start_row, end_row + 1):
-        fill_color = color1 if (row - start_row) % 2 == 0 else color2
+        fill = return_fill(color1 if (row - start_row) % 2 == 0 else color2)
         for col in range(1, num_cols + 1):
             cell = ws.cell(row=row, column=col)
             if not cell.fill.start_color or cell.fill.start_color.rgb == '00000000':
-                cell.fill = PatternFill(start_color=fill_color, 
-                                       end_color=fill_color, 
-                                       fill_type='solid')
+                cell.fill = fill
 
 
 def auto_adjust_column_width(ws, min_width=10, max_width=50):
     """Auto-adjust column widths based on content"""
-    for column in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        
-        for cell in column:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except:
-                pass
-        
+    ## one pass over the values, without touching cell objects or styles
+    max_lengths = [0] * ws.max_column
+    for row in ws.iter_rows(values_only=True):
+        for col, value in enumerate(row):
+            if value:
+                max_lengths[col] = max(max_lengths[col], len(str(value)))
+    
+    for col, max_length in enumerate(max_lengths, start=1):
         adjusted_width = min(max(max_length + 2, min_width), max_width)
-        ws.column_dimensions[column_letter].width = adjusted_width
+        ws.column_dimensions[get_column_letter(col)].width = adjusted_width
 
 
 def add_conditional_formatting_attendance_rate(ws, data_range, rate_column):
@@ -122,9 +142,7 @@ def add_conditional_formatting_attendance_rate(ws, data_range, rate_column):
         CellIsRule(
             operator='greaterThan',
             formula=['0.9'],
-            fill=PatternFill(start_color=COLORS['good_attendance'], 
-                           end_color=COLORS['good_attendance'], 
-                           fill_type='solid')
+            fill=return_fill(COLORS['good_attendance'])
         )
     )
     
@@ -134,9 +152,7 @@ def add_conditional_formatting_attendance_rate(ws, data_range, rate_column):
         CellIsRule(
             operator='between',
             formula=['0.8', '0.9'],
-            fill=PatternFill(start_color=COLORS['approaching_chronic'], 
-                           end_color=COLORS['approaching_chronic'], 
-                           fill_type='solid')
+            fill=return_fill(COLORS['approaching_chronic'])
         )
     )
     
@@ -146,9 +162,7 @@ def add_conditional_formatting_attendance_rate(ws, data_range, rate_column):
         CellIsRule(
             operator='lessThan',
             formula=['0.8'],
-            fill=PatternFill(start_color=COLORS['chronic_absent'], 
-                           end_color=COLORS['chronic_absent'], 
-                           fill_type='solid')
+            fill=return_fill(COLORS['chronic_absent'])
         )
     )
 
@@ -182,7 +196,7 @@ def create_section_header(ws, row_num, title, num_cols):
     cell = ws.cell(row=row_num, column=1)
     cell.value = title
     cell.font = Font(bold=True, size=12, color='FFFFFF')
-    cell.fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    cell.fill = return_fill('4472C4')
     cell.alignment = Alignment(horizontal='left', vertical='center')
     
     return row_num + 1
@@ -208,9 +222,7 @@ def create_summary_box(ws, start_row, start_col, title, stats_dict):
     cell = ws.cell(row=current_row, column=start_col)
     cell.value = title
     cell.font = Font(bold=True, size=11)
-    cell.fill = PatternFill(start_color=COLORS['subheader'], 
-                           end_color=COLORS['subheader'], 
-                           fill_type='solid')
+    cell.fill = return_fill(COLORS['subheader'])
     ws.merge_cells(start_row=current_row, start_column=start_col,
                    end_row=current_row, end_column=start_col + 1)
     current_row += 1
@@ -255,9 +267,7 @@ def add_legend(ws, start_row, start_col):
     for label, color_key in legend_items:
         label_cell = ws.cell(row=current_row, column=start_col)
         label_cell.value = label
-        label_cell.fill = PatternFill(start_color=COLORS[color_key], 
-                                     end_color=COLORS[color_key], 
-                                     fill_type='solid')
+        label_cell.fill = return_fill(COLORS[color_key])
         current_row += 1
     
     return current_row
\ No newline at end of file
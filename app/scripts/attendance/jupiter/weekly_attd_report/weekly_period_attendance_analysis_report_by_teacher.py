@@ -305,12 +305,8 @@ def create_tier3_sheet(wb, tier3_df, date_of_report):
             cell = ws.cell(row=r_idx, column=c_idx, value=value)
             
             if r_idx == current_row:  # Header row
-                cell.font = openpyxl.styles.Font(bold=True)
-                cell.fill = openpyxl.styles.PatternFill(
-                    start_color=formatting.COLORS['header'],
-                    end_color=formatting.COLORS['header'],
-                    fill_type='solid'
-                )
+                cell.font = formatting.HEADER_FONT
+                cell.fill = formatting.return_fill(formatting.COLORS['header'])
             else:
                 # Color code by severity
                 semester_rate = tier3_df.iloc[r_idx - current_row - 1]['semester_attendance_rate']
@@ -321,9 +317,7 @@ def create_tier3_sheet(wb, tier3_df, date_of_report):
                 else:
                     fill_color = formatting.COLORS['declining_trend']
                 
-                cell.fill = openpyxl.styles.PatternFill(
-                    start_color=fill_color, end_color=fill_color, fill_type='solid'
-                )
+                cell.fill = formatting.return_fill(fill_color)
     
     formatting.auto_adjust_column_width(ws)
 
@@ -364,10 +358,10 @@ def create_most_improved_sheet(wb, by_section_df, by_counselor_df, date_of_repor
         for r_idx, row in enumerate(dataframe_to_rows(section_output, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(section_output.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(section_output.columns), 'most_improved')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(section_output.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(section_output.columns), 'most_improved')
         
         current_row += len(section_output) + 2
     else:
@@ -396,10 +390,10 @@ def create_most_improved_sheet(wb, by_section_df, by_counselor_df, date_of_repor
         for r_idx, row in enumerate(dataframe_to_rows(counselor_output, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(counselor_output.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(counselor_output.columns), 'most_improved')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(counselor_output.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(counselor_output.columns), 'most_improved')
         
         current_row += len(counselor_output) + 2
     
@@ -437,11 +431,7 @@ def create_teacher_sheet(wb, teacher, attendance_df, weekly_stats, selected_week
                 else:
                     # Color missing attendance
                     if value == '✗':
-                        cell.fill = openpyxl.styles.PatternFill(
-                            start_color=formatting.COLORS['missing_data'],
-                            end_color=formatting.COLORS['missing_data'],
-                            fill_type='solid'
-                        )
+                        cell.fill = formatting.return_fill(formatting.COLORS['missing_data'])
         current_row += len(completion_grid) + 2
     
     # Students with potential cuts
@@ -453,10 +443,10 @@ def create_teacher_sheet(wb, teacher, attendance_df, weekly_stats, selected_week
         for r_idx, row in enumerate(dataframe_to_rows(cuts_df, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(cuts_df.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(cuts_df.columns), 'cuts')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(cuts_df.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(cuts_df.columns), 'cuts')
         current_row += len(cuts_df) + 2
     else:
         ws.cell(row=current_row, column=1).value = "No potential cuts this week"
@@ -471,10 +461,10 @@ def create_teacher_sheet(wb, teacher, attendance_df, weekly_stats, selected_week
         for r_idx, row in enumerate(dataframe_to_rows(lates_df, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(lates_df.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(lates_df.columns), 'late_to_school')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(lates_df.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(lates_df.columns), 'late_to_school')
         current_row += len(lates_df) + 2
     
     # Attendance errors
@@ -486,10 +476,10 @@ def create_teacher_sheet(wb, teacher, attendance_df, weekly_stats, selected_week
         for r_idx, row in enumerate(dataframe_to_rows(errors_df, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(errors_df.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(errors_df.columns), 'attendance_error')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(errors_df.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(errors_df.columns), 'attendance_error')
         current_row += len(errors_df) + 2
     
     # Students absent all week
@@ -501,10 +491,10 @@ def create_teacher_sheet(wb, teacher, attendance_df, weekly_stats, selected_week
         for r_idx, row in enumerate(dataframe_to_rows(absent_df, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(absent_df.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(absent_df.columns), 'chronic_absent')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(absent_df.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(absent_df.columns), 'chronic_absent')
         current_row += len(absent_df) + 2
     
     # Most improved in teacher's sections
@@ -520,10 +510,10 @@ def create_teacher_sheet(wb, teacher, attendance_df, weekly_stats, selected_week
         for r_idx, row in enumerate(dataframe_to_rows(improved_output, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(improved_output.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(improved_output.columns), 'most_improved')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(improved_output.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(improved_output.columns), 'most_improved')
     
     formatting.auto_adjust_column_width(ws)
 
@@ -607,18 +597,18 @@ def create_counselor_sheet(wb, counselor, attendance_df, weekly_stats, selected_
         for r_idx, row in enumerate(dataframe_to_rows(tier3_display, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(tier3_display.columns))
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(tier3_display.columns))
+            else:
+                # Color by severity
+                semester_rate = tier3_caseload.iloc[r_idx - current_row - 1]['SemesterRate']
+                if semester_rate < 0.8:
+                    color = 'chronic_absent'
+                elif semester_rate < 0.9:
+                    color = 'approaching_chronic'
                 else:
-                    # Color by severity
-                    semester_rate = tier3_caseload.iloc[r_idx - current_row - 1]['SemesterRate']
-                    if semester_rate < 0.8:
-                        color = 'chronic_absent'
-                    elif semester_rate < 0.9:
-                        color = 'approaching_chronic'
-                    else:
-                        color = 'declining_trend'
-                    formatting.apply_data_row_style(ws, r_idx, len(tier3_display.columns), color)
+                    color = 'declining_trend'
+                formatting.apply_data_row_style(ws, r_idx, len(tier3_display.columns), color)
         
         current_row += len(tier3_display) + 2
     else:
@@ -708,18 +698,18 @@ def create_counselor_sheet(wb, counselor, attendance_df, weekly_stats, selected_
         for r_idx, row in enumerate(dataframe_to_rows(absent_display, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(absent_display.columns))
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(absent_display.columns))
+            else:
+                # Color by trend
+                trend = absent_df.iloc[r_idx - current_row - 1]['Trend']
+                if trend == 'Declining':
+                    color = 'chronic_absent'
+                elif trend == 'Improving':
+                    color = 'approaching_chronic'
                 else:
-                    # Color by trend
-                    trend = absent_df.iloc[r_idx - current_row - 1]['Trend']
-                    if trend == 'Declining':
-                        color = 'chronic_absent'
-                    elif trend == 'Improving':
-                        color = 'approaching_chronic'
-                    else:
-                        color = 'chronic_absent'
-                    formatting.apply_data_row_style(ws, r_idx, len(absent_display.columns), color)
+                    color = 'chronic_absent'
+                formatting.apply_data_row_style(ws, r_idx, len(absent_display.columns), color)
         
         current_row += len(absent_display) + 2
     else:
@@ -745,10 +735,10 @@ def create_counselor_sheet(wb, counselor, attendance_df, weekly_stats, selected_
         for r_idx, row in enumerate(dataframe_to_rows(improved_output, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(improved_output.columns))
-                else:
-                    formatting.apply_data_row_style(ws, r_idx, len(improved_output.columns), 'most_improved')
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(improved_output.columns))
+            else:
+                formatting.apply_data_row_style(ws, r_idx, len(improved_output.columns), 'most_improved')
         
         current_row += len(improved_output) + 2
     
@@ -824,17 +814,17 @@ def create_attendance_teacher_sheet(wb, att_teacher, attendance_df, weekly_stats
         for r_idx, row in enumerate(dataframe_to_rows(tier3_display, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(tier3_display.columns))
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(tier3_display.columns))
+            else:
+                semester_rate = tier3_caseload.iloc[r_idx - current_row - 1]['SemesterRate']
+                if semester_rate < 0.8:
+                    color = 'chronic_absent'
+                elif semester_rate < 0.9:
+                    color = 'approaching_chronic'
                 else:
-                    semester_rate = tier3_caseload.iloc[r_idx - current_row - 1]['SemesterRate']
-                    if semester_rate < 0.8:
-                        color = 'chronic_absent'
-                    elif semester_rate < 0.9:
-                        color = 'approaching_chronic'
-                    else:
-                        color = 'declining_trend'
-                    formatting.apply_data_row_style(ws, r_idx, len(tier3_display.columns), color)
+                    color = 'declining_trend'
+                formatting.apply_data_row_style(ws, r_idx, len(tier3_display.columns), color)
         
         current_row += len(tier3_display) + 2
     else:
@@ -917,17 +907,17 @@ def create_attendance_teacher_sheet(wb, att_teacher, attendance_df, weekly_stats
         for r_idx, row in enumerate(dataframe_to_rows(absent_display, index=False, header=True), current_row):
             for c_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == current_row:
-                    formatting.apply_header_style(ws, r_idx, len(absent_display.columns))
+            if r_idx == current_row:
+                formatting.apply_header_style(ws, r_idx, len(absent_display.columns))
+            else:
+                trend = absent_df.iloc[r_idx - current_row - 1]['Trend']
+                if trend == 'Declining':
+                    color = 'chronic_absent'
+                elif trend == 'Improving':
+                    color = 'approaching_chronic'
                 else:
-                    trend = absent_df.iloc[r_idx - current_row - 1]['Trend']
-                    if trend == 'Declining':
-                        color = 'chronic_absent'
-                    elif trend == 'Improving':
-                        color = 'approaching_chronic'
-                    else:
-                        color = 'chronic_absent'
-                    formatting.apply_data_row_style(ws, r_idx, len(absent_display.columns), color)
+                    color = 'chronic_absent'
+                formatting.apply_data_row_style(ws, r_idx, len(absent_display.columns), color)
         
         current_row += len(absent_display) + 2
     else:
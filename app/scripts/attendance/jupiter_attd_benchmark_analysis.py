@@ -2,7 +2,7 @@ import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.date_to_marking_period import return_mp_from_date
 
@@ -10,6 +10,7 @@ import math
 
 def main(data):
     ## student_info
+    files_df = utils.return_files_df()
     cr_3_07_filename = utils.return_most_recent_report(files_df, "3_07")
     cr_3_07_df = utils.return_file_as_df(cr_3_07_filename)
     school_year = session["school_year"]
@@ -2,12 +2,13 @@ import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.date_to_marking_period import return_mp_from_date
 
 
 def main(data):
+    files_df = utils.return_files_df()
     report = "rosters_and_grades"
     filename = utils.return_most_recent_report(files_df, report)
 
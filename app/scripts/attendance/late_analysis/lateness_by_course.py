@@ -5,10 +5,11 @@ from flask import session, current_app
 import os
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -69,18 +70,20 @@ def main():
     for time_col in ["Entry Time", "PeriodStartTime", "PeriodEndTime"]:
         attendance_marks_df[time_col] = pd.to_datetime(attendance_marks_df[time_col])
 
-    attendance_marks_df["swiped_into_building_flag"] = attendance_marks_df.apply(
-        return_if_swiped_into_building, axis=1
+    is_not_absent = attendance_marks_df["Attendance Status"] != "Absent"
+    attendance_marks_df["swiped_into_building_flag"] = is_not_absent & (
+        attendance_marks_df["Entry Time"] < attendance_marks_df["PeriodEndTime"]
     )
-
-    attendance_marks_df["swiped_into_building_on_time_flag"] = (
-        attendance_marks_df.apply(return_if_swiped_into_building_on_time, axis=1)
+    attendance_marks_df["swiped_into_building_on_time_flag"] = is_not_absent & (
+        attendance_marks_df["Entry Time"] <= attendance_marks_df["PeriodStartTime"]
     )
 
     attendance_marks_df = attendance_marks_df.dropna()
 
-    attendance_marks_df["missed_late_flag"] = attendance_marks_df.apply(
-        return_if_missed_late, axis=1
+    attendance_marks_df["missed_late_flag"] = (
+        ~attendance_marks_df["swiped_into_building_on_time_flag"]
+        & attendance_marks_df["swiped_into_building_flag"]
+        & (attendance_marks_df["Type"] == "present")
     )
 
     missed_lates_by_course_pvt = (
@@ -146,43 +149,3 @@ def main():
     f.seek(0)
 
     return f, "analysis.xlsx"
-
-
-def return_if_missed_late(row):
-    swiped_into_building_on_time_flag = row["swiped_into_building_on_time_flag"]
-    swiped_into_building_flag = row["swiped_into_building_flag"]
-    attendance_type = row["Type"]
-
-    return (
-        not swiped_into_building_on_time_flag
-        and swiped_into_building_flag
-        and (attendance_type == "present")
-    )
-
-
-def return_if_swiped_into_building(row):
-    attendance_status = row["Attendance Status"]
-
-    if attendance_status == "Absent":
-        return False
-    swipe_time = row["Entry Time"]
-    period_start_time = row["PeriodStartTime"]
-    period_end_time = row["PeriodEndTime"]
-    if swipe_time < period_end_time:
-        return True
-    else:
-        return False
-
-
-def return_if_swiped_into_building_on_time(row):
-    attendance_status = row["Attendance Status"]
-
-    if attendance_status == "Absent":
-        return False
-    swipe_time = row["Entry Time"]
-    period_start_time = row["PeriodStartTime"]
-    period_end_time = row["PeriodEndTime"]
-    if swipe_time <= period_start_time:
-        return True
-    else:
-        return False
@@ -4,13 +4,14 @@ import datetime as dt
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+from app.scripts import scripts
 
 def main():
     f = BytesIO()
 
     attd_by_student = process_jupiter_attendance()
-    attd_by_student = attd_by_student.merge(photos_df, on=['StudentID'], how='left')
+    attd_by_student = attd_by_student.merge(utils.return_photos_df(), on=['StudentID'], how='left')
     flowables = []
     for period in [1,2,3,4,5,6,7,8,9]:
         page_header = f"Top Lates by Period {period}"
@@ -18,7 +19,7 @@ def main():
         flowables.extend(return_photo_roster_pdf(page_header, top_30_lates))
 
     attd_by_student = return_top_lates_overall()
-    attd_by_student = attd_by_student.merge(photos_df, on=['StudentID'], how='left')
+    attd_by_student = attd_by_student.merge(utils.return_photos_df(), on=['StudentID'], how='left')
     page_header = f"Top Lates Overall"
     top_30_lates = attd_by_student.sort_values(by=['%_late']).drop_duplicates(subset=['StudentID']).tail(27)
     flowables.extend(return_photo_roster_pdf(page_header, top_30_lates))    
@@ -39,6 +40,7 @@ def main():
     return f, download_name
 
 def return_top_lates_overall():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -97,6 +99,7 @@ def return_top_lates_overall():
 
 
 def process_jupiter_attendance():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -215,7 +218,7 @@ def return_photo_roster_pdf(page_header, students_df):
 
 
         try:
-            I = Image(photo_path)
+            I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, image_dim))
             I.drawHeight = image_dim * inch
             I.drawWidth = image_dim * inch
             I.hAlign = "CENTER"
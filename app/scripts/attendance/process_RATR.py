@@ -1,10 +1,11 @@
 import pandas as pd
 import random
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 from app.scripts.date_to_marking_period import return_mp_from_date
 
 def main(RATR_df,school_year):
+    files_df = utils.return_files_df()
     calendar_filename = "app/data/SchoolCalendar.xlsx"
     calendar_df = pd.read_excel(calendar_filename)
     calendar_df["Holiday?"] = calendar_df["Holiday?"].astype("bool")
@@ -4,7 +4,7 @@ import os
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
@@ -29,12 +29,13 @@ def main(form, request):
 
 
 def return_rdal_report(consecutive_absences_df, rdal_df, class_date):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
 
     absentee_form_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "absentee_form_results", year_and_semester
+        utils.return_gsheets_df(), "absentee_form_results", year_and_semester
     )
 
     absentee_form_df = utils.return_google_sheet_as_dataframe(absentee_form_url)
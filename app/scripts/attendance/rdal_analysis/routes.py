@@ -5,7 +5,7 @@ from io import BytesIO
 
 from flask import render_template, request, send_file
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.attendance.rdal_analysis.forms import RDALUploadForm
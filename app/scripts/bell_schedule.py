@@ -0,0 +1,164 @@
+"""
+Bell Schedule
+
+Class-period lookup for time-stamped feeds (SmartPass passes, CAASS swipes,
+phone calls). Each schedule is a list of (period, start_time, end_time) tuples
+and a weekday schedule maps Monday=0 ... Sunday=6 to one of them. Lookups work
+on a whole datetime column at once with np.searchsorted over the period end
+times instead of looping over the schedule for every row.
+
+A time belongs to the first period that has not ended yet, so the passing
+time before a period counts toward it and anything after the last period has
+no class period.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+# Monday: All periods are 35 minutes
+MONDAY_SCHEDULE = [
+    (1, dt.time(9, 45), dt.time(10, 20)),   # Period 1: 9:45 - 10:20 (35 min)
+    (2, dt.time(10, 20), dt.time(11, 0)),   # Period 2: 10:20 - 11:00 (40 min - includes 5 min passing)
+    (3, dt.time(11, 0), dt.time(11, 40)),   # Period 3: 11:00 - 11:40 (40 min)
+    (4, dt.time(11, 40), dt.time(12, 20)),  # Period 4: 11:40 - 12:20 (40 min)
+    (5, dt.time(12, 20), dt.time(13, 0)),   # Period 5: 12:20 - 13:00 (40 min)
+    (6, dt.time(13, 0), dt.time(13, 40)),   # Period 6: 13:00 - 13:40 (40 min)
+    (7, dt.time(13, 40), dt.time(14, 20)),  # Period 7: 13:40 - 14:20 (40 min)
+    (8, dt.time(14, 20), dt.time(15, 0)),   # Period 8: 14:20 - 15:00 (40 min)
+    (9, dt.time(15, 0), dt.time(15, 40)),   # Period 9: 15:00 - 15:40 (40 min)
+]
+
+# Tuesday-Friday: Periods 1,2,4,5,6,7,8,9 are 45 minutes; Period 3 is 50 minutes
+REGULAR_SCHEDULE = [
+    (1, dt.time(8, 5), dt.time(8, 55)),     # Period 1: 8:05 - 8:55 (50 min - includes 5 min passing)
+    (2, dt.time(8, 55), dt.time(9, 45)),    # Period 2: 8:55 - 9:45 (50 min)
+    (3, dt.time(9, 45), dt.time(10, 40)),   # Period 3: 9:45 - 10:40 (55 min)
+    (4, dt.time(10, 40), dt.time(11, 30)),  # Period 4: 10:40 - 11:30 (50 min)
+    (5, dt.time(11, 30), dt.time(12, 20)),  # Period 5: 11:30 - 12:20 (50 min)
+    (6, dt.time(12, 20), dt.time(13, 10)),  # Period 6: 12:20 - 13:10 (50 min)
+    (7, dt.time(13, 10), dt.time(14, 0)),   # Period 7: 13:10 - 14:00 (50 min)
+    (8, dt.time(14, 0), dt.time(14, 50)),   # Period 8: 14:00 - 14:50 (50 min)
+    (9, dt.time(14, 50), dt.time(15, 40)),  # Period 9: 14:50 - 15:40 (50 min)
+]
+
+SUMMER_SCHEDULE = [
+    (1, dt.time(8, 0), dt.time(9, 48)),     # Assuming 108 min periods
+    (2, dt.time(9, 48), dt.time(11, 52)),
+    (3, dt.time(11, 52), dt.time(14, 27)),
+]
+
+## weekends fall back to the regular schedule, as the SmartPass report always has
+WEEKDAY_SCHEDULES = {0: MONDAY_SCHEDULE, **{weekday: REGULAR_SCHEDULE for weekday in range(1, 7)}}
+SUMMER_WEEKDAY_SCHEDULES = {weekday: SUMMER_SCHEDULE for weekday in range(7)}
+
+
+def return_weekday_schedules(term=None):
+    if term == 7:
+        return SUMMER_WEEKDAY_SCHEDULES
+    return WEEKDAY_SCHEDULES
+
+
+def return_time_ns(time):
+    return (
+        (time.hour * 3600 + time.minute * 60 + time.second) * 1_000_000_000
+        + time.microsecond * 1_000
+    )
+
+
+def _return_schedule_arrays(schedule):
+    periods = np.array([period for period, start_time, end_time in schedule])
+    start_ns = np.array([return_time_ns(start_time) for period, start_time, end_time in schedule])
+    end_ns = np.array([return_time_ns(end_time) for period, start_time, end_time in schedule])
+    return periods, start_ns, end_ns
+
+
+def return_time_of_day_ns(datetimes):
+    datetimes = pd.to_datetime(pd.Series(datetimes))
+    return (datetimes - datetimes.dt.normalize()).to_numpy("timedelta64[ns]").view("int64")
+
+
+def _return_schedule_groups(datetimes, weekday_schedules):
+    """Yields (schedule, row mask) for each distinct schedule in use."""
+    weekdays = datetimes.dt.weekday.to_numpy()
+    schedules = {}
+    for weekday, schedule in weekday_schedules.items():
+        schedules.setdefault(id(schedule), (schedule, []))[1].append(weekday)
+    for schedule, weekdays_on_schedule in schedules.values():
+        mask = np.isin(weekdays, weekdays_on_schedule)
+        if mask.any():
+            yield schedule, mask
+
+
+def return_class_periods_df(datetimes, weekday_schedules=WEEKDAY_SCHEDULES):
+    """
+    Returns class_period, period_start and minutes_into_period for every
+    datetime, indexed like datetimes.
+
+    class_period is int64 when every datetime falls in a period and float64
+    with NaN otherwise. minutes_into_period is negative during the passing
+    time before a period starts.
+    """
+    datetimes = pd.to_datetime(pd.Series(datetimes))
+    time_of_day_ns = return_time_of_day_ns(datetimes)
+    is_valid = datetimes.notna().to_numpy()
+
+    class_period = np.full(len(datetimes), np.nan)
+    period_start_ns = np.full(len(datetimes), np.nan)
+    for schedule, mask in _return_schedule_groups(datetimes, weekday_schedules):
+        mask = mask & is_valid
+        periods, start_ns, end_ns = _return_schedule_arrays(schedule)
+        idx = np.searchsorted(end_ns, time_of_day_ns[mask], side="left")
+        in_period = idx < len(periods)
+        rows = np.flatnonzero(mask)[in_period]
+        class_period[rows] = periods[idx[in_period]]
+        period_start_ns[rows] = start_ns[idx[in_period]]
+
+    if not np.isnan(class_period).any():
+        class_period = class_period.astype("int64")
+
+    return pd.DataFrame(
+        {
+            "class_period": class_period,
+            "period_start": pd.to_timedelta(period_start_ns, unit="ns"),
+            "minutes_into_period": (time_of_day_ns - period_start_ns) / 60e9,
+        },
+        index=datetimes.index,
+    )
+
+
+def return_class_period_column(datetimes, weekday_schedules=WEEKDAY_SCHEDULES):
+    return return_class_periods_df(datetimes, weekday_schedules)["class_period"]
+
+
+def return_period_bounds_df(datetimes, class_periods, weekday_schedules=WEEKDAY_SCHEDULES):
+    """
+    Returns period_start_time and period_end_time (dt.time, or None when the
+    period is not on that day's schedule) for datetimes paired with an already
+    known class period, e.g. a Jupiter attendance Pd.
+    """
+    datetimes = pd.to_datetime(pd.Series(datetimes))
+    class_periods = pd.Series(class_periods).to_numpy()
+
+    period_start_time = np.full(len(datetimes), None, dtype=object)
+    period_end_time = np.full(len(datetimes), None, dtype=object)
+    for schedule, mask in _return_schedule_groups(datetimes, weekday_schedules):
+        start_times = {period: start_time for period, start_time, end_time in schedule}
+        end_times = {period: end_time for period, start_time, end_time in schedule}
+        rows = np.flatnonzero(mask)
+        period_start_time[rows] = [start_times.get(period) for period in class_periods[rows]]
+        period_end_time[rows] = [end_times.get(period) for period in class_periods[rows]]
+
+    return pd.DataFrame(
+        {"period_start_time": period_start_time, "period_end_time": period_end_time},
+        index=datetimes.index,
+    )
+
+
+def is_in_first_n_minutes(datetimes, minutes=10, weekday_schedules=WEEKDAY_SCHEDULES):
+    """True where the datetime falls within the first `minutes` minutes after
+    its class period starts, inclusive on both ends."""
+    class_periods_df = return_class_periods_df(datetimes, weekday_schedules)
+    minutes_into_period = class_periods_df["minutes_into_period"]
+    return (minutes_into_period >= 0) & (minutes_into_period <= minutes)
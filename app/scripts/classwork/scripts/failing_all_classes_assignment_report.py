@@ -5,11 +5,13 @@ from io import BytesIO
 import pandas as pd
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
+from app.scripts.assignments import clean_assignments
 
 from flask import session
 
 def main(data):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -49,13 +51,13 @@ def main(data):
 
     ## process assignments
     filename = utils.return_most_recent_report_by_semester(files_df, "assignments", year_and_semester=year_and_semester)
-    assignments_df = utils.return_file_as_df(filename)
+    assignments_df = clean_assignments.return_clean_assignments_df(filename)
     # Keep Assignments from Marking Period
     assignments_df = assignments_df[assignments_df['Term']==term]
     # keep just assignments from relevant students
     assignments_df = assignments_df[assignments_df['StudentID'].isin(students_failing_all_classes)]
     # keep assignments less than passing
-    assignments_df = assignments_df[assignments_df['Percent'] < 65]
+    assignments_df = assignments_df[assignments_df['IsFailing']]
     ## drop duplicates due to mutliple objectives
     assignments_df = assignments_df.drop_duplicates(subset=['StudentID','Course','Assignment','DueDate'])
     assignments_df = assignments_df.sort_values(by=['Category','Missing','WorthPoints'], ascending=[True,True,False])
@@ -68,12 +70,15 @@ def main(data):
     students_df.to_excel(writer, sheet_name='StudentFailingAllClasses', index=False)
     
     table_cols = ['Teacher','Course','Pct','Assignment','Category','DueDate','RawScore','WorthPoints']
+    ## split once instead of filtering the assignments for every student
+    assignments_by_student = dict(tuple(assignments_df[['StudentID'] + table_cols].groupby('StudentID', sort=False)))
+    empty_df = pd.DataFrame(columns=table_cols)
     for index, student in students_df.iterrows():
         first_name = student['FirstName']
         last_name = student['LastName']
         StudentID = student['StudentID']
         sheet_name = f"{last_name} {first_name[0]}"
-        df = assignments_df[assignments_df['StudentID']==StudentID]
+        df = assignments_by_student.get(StudentID, empty_df)
         df[table_cols].to_excel(writer, sheet_name=sheet_name, index=False)
 
     for sheet in writer.sheets:
@@ -55,11 +55,13 @@ closing = [
 import pandas as pd
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
+from app.scripts.assignments import clean_assignments
 
 from flask import session
 
 def main(data):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -109,7 +111,7 @@ def main(data):
 
     ## process assignments
     filename = utils.return_most_recent_report_by_semester(files_df, "assignments", year_and_semester=year_and_semester)
-    assignments_df = utils.return_file_as_df(filename)
+    assignments_df = clean_assignments.return_clean_assignments_df(filename)
     # Keep Assignments from Marking Period
     assignments_df = assignments_df[assignments_df["Term"] == term]
     # keep just assignments from relevant students
@@ -117,7 +119,7 @@ def main(data):
         assignments_df["StudentID"].isin(students_failing_one_class)
     ]
     # keep assignments less than passing
-    assignments_df = assignments_df[assignments_df["Percent"] < 65]
+    assignments_df = assignments_df[assignments_df["IsFailing"]]
     ## drop duplicates due to mutliple objectives
     assignments_df = assignments_df.drop_duplicates(
         subset=["StudentID", "Course", "Assignment", "DueDate"]
@@ -126,8 +128,12 @@ def main(data):
         by=["Category", "Missing", "WorthPoints"], ascending=[True, True, False]
     )
 
+    ## split once instead of filtering the assignments for every student
+    assignments_by_student_and_course = dict(
+        tuple(assignments_df.groupby(["StudentID", "Course"], sort=False))
+    )
     students_df["flowables"] = students_df.apply(
-        return_student_flowables, axis=1, args=(assignments_df,)
+        return_student_flowables, axis=1, args=(assignments_by_student_and_course,)
     )
 
     ## sort by teacher, course, section
@@ -153,7 +159,7 @@ def main(data):
     return f
 
 
-def return_student_flowables(student_row, assignments_df):
+def return_student_flowables(student_row, assignments_by_student_and_course):
     flowables = []
 
     StudentID = student_row["StudentID"]
@@ -164,11 +170,10 @@ def return_student_flowables(student_row, assignments_df):
     section = student_row["Section"]
     teacher = student_row["Teacher1"]
 
-    student_assignments = assignments_df[
-        (assignments_df["StudentID"] == StudentID)
-        & (assignments_df["Course"] == course)
-    ]
     table_cols = ["Assignment", "Category", "DueDate", "RawScore", "WorthPoints"]
+    student_assignments = assignments_by_student_and_course.get(
+        (StudentID, course), pd.DataFrame(columns=table_cols)
+    )
     student_assignments = student_assignments[table_cols]
 
     paragraph = Paragraph(
@@ -6,7 +6,7 @@ from io import BytesIO
 from flask import session, current_app
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.reportlab_utils import reportlab_letter_head, reportlab_closing
 import app.scripts.utils as utils
@@ -14,6 +14,7 @@ import app.scripts.utils as utils
 
 def main(form, request):
 
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
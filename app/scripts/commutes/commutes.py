@@ -12,7 +12,7 @@ from reportlab.platypus import SimpleDocTemplate
 import app.scripts.utils as utils
 import app.scripts.commutes.utils as commute_utils
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.commutes.forms import CommuteByClassForm
 
@@ -33,6 +33,7 @@ def return_commute_reports():
 
 @scripts.route("/commutes/class_report/", methods=["GET", "POST"])
 def generate_commute_class_report():
+    files_df = utils.return_files_df()
     if request.method == 'GET':
         data = {"form": CommuteByClassForm()}
         return render_template("commutes/templates/commutes/commutes_by_class.html",data=data)
@@ -0,0 +1,141 @@
+"""
+DataFrame Cache
+
+Process-wide LRU cache of parsed report files used by utils.return_file_as_df.
+Entries are keyed by (path, mtime, size, read kwargs), so re-uploading a file
+under the same name misses the cache and replaces the stale entry. The cache
+hands out copies of the stored frames so callers that mutate their DataFrame
+cannot change what the next request reads.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+MAX_ENTRIES = 64
+MAX_BYTES = 2 * 1024**3
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if callable(value) and not isinstance(value, type):
+        raise TypeError("callable read kwargs are not cacheable")
+    hash(value)
+    return value
+
+
+def _return_nbytes(obj):
+    if isinstance(obj, dict):
+        return sum(_return_nbytes(v) for v in obj.values())
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    return 0
+
+
+def _return_copy(obj):
+    if isinstance(obj, dict):
+        return {k: _return_copy(v) for k, v in obj.items()}
+    if isinstance(obj, pd.DataFrame):
+        return obj.copy()
+    return obj
+
+
+class DataFrameCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    def return_key(self, filename, kwargs):
+        stat = os.stat(filename)
+        return (
+            os.path.abspath(filename),
+            stat.st_mtime_ns,
+            stat.st_size,
+            _freeze(kwargs),
+        )
+
+    def get_or_load(self, filename, loader, **kwargs):
+        try:
+            key = self.return_key(filename, kwargs)
+        except (OSError, TypeError):
+            with self._lock:
+                self.uncacheable += 1
+            return loader(filename, **kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _return_copy(entry[0])
+            self.misses += 1
+
+        obj = loader(filename, **kwargs)
+        nbytes = _return_nbytes(obj)
+        if nbytes <= self.max_bytes:
+            with self._lock:
+                self._store(key, obj, nbytes)
+        return _return_copy(obj)
+
+    def _store(self, key, obj, nbytes):
+        ## drop entries for earlier versions of the same file
+        for stale_key in [
+            k for k in self._entries if k[0] == key[0] and k[1:3] != key[1:3]
+        ]:
+            self._nbytes -= self._entries.pop(stale_key)[1]
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._nbytes -= old[1]
+        self._entries[key] = (obj, nbytes)
+        self._nbytes += nbytes
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._nbytes > self.max_bytes
+        ):
+            _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= evicted_nbytes
+            self.evictions += 1
+
+    def invalidate(self, filename=None):
+        with self._lock:
+            if filename is None:
+                self._entries.clear()
+                self._nbytes = 0
+                return
+            path = os.path.abspath(filename)
+            for key in [key for key in self._entries if key[0] == path]:
+                self._nbytes -= self._entries.pop(key)[1]
+
+    def return_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+                "evictions": self.evictions,
+                "uncacheable": self.uncacheable,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "nbytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "files": [
+                    {"filename": key[0], "kwargs": repr(key[3]), "nbytes": nbytes}
+                    for key, (_, nbytes) in self._entries.items()
+                ],
+            }
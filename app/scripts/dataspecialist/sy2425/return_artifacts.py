@@ -5,7 +5,7 @@ from io import BytesIO
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
@@ -44,6 +44,7 @@ def main():
 
 
 def return_attendance_flowables(year_and_semester):
+    files_df = utils.return_files_df()
     jupiter_attd_filename = utils.return_most_recent_report_by_semester(files_df, "jupiter_period_attendance", year_and_semester=year_and_semester)
     
     attendance_marks_df = utils.return_file_as_df(jupiter_attd_filename)
@@ -81,6 +82,7 @@ def return_attendance_flowables(year_and_semester):
 
 
 def return_assignments_flowables(year_and_semester):
+    files_df = utils.return_files_df()
     filename = utils.return_most_recent_report_by_semester(files_df, "assignments", year_and_semester=year_and_semester)
     
     student_assignments_df = utils.return_file_as_df(filename)
@@ -104,6 +106,7 @@ def return_assignments_flowables(year_and_semester):
 
 
 def return_attendance_and_assignments_flowables(year_and_semester):
+    files_df = utils.return_files_df()
     filename = utils.return_most_recent_report_by_semester(files_df, "3_07", year_and_semester=year_and_semester)
     students_df = utils.return_file_as_df(filename)
     students_df = students_df[['StudentID','LastName','FirstName']]
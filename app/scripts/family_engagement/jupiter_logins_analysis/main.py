@@ -5,7 +5,7 @@ from io import BytesIO
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 
@@ -33,6 +33,7 @@ def process_login_data(login_df):
 
 def return_login_report(login_df):
 
+    files_df = utils.return_files_df()
     pvt_tbl = pd.pivot_table(
         login_df,
         index=['StudentID'],
@@ -4,7 +4,7 @@ from io import BytesIO
 from flask import render_template, request, send_file, session
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 
@@ -7,7 +7,7 @@ from wtforms.validators import DataRequired, Regexp, InputRequired
 from werkzeug.utils import secure_filename
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 import pandas as pd
 
@@ -19,6 +19,7 @@ class AttendanceWeekOfForm(FlaskForm):
     )
 
     def __init__(self, *args, **kwargs):
+        files_df = utils.return_files_df()
         super(AttendanceWeekOfForm, self).__init__(*args, **kwargs)
 
         school_year = session["school_year"]
@@ -1,6 +1,6 @@
 from flask import render_template, request, send_file, session
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 import pandas as pd
 import itertools
@@ -23,6 +23,7 @@ def return_weekly_assignments(form, request):
 
 def analyze_recent_attendance(form, request):
 
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -39,6 +40,7 @@ def analyze_recent_attendance(form, request):
 
 def analyze_recent_assignments(form, request):
 
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -55,6 +57,7 @@ def analyze_recent_assignments(form, request):
 
 
 def assign_students_to_staff():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -0,0 +1,62 @@
+"""
+Concurrent Fan-out
+
+Runs one update per target (a teacher's gradebook, a sending school's
+attendance sheet) on a bounded thread pool instead of one after another.
+These updates spend nearly all their time waiting on the Google APIs, so a
+60-teacher push takes about as long as its slowest few targets rather than
+the sum of them.
+
+A failing target is recorded and the rest carry on. run_fan_out returns a
+summary frame with one row per target, in the order given. The per-minute
+Sheets quota is enforced by the gateway's rate limiters, which every thread
+shares.
+
+The update functions run outside the Flask request, so they must not touch
+session or current_app; read those first and pass the values in.
+"""
+
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+MAX_WORKERS = 8
+
+
+def run_target(function, args):
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+        status, error = "ok", ""
+    except Exception as e:
+        traceback.print_exc()
+        result, status, error = None, "failed", f"{type(e).__name__}: {e}"
+    return {
+        "status": status,
+        "error": error,
+        "result": result,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def run_fan_out(function, targets, max_workers=MAX_WORKERS):
+    """
+    Calls function(*args) for every (name, args) in targets on up to
+    max_workers threads. Returns a frame indexed by name with status ("ok" or
+    "failed"), error, result and seconds.
+    """
+    targets = list(targets)
+    if not targets:
+        return pd.DataFrame(columns=["status", "error", "result", "seconds"])
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as executor:
+        futures = [executor.submit(run_target, function, args) for name, args in targets]
+        rows = [future.result() for future in futures]
+    summary_df = pd.DataFrame(rows, index=[name for name, args in targets])
+    num_of_failed = (summary_df["status"] == "failed").sum()
+    print(
+        f"{function.__name__}: {len(summary_df) - num_of_failed} ok, "
+        f"{num_of_failed} failed"
+    )
+    return summary_df
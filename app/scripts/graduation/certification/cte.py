@@ -1,12 +1,13 @@
 import pandas as pd  #
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import current_app, session
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     cte_df = pd.DataFrame()
 
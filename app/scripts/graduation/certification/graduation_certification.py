@@ -2,7 +2,7 @@ import pandas as pd  #
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import current_app, session
 
@@ -10,6 +10,7 @@ from app.scripts.graduation.certification import cte
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -6,7 +6,6 @@ import os
 from flask import render_template, request, send_file, session, current_app
 
 
-from app.scripts import files_df
 import app.scripts.utils as utils
 
 
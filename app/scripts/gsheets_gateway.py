@@ -0,0 +1,666 @@
+"""
+Google Sheets Gateway
+
+One place for every Google Sheets read and write. The gateway holds the single
+authorized pygsheets client and caches two things per spreadsheet:
+- the spreadsheet handle, which gives the worksheet titles;
+- worksheet values, for TTL_SECONDS.
+
+When an entry is older than the TTL, it is kept if the file's Drive
+modifiedTime has not changed, which costs one small Drive request instead of
+re-reading the values. Reading several worksheets of one spreadsheet is one
+values.batchGet. Writes through the gateway invalidate that spreadsheet's
+cache.
+
+Rate-limit (429) and transient 5xx errors are retried with exponential
+backoff and jitter. pygsheets' own fixed 100 second sleep is turned off.
+
+sync_dataframe is the incremental alternative to set_dataframe. It reads
+the worksheet, diffs it cell by cell against the frame, and writes only the
+changed blocks in a single values.batchUpdate. Values are compared the way
+Sheets displays them, so 90 and "90.0" are equal. When the diff would need too
+many ranges, or the worksheet is new, it rewrites the whole block instead.
+
+The client is safe to share between threads (see fan_out): each thread gets
+its own httplib2 connection, and every Sheets request first waits on a
+per-minute rate limiter for reads or writes, so concurrent updates stay under
+the per-user quota instead of collecting 429s.
+
+Setting GSHEETS_FAKE_DIRECTORY swaps the Google backend for FileBackend, which
+keeps every spreadsheet as a directory of CSV files (<key>/<worksheet>.csv),
+so sheet-driven reports can run offline.
+"""
+
+import collections
+import csv
+import os
+import random
+import re
+import threading
+import time
+from urllib.parse import quote, unquote
+
+import httplib2
+import pandas as pd
+import pygsheets
+from pygsheets.utils import numericise, numericise_all
+
+from app.scripts.lazy import lazy_object
+
+TTL_SECONDS = 60
+MAX_RETRIES = 6
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_MAX_SECONDS = 32
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+## the Sheets API allows 60 read and 60 write requests per minute per user
+SHEETS_READS_PER_MINUTE = 55
+SHEETS_WRITES_PER_MINUTE = 55
+SHEETS_API_HOST = "sheets.googleapis.com"
+## sync_dataframe rewrites the whole block when the diff needs more ranges
+MAX_SYNC_RANGES = 200
+
+SPREADSHEET_KEY_REGEX = re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)")
+
+
+class RateLimiter:
+    """Blocks acquire() so that at most num_of_requests start in any
+    per_seconds window."""
+
+    def __init__(self, num_of_requests, per_seconds=60):
+        self.num_of_requests = num_of_requests
+        self.per_seconds = per_seconds
+        self._starts = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= self.per_seconds:
+                    self._starts.popleft()
+                if len(self._starts) < self.num_of_requests:
+                    self._starts.append(now)
+                    return
+                wait = self.per_seconds - (now - self._starts[0])
+            time.sleep(wait)
+
+
+sheets_read_limiter = RateLimiter(SHEETS_READS_PER_MINUTE)
+sheets_write_limiter = RateLimiter(SHEETS_WRITES_PER_MINUTE)
+
+
+class ThreadLocalHttp:
+    """httplib2.Http stand-in holding one connection per thread, since
+    httplib2 is not thread-safe. Sheets requests wait on the read or write
+    rate limiter first."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def http(self):
+        if not hasattr(self._local, "http"):
+            self._local.http = httplib2.Http()
+        return self._local.http
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        if SHEETS_API_HOST in uri:
+            limiter = sheets_read_limiter if method == "GET" else sheets_write_limiter
+            limiter.acquire()
+        return self.http.request(uri, method, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+def authorize_google_client():
+    ## check=False: let call_with_backoff handle 429s instead of pygsheets
+    ## sleeping a fixed seconds_per_quota
+    return pygsheets.authorize(
+        service_account_env_var="GDRIVE_API_CREDENTIALS", check=False, http=ThreadLocalHttp()
+    )
+
+
+gc = lazy_object(authorize_google_client)
+
+
+def return_spreadsheet_key(spreadsheet_id):
+    """Spreadsheet key from a Google Sheets URL or a bare key."""
+    mo = SPREADSHEET_KEY_REGEX.search(spreadsheet_id)
+    if mo:
+        return mo.group(1)
+    return spreadsheet_id
+
+
+def return_a1_range(title):
+    return "'{}'".format(title.replace("'", "''"))
+
+
+def _return_http_status(error):
+    resp = getattr(error, "resp", None)
+    try:
+        return int(getattr(resp, "status", None))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_backoff(function, *args, on_retry=None, **kwargs):
+    """function(*args, **kwargs), retried on rate-limit and transient server
+    errors with exponential backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            status = _return_http_status(e)
+            if status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                raise
+            delay = min(BACKOFF_BASE_SECONDS * 2**attempt, BACKOFF_MAX_SECONDS)
+            if on_retry:
+                on_retry()
+            time.sleep(delay * (0.5 + random.random() / 2))
+
+
+def return_df_from_values(values, empty_value=""):
+    """The frame pygsheets' Worksheet.get_as_df builds from the same values:
+    rows padded to the widest row, numbers numericised, first row as header."""
+    if not values:
+        return pd.DataFrame()
+    max_row = max(len(row) for row in values)
+    values = [list(row) + [empty_value] * (max_row - len(row)) for row in values]
+    values = [numericise_all(row, empty_value) for row in values]
+    return pd.DataFrame(values[1:], columns=values[0])
+
+
+def return_column_letter(col):
+    """1 -> A, 27 -> AA"""
+    letters = ""
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def return_a1_block(title, row_start, row_end, col_start, col_end):
+    """A1 range of the zero-based, end-exclusive block on worksheet title."""
+    return (
+        f"{return_a1_range(title)}!{return_column_letter(col_start + 1)}{row_start + 1}:"
+        f"{return_column_letter(col_end)}{row_end}"
+    )
+
+
+def return_value_grid(df, nan=""):
+    """Header plus rows as the strings pygsheets' set_dataframe writes."""
+    values = df.fillna(nan).astype(str).values.tolist() if len(df.columns) else []
+    return [[str(col) for col in df.columns]] + values
+
+
+def _normalize(value):
+    return numericise(value) if isinstance(value, str) else value
+
+
+def _return_cell(grid, row, col):
+    if row < len(grid) and col < len(grid[row]):
+        return grid[row][col]
+    return ""
+
+
+def return_changed_blocks(current, target, num_of_cols=None):
+    """
+    Cells where target differs from current, as zero-based end-exclusive
+    blocks (row_start, row_end, col_start, col_end): contiguous runs within a
+    row, merged with the rows below that change the same columns. Cells past
+    the end of target count as "" so stale rows and columns are cleared.
+    num_of_cols limits the comparison to the first num_of_cols columns.
+    Returns (blocks, cells_changed).
+    """
+    num_of_rows = max(len(current), len(target))
+    if num_of_cols is None:
+        num_of_cols = max((len(row) for row in current + target), default=0)
+
+    runs_by_row = []
+    cells_changed = 0
+    for row in range(num_of_rows):
+        runs = []
+        run_start = None
+        for col in range(num_of_cols + 1):
+            changed = col < num_of_cols and _normalize(_return_cell(current, row, col)) != _normalize(
+                _return_cell(target, row, col)
+            )
+            if changed:
+                cells_changed += 1
+                if run_start is None:
+                    run_start = col
+            elif run_start is not None:
+                runs.append((run_start, col))
+                run_start = None
+        runs_by_row.append(runs)
+
+    blocks = []
+    open_blocks = {}
+    for row, runs in enumerate(runs_by_row):
+        next_open_blocks = {}
+        for run in runs:
+            block = open_blocks.get(run)
+            if block is not None:
+                block[1] = row + 1
+            else:
+                block = [row, row + 1, run[0], run[1]]
+                blocks.append(block)
+            next_open_blocks[run] = block
+        open_blocks = next_open_blocks
+    return [tuple(block) for block in blocks], cells_changed
+
+
+def return_row_changes(current, target, key_col, num_of_cols=None):
+    """Rows added, removed and changed between two value grids, matched on
+    the key_col header and compared over the first num_of_cols columns."""
+
+    def return_rows_by_key(grid):
+        if not grid or key_col not in grid[0][:num_of_cols]:
+            return {}
+        header = grid[0][:num_of_cols]
+        key_index = header.index(key_col)
+        return {
+            _normalize(_return_cell(grid, row, key_index)): tuple(
+                (col, _normalize(_return_cell(grid, row, i))) for i, col in enumerate(header)
+            )
+            for row in range(1, len(grid))
+        }
+
+    current_rows = return_rows_by_key(current)
+    target_rows = return_rows_by_key(target)
+    common_keys = current_rows.keys() & target_rows.keys()
+    return {
+        "rows_added": len(target_rows.keys() - current_rows.keys()),
+        "rows_removed": len(current_rows.keys() - target_rows.keys()),
+        "rows_changed": sum(current_rows[k] != target_rows[k] for k in common_keys),
+    }
+
+
+class PygsheetsBackend:
+    def __init__(self, client):
+        self.client = client
+
+    def open(self, key):
+        return self.client.open_by_key(key)
+
+    def return_sheet_titles(self, spreadsheet):
+        return [wks.title for wks in spreadsheet.worksheets()]
+
+    def batch_get(self, spreadsheet, titles):
+        value_ranges = self.client.sheet.values_batch_get(
+            spreadsheet.id, [return_a1_range(title) for title in titles]
+        )
+        return [value_range.get("values", []) for value_range in value_ranges]
+
+    def return_modified_time(self, spreadsheet):
+        return self.client.drive.get_update_time(spreadsheet.id)
+
+    def set_dataframe(self, spreadsheet, title, df):
+        try:
+            wks = spreadsheet.worksheet_by_title(title)
+        except pygsheets.exceptions.WorksheetNotFound:
+            wks = spreadsheet.add_worksheet(title)
+        wks.clear()
+        wks.set_dataframe(df, "A1")
+
+    def return_worksheet(self, spreadsheet, title):
+        return spreadsheet.worksheet_by_title(title)
+
+    def add_worksheet(self, spreadsheet, title, rows, cols):
+        return spreadsheet.add_worksheet(title, rows=max(rows, 1000), cols=max(cols, 26))
+
+    def update_values(self, spreadsheet, title, data, rows, cols):
+        """Writes every (a1_range, values) in data in one values.batchUpdate,
+        growing the worksheet first if needed."""
+        wks = spreadsheet.worksheet_by_title(title)
+        if rows > wks.rows or cols > wks.cols:
+            wks.resize(rows=max(rows, wks.rows), cols=max(cols, wks.cols))
+        request = self.client.sheet.service.spreadsheets().values().batchUpdate(
+            spreadsheetId=spreadsheet.id,
+            body={
+                "valueInputOption": "USER_ENTERED",
+                "data": [{"range": a1_range, "values": values} for a1_range, values in data],
+            },
+        )
+        return self.client.sheet._execute_requests(request)
+
+
+class FileWorksheet:
+    """Formatting calls (frozen rows, column widths, validation) are no-ops
+    offline."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FileSpreadsheet:
+    def __init__(self, directory, key):
+        self.id = key
+        self.directory = os.path.join(directory, key)
+
+
+class FileBackend:
+    """Offline stand-in for PygsheetsBackend: <directory>/<key>/<title>.csv
+    per worksheet, values stored as strings like the Sheets API returns
+    them."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def open(self, key):
+        spreadsheet = FileSpreadsheet(self.directory, key)
+        if not os.path.isdir(spreadsheet.directory):
+            raise pygsheets.exceptions.SpreadsheetNotFound(key)
+        return spreadsheet
+
+    def return_worksheet_path(self, spreadsheet, title):
+        ## worksheet titles like 7/1 are valid on Sheets but not as filenames
+        return os.path.join(spreadsheet.directory, f"{quote(title, safe=' ')}.csv")
+
+    def return_sheet_titles(self, spreadsheet):
+        return sorted(
+            unquote(filename[: -len(".csv")])
+            for filename in os.listdir(spreadsheet.directory)
+            if filename.endswith(".csv")
+        )
+
+    def batch_get(self, spreadsheet, titles):
+        lst = []
+        for title in titles:
+            with open(self.return_worksheet_path(spreadsheet, title), newline="") as f:
+                rows = [row for row in csv.reader(f)]
+            ## the API drops trailing empty cells and rows
+            rows = [row[: max((i + 1 for i, v in enumerate(row) if v != ""), default=0)] for row in rows]
+            while rows and not rows[-1]:
+                rows.pop()
+            lst.append(rows)
+        return lst
+
+    def return_modified_time(self, spreadsheet):
+        return max(
+            (
+                os.stat(os.path.join(spreadsheet.directory, filename)).st_mtime_ns
+                for filename in os.listdir(spreadsheet.directory)
+            ),
+            default=0,
+        )
+
+    def set_dataframe(self, spreadsheet, title, df):
+        os.makedirs(spreadsheet.directory, exist_ok=True)
+        path = self.return_worksheet_path(spreadsheet, title)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([str(col) for col in df.columns])
+            writer.writerows([["" if v == "" else str(v) for v in row] for row in df.itertuples(index=False)])
+        os.replace(temp_path, path)
+
+    def return_worksheet(self, spreadsheet, title):
+        return FileWorksheet()
+
+    def add_worksheet(self, spreadsheet, title, rows, cols):
+        os.makedirs(spreadsheet.directory, exist_ok=True)
+        open(self.return_worksheet_path(spreadsheet, title), "w").close()
+        return FileWorksheet()
+
+    def update_values(self, spreadsheet, title, data, rows, cols):
+        with open(self.return_worksheet_path(spreadsheet, title), newline="") as f:
+            grid = [row for row in csv.reader(f)]
+        grid += [[] for _ in range(rows - len(grid))]
+        for a1_range, values in data:
+            start = a1_range.rsplit("!", 1)[1].split(":")[0]
+            col_letters = start.rstrip("0123456789")
+            row_start = int(start[len(col_letters):]) - 1
+            col_start = sum((ord(c) - 64) * 26**i for i, c in enumerate(reversed(col_letters))) - 1
+            for i, row_values in enumerate(values):
+                row = grid[row_start + i]
+                row += [""] * (col_start + len(row_values) - len(row))
+                row[col_start : col_start + len(row_values)] = row_values
+        path = self.return_worksheet_path(spreadsheet, title)
+        with open(path + ".tmp", "w", newline="") as f:
+            csv.writer(f).writerows(grid)
+        os.replace(path + ".tmp", path)
+
+
+class SheetsGateway:
+    def __init__(self, backend, ttl_seconds=TTL_SECONDS):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        ## key -> [spreadsheet, titles, checked_at, modified_time]
+        self._spreadsheets = {}
+        ## (key, title) -> [values, modified_time]
+        self._values = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.retries = 0
+
+    def _call(self, function, *args):
+        return call_with_backoff(function, *args, on_retry=self._count_retry)
+
+    def _count_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def _return_spreadsheet_entry(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._spreadsheets.get(key)
+            if entry is not None and now - entry[2] < self.ttl_seconds:
+                return entry
+
+        if entry is not None:
+            modified_time = self._call(self.backend.return_modified_time, entry[0])
+            with self._lock:
+                self.revalidations += 1
+                if modified_time == entry[3]:
+                    entry[2] = now
+                    return entry
+
+        spreadsheet = self._call(self.backend.open, key)
+        titles = self.backend.return_sheet_titles(spreadsheet)
+        modified_time = self._call(self.backend.return_modified_time, spreadsheet)
+        entry = [spreadsheet, titles, now, modified_time]
+        with self._lock:
+            self._spreadsheets[key] = entry
+            self._values = {k: v for k, v in self._values.items() if k[0] != key or v[1] == modified_time}
+        return entry
+
+    def return_spreadsheet(self, spreadsheet_id):
+        """Cached pygsheets Spreadsheet (or FileSpreadsheet) for a URL or key."""
+        return self._return_spreadsheet_entry(return_spreadsheet_key(spreadsheet_id))[0]
+
+    def return_sheet_titles(self, spreadsheet_id):
+        return list(self._return_spreadsheet_entry(return_spreadsheet_key(spreadsheet_id))[1])
+
+    def return_values_batch(self, spreadsheet_id, sheets):
+        """{sheet: values} for every title in sheets, fetching the ones not
+        cached for the current version in a single batchGet."""
+        key = return_spreadsheet_key(spreadsheet_id)
+        return self._return_values_batch(key, self._return_spreadsheet_entry(key), sheets)
+
+    def _return_values_batch(self, key, entry, sheets):
+        spreadsheet, titles, checked_at, modified_time = entry
+        missing = [title for title in sheets if title not in titles]
+        if missing:
+            raise pygsheets.exceptions.WorksheetNotFound(", ".join(missing))
+
+        values_by_title = {}
+        with self._lock:
+            for title in sheets:
+                cached = self._values.get((key, title))
+                if cached is not None and cached[1] == modified_time:
+                    values_by_title[title] = cached[0]
+            self.hits += len(values_by_title)
+            to_fetch = list(dict.fromkeys(t for t in sheets if t not in values_by_title))
+            self.misses += len(to_fetch)
+
+        if to_fetch:
+            fetched = self._call(self.backend.batch_get, spreadsheet, to_fetch)
+            with self._lock:
+                for title, values in zip(to_fetch, fetched):
+                    self._values[(key, title)] = (values, modified_time)
+                    values_by_title[title] = values
+        return values_by_title
+
+    def return_dataframes(self, spreadsheet_id, sheets):
+        """{sheet: DataFrame} for several worksheets of one spreadsheet, read as
+        Worksheet.get_as_df(include_tailing_empty=False) would. A sheet title
+        that does not exist falls back to the first worksheet."""
+        key = return_spreadsheet_key(spreadsheet_id)
+        entry = self._return_spreadsheet_entry(key)
+        titles = entry[1]
+        if not titles:
+            raise pygsheets.exceptions.WorksheetNotFound(spreadsheet_id)
+        resolved = {sheet: sheet if sheet in titles else titles[0] for sheet in sheets}
+        values_by_title = self._return_values_batch(key, entry, list(resolved.values()))
+
+        dfs = {}
+        for sheet, title in resolved.items():
+            df = return_df_from_values(values_by_title[title])
+            if "Student ID" in df.columns:
+                df = df.rename(columns={"Student ID": "StudentID"})
+            dfs[sheet] = df
+        return dfs
+
+    def return_dataframe(self, spreadsheet_id, sheet="Sheet1"):
+        return self.return_dataframes(spreadsheet_id, [sheet])[sheet]
+
+    def set_dataframe(self, output_df, spreadsheet_id, sheet="Output"):
+        key = return_spreadsheet_key(spreadsheet_id)
+        spreadsheet = self._return_spreadsheet_entry(key)[0]
+        try:
+            self._call(self.backend.set_dataframe, spreadsheet, sheet, output_df.fillna(""))
+        finally:
+            self.invalidate(key)
+        return True
+
+    def return_worksheet(self, spreadsheet_id, sheet):
+        """Worksheet handle for formatting calls after a sync."""
+        spreadsheet = self.return_spreadsheet(spreadsheet_id)
+        return self._call(self.backend.return_worksheet, spreadsheet, sheet)
+
+    def sync_dataframe(
+        self,
+        output_df,
+        spreadsheet_id,
+        sheet="Output",
+        key_col="StudentID",
+        nan="",
+        clear_extra_columns=True,
+        incremental=True,
+    ):
+        """
+        Makes worksheet sheet show output_df (header in row 1), writing only the
+        cells that differ. With clear_extra_columns=False, columns to the right
+        of output_df are left alone, such as teacher notes next to a roster.
+        incremental=False rewrites the whole block; so does a new worksheet or a
+        diff that needs more than MAX_SYNC_RANGES ranges.
+
+        Returns a summary: mode ("unchanged", "diff" or "full"), cells_changed,
+        cells_written, ranges, and rows_added/removed/changed matched on
+        key_col.
+        """
+        key = return_spreadsheet_key(spreadsheet_id)
+        entry = self._return_spreadsheet_entry(key)
+        if sheet not in entry[1]:
+            ## the cached titles may predate the worksheet
+            self.invalidate(key)
+            entry = self._return_spreadsheet_entry(key)
+        spreadsheet, titles = entry[0], entry[1]
+        target = return_value_grid(output_df, nan=nan)
+        num_of_target_cols = len(target[0])
+
+        is_new_worksheet = sheet not in titles
+        if is_new_worksheet:
+            self._call(
+                self.backend.add_worksheet, spreadsheet, sheet, len(target), num_of_target_cols
+            )
+            current = []
+        else:
+            ## always re-read: a cached copy could hide an edit made since
+            current = self._call(self.backend.batch_get, spreadsheet, [sheet])[0]
+
+        num_of_cols = None if clear_extra_columns else num_of_target_cols
+        blocks, cells_changed = return_changed_blocks(current, target, num_of_cols)
+        summary = {
+            "mode": "unchanged",
+            "cells_changed": cells_changed,
+            "cells_written": 0,
+            "ranges": 0,
+        }
+        summary.update(return_row_changes(current, target, key_col, num_of_cols))
+
+        if is_new_worksheet or not incremental or len(blocks) > MAX_SYNC_RANGES:
+            num_of_rows = max(len(current), len(target))
+            if num_of_cols is None:
+                num_of_cols = max((len(row) for row in current + target), default=0)
+            blocks = [(0, num_of_rows, 0, num_of_cols)] if num_of_rows and num_of_cols else []
+            summary["mode"] = "full"
+        elif blocks:
+            summary["mode"] = "diff"
+
+        if blocks:
+            data = [
+                (
+                    return_a1_block(sheet, row_start, row_end, col_start, col_end),
+                    [
+                        [_return_cell(target, row, col) for col in range(col_start, col_end)]
+                        for row in range(row_start, row_end)
+                    ],
+                )
+                for row_start, row_end, col_start, col_end in blocks
+            ]
+            num_of_rows = max(block[1] for block in blocks)
+            num_of_cols = max(block[3] for block in blocks)
+            try:
+                self._call(
+                    self.backend.update_values, spreadsheet, sheet, data, num_of_rows, num_of_cols
+                )
+            finally:
+                self.invalidate(key)
+            summary["ranges"] = len(blocks)
+            summary["cells_written"] = sum(
+                (row_end - row_start) * (col_end - col_start)
+                for row_start, row_end, col_start, col_end in blocks
+            )
+        elif is_new_worksheet:
+            self.invalidate(key)
+        return summary
+
+    def invalidate(self, spreadsheet_id=None):
+        with self._lock:
+            if spreadsheet_id is None:
+                self._spreadsheets.clear()
+                self._values.clear()
+                return
+            key = return_spreadsheet_key(spreadsheet_id)
+            self._spreadsheets.pop(key, None)
+            self._values = {k: v for k, v in self._values.items() if k[0] != key}
+
+    def return_stats(self):
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "spreadsheets": len(self._spreadsheets),
+                "worksheets": len(self._values),
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "retries": self.retries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+def return_default_gateway():
+    fake_directory = os.getenv("GSHEETS_FAKE_DIRECTORY")
+    if fake_directory:
+        return SheetsGateway(FileBackend(fake_directory))
+    return SheetsGateway(PygsheetsBackend(gc))
+
+
+gateway = lazy_object(return_default_gateway)
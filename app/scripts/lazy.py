@@ -0,0 +1,94 @@
+"""
+Lazy Loading Helpers
+
+lazy_import defers importing a heavy optional dependency (sklearn, networkx,
+plotly, geopandas, pyautogui, pytesseract) until the first attribute access or
+call, so create_app does not pay for it and a missing package only breaks the
+routes that use it.
+
+LazyValue holds a shared registry (photos_df, gsheets_df) that is computed on
+first use and can be refreshed in place. lazy_object wraps a client such as
+the pygsheets authorization so a missing credential fails the request that
+needs it instead of app startup.
+"""
+
+import importlib
+import threading
+
+
+class _LazyImport:
+    def __init__(self, module_name, attribute=None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            target = importlib.import_module(self._module_name)
+            if self._attribute:
+                target = getattr(target, self._attribute)
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = self._module_name
+        if self._attribute:
+            name = f"{name}.{self._attribute}"
+        return f"<lazy {name}>"
+
+
+def lazy_import(module_name, attribute=None):
+    """lazy_import("plotly.express") stands in for `import plotly.express`,
+    lazy_import("sklearn.linear_model", "LinearRegression") for
+    `from sklearn.linear_model import LinearRegression`."""
+    return _LazyImport(module_name, attribute)
+
+
+class LazyValue:
+    def __init__(self, loader):
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self._is_loaded = False
+
+    def get(self):
+        if not self._is_loaded:
+            with self._lock:
+                if not self._is_loaded:
+                    self._value = self.loader()
+                    self._is_loaded = True
+        return self._value
+
+    def refresh(self):
+        with self._lock:
+            self._value = self.loader()
+            self._is_loaded = True
+        return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._is_loaded = False
+
+
+class _LazyObject:
+    def __init__(self, lazy_value):
+        self._lazy_value = lazy_value
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_value.get(), name)
+
+    def __repr__(self):
+        return f"<lazy {self._lazy_value.loader.__name__}>"
+
+
+def lazy_object(loader):
+    """Stands in for `obj = loader()` at module level; loader runs on the
+    first attribute access."""
+    return _LazyObject(LazyValue(loader))
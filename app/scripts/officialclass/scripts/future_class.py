@@ -5,10 +5,11 @@ import datetime as dt
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 def main(data):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     
     ## Student Current Student Official Classes
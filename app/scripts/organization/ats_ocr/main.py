@@ -1,12 +1,15 @@
-import pyautogui
-import pytesseract 
+from app.scripts.lazy import lazy_import
+pyautogui = lazy_import("pyautogui")
+pytesseract = lazy_import("pytesseract")
 from PIL import Image
 import time
 import re 
 import pandas as pd 
 
-screen_width, screen_height = pyautogui.size()
-right_half = (screen_width // 2, 0, screen_width // 2, screen_height)
+
+def return_right_half():
+    screen_width, screen_height = pyautogui.size()
+    return (screen_width // 2, 0, screen_width // 2, screen_height)
 
 class ScreenshotOCR:
     def extract_text_from_image(self, image, config=''):
@@ -53,7 +56,7 @@ def capture_right_half_and_extract_text():
     ocr = ScreenshotOCR()
     
     # Capture the right half of the screen
-    screenshot = ocr.capture_region(*right_half)
+    screenshot = ocr.capture_region(*return_right_half())
     
     # Preprocess the image
     processed_image = ocr.preprocess_image(screenshot)
@@ -10,7 +10,7 @@ from flask import render_template, request, redirect, url_for, flash
 import app.scripts.utils as utils
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 
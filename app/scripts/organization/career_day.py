@@ -1,6 +1,6 @@
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from io import BytesIO
 import urllib.parse
@@ -14,6 +14,7 @@ def process_spreadsheet(form, request):
 
 
 
+    files_df = utils.return_files_df()
     locations = request.files[form.locations_file.name]
     locations_df = pd.read_csv(locations)
 
@@ -225,6 +226,7 @@ def process_spreadsheet(form, request):
 
 
 def return_assignments_as_spreadsheet(assignments_df):
+    files_df = utils.return_files_df()
     f = BytesIO()
     writer = pd.ExcelWriter(f)
 
@@ -370,6 +372,7 @@ def return_student_flowables(student_row, current_year):
 
 
 def return_student_letters(assignments_df):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -1,9 +1,10 @@
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     student_subset_title = form.subset_title.data
 
     student_lst_str = form.subset_lst.data
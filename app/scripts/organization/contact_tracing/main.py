@@ -6,9 +6,10 @@ from io import BytesIO
 from flask import session, current_app
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 def return_contact_tracing_results(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -1,13 +1,14 @@
 import pandas as pd
 import datetime as dt
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from io import BytesIO
 
 from flask import session
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -5,7 +5,7 @@ import numpy as np
 
 import app.scripts.utils as utils
 import app.scripts.programming.post_summer.utils as post_summer_utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from flask import session
 
 from io import BytesIO
@@ -22,6 +22,7 @@ def main():
     2. Regents Max
     Return updated fall opening day assignments.  
     """
+    files_df = utils.return_files_df()
 
     school_year = session["school_year"]
     term = session["term"]
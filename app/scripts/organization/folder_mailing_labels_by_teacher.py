@@ -12,7 +12,7 @@ from reportlab.graphics import shapes
 from io import BytesIO
 import re
 
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 
 def main(form, request):
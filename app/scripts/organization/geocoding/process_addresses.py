@@ -1,5 +1,5 @@
 from flask import current_app, session
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from geopy.geocoders import GoogleV3
@@ -8,6 +8,7 @@ import os
 import pandas as pd
 
 def main():
+    files_df = utils.return_files_df()
     path = os.path.join(current_app.root_path, f"data/geocoded_addresses.csv")
     cached_addresses_df = pd.read_csv(path)
     cached_addresses_lst = cached_addresses_df['full_address'].unique().tolist()
@@ -1,8 +1,9 @@
 from flask import current_app, session
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
-import geopandas as gpd
+from app.scripts.lazy import lazy_import
+gpd = lazy_import("geopandas")
 from shapely.geometry import Point
 
 import os 
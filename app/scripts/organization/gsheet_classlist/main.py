@@ -10,14 +10,15 @@ import os
 import numpy as np
 
 import datetime as dt
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
@@ -27,7 +28,7 @@ def main(form, request):
         student_info_by_teacher_url = form.gsheet_url.data
     else:
         student_info_by_teacher_url = utils.return_gsheet_url_by_title(
-            gsheets_df, "student_info_by_teacher", year_and_semester
+            utils.return_gsheets_df(), "student_info_by_teacher", year_and_semester
         )
 
     filename = utils.return_most_recent_report_by_semester(
@@ -199,7 +200,7 @@ def main(form, request):
     ## get gsheet
 
     student_info_by_teacher_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "student_info_by_teacher", year_and_semester
+        utils.return_gsheets_df(), "student_info_by_teacher", year_and_semester
     )
 
     teacher_cols = [
@@ -9,7 +9,7 @@ from reportlab.graphics import shapes
 from reportlab.lib import colors
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import current_app, session
 
@@ -1,6 +1,6 @@
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from io import BytesIO
 from flask import session
@@ -13,6 +13,7 @@ from reportlab.lib.units import inch
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -1,4 +1,4 @@
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import session
 
@@ -11,6 +11,7 @@ from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 from reportlab.platypus import SimpleDocTemplate
 from werkzeug.utils import secure_filename
+import app.scripts.pdf_page_index as pdf_page_index
 import app.scripts.utils as utils
 import labels
 
@@ -102,6 +103,7 @@ def draw_label(label, width, height, obj):
 
 def by_list_of_students(form, request):
 
+    files_df = utils.return_files_df()
     student_lst_str = form.subset_lst.data
     student_lst = []
     if student_lst_str != '':
@@ -137,38 +139,12 @@ def by_list_of_students(form, request):
 
 def main(form, request):
 
+    files_df = utils.return_files_df()
     PDF = request.files[form.student_records_pdf.name]
     
 
-    StudentID_Regex = r"\d{9}"
-    StudentIDRegex = re.compile(StudentID_Regex)
-
-    pdfReader = PyPDF2.PdfReader(PDF)
-    num_of_pages = pdfReader.pages
-
-    StudentID_dict = {}
-    StudentID_lst = []
-
-    for page_num, page in enumerate(num_of_pages):
-        try:
-            page_text = page.extract_text()
-        except AttributeError:
-            continue
-        page_text = page_text.replace(" ", "")
-
-        mo = StudentIDRegex.search(page_text)
-
-        if mo:
-            StudentID = mo.group()
-            
-
-            if StudentID_dict.get(StudentID):
-                StudentID_dict[StudentID].append(page_num)
-            else:
-                
-                StudentID_dict[StudentID] = [page_num]
-                StudentID = int(StudentID)
-                StudentID_lst.append(StudentID)
+    StudentID_dict = pdf_page_index.return_StudentID_dict(PDF)
+    StudentID_lst = list(StudentID_dict.keys())
 
     
 
@@ -201,6 +177,7 @@ def main(form, request):
 
 
 def by_student_class_list(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
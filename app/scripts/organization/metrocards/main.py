@@ -9,7 +9,7 @@ from reportlab.graphics import shapes
 from reportlab.lib import colors
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import current_app, session
 
@@ -56,6 +56,7 @@ def return_processed_data(form, request):
 
 
 def return_busing_students():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -73,6 +74,7 @@ def clean_StudentID_str(student_id_str):
 
 
 def return_eligible_students():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
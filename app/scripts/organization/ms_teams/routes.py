@@ -12,13 +12,14 @@ from werkzeug.utils import secure_filename
 import app.scripts.utils as utils
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 ms_teams_HSFI_support_webhook_url = os.getenv("ms_teams_HSFI_support_webhook_url")
 
 
 @scripts.route("/organization/ms_teams_test", methods=["GET", "POST"])
 def return_post_to_ms_teams_test():
+    files_df = utils.return_files_df()
     if request.method == "GET":
 
         filename = utils.return_most_recent_report(files_df, "rosters_and_grades")
@@ -1,4 +1,5 @@
 import pandas as pd
+import app.scripts.pdf_page_index as pdf_page_index
 import app.scripts.utils as utils
 
 import PyPDF2
@@ -49,26 +50,11 @@ def main(data):
     StudentIDRegex = re.compile(StudentID_Regex)
 
     PDF = f"{year}/PDFs/Inputs/Programs.pdf"
-    pdfFileObj = open(PDF, "rb")
-    pdfReader = PyPDF2.PdfReader(pdfFileObj)
-    num_of_pages = pdfReader.pages
-
-    StudentID_dict = {}
-
-    for page_num, page in enumerate(num_of_pages):
-        page_text = page.extract_text()
-        page_text = page_text.replace(" ", "")
-
-        mo = StudentIDRegex.search(page_text)
-
-        if mo:
-            StudentID = mo.group()
-            StudentID = int(StudentID)
-
-            if StudentID_dict.get(StudentID):
-                StudentID_dict[StudentID].append(page_num)
-            else:
-                StudentID_dict[StudentID] = [page_num]
+    pdf_bytes = pdf_page_index.return_pdf_bytes(PDF)
+    pdfReader = pdf_page_index.return_pdf_reader(pdf_bytes)
+    StudentID_dict = pdf_page_index.return_StudentID_dict(
+        pdf_bytes, StudentIDRegex, pdfReader=pdfReader
+    )
 
     sort_by_col = data["sort_by_col"]
     student_sort_by_col = data["student_sort_by_col"]
@@ -11,7 +11,10 @@ from reportlab.lib.units import inch
 from io import BytesIO
 import re
 
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
+import app.scripts.pdf_page_index as pdf_page_index
+import app.scripts.utils as utils
+import app.scripts.photo_thumbnails as photo_thumbnails
 
 
 def main(form, request):
@@ -19,31 +22,12 @@ def main(form, request):
     PDF = request.files[form.student_records_pdf.name]
     orientation_flag = form.student_records_pdf_orientation.data
 
-    StudentID_Regex = r"\d{9}"
-    StudentIDRegex = re.compile(StudentID_Regex)
-
-    pdfReader = PyPDF2.PdfReader(PDF)
-    num_of_pages = pdfReader.pages
-
-    StudentID_dict = {}
-
-    for page_num, page in enumerate(num_of_pages):
-        try:
-            page_text = page.extract_text()
-        except AttributeError:
-            continue
-        page_text = page_text.replace(" ", "")
-
-        mo = StudentIDRegex.search(page_text)
-
-        if mo:
-            StudentID = mo.group()
-            # StudentID = int(StudentID)
-
-            if StudentID_dict.get(StudentID):
-                StudentID_dict[StudentID].append(page_num)
-            else:
-                StudentID_dict[StudentID] = [page_num]
+    pdf_bytes = pdf_page_index.return_pdf_bytes(PDF)
+    pdfReader = pdf_page_index.return_pdf_reader(pdf_bytes)
+    ## the student list is read as str, so keep the IDs as str
+    StudentID_dict = pdf_page_index.return_StudentID_dict(
+        pdf_bytes, as_int=False, pdfReader=pdfReader
+    )
 
     filename = form.student_list.data
 
@@ -99,7 +83,7 @@ def main(form, request):
         students_df = students_df.sort_values(by=student_sort_by_cols).dropna()
         
         if include_classlist_flag:
-            sort_by_df = sort_by_df.merge(photos_df[['StudentID','photo_filename']], on=["StudentID"], how='left')
+            sort_by_df = sort_by_df.merge(utils.return_photos_df()[['StudentID','photo_filename']], on=["StudentID"], how='left')
             roster_pdf = return_class_list_roster_pdf(
                 sort_by, students_df, student_roster_table_cols
             )
@@ -283,7 +267,7 @@ def return_photo_roster_pdf(sort_by, students_df, student_roster_table_cols):
             I = ''
         else:
             try:
-                I = Image(photo_path)
+                I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, image_dim))
                 I.drawHeight = image_dim * inch
                 I.drawWidth = image_dim * inch
                 I.hAlign = "CENTER"
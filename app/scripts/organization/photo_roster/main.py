@@ -1,4 +1,4 @@
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 from flask import session
 
 from io import BytesIO
@@ -26,6 +26,7 @@ styles.add(
 )
 
 import app.scripts.utils as utils
+import app.scripts.photo_thumbnails as photo_thumbnails
 import pandas as pd
 import PyPDF2
 import re
@@ -34,6 +35,7 @@ import datetime as dt
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -60,7 +62,7 @@ def main(form, request):
     students_df = students_df.sort_values(by=["LastName", "FirstName"])
 
     students_df = students_df.merge(
-        photos_df[["StudentID", "photo_filename"]], on=["StudentID"], how="left"
+        utils.return_photos_df()[["StudentID", "photo_filename"]], on=["StudentID"], how="left"
     )
     photo_roster_pdf = return_photo_roster_pdf(students_df, lst_title)
 
@@ -102,7 +104,7 @@ def return_photo_roster_pdf(students_df, lst_title):
             FirstName, LastName = student["StudentName"].split(",")
 
         try:
-            I = Image(photo_path)
+            I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, image_dim))
             I.drawHeight = image_dim * inch
             I.drawWidth = image_dim * inch
             I.hAlign = "CENTER"
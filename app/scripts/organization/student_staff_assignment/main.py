@@ -2,15 +2,17 @@ import pandas as pd
 import numpy as np
 from scipy.optimize import linear_sum_assignment
 from collections import defaultdict, Counter
-import networkx as nx
+from app.scripts.lazy import lazy_import
+nx = lazy_import("networkx")
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from flask import session
 
 from io import BytesIO
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
@@ -42,7 +44,7 @@ import pandas as pd
 import numpy as np
 from scipy.optimize import linear_sum_assignment
 from collections import defaultdict, Counter
-import networkx as nx
+nx = lazy_import("networkx")
 
 def assign_students_optimal_hungarian(df, student_id_col='StudentID', 
                                     last_name_col='LastName', first_name_col='FirstName',
@@ -3,7 +3,6 @@ from collections import defaultdict
 import io
 from flask import session
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 
 def main(request, form):
@@ -444,6 +443,7 @@ def create_missing_teachers_info(missing_teachers):
 # Keep existing helper functions
 def get_teacher_student_schedule():
     """Get teacher-student-course relationships from student schedules."""
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
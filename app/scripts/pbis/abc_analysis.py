@@ -2,7 +2,7 @@ from flask import session
 import pandas as pd
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.attendance.jupiter.stats_by_student import (
     main as attd_stats_by_student,
@@ -27,6 +27,7 @@ def main(form, request):
 
 
 def return_student_grades():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
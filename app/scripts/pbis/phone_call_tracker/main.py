@@ -5,7 +5,7 @@ from io import BytesIO
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
@@ -30,6 +30,7 @@ def main(form, request):
 
 def process_screener_data(dfs_dict):
 
+    files_df = utils.return_files_df()
     dfs_lst = []
     for teacher, df in dfs_dict.items():
         df["Teacher"] = teacher
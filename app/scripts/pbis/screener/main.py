@@ -5,7 +5,7 @@ from io import BytesIO
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
@@ -33,6 +33,7 @@ def return_screener_questions(columns):
 
 
 def process_screener_data(dfs_dict):
+    files_df = utils.return_files_df()
     non_surveys = ['Students','Families']
     surveys_list = [df for (sheet, df) in dfs_dict.items() if not sheet in non_surveys]
 
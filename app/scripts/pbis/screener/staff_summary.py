@@ -5,7 +5,7 @@ from io import BytesIO
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
@@ -121,9 +121,10 @@ def return_download_file(df):
 
     return build_letters(flowables)
 
-import plotly.express as px
-import plotly.io as pio
-import plotly.graph_objects as go
+from app.scripts.lazy import lazy_import
+px = lazy_import("plotly.express")
+pio = lazy_import("plotly.io")
+go = lazy_import("plotly.graph_objects")
 def return_student_survey_responses_by_teacher(df):
     color_discrete_sequence = [
         # "#000000",
@@ -7,7 +7,7 @@ from io import BytesIO
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
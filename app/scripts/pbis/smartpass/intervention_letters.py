@@ -45,7 +45,7 @@ from flask import session, current_app
 
 from app.scripts.reportlab_utils import reportlab_letter_head, reportlab_closing
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.pbis.smartpass.main import process_smartpass_data, return_total_time_per_period_by_student
 from app.scripts.pbis.smartpass import return_student_period_usage_graph as return_student_period_usage_graph
@@ -76,6 +76,7 @@ def main(form, request):
     return f, download_name
 
 def return_parent_codes():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -5,42 +5,12 @@ from io import BytesIO
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
-# Define class period schedules as module-level constants
-# Monday: All periods are 35 minutes
-MONDAY_SCHEDULE = [
-    (1, dt.time(9, 45), dt.time(10, 20)),   # Period 1: 9:45 - 10:20 (35 min)
-    (2, dt.time(10, 20), dt.time(11, 0)),   # Period 2: 10:20 - 11:00 (40 min - includes 5 min passing)
-    (3, dt.time(11, 0), dt.time(11, 40)),   # Period 3: 11:00 - 11:40 (40 min)
-    (4, dt.time(11, 40), dt.time(12, 20)),  # Period 4: 11:40 - 12:20 (40 min)
-    (5, dt.time(12, 20), dt.time(13, 0)),   # Period 5: 12:20 - 13:00 (40 min)
-    (6, dt.time(13, 0), dt.time(13, 40)),   # Period 6: 13:00 - 13:40 (40 min)
-    (7, dt.time(13, 40), dt.time(14, 20)),  # Period 7: 13:40 - 14:20 (40 min)
-    (8, dt.time(14, 20), dt.time(15, 0)),   # Period 8: 14:20 - 15:00 (40 min)
-    (9, dt.time(15, 0), dt.time(15, 40)),   # Period 9: 15:00 - 15:40 (40 min)
-]
-
-# Tuesday-Friday: Periods 1,2,4,5,6,7,8,9 are 45 minutes; Period 3 is 50 minutes
-REGULAR_SCHEDULE = [
-    (1, dt.time(8, 5), dt.time(8, 55)),     # Period 1: 8:05 - 8:55 (50 min - includes 5 min passing)
-    (2, dt.time(8, 55), dt.time(9, 45)),    # Period 2: 8:55 - 9:45 (50 min)
-    (3, dt.time(9, 45), dt.time(10, 40)),   # Period 3: 9:45 - 10:40 (55 min)
-    (4, dt.time(10, 40), dt.time(11, 30)),  # Period 4: 10:40 - 11:30 (50 min)
-    (5, dt.time(11, 30), dt.time(12, 20)),  # Period 5: 11:30 - 12:20 (50 min)
-    (6, dt.time(12, 20), dt.time(13, 10)),  # Period 6: 12:20 - 13:10 (50 min)
-    (7, dt.time(13, 10), dt.time(14, 0)),   # Period 7: 13:10 - 14:00 (50 min)
-    (8, dt.time(14, 0), dt.time(14, 50)),   # Period 8: 14:00 - 14:50 (50 min)
-    (9, dt.time(14, 50), dt.time(15, 40)),  # Period 9: 14:50 - 15:40 (50 min)
-]
-
-SUMMER_SCHEDULE = [
-    (1, dt.time(8, 0), dt.time(9, 48)),     # Assuming 108 min periods
-    (2, dt.time(9, 48), dt.time(11, 52)),
-    (3, dt.time(11, 52), dt.time(14, 27)),
-]
+from app.scripts import bell_schedule
+from app.scripts.bell_schedule import MONDAY_SCHEDULE, REGULAR_SCHEDULE, SUMMER_SCHEDULE
 
 
 def main(form, request):
@@ -62,6 +32,7 @@ def main(form, request):
 
 
 def process_smartpass_data(smartpass_df):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -113,23 +84,15 @@ def process_smartpass_data(smartpass_df):
         smartpass_df["Duration (sec)"], unit="S"
     )
     
-    if session['term'] == 7:
-        smartpass_df["class_period"] = smartpass_df.apply(
-            return_summer_class_period, axis=1
-        )
-        smartpass_df["FirstTenMinutesFlag"] = smartpass_df.apply(
-            lambda row: is_in_first_ten_minutes(row, SUMMER_SCHEDULE), axis=1
-        )
-    else:
-        ## return class period based on the time of the pass
-        ## if it is a Monday, then the first period is at 10:20
-        ## otherwise, the first period is at 8:55
-        smartpass_df["class_period"] = smartpass_df.apply(return_class_period, axis=1)
-        smartpass_df["FirstTenMinutesFlag"] = smartpass_df.apply(
-            lambda row: is_in_first_ten_minutes(
-                row, MONDAY_SCHEDULE if row["datetime"].weekday() == 0 else REGULAR_SCHEDULE
-            ), axis=1
-        )
+    ## return class period based on the time of the pass
+    ## Monday passes use the Monday bell schedule, summer passes the summer one
+    weekday_schedules = bell_schedule.return_weekday_schedules(session["term"])
+    smartpass_df["class_period"] = bell_schedule.return_class_period_column(
+        smartpass_df["datetime"], weekday_schedules
+    )
+    smartpass_df["FirstTenMinutesFlag"] = bell_schedule.is_in_first_n_minutes(
+        smartpass_df["datetime"], 10, weekday_schedules
+    )
 
     return smartpass_df
 
@@ -189,7 +152,129 @@ def return_class_period(pass_row):
     return None
 
 
-def return_possible_encounters(smartpass_df):
+def return_possible_encounters(smartpass_df, vectorized=True):
+    """
+    vectorized=False runs the original pairwise iterrows version, kept to check
+    the sweep-line version against.
+    """
+    if vectorized:
+        encounters_df = return_encounters_df(smartpass_df)
+    else:
+        encounters_df = return_encounters_df_rowwise(smartpass_df)
+    return return_encounters_pvt(encounters_df)
+
+
+ENCOUNTER_COLS = [
+    "Student1_StudentID",
+    "Student1_StudentName",
+    "Student1_Origin",
+    "Student1_Destination",
+    "Student2_StudentID",
+    "Student2_StudentName",
+    "Student2_Origin",
+    "Student2_Destination",
+    "Date",
+    "Period",
+    "overlap_factor",
+]
+
+
+def return_overlapping_pass_pairs(starts, ends, group_codes):
+    """
+    Returns index arrays (i, j) of every pair of passes in the same group whose
+    time intervals overlap, each unordered pair once.
+
+    Passes are sorted by (group, start); for pass i, the passes that overlap
+    it and start no earlier are the ones after it in the same group that start
+    before it ends, found with one searchsorted per group. Cost is
+    O(n log n + k) for k overlapping pairs.
+    """
+    order = np.lexsort((starts, group_codes))
+    starts = starts[order]
+    ends = ends[order]
+    group_codes = group_codes[order]
+
+    group_bounds = np.flatnonzero(np.diff(group_codes)) + 1
+    group_bounds = np.concatenate([[0], group_bounds, [len(order)]])
+
+    upper = np.empty(len(order), dtype=np.int64)
+    for group_start, group_end in zip(group_bounds[:-1], group_bounds[1:]):
+        upper[group_start:group_end] = group_start + np.searchsorted(
+            starts[group_start:group_end], ends[group_start:group_end], side="left"
+        )
+
+    num_of_partners = np.maximum(upper - np.arange(len(order)) - 1, 0)
+    i = np.repeat(np.arange(len(order)), num_of_partners)
+    offsets = np.arange(len(i)) - np.repeat(
+        np.cumsum(num_of_partners) - num_of_partners, num_of_partners
+    )
+    j = i + 1 + offsets
+    return order[i], order[j]
+
+
+def return_encounters_df(smartpass_df):
+    smartpass_df = smartpass_df.dropna(subset=["class_period"])
+    if len(smartpass_df) == 0:
+        return pd.DataFrame(columns=ENCOUNTER_COLS)
+
+    ## group on the calendar day of the pass rather than the Date string so
+    ## exports spanning several months with mixed date formats line up
+    Date = smartpass_df["datetime"].dt.normalize()
+    group_codes, _ = pd.factorize(
+        pd.MultiIndex.from_arrays([Date, smartpass_df["class_period"]])
+    )
+    starts = smartpass_df["datetime"].to_numpy("datetime64[ns]").view("int64")
+    ends = smartpass_df["endtime"].to_numpy("datetime64[ns]").view("int64")
+
+    i, j = return_overlapping_pass_pairs(starts, ends, group_codes)
+
+    StudentID = smartpass_df["StudentID"].to_numpy()
+    different_student = StudentID[i] != StudentID[j]
+    i, j = i[different_student], j[different_student]
+
+    seconds_of_overlap = (np.minimum(ends[i], ends[j]) - starts[j]) / 1e9
+    destination_codes, _ = pd.factorize(smartpass_df["Destination"])
+    origin_codes, _ = pd.factorize(smartpass_df["Origin"])
+    is_same_destination = (destination_codes[i] == destination_codes[j]) & (
+        destination_codes[i] != -1
+    )
+    is_same_origin = (origin_codes[i] == origin_codes[j]) & (origin_codes[i] != -1)
+    overlap_factor = return_overlap_factor(
+        seconds_of_overlap, is_same_destination, is_same_origin
+    )
+
+    is_encounter = overlap_factor > 60
+    i, j = i[is_encounter], j[is_encounter]
+    ## the pairwise version visits (a, b) and (b, a) and records both
+    ## directions each time, so every direction is counted twice
+    overlap_factor = 2 * overlap_factor[is_encounter]
+
+    passes_df = smartpass_df.reset_index(drop=True)
+    lst = []
+    for one, two in [(i, j), (j, i)]:
+        pass_one = passes_df.iloc[one].reset_index(drop=True)
+        pass_two = passes_df.iloc[two].reset_index(drop=True)
+        lst.append(
+            pd.DataFrame(
+                {
+                    "Student1_StudentID": pass_one["StudentID"],
+                    "Student1_StudentName": pass_one["Student Name"],
+                    "Student1_Origin": pass_one["Origin"],
+                    "Student1_Destination": pass_one["Destination"],
+                    "Student2_StudentID": pass_two["StudentID"],
+                    "Student2_StudentName": pass_two["Student Name"],
+                    "Student2_Origin": pass_two["Origin"],
+                    "Student2_Destination": pass_two["Destination"],
+                    "Date": pass_one["Date"],
+                    "Period": pass_one["class_period"],
+                    "overlap_factor": overlap_factor,
+                }
+            )
+        )
+    return pd.concat(lst, ignore_index=True)
+
+
+def return_encounters_df_rowwise(smartpass_df):
     list_of_encounters = []
     for (day, period), passes_df in smartpass_df.groupby(["Date", "class_period"]):
         for index, pass_one in passes_df.iterrows():
@@ -239,7 +324,23 @@ def return_possible_encounters(smartpass_df):
                         }
                         list_of_encounters.append(student_two)
 
-    encounters_df = pd.DataFrame(list_of_encounters)
+    return pd.DataFrame(list_of_encounters)
+
+
+def return_encounters_pvt(encounters_df):
+    if len(encounters_df) == 0:
+        return pd.DataFrame(
+            columns=[
+                "Student1_StudentID",
+                "Student1_StudentName",
+                "Student2_StudentID",
+                "Student2_StudentName",
+                "overlap_factor",
+                "Student1_Avg",
+                "Student1_Std",
+                "Student1_z_score",
+            ]
+        )
     cols = [
         "Student1_StudentID",
         "Student1_StudentName",
@@ -282,12 +383,8 @@ def return_possible_encounters(smartpass_df):
 
 
 def return_overlap_factor(seconds_of_overlap, is_same_destination, is_same_origin):
-    factor = seconds_of_overlap
-    if is_same_destination:
-        factor *= 2
-    if is_same_origin:
-        factor *= 2
-    return factor
+    ## works on single passes or on NumPy arrays of pass pairs
+    return seconds_of_overlap * 2**is_same_destination * 2**is_same_origin
 
 
 def return_seconds_of_overlap(datetime_one, endtime_one, datetime_two, endtime_two):
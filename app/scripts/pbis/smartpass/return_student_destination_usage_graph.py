@@ -1,7 +1,8 @@
 import pandas as pd
-import plotly.express as px
-import plotly.io as pio
-import plotly.graph_objects as go
+from app.scripts.lazy import lazy_import
+px = lazy_import("plotly.express")
+pio = lazy_import("plotly.io")
+go = lazy_import("plotly.graph_objects")
 
 from io import BytesIO
 
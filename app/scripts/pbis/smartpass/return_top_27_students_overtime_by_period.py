@@ -4,7 +4,8 @@ import datetime as dt
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+from app.scripts import scripts
 
 from .main import process_smartpass_data
 
@@ -35,7 +36,7 @@ def main(form, request):
     #     aggfunc="sum",
     # )
 
-    # attd_by_student = attd_by_student.merge(photos_df, on=["StudentID"], how="left")
+    # attd_by_student = attd_by_student.merge(utils.return_photos_df(), on=["StudentID"], how="left")
 
 
     overtime_passes_df = smartpass_df[smartpass_df["OvertimeFlag"] == True]
@@ -52,7 +53,7 @@ def main(form, request):
     overtime_pivot.columns = ["#_overtime_passes", "Most_Common_Origin"]
     overtime_pivot = overtime_pivot.reset_index()
 
-    overtime_pivot = overtime_pivot.merge(photos_df, on=["StudentID"], how="left")
+    overtime_pivot = overtime_pivot.merge(utils.return_photos_df(), on=["StudentID"], how="left")
 
 
     flowables = []
@@ -132,7 +133,7 @@ def return_photo_roster_pdf(page_header, students_df):
 
 
         try:
-            I = Image(photo_path)
+            I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, image_dim))
             I.drawHeight = image_dim * inch
             I.drawWidth = image_dim * inch
             I.hAlign = "CENTER"
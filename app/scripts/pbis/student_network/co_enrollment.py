@@ -0,0 +1,197 @@
+"""
+Student Co-Enrollment Network
+
+Builds the student network from a 1_01 class roster as a sparse
+student x section incidence matrix A, so the weighted adjacency A·Aᵀ holds
+the number of sections every pair of students shares. Betweenness centrality
+can be estimated from k sampled source students (networkx's k-pivot
+approximation) instead of running Brandes' algorithm from every student.
+
+Built networks, with any centrality already computed, are memoized per roster
+file in-process and pickled next to the roster's report sidecar (see
+report_sidecars), so other features can load the adjacency and graph without
+re-reading the roster.
+"""
+
+import os
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sparse
+
+import app.scripts.report_sidecars as report_sidecars
+import app.scripts.utils as utils
+from app.scripts.lazy import lazy_import
+
+nx = lazy_import("networkx")
+
+NETWORK_EXTENSION = ".network.pkl"
+NETWORK_VERSION = 1
+
+## source students sampled for approximate betweenness centrality; None
+## computes the exact value from every student
+BETWEENNESS_PIVOTS = 500
+BETWEENNESS_SEED = 0
+
+
+def return_network_path(filename):
+    sidecar_path = report_sidecars.return_sidecar_path(filename)
+    return sidecar_path[: -len(report_sidecars.SIDECAR_EXTENSION)] + NETWORK_EXTENSION
+
+
+def return_class_enrollment_df(cr_1_01_df):
+    ## periods 1-9, no Z-coded courses
+    df = cr_1_01_df[(cr_1_01_df["Period"] >= 1) & (cr_1_01_df["Period"] <= 9)]
+    df = df[df["Course"].str[0] != "Z"]
+    return df[["StudentID", "Course", "Section"]].drop_duplicates()
+
+
+def return_incidence_matrix(enrollment_df):
+    """Returns (StudentIDs, A) where A[i, j] is 1 when StudentIDs[i] is in
+    section j."""
+    student_codes, StudentIDs = pd.factorize(enrollment_df["StudentID"], sort=True)
+    section_codes, _ = pd.factorize(
+        pd.MultiIndex.from_frame(enrollment_df[["Course", "Section"]])
+    )
+    incidence = sparse.csr_matrix(
+        (
+            np.ones(len(enrollment_df), dtype=np.int32),
+            (student_codes, section_codes),
+        ),
+        shape=(len(StudentIDs), section_codes.max() + 1 if len(section_codes) else 0),
+    )
+    return np.asarray(StudentIDs), incidence
+
+
+def return_adjacency_matrix(incidence):
+    """A·Aᵀ with the diagonal removed: the number of sections each pair of
+    students shares."""
+    adjacency = (incidence @ incidence.T).tocsr()
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+    return adjacency
+
+
+class StudentNetwork:
+    def __init__(self, StudentIDs, adjacency):
+        self.StudentIDs = StudentIDs
+        self.adjacency = adjacency
+        self.centrality_by_pivots = {}
+        self._graph = None
+
+    @classmethod
+    def from_roster(cls, cr_1_01_df):
+        enrollment_df = return_class_enrollment_df(cr_1_01_df)
+        StudentIDs, incidence = return_incidence_matrix(enrollment_df)
+        return cls(StudentIDs, return_adjacency_matrix(incidence))
+
+    @property
+    def graph(self):
+        """networkx Graph on StudentIDs; edge weight is the number of shared
+        sections. Students who share no section with anyone are left out."""
+        if self._graph is None:
+            upper = sparse.triu(self.adjacency, k=1).tocoo()
+            StudentIDs = self.StudentIDs.tolist()
+            G = nx.Graph()
+            G.add_weighted_edges_from(
+                zip(
+                    [StudentIDs[i] for i in upper.row.tolist()],
+                    [StudentIDs[j] for j in upper.col.tolist()],
+                    upper.data.tolist(),
+                )
+            )
+            self._graph = G
+        return self._graph
+
+    def return_degree_centrality(self):
+        G = self.graph
+        return pd.Series(nx.degree_centrality(G), name="Degree-Centrality")
+
+    def return_betweenness_centrality(self, pivots=BETWEENNESS_PIVOTS, seed=BETWEENNESS_SEED):
+        G = self.graph
+        if pivots is not None and pivots >= G.number_of_nodes():
+            pivots = None
+        key = (pivots, seed if pivots else None)
+        if key not in self.centrality_by_pivots:
+            self.centrality_by_pivots[key] = nx.betweenness_centrality(
+                G, k=pivots, seed=seed if pivots else None
+            )
+        return pd.Series(self.centrality_by_pivots[key], name="Betweenness-Centrality")
+
+    def return_centrality_df(self, pivots=BETWEENNESS_PIVOTS, seed=BETWEENNESS_SEED):
+        centrality_df = pd.concat(
+            [
+                self.return_degree_centrality(),
+                self.return_betweenness_centrality(pivots=pivots, seed=seed),
+            ],
+            axis=1,
+        )
+        centrality_df.index.name = "StudentID"
+        return centrality_df.reset_index()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_graph"] = None
+        return state
+
+
+networks = {}
+networks_lock = threading.Lock()
+
+
+def _load_network(filename, source_mtime_ns):
+    try:
+        with open(return_network_path(filename), "rb") as f:
+            state = pickle.load(f)
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+        return None
+    if state.get("version") != NETWORK_VERSION:
+        return None
+    if state.get("source_mtime_ns") != source_mtime_ns:
+        return None
+    return state["network"]
+
+
+def save_network(filename, network):
+    network_path = return_network_path(filename)
+    state = {
+        "version": NETWORK_VERSION,
+        "source_mtime_ns": os.stat(filename).st_mtime_ns,
+        "network": network,
+    }
+    try:
+        os.makedirs(os.path.dirname(network_path), exist_ok=True)
+        temp_path = network_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, network_path)
+    except OSError as e:
+        print(f"Unable to save student network for {filename}: {e}")
+
+
+def return_student_network(filename):
+    """StudentNetwork for a 1_01 roster file, rebuilt only when the file
+    changes."""
+    source_mtime_ns = os.stat(filename).st_mtime_ns
+    with networks_lock:
+        cached = networks.get(filename)
+        if cached is not None and cached[0] == source_mtime_ns:
+            return cached[1]
+
+        network = _load_network(filename, source_mtime_ns)
+        if network is None:
+            network = StudentNetwork.from_roster(utils.return_file_as_df(filename))
+            save_network(filename, network)
+        networks[filename] = (source_mtime_ns, network)
+    return network
+
+
+def return_centrality_df(filename, pivots=BETWEENNESS_PIVOTS, seed=BETWEENNESS_SEED):
+    network = return_student_network(filename)
+    num_of_cached = len(network.centrality_by_pivots)
+    centrality_df = network.return_centrality_df(pivots=pivots, seed=seed)
+    if len(network.centrality_by_pivots) > num_of_cached:
+        save_network(filename, network)
+    return centrality_df
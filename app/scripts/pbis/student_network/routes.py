@@ -6,7 +6,7 @@ from io import BytesIO
 
 from flask import render_template, request, send_file
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 
@@ -27,5 +27,10 @@ from app.scripts.pbis.student_network import main as student_network_overall
 
 @scripts.route("/pbis/student_network/overall")
 def return_student_network_overall_analysis():
-    f, download_name = student_network_overall.main()
+    ## ?pivots=0 computes exact betweenness centrality
+    pivots = request.args.get("pivots", type=int)
+    if pivots is None:
+        f, download_name = student_network_overall.main()
+    else:
+        f, download_name = student_network_overall.main(betweenness_pivots=pivots or None)
     return send_file(f, as_attachment=True, download_name=download_name)
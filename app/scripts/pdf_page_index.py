@@ -0,0 +1,161 @@
+"""
+PDF Page Index
+
+Page text and StudentID -> pages lookups for the tools that re-sort or split
+uploaded ATS printouts (programs, transcripts, student records). Text
+extraction is the slow part of those tools, several thousand pages taking
+minutes, and the same PDF is often uploaded again with a different sort key.
+
+Page texts are extracted in chunks of pages on the sharded_pdf process pool
+and cached in app/data/.pdf_index/<sha256 of the PDF>.json.gz, so a repeat
+upload only reads the cache. The callers pass in the PdfReader they copy
+page objects from, so a first upload read in the request process parses
+each page once, as the loop it replaced did.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from io import BytesIO
+
+import PyPDF2
+
+import app.scripts.sharded_pdf as sharded_pdf
+import app.scripts.utils as utils
+
+INDEX_DIRECTORY = "app/data/.pdf_index"
+## smaller PDFs are read in the request process
+MIN_PAGES_FOR_POOL = 200
+PAGES_PER_CHUNK = 100
+## the index is written while the user waits on a first upload; level 9 took
+## longer than a tenth of the extraction for barely smaller files
+INDEX_COMPRESSLEVEL = 1
+
+
+def return_pdf_bytes(PDF):
+    """Bytes of PDF, given a path, bytes, or an open file such as an
+    uploaded FileStorage."""
+    if isinstance(PDF, bytes):
+        return PDF
+    if isinstance(PDF, (str, os.PathLike)):
+        with open(PDF, "rb") as f:
+            return f.read()
+    PDF.seek(0)
+    return PDF.read()
+
+
+def return_pdf_reader(pdf_bytes):
+    return PyPDF2.PdfReader(BytesIO(pdf_bytes))
+
+
+def return_index_path(pdf_hash):
+    return os.path.join(INDEX_DIRECTORY, f"{pdf_hash}.json.gz")
+
+
+def extract_page_text(page):
+    ## some ATS pages have no text layer
+    try:
+        return page.extract_text()
+    except AttributeError:
+        return None
+
+
+## per-worker reader of the most recent PDF; opening one walks the whole page
+## tree, which costs more than extracting a chunk of pages
+_reader_cache = {}
+
+
+def _return_reader(pdf_path):
+    if pdf_path not in _reader_cache:
+        _reader_cache.clear()
+        _reader_cache[pdf_path] = PyPDF2.PdfReader(pdf_path)
+    return _reader_cache[pdf_path]
+
+
+def extract_page_texts(pdf_path, start, end):
+    pdfReader = _return_reader(pdf_path)
+    return [extract_page_text(pdfReader.pages[page_num]) for page_num in range(start, end)]
+
+
+def read_page_texts(pdf_hash):
+    try:
+        with gzip.open(return_index_path(pdf_hash), "rt") as f:
+            return json.load(f)
+    except (FileNotFoundError, EOFError, json.JSONDecodeError):
+        return None
+
+
+def write_page_texts(pdf_hash, page_texts):
+    os.makedirs(INDEX_DIRECTORY, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=INDEX_DIRECTORY)
+    try:
+        with gzip.open(os.fdopen(fd, "wb"), "wt", compresslevel=INDEX_COMPRESSLEVEL) as f:
+            json.dump(page_texts, f)
+        os.replace(temp_path, return_index_path(pdf_hash))
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def return_page_texts(PDF, use_pool=None, pdfReader=None):
+    """
+    Text of every page of PDF (None for a page without a text layer), from
+    the cache when this PDF has been read before. pdfReader, the caller's
+    reader of the same PDF, is read from instead of opening another.
+    """
+    pdf_bytes = return_pdf_bytes(PDF)
+    pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    page_texts = read_page_texts(pdf_hash)
+    if page_texts is not None:
+        return page_texts
+
+    if pdfReader is None:
+        pdfReader = return_pdf_reader(pdf_bytes)
+    num_of_pages = len(pdfReader.pages)
+    if use_pool is None:
+        use_pool = sharded_pdf.MAX_WORKERS > 1 and num_of_pages >= MIN_PAGES_FOR_POOL
+
+    if not use_pool:
+        page_texts = [extract_page_text(page) for page in pdfReader.pages]
+    else:
+        ## the hash in the name keeps a reused temp path from matching a
+        ## worker's cached reader of another PDF
+        fd, pdf_path = tempfile.mkstemp(prefix=f"{pdf_hash}-", suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            executor = sharded_pdf.return_executor()
+            futures = [
+                executor.submit(
+                    extract_page_texts, pdf_path, start, min(start + PAGES_PER_CHUNK, num_of_pages)
+                )
+                for start in range(0, num_of_pages, PAGES_PER_CHUNK)
+            ]
+            page_texts = [text for future in futures for text in future.result()]
+        finally:
+            os.remove(pdf_path)
+
+    write_page_texts(pdf_hash, page_texts)
+    return page_texts
+
+
+def return_StudentID_dict(
+    PDF, StudentIDRegex=utils.StudentIDRegex, as_int=True, use_pool=None, pdfReader=None
+):
+    """
+    {StudentID: [page_num, ...]} for the first StudentID on each page, in
+    order of first appearance. Spaces are removed from the page text first,
+    as the ATS printouts space out their digits.
+    """
+    StudentID_dict = {}
+    page_texts = return_page_texts(PDF, use_pool=use_pool, pdfReader=pdfReader)
+    for page_num, page_text in enumerate(page_texts):
+        if page_text is None:
+            continue
+        mo = StudentIDRegex.search(page_text.replace(" ", ""))
+        if mo:
+            StudentID = int(mo.group()) if as_int else mo.group()
+            StudentID_dict.setdefault(StudentID, []).append(page_num)
+    return StudentID_dict
@@ -0,0 +1,164 @@
+"""
+Student Photo Thumbnails
+
+Downsampled, face-cropped copies of the StudentPhotos JPEGs for the PDF
+rosters, ID pages and invitations. The originals are full-resolution camera
+images, but they print at 0.75 to 3 inches, so embedding them directly made
+those PDFs hundreds of MB.
+
+Thumbnails live in app/data/.thumbnails/<pixels>/<StudentID>.jpg (a hidden
+directory, so return_dataframe_of_files never lists them). They are made at
+PRINT_DPI for the smallest entry of THUMBNAIL_INCHES that covers the printed
+size. A thumbnail is regenerated when its source photo is newer.
+
+When opencv is installed the square crop is centered on the largest detected
+face. Otherwise it is centered horizontally and biased toward the top of the
+photo, where the face is on school ID pictures.
+"""
+
+import math
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageOps
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+import app.scripts.utils as utils
+
+THUMBNAIL_DIRECTORY = "app/data/.thumbnails"
+PRINT_DPI = 300
+THUMBNAIL_INCHES = (1.5, 3.0)
+JPEG_QUALITY = 85
+## square crop side as a multiple of the detected face width
+FACE_CROP_FACTOR = 2.4
+## share of the spare height left above the crop when no face is found
+TOP_BIAS = 0.25
+
+_face_cascade = None
+
+
+def return_thumbnail_pixels(inches):
+    for thumbnail_inches in THUMBNAIL_INCHES:
+        if inches <= thumbnail_inches:
+            return math.ceil(thumbnail_inches * PRINT_DPI)
+    return math.ceil(inches * PRINT_DPI)
+
+
+def return_thumbnail_key(photo_filename):
+    mo = utils.StudentIDRegex.search(os.path.basename(photo_filename))
+    if mo:
+        return mo.group()
+    return os.path.splitext(os.path.basename(photo_filename))[0]
+
+
+def return_thumbnail_path(photo_filename, inches=THUMBNAIL_INCHES[0]):
+    return os.path.join(
+        THUMBNAIL_DIRECTORY,
+        str(return_thumbnail_pixels(inches)),
+        f"{return_thumbnail_key(photo_filename)}.jpg",
+    )
+
+
+def is_thumbnail_fresh(photo_filename, thumbnail_path):
+    try:
+        return os.stat(thumbnail_path).st_mtime_ns >= os.stat(photo_filename).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def return_face_box(image):
+    """(left, top, width, height) of the largest face in image, or None."""
+    global _face_cascade
+    if cv2 is None:
+        return None
+    if _face_cascade is None:
+        _face_cascade = cv2.CascadeClassifier(
+            os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+        )
+    gray = np.asarray(image.convert("L"))
+    min_side = max(min(gray.shape) // 8, 20)
+    faces = _face_cascade.detectMultiScale(
+        gray, scaleFactor=1.1, minNeighbors=5, minSize=(min_side, min_side)
+    )
+    if len(faces) == 0:
+        return None
+    return tuple(int(x) for x in max(faces, key=lambda face: face[2] * face[3]))
+
+
+def return_crop_box(width, height, face_box=None):
+    side = min(width, height)
+    if face_box is None:
+        left = (width - side) / 2
+        top = (height - side) * TOP_BIAS
+    else:
+        face_left, face_top, face_width, face_height = face_box
+        side = min(side, max(face_width * FACE_CROP_FACTOR, side / 2))
+        left = face_left + face_width / 2 - side / 2
+        top = face_top + face_height / 2 - side / 2
+        left = min(max(left, 0), width - side)
+        top = min(max(top, 0), height - side)
+    return (round(left), round(top), round(left + side), round(top + side))
+
+
+def write_thumbnail(photo_filename, thumbnail_path, pixels):
+    with Image.open(photo_filename) as image:
+        ## let the JPEG decoder downscale while keeping at least twice the
+        ## thumbnail size across the short side
+        scale = 2 * pixels / min(image.size)
+        image.draft("RGB", (image.width * scale, image.height * scale))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        crop_box = return_crop_box(image.width, image.height, return_face_box(image))
+        thumbnail = image.resize((pixels, pixels), Image.LANCZOS, box=crop_box)
+
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(thumbnail_path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            thumbnail.save(f, "JPEG", quality=JPEG_QUALITY, optimize=True, dpi=(PRINT_DPI, PRINT_DPI))
+        os.replace(temp_path, thumbnail_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def return_thumbnail_filename(photo_filename, inches=THUMBNAIL_INCHES[0]):
+    """Thumbnail to embed for a photo printed at `inches` square, made or
+    refreshed as needed. Falls back to photo_filename (which may be NaN for a
+    student without a photo) when no thumbnail can be made."""
+    if not isinstance(photo_filename, str) or not os.path.exists(photo_filename):
+        return photo_filename
+    thumbnail_path = return_thumbnail_path(photo_filename, inches)
+    if is_thumbnail_fresh(photo_filename, thumbnail_path):
+        return thumbnail_path
+    try:
+        write_thumbnail(photo_filename, thumbnail_path, return_thumbnail_pixels(inches))
+    except Exception as e:
+        print(f"Unable to write thumbnail for {photo_filename}: {e}")
+        return photo_filename
+    return thumbnail_path
+
+
+def update_thumbnails(photos_df=None, inches=THUMBNAIL_INCHES, max_workers=4):
+    """Makes every missing or stale thumbnail at each size in `inches` and
+    returns how many were written."""
+    if photos_df is None:
+        photos_df = utils.return_photos_df()
+    if len(photos_df) == 0:
+        return 0
+    jobs = [
+        (photo_filename, thumbnail_inches)
+        for photo_filename in photos_df["photo_filename"]
+        for thumbnail_inches in inches
+        if not is_thumbnail_fresh(
+            photo_filename, return_thumbnail_path(photo_filename, thumbnail_inches)
+        )
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(lambda job: return_thumbnail_filename(*job), jobs))
+    return len(jobs)
@@ -6,12 +6,13 @@ import math
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from app.scripts.date_to_marking_period import return_mp_from_date
 
 
 def main(PRESENT_STANDARD=90, ON_TIME_STANDARD=80):
 
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -125,6 +126,7 @@ def main(PRESENT_STANDARD=90, ON_TIME_STANDARD=80):
 
 
 def return_attd_grid(StudentID):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
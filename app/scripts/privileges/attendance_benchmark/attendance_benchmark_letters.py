@@ -26,7 +26,7 @@ import json
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from app.scripts.date_to_marking_period import return_mp_from_date
 
 from app.scripts.privileges.attendance_benchmark import attendance_benchmark
@@ -67,6 +67,7 @@ closing = [
 
 
 def return_attendance_benchmark_letters(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -26,7 +26,7 @@ import json
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from app.scripts.date_to_marking_period import return_mp_from_date
 
 from app.scripts.privileges.attendance_benchmark import attendance_benchmark
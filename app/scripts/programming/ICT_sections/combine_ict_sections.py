@@ -1,6 +1,6 @@
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 import os
 from flask import current_app, session
@@ -9,6 +9,7 @@ import math
 
 
 def main(request, form):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
@@ -4,7 +4,7 @@ from io import BytesIO
 from flask import render_template, request, send_file, session, url_for, redirect
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.programming.jupiter.forms import JupiterMasterScheduleForm
@@ -1,7 +1,6 @@
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from flask import session
 
@@ -52,6 +51,7 @@ closing = [
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     school_year = int(school_year) + 1
 
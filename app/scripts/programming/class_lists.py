@@ -4,9 +4,8 @@ import app.scripts.utils as utils
 import datetime as dt
 import os
 
-files_df = utils.return_dataframe_of_files()
-
 def generate_class_list(data):
+    files_df = utils.return_files_df()
 
     year_and_semester = data["year_and_semester"]
 
@@ -117,3 +117,29 @@ class AP_offers_Letter_Form(FlaskForm):
         self.date_of_letter.data = dt.datetime.today()
         self.due_date.data = dt.datetime.today() + dt.timedelta(days=14)
         super().__init__(*args, **kwargs)
+
+
+class ScheduleEngineForm(FlaskForm):
+    requests_file = FileField(
+        "Student Course Requests (Student_ID, Course_Code)",
+        validators=[FileRequired()],
+    )
+
+    master_schedule_file = FileField(
+        "Master Schedule (Course_Code, Section, Teacher, Room, Capacity, Period, Cycle_Day)",
+        validators=[FileRequired()],
+    )
+
+    locked_file = FileField("Locked Assignments (Student_ID, Course_Code, Section)")
+
+    conflicts_file = FileField("Student Conflicts (Student_A, Student_B)")
+
+    time_constraints_file = FileField(
+        "Course Time Constraints (Course_Code, Allowed_Periods, Allowed_Days)"
+    )
+
+    max_workers = IntegerField(
+        "Processes for Optimization Passes",
+        widget=NumberInput(min=1, max=16, step=1),
+        default=1,
+    )
@@ -1,6 +1,6 @@
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 import os
 from flask import current_app, session
@@ -44,6 +44,7 @@ def main(request, form):
 
 
 def return_student_jupiter(request, form):
+    files_df = utils.return_files_df()
     jupiter_df = return_jupiter_schedule(request, form)
     jupiter_df = jupiter_df.drop_duplicates(subset=["Course Code", "Section"])
     jupiter_df = jupiter_df[
@@ -73,6 +74,7 @@ def return_student_jupiter(request, form):
 
 
 def return_jupiter_schedule(request=None, form=None):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
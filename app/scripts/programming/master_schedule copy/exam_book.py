@@ -1,6 +1,6 @@
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 import os
 from flask import current_app, session
@@ -14,11 +14,10 @@ import app.scripts.programming.master_schedule.identify_irresolvables as identif
 
 from app.scripts.programming.master_schedule.utils import output_cols
 
-from app.scripts import gsheets_df
 
 from flask import session
 
-from app.scripts.utils import return_gsheet_url_by_title
+from app.scripts.utils import return_gsheet_url_by_title, return_gsheets_df
 
 def main():
 
@@ -57,7 +56,7 @@ def main():
     ## identify if the value should be added
     output_df['to_count'] = output_df.apply(to_count,axis=1)
     output_cols.append('to_count')
-    spreadsheet_id = return_gsheet_url_by_title(gsheets_df, 'master_schedule_planning', year_and_semester=year_and_semester)
+    spreadsheet_id = return_gsheet_url_by_title(return_gsheets_df(), 'master_schedule_planning', year_and_semester=year_and_semester)
     gsheet_utils.set_df_to_dataframe(
         output_df[output_cols], spreadsheet_id, sheet="Output")
 
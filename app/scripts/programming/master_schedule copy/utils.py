@@ -7,7 +7,7 @@ import app.scripts.programming.master_schedule.gsheet_utils as gsheet_utils
 import app.scripts.programming.master_schedule.spreadsheet_ids as spreadsheet_ids
 
 
-from app.scripts import gsheets_df
+import app.scripts.utils as utils
 
 from flask import session
 
@@ -17,6 +17,7 @@ gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
 
 
 def return_master_schedule_by_sheet(sheet_name):
+    gsheets_df = utils.return_gsheets_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -1,9 +1,24 @@
-import pandas as pd
+"""
+Identify Irresolvables
+
+Finds the students whose course requests cannot all be scheduled in the
+master schedule, i.e. there is no way to give each requested course its own
+period (two periods for a double-period course) among the periods where that
+course has sections.
+
+Students are grouped by their set of requested courses, and each group is
+solved once. The solver's result depends only on which periods each course
+meets, so it is cached on that: when a department is re-planned, only the
+groups taking one of its changed courses are solved again.
 
+For every group that cannot be scheduled, the report names the blocking
+courses and the periods they compete for: a set of courses that together
+meet in fewer periods than there are courses.
+"""
 
-from scipy.optimize import linear_sum_assignment
-from scipy.sparse import csr_matrix
-from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+import functools
+
+import pandas as pd
 
 double_periods = [
     'ACS11TD',
@@ -18,56 +33,118 @@ double_periods = [
     'AFS65TCH',
     ]
 
+PERIODS = range(1, 10)
+SOLVER_CACHE_SIZE = 100_000
+
+
+def return_periods_by_course(master_schedule_df):
+    """{CourseCode: (periods with a section, ...)}"""
+    df = master_schedule_df[['CourseCode', 'PeriodID']].copy()
+    df['PeriodID'] = pd.to_numeric(df['PeriodID'], errors='coerce')
+    df = df[df['PeriodID'].isin(PERIODS)]
+    df['PeriodID'] = df['PeriodID'].astype(int)
+    return df.groupby('CourseCode')['PeriodID'].agg(lambda x: tuple(sorted(set(x)))).to_dict()
+
+
+def return_request_signatures(student_requests_df):
+    """Each student's requested courses as a sorted tuple, indexed by
+    StudentID."""
+    df = student_requests_df[['StudentID', 'Course']].drop_duplicates()
+    return df.sort_values('Course').groupby('StudentID')['Course'].agg(tuple)
+
+
+def return_course_slots(courses, periods_by_course):
+    """One (course, periods) slot per course period to fill."""
+    course_slots = []
+    for course in courses:
+        periods = periods_by_course.get(course, ())
+        course_slots.append((course, periods))
+        if course in double_periods:
+            course_slots.append((course, periods))
+    return tuple(course_slots)
+
+
+@functools.lru_cache(maxsize=SOLVER_CACHE_SIZE)
+def solve_course_slots(course_slots):
+    """
+    Matches each slot to a distinct period. Returns (blocking_courses,
+    blocking_periods, num_of_unscheduled); the first two are empty when every
+    slot fits.
+    """
+    slot_by_period = {}
+
+    def augment(slot, seen):
+        for period in course_slots[slot][1]:
+            if period in seen:
+                continue
+            seen.add(period)
+            if period not in slot_by_period or augment(slot_by_period[period], seen):
+                slot_by_period[period] = slot
+                return True
+        return False
+
+    unscheduled = [slot for slot in range(len(course_slots)) if not augment(slot, set())]
+    if not unscheduled:
+        return (), (), 0
+
+    ## the slots reachable from an unscheduled slot by alternating paths meet
+    ## in fewer periods than there are slots (Hall's condition fails there)
+    blocking_slots = set(unscheduled)
+    blocking_periods = set()
+    to_visit = list(unscheduled)
+    while to_visit:
+        slot = to_visit.pop()
+        for period in course_slots[slot][1]:
+            if period in blocking_periods:
+                continue
+            blocking_periods.add(period)
+            matched_slot = slot_by_period[period]
+            if matched_slot not in blocking_slots:
+                blocking_slots.add(matched_slot)
+                to_visit.append(matched_slot)
+
+    blocking_courses = sorted({course_slots[slot][0] for slot in blocking_slots})
+    return tuple(blocking_courses), tuple(sorted(blocking_periods)), len(unscheduled)
+
+
+def return_irresolvables_df(student_requests_df, master_schedule_df):
+    """
+    One row per group of students with the same requests that cannot be
+    scheduled: Courses, NumberOfStudents, StudentIDs, BlockingCourses,
+    BlockingPeriods and UnscheduledCourses, largest groups first.
+    """
+    periods_by_course = return_periods_by_course(master_schedule_df)
+    signatures = return_request_signatures(student_requests_df)
+
+    rows = []
+    for courses, StudentIDs in signatures.groupby(signatures).groups.items():
+        blocking_courses, blocking_periods, num_of_unscheduled = solve_course_slots(
+            return_course_slots(courses, periods_by_course)
+        )
+        if num_of_unscheduled:
+            rows.append(
+                {
+                    'Courses': ', '.join(courses),
+                    'NumberOfStudents': len(StudentIDs),
+                    'StudentIDs': ', '.join(str(StudentID) for StudentID in StudentIDs),
+                    'BlockingCourses': ', '.join(blocking_courses),
+                    'BlockingPeriods': ', '.join(str(period) for period in blocking_periods),
+                    'UnscheduledCourses': num_of_unscheduled,
+                }
+            )
+    cols = ['Courses', 'NumberOfStudents', 'StudentIDs', 'BlockingCourses', 'BlockingPeriods', 'UnscheduledCourses']
+    df = pd.DataFrame(rows, columns=cols)
+    return df.sort_values(by=['NumberOfStudents', 'Courses'], ascending=[False, True], ignore_index=True)
+
+
 def main(master_schedule_output_filename):
     master_schedule_df = pd.read_excel(master_schedule_output_filename).fillna('')
     student_requests_df = pd.read_excel('4.01.xlsx')
 
-
-    requests_cols = ['StudentID','LastName','FirstName','Course']
-    master_schedule_cols = ['CourseCode','SectionID','PeriodID']
-    combined_df = student_requests_df[requests_cols].merge(master_schedule_df[master_schedule_cols], left_on=['Course'], right_on=['CourseCode'], how='left')
-
-    combined_df = combined_df.sort_values(by=['PeriodID'])
-
-    student_group_by = combined_df.groupby(['StudentID'])
-    counter = 0
-    for StudentID, student_courses_df in student_group_by:
-        student_course_list = student_courses_df['Course'].unique()
-        student_course_grid_df = student_courses_df.groupby(['Course'])
-        output_matrix = []
-        for course, course_grid_df in student_course_grid_df:
-            output_dict = {'Course':course}
-            list_of_periods = list(course_grid_df['PeriodID'])
-            for i in range(10):
-                if i in list_of_periods:
-                    if output_dict.get(i):
-                        output_dict[i] += 1
-                    else:
-                        output_dict[i] = 1
-                else:
-                    output_dict[i] = 0
-            output_matrix.append(output_dict)
-
-            if course in double_periods:
-                output_matrix.append(output_dict)
-
-        output_df = pd.DataFrame(output_matrix)
-
-        cost = output_df[[1,2,3,4,5,6,7,8,9]]
-        biadjacency_matrix = csr_matrix(cost)
-        try:
-            matching_output = min_weight_full_bipartite_matching(biadjacency_matrix)[1]
-        except ValueError:
-            counter+=1
-            print(output_df)
-            print(f'no match {StudentID}: #{counter}')
-
-        # row_ind, col_ind = linear_sum_assignment(cost)
-        # print(row_ind)
-        # print(col_ind)
-
-
-
+    irresolvables_df = return_irresolvables_df(student_requests_df, master_schedule_df)
+    print(irresolvables_df)
+    print(f"{irresolvables_df['NumberOfStudents'].sum()} students cannot be scheduled")
+    return irresolvables_df
 
 
 if __name__ == "__main__":
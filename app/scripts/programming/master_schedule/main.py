@@ -14,11 +14,16 @@ import app.scripts.programming.master_schedule.identify_irresolvables as identif
 
 from app.scripts.programming.master_schedule.utils import output_cols
 
-from app.scripts import gsheets_df
 
 from flask import session
 
-from app.scripts.utils import return_gsheet_url_by_title
+from app.scripts.utils import (
+    return_file_as_df,
+    return_files_df,
+    return_gsheet_url_by_title,
+    return_gsheets_df,
+    return_most_recent_report_by_semester,
+)
 
 def main():
 
@@ -26,10 +31,25 @@ def main():
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
 
+    output_df = return_master_schedule_output_df()
+
+    spreadsheet_id = return_gsheet_url_by_title(return_gsheets_df(), 'master_schedule_planning', year_and_semester=year_and_semester)
+    gsheet_utils.set_df_to_dataframe(
+        output_df[output_cols], spreadsheet_id, sheet="Output")
+
+    return output_df[output_cols].to_html()
+
+
+def return_master_schedule_output_df():
+    """The master schedule built from the planning spreadsheet, without
+    writing it back."""
     output_list = []
 
+    academic_depts = ['PE','ELA','CTE','Science','Math','Spanish','SS','EE']
+    utils.prefetch_master_schedule_sheets(['CourseInfo', 'JustAppend'] + academic_depts)
+
     # for academic_dept in ['Spanish','Math','Science','SS','ELA']:
-    for academic_dept in ['PE','ELA','CTE','Science','Math','Spanish','SS','EE']:
+    for academic_dept in academic_depts:
         output_list.extend(process_course_list.main(academic_dept))
         # output_list.extend(process_half_credit.main(academic_dept))
 
@@ -58,7 +78,7 @@ def main():
     
     
     ## Combine Teacher Names
-    output_df['Teacher Name'] = output_df.apply(utils.return_combined_teacher_names, args=(output_df,), axis=1)
+    output_df['Teacher Name'] = utils.return_combined_teacher_names_by_section(output_df)
     output_df['Course name'] = ''
 
     ## convert Cycle Day to string with a leading '
@@ -69,10 +89,26 @@ def main():
 
     ## Append Exam Book
     output_df = pd.concat([output_df, exam_book.main()], ignore_index=True)
+    return output_df[output_cols]
 
-    spreadsheet_id = return_gsheet_url_by_title(gsheets_df, 'master_schedule_planning', year_and_semester=year_and_semester)
-    gsheet_utils.set_df_to_dataframe(
-        output_df[output_cols], spreadsheet_id, sheet="Output")
 
-    return output_df[output_cols].to_html()
+def return_irresolvables_html():
+    """Students whose requests the current planning spreadsheet cannot
+    schedule, for checking a schedule change before writing the output."""
+    school_year = session["school_year"]
+    term = session["term"]
+    year_and_semester = f"{school_year}-{term}"
+
+    filename = return_most_recent_report_by_semester(return_files_df(), "4_01", year_and_semester)
+    student_requests_df = return_file_as_df(filename)
+    irresolvables_df = identify_irresolvables.return_irresolvables_df(
+        student_requests_df, return_master_schedule_output_df()
+    )
+    cache_info = identify_irresolvables.solve_course_slots.cache_info()
+    summary = (
+        f"<p>{irresolvables_df['NumberOfStudents'].sum()} students in "
+        f"{len(irresolvables_df)} request groups cannot be scheduled "
+        f"(solver cache: {cache_info.hits} hits, {cache_info.misses} misses)</p>"
+    )
+    return summary + irresolvables_df.to_html(index=False)
 
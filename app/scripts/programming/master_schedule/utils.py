@@ -2,26 +2,37 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+import numpy as np
+import pandas as pd
 import pygsheets
 import app.scripts.programming.master_schedule.gsheet_utils as gsheet_utils
 import app.scripts.programming.master_schedule.spreadsheet_ids as spreadsheet_ids
 
 
-from app.scripts import gsheets_df
 
 from flask import session
 
-from app.scripts.utils import return_gsheet_url_by_title
+from app.scripts.utils import return_gsheet_url_by_title, return_gsheets_df
 
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+from app.scripts.utils import gc
 
 
-def return_master_schedule_by_sheet(sheet_name):
+def return_master_schedule_spreadsheet_id():
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
-    
-    spreadsheet_id = return_gsheet_url_by_title(gsheets_df, 'master_schedule_planning', year_and_semester=year_and_semester)
+    return return_gsheet_url_by_title(return_gsheets_df(), 'master_schedule_planning', year_and_semester=year_and_semester)
+
+
+def prefetch_master_schedule_sheets(sheet_names):
+    """Reads sheet_names in one batch request, so the
+    return_master_schedule_by_sheet calls of a build are served from the
+    gateway cache."""
+    gsheet_utils.return_google_sheets_as_dataframes(return_master_schedule_spreadsheet_id(), sheet_names)
+
+
+def return_master_schedule_by_sheet(sheet_name):
+    spreadsheet_id = return_master_schedule_spreadsheet_id()
     df = gsheet_utils.return_google_sheet_as_dataframe(spreadsheet_id, sheet=sheet_name)
     df = df.fillna("")
     if "department" in df.columns:
@@ -43,6 +54,45 @@ def return_room_by_teacher_by_period(master_row, room_grid_dict):
         return default_room
 
 
+def return_rooms_by_teacher_by_period(output_df, room_grid_df):
+    """
+    return_room_by_teacher_by_period for every row of output_df at once, as a
+    keyed lookup of (Teacher Name, Period<PeriodID>) in room_grid_df (indexed
+    by Teacher Name, one Period<n> column per period). As before, a teacher
+    on the grid with no room for that period gets None.
+    """
+    period_keys = "Period" + output_df["PeriodID"].astype(str)
+    grid_rooms = (
+        room_grid_df.rename_axis("grid_teacher")
+        .reset_index()
+        .melt(id_vars="grid_teacher", var_name="period_key", value_name="grid_room")
+        .set_index(["grid_teacher", "period_key"])["grid_room"]
+    )
+    grid_rooms = grid_rooms.reindex(
+        pd.MultiIndex.from_arrays([output_df["Teacher Name"], period_keys])
+    ).to_numpy()
+    on_grid = output_df["Teacher Name"].isin(room_grid_df.index) & (len(room_grid_df.columns) > 0)
+    has_grid_room = pd.notna(grid_rooms) & (grid_rooms != "")
+    rooms = np.where(on_grid, np.where(has_grid_room, grid_rooms, None), output_df["Room"])
+    return pd.Series(rooms, index=output_df.index, dtype=object)
+
+
+def return_combined_teacher_names_by_section(output_df):
+    """
+    return_combined_teacher_names for every row of output_df at once: one
+    groupby over (PeriodID, SectionID, Room) instead of a mask over the whole
+    frame per row. Sections with exactly two teachers get both last names.
+    """
+    keys = [output_df[col].astype(str) for col in ["PeriodID", "SectionID", "Room"]]
+    teachers_by_section = output_df.groupby(keys, sort=False)["Teacher Name"].unique()
+    coteachers = teachers_by_section[teachers_by_section.map(len) == 2].map(
+        convert_list_of_names_to_coteachers
+    )
+    combined_names = coteachers.reindex(pd.MultiIndex.from_arrays(keys)).to_numpy()
+    teacher_names = np.where(pd.notna(combined_names), combined_names, output_df["Teacher Name"])
+    return pd.Series(teacher_names, index=output_df.index, dtype=object)
+
+
 def return_combined_teacher_names(master_row, output_df):
     PeriodID = master_row["PeriodID"]
     SectionID = master_row["SectionID"]
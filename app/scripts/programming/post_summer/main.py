@@ -5,7 +5,7 @@ import numpy as np
 
 import app.scripts.utils as utils
 import app.scripts.programming.post_summer.utils as post_summer_utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from flask import session
 
 from io import BytesIO
@@ -27,6 +27,7 @@ def main():
     4. Regents Max
     Return updated requests.  
     """
+    files_df = utils.return_files_df()
 
     school_year = session["school_year"]
     term = session["term"]
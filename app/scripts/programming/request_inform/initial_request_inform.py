@@ -1,7 +1,6 @@
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from flask import session
 
@@ -17,6 +16,7 @@ from reportlab_qrcode import QRCodeImage
 
 
 def main(data):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"  
@@ -20,12 +20,13 @@ import app.scripts.programming.requests.finalize_requests as finalize_requests
 from app.scripts.attendance.process_RATR import student_lateness_overall
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from flask import session
 
 from io import BytesIO
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"    
@@ -4,7 +4,7 @@ import numpy as np
 
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 from flask import session
 
 from io import BytesIO
@@ -14,6 +14,7 @@ from app.scripts.utils_v2.stars.analyze_regents_max import main as analyze_regen
 from app.scripts.utils_v2.stars.analyze_transcript import main as analyze_transcript_main
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
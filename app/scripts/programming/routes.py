@@ -4,7 +4,7 @@ from io import BytesIO
 from flask import render_template, request, send_file, session, url_for, redirect
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from flask_wtf import FlaskForm
@@ -15,6 +15,7 @@ from app.scripts.programming.forms import (
     FinalRequestInformLetters,
     MajorReapplicationForm,
     AP_offers_Letter_Form,
+    ScheduleEngineForm,
 )
 
 from app.scripts.programming.jupiter.forms import JupiterMasterScheduleForm
@@ -29,6 +30,7 @@ def return_programming_reports():
     upload_advanced_coursework_surveys = UploadAdvancedCourseSurveyForm()
     ap_offer_letter_form = AP_offers_Letter_Form()
     jupiter_master_schedule_form = JupiterMasterScheduleForm()
+    schedule_engine_form = ScheduleEngineForm()
     generic_form = FlaskForm()
     form_cards = [
         {
@@ -85,6 +87,18 @@ def return_programming_reports():
             "form": initial_request_form,
             "route": "scripts.return_processed_master_schedule",
         },
+        {
+            "Title": "Check Master Schedule Feasibility",
+            "Description": "Build the master schedule from the planning spreadsheet without saving it and list the students whose requests cannot be scheduled, with the courses and periods blocking them",
+            "form": initial_request_form,
+            "route": "scripts.return_master_schedule_irresolvables",
+        },
+        {
+            "Title": "Run Scheduling Engine",
+            "Description": "Assign students to sections from their requests, the master schedule, locked assignments and conflicts; returns the assignments with statistics, master schedule recommendations and the students who could not be fully scheduled",
+            "form": schedule_engine_form,
+            "route": "scripts.return_schedule_engine_output",
+        },
         {
             "Title": "Return Jupiter Master Schedule",
             "Description": "Process Master Schedule to Return File to Upload To Jupiter",
@@ -320,6 +334,31 @@ def return_processed_master_schedule():
     return process_master_schedule.main()
 
 
+@scripts.route("/programming/master_schedule_irresolvables", methods=["GET", "POST"])
+def return_master_schedule_irresolvables():
+    return process_master_schedule.return_irresolvables_html()
+
+
+import app.scripts.programming.schedule_engine.main as schedule_engine
+
+
+@scripts.route("/programming/schedule_engine", methods=["GET", "POST"])
+def return_schedule_engine_output():
+    school_year = session["school_year"]
+    term = session["term"]
+
+    form = ScheduleEngineForm(request.form)
+    f = schedule_engine.main(form, request)
+
+    download_name = f"{school_year}_{term}_schedule_engine_output.xlsx"
+
+    return send_file(
+        f,
+        as_attachment=True,
+        download_name=download_name,
+    )
+
+
 import app.scripts.programming.ap_offers.main as ap_offers
 
 
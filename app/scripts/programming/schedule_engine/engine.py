@@ -0,0 +1,581 @@
+"""
+Schedule Engine
+
+Assigns students to sections in the phases laid out in prompt.md:
+
+1. Constraint processing: validate the locked assignments, find the
+   singletons and virtual singletons (courses whose every section meets at
+   the same time) and the course pairs they make impossible to take together,
+   and score each student's difficulty.
+2. Initial assignment: place the locked students, then every other student
+   hardest first. Within a student, the request with the fewest sections that
+   still fit goes next, into the section with the fewest conflict partners
+   and then the lowest fill. A request with no fitting section may move one
+   of the student's other courses to another section to make room.
+3. Optimization: rounds of balance, compact and resolve_conflicts passes,
+   each followed by a refill of the requests still unscheduled.
+
+Every optimization pass looks at one course at a time, so a pass over all
+courses can be split across the sharded_pdf process pool: each worker runs
+the pass on its own copy of the model over a share of the courses and returns
+its moves, and the moves are then re-checked and applied here one at a time,
+as another worker may have moved the same student. With max_workers=1 the
+pass runs in place and every move is applied as it is found.
+"""
+
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.sharded_pdf as sharded_pdf
+from app.scripts.programming.schedule_engine.model import (
+    DAYS,
+    MAX_PERIODS,
+    UNASSIGNED,
+    ScheduleModel,
+    normalize_section,
+    return_mask_description,
+)
+
+## difficulty score weights
+REQUEST_WEIGHT = 1
+LIMITED_SECTIONS_WEIGHT = 2
+LOCKED_CONFLICT_WEIGHT = 3
+SINGLETON_CLASH_WEIGHT = 5
+
+PASSES = ["balance", "compact", "resolve_conflicts"]
+OPTIMIZATION_ROUNDS = 2
+## a compacting move may leave the new section this much fuller (as a share
+## of capacity) than the one it leaves
+COMPACT_BALANCE_SLACK = 0.1
+## passes over fewer courses than this run in process
+MIN_COURSES_FOR_POOL = 20
+## students share a few hundred weekly patterns, so gaps are cached on them
+GAPS_CACHE_SIZE = 65_536
+
+DAY_MASKS = [
+    sum(1 << (period * len(DAYS) + day) for period in range(MAX_PERIODS))
+    for day in range(len(DAYS))
+]
+
+
+def validate_locks(locked_df, master_schedule_df):
+    """
+    Splits locked_df into the locks that name a course and section in the
+    master schedule and error rows (Student_ID, Course_Code, Section,
+    Error_Description) for the rest. A student locked into two sections of
+    one course keeps the first.
+    """
+    error_cols = ["Student_ID", "Course_Code", "Section", "Error_Description"]
+    if locked_df is None or locked_df.empty:
+        return pd.DataFrame(columns=["Student_ID", "Course_Code", "Section"]), pd.DataFrame(columns=error_cols)
+
+    locked_df = locked_df[["Student_ID", "Course_Code", "Section"]].copy()
+    locked_df["Section"] = locked_df["Section"].apply(normalize_section)
+    sections = set(
+        zip(master_schedule_df["Course_Code"], master_schedule_df["Section"].apply(normalize_section))
+    )
+    courses = set(master_schedule_df["Course_Code"])
+
+    has_course = locked_df["Course_Code"].isin(courses)
+    has_section = pd.Series(
+        [key in sections for key in zip(locked_df["Course_Code"], locked_df["Section"])],
+        index=locked_df.index,
+        dtype=bool,
+    )
+    is_duplicate = locked_df.duplicated(subset=["Student_ID", "Course_Code"]) & has_section
+
+    errors_df = locked_df[~has_section | is_duplicate].copy()
+    errors_df["Error_Description"] = np.select(
+        [~has_course[errors_df.index].to_numpy(), ~has_section[errors_df.index].to_numpy()],
+        ["Course no longer in master schedule", "Section no longer in master schedule"],
+        "Student locked into more than one section of course; first lock kept",
+    )
+    valid_locks_df = locked_df[has_section & ~is_duplicate]
+    return valid_locks_df, errors_df[error_cols]
+
+
+def return_requests_with_locks(requests_df, valid_locks_df):
+    """Requests plus the locked courses a student did not request."""
+    requests_df = requests_df[["Student_ID", "Course_Code"]]
+    return pd.concat(
+        [requests_df, valid_locks_df[["Student_ID", "Course_Code"]]], ignore_index=True
+    ).drop_duplicates(ignore_index=True)
+
+
+def place_locks(model, valid_locks_df):
+    """Assigns the valid locks, ignoring capacity. Returns error rows for
+    locks that overlap another lock of the same student or overfill their
+    section."""
+    errors = []
+    for Student_ID, Course_Code, Section in valid_locks_df[["Student_ID", "Course_Code", "Section"]].itertuples(
+        index=False
+    ):
+        student = model.student_index[Student_ID]
+        request = model.request_by_student_course[(student, model.course_index[Course_Code])]
+        section = model.section_index[(Course_Code, Section)]
+        overlapping = [
+            model.return_section_label(model.assignment[other])
+            for other in model.student_requests[student]
+            if model.assignment[other] != UNASSIGNED
+            and int(model.section_mask[model.assignment[other]]) & int(model.section_mask[section])
+        ]
+        if overlapping:
+            errors.append(
+                (Student_ID, Course_Code, Section, f"Time conflict with locked {', '.join(overlapping)}; not placed")
+            )
+            continue
+        model.assign(request, section)
+        model.locked[request] = True
+        if model.load[section] > model.capacity[section]:
+            errors.append(
+                (
+                    Student_ID,
+                    Course_Code,
+                    Section,
+                    f"Locked students exceed capacity ({model.load[section]}/{model.capacity[section]})",
+                )
+            )
+    return pd.DataFrame(errors, columns=["Student_ID", "Course_Code", "Section", "Error_Description"])
+
+
+def return_fixed_time_courses_df(model):
+    """Courses whose every section meets at the same time: Singleton (one
+    section) or Virtual Singleton."""
+    rows = []
+    for course, sections in enumerate(model.course_sections):
+        if not len(sections):
+            continue
+        masks = set(model.section_mask[sections].tolist())
+        if len(masks) == 1:
+            rows.append(
+                {
+                    "course": course,
+                    "Course_Code": model.courses[course],
+                    "Type": "Singleton" if len(sections) == 1 else "Virtual Singleton",
+                    "Sections": len(sections),
+                    "Time": return_mask_description(masks.pop()),
+                    "Requests": len(model.course_requests[course]),
+                }
+            )
+    return pd.DataFrame(rows, columns=["course", "Course_Code", "Type", "Sections", "Time", "Requests"])
+
+
+def return_clashes_df(model, fixed_time_courses_df):
+    """
+    Pairs of co-requested courses that cannot be taken together because one
+    is fixed in time and every section of the other overlaps it, with the
+    number of students requesting both.
+    """
+    incidence = model.return_incidence_matrix()
+    co_requests = (incidence.T @ incidence).tocsr()
+    fixed_courses = set(fixed_time_courses_df["course"])
+    rows = []
+    for course, Type in zip(fixed_time_courses_df["course"], fixed_time_courses_df["Type"]):
+        mask = model.section_mask[model.course_sections[course][0]]
+        start, end = co_requests.indptr[course], co_requests.indptr[course + 1]
+        for other, num_of_students in zip(co_requests.indices[start:end], co_requests.data[start:end]):
+            other_sections = model.course_sections[other]
+            if other == course or not len(other_sections):
+                continue
+            ## both fixed: report the pair once
+            if other in fixed_courses and other < course:
+                continue
+            if (model.section_mask[other_sections] & mask).all():
+                rows.append(
+                    {
+                        "course": course,
+                        "other_course": other,
+                        "Course_Code": model.courses[course],
+                        "Type": Type,
+                        "Time": return_mask_description(mask),
+                        "Clashing_Course": model.courses[other],
+                        "Clashing_Sections": len(other_sections),
+                        "Students_Affected": int(num_of_students),
+                        "Cross_Department": model.courses[course][:1] != model.courses[other][:1],
+                    }
+                )
+    cols = [
+        "course",
+        "other_course",
+        "Course_Code",
+        "Type",
+        "Time",
+        "Clashing_Course",
+        "Clashing_Sections",
+        "Students_Affected",
+        "Cross_Department",
+    ]
+    df = pd.DataFrame(rows, columns=cols)
+    return df.sort_values(by=["Students_Affected", "Course_Code"], ascending=[False, True], ignore_index=True)
+
+
+def return_difficulty_df(model, clashes_df):
+    """Per-student difficulty score and its parts, indexed like model.students."""
+    num_of_students = len(model.students)
+    num_of_requests = np.bincount(model.request_student, minlength=num_of_students)
+
+    num_of_sections = np.array([len(sections) for sections in model.course_sections])
+    request_sections = num_of_sections[model.request_course]
+    limited_sections = np.bincount(
+        model.request_student,
+        weights=np.divide(1.0, request_sections, out=np.zeros(len(request_sections)), where=request_sections > 0),
+        minlength=num_of_students,
+    )
+
+    locked_conflicts = np.zeros(num_of_students, dtype=np.int64)
+    for request in np.flatnonzero(model.locked):
+        course = model.request_course[request]
+        for partner in model.conflict_partners[model.request_student[request]]:
+            if (partner, course) in model.request_by_student_course:
+                locked_conflicts[partner] += 1
+
+    singleton_clashes = np.zeros(num_of_students, dtype=np.int64)
+    incidence = model.return_incidence_matrix().tocsc()
+    for course, other in zip(clashes_df["course"], clashes_df["other_course"]):
+        students = np.intersect1d(
+            incidence.indices[incidence.indptr[course] : incidence.indptr[course + 1]],
+            incidence.indices[incidence.indptr[other] : incidence.indptr[other + 1]],
+            assume_unique=True,
+        )
+        singleton_clashes[students] += 1
+
+    df = pd.DataFrame(
+        {
+            "Student_ID": model.students,
+            "Requests": num_of_requests,
+            "Limited_Sections": limited_sections.round(2),
+            "Locked_Conflicts": locked_conflicts,
+            "Singleton_Clashes": singleton_clashes,
+        }
+    )
+    df["Difficulty"] = (
+        REQUEST_WEIGHT * df["Requests"]
+        + LIMITED_SECTIONS_WEIGHT * limited_sections
+        + LOCKED_CONFLICT_WEIGHT * df["Locked_Conflicts"]
+        + SINGLETON_CLASH_WEIGHT * df["Singleton_Clashes"]
+    ).round(2)
+    return df
+
+
+def return_open_sections(model, student, course):
+    sections = model.course_sections[course]
+    fits = (model.load[sections] < model.capacity[sections]) & (
+        (model.section_mask[sections] & model.busy[student]) == 0
+    )
+    return sections[fits]
+
+
+def choose_section(model, student, sections):
+    return min(
+        sections,
+        key=lambda section: (
+            model.return_conflict_count(student, section),
+            model.load[section] / model.capacity[section],
+            section,
+        ),
+    )
+
+
+def repair(model, student, request):
+    """
+    Places request by moving exactly one of the student's other (unlocked)
+    courses to another section of that course. Returns whether it worked.
+    """
+    sections = model.course_sections[model.request_course[request]]
+    sections = sections[model.load[sections] < model.capacity[sections]]
+    busy = int(model.busy[student])
+    for section in sorted(sections, key=lambda section: model.load[section] / model.capacity[section]):
+        mask = int(model.section_mask[section])
+        blockers = [
+            other
+            for other in model.student_requests[student]
+            if model.assignment[other] != UNASSIGNED and int(model.section_mask[model.assignment[other]]) & mask
+        ]
+        if len(blockers) != 1 or model.locked[blockers[0]]:
+            continue
+        blocker = blockers[0]
+        blocker_section = model.assignment[blocker]
+        busy_after = (busy & ~int(model.section_mask[blocker_section])) | mask
+        alternatives = [
+            other_section
+            for other_section in model.course_sections[model.request_course[blocker]]
+            if other_section != blocker_section
+            and model.load[other_section] < model.capacity[other_section]
+            and not busy_after & int(model.section_mask[other_section])
+        ]
+        if alternatives:
+            model.unassign(blocker)
+            model.assign(request, section)
+            model.assign(blocker, choose_section(model, student, alternatives))
+            return True
+    return False
+
+
+def return_unscheduled_reason(model, student, request):
+    course = model.request_course[request]
+    sections = model.course_sections[course]
+    if not len(sections):
+        return "Course not in master schedule"
+    open_sections = sections[model.load[sections] < model.capacity[sections]]
+    if not len(open_sections):
+        return f"All {len(sections)} section(s) full"
+    open_mask = int(np.bitwise_or.reduce(model.section_mask[open_sections]))
+    clashing_courses = sorted(
+        {
+            model.courses[model.request_course[other]]
+            for other in model.student_requests[student]
+            if model.assignment[other] != UNASSIGNED and int(model.section_mask[model.assignment[other]]) & open_mask
+        }
+    )
+    full = len(sections) - len(open_sections)
+    reason = f"Time conflict with {', '.join(clashing_courses)}"
+    if full:
+        reason += f" ({full} of {len(sections)} section(s) full)"
+    return reason
+
+
+def place_student(model, student, reasons):
+    """Places the student's unscheduled requests, fewest fitting sections
+    first; reasons gets {request: why} for those that cannot be placed."""
+    pending = [request for request in model.student_requests[student] if model.assignment[request] == UNASSIGNED]
+    while pending:
+        best_request, best_sections = None, None
+        for request in pending:
+            sections = return_open_sections(model, student, model.request_course[request])
+            if best_sections is None or len(sections) < len(best_sections):
+                best_request, best_sections = request, sections
+                if not len(sections):
+                    break
+        pending.remove(best_request)
+        if len(best_sections):
+            model.assign(best_request, choose_section(model, student, best_sections))
+            reasons.pop(best_request, None)
+        elif repair(model, student, best_request):
+            reasons.pop(best_request, None)
+        else:
+            reasons[best_request] = return_unscheduled_reason(model, student, best_request)
+
+
+@functools.lru_cache(maxsize=GAPS_CACHE_SIZE)
+def return_gaps(busy):
+    """Empty periods between a student's first and last class, summed over
+    the days of the week."""
+    gaps = 0
+    for day_mask in DAY_MASKS:
+        day_busy = busy & day_mask
+        if day_busy:
+            first = (day_busy & -day_busy).bit_length()
+            span = (day_busy.bit_length() - first) // len(DAYS) + 1
+            gaps += span - day_busy.bit_count()
+    return gaps
+
+
+def return_move_gains(model, pass_name, request, sections):
+    """
+    How much moving request to each of sections improves pass_name's
+    objective; 0 or less where the move is not allowed or does not help.
+    Every pass keeps the student's schedule valid and never adds conflict
+    partners, and balance and compact do not undo each other: a balancing
+    move may not add gaps, a compacting one may not unbalance by more than
+    COMPACT_BALANCE_SLACK.
+    """
+    gains = np.zeros(len(sections))
+    current = model.assignment[request]
+    if current == UNASSIGNED or model.locked[request]:
+        return gains
+    student = model.request_student[request]
+    current_mask = model.section_mask[current]
+    allowed = (
+        (sections != current)
+        & (model.load[sections] < model.capacity[sections])
+        & ((model.section_mask[sections] & (model.busy[student] & ~current_mask)) == 0)
+    )
+    conflicts_gain = np.zeros(len(sections))
+    if model.conflict_partners[student]:
+        current_conflicts = model.return_conflict_count(student, current)
+        conflicts_gain = np.array(
+            [current_conflicts - model.return_conflict_count(student, section) for section in sections]
+        )
+        allowed &= conflicts_gain >= 0
+    current_fill = model.load[current] / model.capacity[current]
+    new_fill = (model.load[sections] + 1) / model.capacity[sections]
+
+    if pass_name == "balance":
+        gains = current_fill - new_fill
+        allowed &= gains > 0
+    elif pass_name == "compact":
+        allowed &= new_fill <= current_fill + COMPACT_BALANCE_SLACK
+    elif pass_name == "resolve_conflicts":
+        gains = conflicts_gain
+    else:
+        raise ValueError(f"Unknown pass {pass_name}")
+
+    if pass_name in ("balance", "compact") and allowed.any():
+        busy = int(model.busy[student])
+        freed_busy = busy & ~int(current_mask)
+        gaps = return_gaps(busy)
+        gaps_gain = np.array(
+            [
+                gaps - return_gaps(freed_busy | int(model.section_mask[section])) if is_allowed else 0
+                for section, is_allowed in zip(sections, allowed)
+            ]
+        )
+        if pass_name == "balance":
+            allowed &= gaps_gain >= 0
+        else:
+            gains = gaps_gain
+    return np.where(allowed, gains, 0)
+
+
+def return_move_gain(model, pass_name, request, section):
+    return return_move_gains(model, pass_name, request, np.array([section]))[0]
+
+
+def return_candidate_requests(model, pass_name, course):
+    requests = model.course_requests[course]
+    requests = requests[(model.assignment[requests] != UNASSIGNED) & ~model.locked[requests]]
+    if pass_name == "balance":
+        ## fullest sections first, skipping sections no move could lighten
+        sections = model.assignment[requests]
+        fill = model.load[sections] / model.capacity[sections]
+        course_sections = model.course_sections[course]
+        lowest_new_fill = ((model.load[course_sections] + 1) / model.capacity[course_sections]).min()
+        requests, fill = requests[fill > lowest_new_fill], fill[fill > lowest_new_fill]
+        return requests[np.argsort(-fill, kind="stable")]
+    if pass_name == "compact":
+        return [request for request in requests if return_gaps(int(model.busy[model.request_student[request]]))]
+    if pass_name == "resolve_conflicts":
+        return [
+            request
+            for request in requests
+            if model.return_conflict_count(model.request_student[request], model.assignment[request])
+        ]
+    raise ValueError(f"Unknown pass {pass_name}")
+
+
+def propose_moves(model, pass_name, courses):
+    """
+    Runs pass_name over courses on model, applying each improving move as it
+    is found. Returns the moves as (request, from_section, to_section).
+    """
+    moves = []
+    for course in courses:
+        sections = model.course_sections[course]
+        for request in return_candidate_requests(model, pass_name, course):
+            gains = return_move_gains(model, pass_name, request, sections)
+            best = int(np.argmax(gains))
+            if gains[best] > 0:
+                from_section = model.assignment[request]
+                model.move(request, sections[best])
+                moves.append((int(request), int(from_section), int(sections[best])))
+    return moves
+
+
+def run_pass(model, pass_name, max_workers=1):
+    """Runs pass_name over every course with more than one section. Returns
+    the number of moves applied."""
+    courses = [course for course, sections in enumerate(model.course_sections) if len(sections) > 1]
+    if max_workers <= 1 or len(courses) < MIN_COURSES_FOR_POOL:
+        return len(propose_moves(model, pass_name, courses))
+
+    ## interleave so each worker gets some of the large courses
+    chunks = [courses[i::max_workers] for i in range(max_workers)]
+    executor = sharded_pdf.return_executor()
+    futures = [executor.submit(propose_moves, model, pass_name, chunk) for chunk in chunks]
+    num_of_moves = 0
+    for future in futures:
+        for request, from_section, to_section in future.result():
+            if model.assignment[request] == from_section and return_move_gain(model, pass_name, request, to_section) > 0:
+                model.move(request, to_section)
+                num_of_moves += 1
+    return num_of_moves
+
+
+def refill(model, reasons):
+    """Retries the unscheduled requests; optimization may have opened seats
+    or times. Returns the number placed."""
+    num_of_unscheduled = len(reasons)
+    students = sorted({model.request_student[request] for request in reasons})
+    for student in students:
+        place_student(model, student, reasons)
+    return num_of_unscheduled - len(reasons)
+
+
+def return_conflict_pairs_sharing(model):
+    """Conflict pairs (a, b), a < b, who share at least one section."""
+    pairs = set()
+    for members in model.section_members:
+        for student in members:
+            for partner in model.conflict_partners[student] & members:
+                if student < partner:
+                    pairs.add((student, partner))
+    return pairs
+
+
+def schedule_students(
+    requests_df,
+    master_schedule_df,
+    locked_df=None,
+    conflicts_df=None,
+    max_workers=1,
+    rounds=OPTIMIZATION_ROUNDS,
+):
+    """
+    Runs every phase and returns a dict with the model and what the reports
+    need: lock_errors_df, fixed_time_courses_df, clashes_df, difficulty_df,
+    reasons ({request: why unscheduled}), passes_df (moves and seconds per
+    pass), conflict_pairs_at_placement and timings (seconds per phase).
+    """
+    timings = {}
+    start = time.perf_counter()
+    valid_locks_df, lock_errors_df = validate_locks(locked_df, master_schedule_df)
+    model = ScheduleModel(
+        return_requests_with_locks(requests_df, valid_locks_df), master_schedule_df, conflicts_df
+    )
+    lock_errors_df = pd.concat([lock_errors_df, place_locks(model, valid_locks_df)], ignore_index=True)
+    fixed_time_courses_df = return_fixed_time_courses_df(model)
+    clashes_df = return_clashes_df(model, fixed_time_courses_df)
+    difficulty_df = return_difficulty_df(model, clashes_df)
+    timings["constraint_processing"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reasons = {}
+    ## hardest first; ties keep Student_ID order
+    for student in np.argsort(-difficulty_df["Difficulty"].to_numpy(), kind="stable"):
+        place_student(model, student, reasons)
+    conflict_pairs_at_placement = return_conflict_pairs_sharing(model)
+    timings["initial_assignment"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    passes = []
+    for round_num in range(1, rounds + 1):
+        for pass_name in PASSES + ["refill"]:
+            pass_start = time.perf_counter()
+            if pass_name == "refill":
+                num_of_moves = refill(model, reasons)
+            else:
+                num_of_moves = run_pass(model, pass_name, max_workers)
+            passes.append(
+                {
+                    "Round": round_num,
+                    "Pass": pass_name,
+                    "Moves": num_of_moves,
+                    "Seconds": round(time.perf_counter() - pass_start, 3),
+                }
+            )
+    timings["optimization"] = time.perf_counter() - start
+
+    return {
+        "model": model,
+        "lock_errors_df": lock_errors_df,
+        "fixed_time_courses_df": fixed_time_courses_df,
+        "clashes_df": clashes_df,
+        "difficulty_df": difficulty_df,
+        "reasons": reasons,
+        "passes_df": pd.DataFrame(passes, columns=["Round", "Pass", "Moves", "Seconds"]),
+        "conflict_pairs_at_placement": conflict_pairs_at_placement,
+        "timings": timings,
+    }
@@ -0,0 +1,118 @@
+"""
+Student Scheduling Engine
+
+Entry point for the schedule engine (see prompt.md): reads the uploaded
+requests, master schedule, locked assignments, conflict list and optional
+time constraints, runs the engine and returns the reports as one workbook.
+
+    python -m app.scripts.programming.schedule_engine.main requests.xlsx master_schedule.xlsx
+"""
+
+import argparse
+import os
+from io import BytesIO
+
+import pandas as pd
+
+import app.scripts.programming.schedule_engine.engine as engine
+import app.scripts.programming.schedule_engine.reports as reports
+
+
+def return_df_from_upload(f, filename=None):
+    """Frame from an uploaded (or local) .csv or Excel file; None when no
+    file was given."""
+    filename = filename or getattr(f, "filename", None) or (f if isinstance(f, str) else "")
+    if not filename:
+        return None
+    if str(filename).lower().endswith(".csv"):
+        return pd.read_csv(f, dtype={"Cycle_Day": str, "Section": str})
+    return pd.read_excel(f, dtype={"Cycle_Day": str, "Section": str})
+
+
+def return_schedule_results(
+    requests_df,
+    master_schedule_df,
+    locked_df=None,
+    conflicts_df=None,
+    time_constraints_df=None,
+    max_workers=1,
+):
+    """Runs the engine and returns {sheet name: frame} for every report."""
+    results = engine.schedule_students(
+        requests_df, master_schedule_df, locked_df, conflicts_df, max_workers=max_workers
+    )
+    model = results["model"]
+    grades = reports.return_grades(model, requests_df)
+    clashes_df = results["clashes_df"].drop(columns=["course", "other_course"])
+    return {
+        "Assignments": reports.return_assignment_df(model),
+        "Errors": results["lock_errors_df"],
+        "Statistics": reports.return_summary_df(model, results),
+        "Grades": reports.return_grade_breakdown_df(model, grades),
+        "Courses": reports.return_course_utilization_df(model, results),
+        "Sections": reports.return_sections_df(model),
+        "Singletons": results["fixed_time_courses_df"].drop(columns=["course"]),
+        "Clashes": clashes_df,
+        "Competition": reports.return_competition_df(model),
+        "Recommendations": reports.return_recommendations_df(model, results, grades, time_constraints_df),
+        "Problematic Students": reports.return_problematic_students_df(model, results, grades),
+        "Passes": results["passes_df"],
+    }
+
+
+def return_workbook(schedule_results):
+    f = BytesIO()
+    writer = pd.ExcelWriter(f)
+    for sheet_name, df in schedule_results.items():
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+    writer.close()
+    f.seek(0)
+    return f
+
+
+def main(form, request):
+    files = {
+        field: request.files.get(getattr(form, field).name)
+        for field in [
+            "requests_file",
+            "master_schedule_file",
+            "locked_file",
+            "conflicts_file",
+            "time_constraints_file",
+        ]
+    }
+    dfs = {field: return_df_from_upload(f) if f else None for field, f in files.items()}
+    schedule_results = return_schedule_results(
+        dfs["requests_file"],
+        dfs["master_schedule_file"],
+        dfs["locked_file"],
+        dfs["conflicts_file"],
+        dfs["time_constraints_file"],
+        max_workers=form.max_workers.data or 1,
+    )
+    return return_workbook(schedule_results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("requests")
+    parser.add_argument("master_schedule")
+    parser.add_argument("--locked")
+    parser.add_argument("--conflicts")
+    parser.add_argument("--time-constraints")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", default="schedule_engine_output.xlsx")
+    args = parser.parse_args()
+
+    schedule_results = return_schedule_results(
+        return_df_from_upload(args.requests),
+        return_df_from_upload(args.master_schedule),
+        return_df_from_upload(args.locked) if args.locked else None,
+        return_df_from_upload(args.conflicts) if args.conflicts else None,
+        return_df_from_upload(args.time_constraints) if args.time_constraints else None,
+        max_workers=args.workers,
+    )
+    print(schedule_results["Statistics"].to_string(index=False))
+    with open(args.output, "wb") as f:
+        f.write(return_workbook(schedule_results).getvalue())
+    print(f"Wrote {os.path.abspath(args.output)}")
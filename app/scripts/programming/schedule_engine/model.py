@@ -0,0 +1,200 @@
+"""
+Schedule Model
+
+Integer-indexed state for the schedule engine. Students, courses, sections
+and requests are numbered once when the model is built, and everything the
+placement and optimization passes touch is an array indexed by those numbers:
+
+- section_mask: the period/day slots a section meets, one bit per slot
+  ((period - 1) * 5 + day, MTWRF), as uint64
+- busy: the slots each student is already scheduled in, same layout, so a
+  time-conflict check is busy[student] & section_mask[section]
+- load / capacity: seats taken and offered per section, updated on every
+  assign and unassign rather than recounted
+- assignment: the section of each request, -1 while unscheduled
+
+A section that meets in several periods (a double period) has one row per
+period in the master schedule; its rows are combined into one mask.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sparse
+
+DAYS = "MTWRF"
+MAX_PERIODS = 12
+UNASSIGNED = -1
+
+
+def return_cycle_day(cycle_day):
+    """Cycle_Day as a 5-character 0/1 string; Excel drops the leading zeros
+    of "01010" unless the cell was text, and some exports quote it."""
+    cycle_day = str(cycle_day).strip().strip("'").split(".")[0]
+    if not cycle_day or cycle_day == "nan":
+        return "1" * len(DAYS)
+    return cycle_day.zfill(len(DAYS))[-len(DAYS):]
+
+
+def return_slot_mask(period, cycle_day):
+    period = int(period)
+    if not 1 <= period <= MAX_PERIODS:
+        raise ValueError(f"Period {period} is outside 1-{MAX_PERIODS}")
+    mask = 0
+    for day, meets in enumerate(return_cycle_day(cycle_day)):
+        if meets == "1":
+            mask |= 1 << ((period - 1) * len(DAYS) + day)
+    return mask
+
+
+def return_mask_periods(mask):
+    """Periods with at least one slot in mask."""
+    mask = int(mask)
+    return [
+        period
+        for period in range(1, MAX_PERIODS + 1)
+        if (mask >> ((period - 1) * len(DAYS))) & 0b11111
+    ]
+
+
+def return_mask_description(mask):
+    """e.g. "P3 MTWRF" or "P2 MWF, P3 TR" """
+    mask = int(mask)
+    descriptions = []
+    for period in return_mask_periods(mask):
+        day_bits = (mask >> ((period - 1) * len(DAYS))) & 0b11111
+        days = "".join(day for i, day in enumerate(DAYS) if day_bits >> i & 1)
+        descriptions.append(f"P{period} {days}")
+    return ", ".join(descriptions)
+
+
+def return_section_key(Course_Code, Section):
+    return f"{Course_Code}-{Section}"
+
+
+def normalize_section(Section):
+    """Sections compare as strings; 1, 1.0 and "1" are the same section."""
+    if isinstance(Section, float) and Section.is_integer():
+        Section = int(Section)
+    return str(Section).strip()
+
+
+class ScheduleModel:
+    def __init__(self, requests_df, master_schedule_df, conflicts_df=None):
+        requests_df = requests_df[["Student_ID", "Course_Code"]].drop_duplicates()
+        master_schedule_df = master_schedule_df.copy()
+        master_schedule_df["Section"] = master_schedule_df["Section"].apply(normalize_section)
+        master_schedule_df["Period"] = pd.to_numeric(master_schedule_df["Period"])
+        master_schedule_df["Capacity"] = pd.to_numeric(master_schedule_df["Capacity"])
+        master_schedule_df["Slot_Mask"] = [
+            return_slot_mask(period, cycle_day)
+            for period, cycle_day in zip(master_schedule_df["Period"], master_schedule_df["Cycle_Day"])
+        ]
+
+        self.students = sorted(requests_df["Student_ID"].unique().tolist())
+        self.student_index = {Student_ID: i for i, Student_ID in enumerate(self.students)}
+        self.courses = sorted(
+            set(requests_df["Course_Code"]) | set(master_schedule_df["Course_Code"])
+        )
+        self.course_index = {Course_Code: i for i, Course_Code in enumerate(self.courses)}
+
+        ## one section per Course_Code/Section, however many periods it meets
+        sections_df = (
+            master_schedule_df.groupby(["Course_Code", "Section"], sort=True)
+            .agg(
+                Teacher=("Teacher", "first"),
+                Room=("Room", "first"),
+                Capacity=("Capacity", "min"),
+                Period=("Period", "min"),
+                Cycle_Day=("Cycle_Day", "first"),
+                Slot_Mask=("Slot_Mask", lambda masks: np.bitwise_or.reduce(masks.to_numpy(dtype=np.uint64))),
+            )
+            .reset_index()
+        )
+        sections_df["Cycle_Day"] = sections_df["Cycle_Day"].apply(return_cycle_day)
+        self.sections_df = sections_df
+        self.section_index = {
+            (Course_Code, Section): i
+            for i, (Course_Code, Section) in enumerate(zip(sections_df["Course_Code"], sections_df["Section"]))
+        }
+        self.section_course = sections_df["Course_Code"].map(self.course_index).to_numpy(dtype=np.int64)
+        self.section_mask = sections_df["Slot_Mask"].to_numpy(dtype=np.uint64)
+        self.capacity = sections_df["Capacity"].to_numpy(dtype=np.int64)
+        self.load = np.zeros(len(sections_df), dtype=np.int64)
+        self.section_members = [set() for _ in range(len(sections_df))]
+        self.course_sections = [np.zeros(0, dtype=np.int64) for _ in self.courses]
+        for course, sections in sections_df.groupby("Course_Code").groups.items():
+            self.course_sections[self.course_index[course]] = np.asarray(sections, dtype=np.int64)
+
+        self.request_student = requests_df["Student_ID"].map(self.student_index).to_numpy(dtype=np.int64)
+        self.request_course = requests_df["Course_Code"].map(self.course_index).to_numpy(dtype=np.int64)
+        self.assignment = np.full(len(requests_df), UNASSIGNED, dtype=np.int64)
+        self.locked = np.zeros(len(requests_df), dtype=bool)
+        self.busy = np.zeros(len(self.students), dtype=np.uint64)
+        self.student_requests = [[] for _ in self.students]
+        for request, student in enumerate(self.request_student):
+            self.student_requests[student].append(request)
+        self.course_requests = [np.zeros(0, dtype=np.int64) for _ in self.courses]
+        order = np.argsort(self.request_course, kind="stable")
+        courses, starts = np.unique(self.request_course[order], return_index=True)
+        for course, requests in zip(courses, np.split(order, starts[1:])):
+            self.course_requests[course] = requests
+        self.request_by_student_course = {
+            (int(student), int(course)): request
+            for request, (student, course) in enumerate(zip(self.request_student, self.request_course))
+        }
+
+        self.conflict_partners = [set() for _ in self.students]
+        if conflicts_df is not None:
+            for Student_A, Student_B in zip(conflicts_df["Student_A"], conflicts_df["Student_B"]):
+                a, b = self.student_index.get(Student_A), self.student_index.get(Student_B)
+                if a is not None and b is not None and a != b:
+                    self.conflict_partners[a].add(b)
+                    self.conflict_partners[b].add(a)
+
+    @property
+    def num_of_requests(self):
+        return len(self.assignment)
+
+    def return_section_label(self, section):
+        row = self.sections_df.iloc[section]
+        return return_section_key(row["Course_Code"], row["Section"])
+
+    def fits(self, student, section, freed_mask=0):
+        """Open seat and no time conflict, ignoring the slots in freed_mask
+        (the section the student would be leaving)."""
+        busy = int(self.busy[student]) & ~int(freed_mask)
+        return self.load[section] < self.capacity[section] and not busy & int(self.section_mask[section])
+
+    def return_conflict_count(self, student, section):
+        """Conflict partners of student already in section."""
+        partners = self.conflict_partners[student]
+        if not partners:
+            return 0
+        return len(partners & self.section_members[section])
+
+    def assign(self, request, section):
+        student = self.request_student[request]
+        self.assignment[request] = section
+        self.busy[student] |= self.section_mask[section]
+        self.load[section] += 1
+        self.section_members[section].add(int(student))
+
+    def unassign(self, request):
+        section = self.assignment[request]
+        student = self.request_student[request]
+        self.assignment[request] = UNASSIGNED
+        self.busy[student] &= ~self.section_mask[section]
+        self.load[section] -= 1
+        self.section_members[section].discard(int(student))
+        return section
+
+    def move(self, request, section):
+        self.unassign(request)
+        self.assign(request, section)
+
+    def return_incidence_matrix(self):
+        """Sparse students x courses matrix of requests."""
+        return sparse.csr_matrix(
+            (np.ones(self.num_of_requests, dtype=np.int32), (self.request_student, self.request_course)),
+            shape=(len(self.students), len(self.courses)),
+        )
@@ -0,0 +1,508 @@
+"""
+Schedule Engine Reports
+
+Turns a finished engine run into the output frames listed in prompt.md:
+student assignments, lock errors, statistics (overall, by grade, by course
+and section), master schedule analysis with recommendations, and the
+students who could not be fully scheduled.
+
+Grade levels come from a Grade column on the requests when there is one.
+Otherwise they are inferred from each student's English course code, whose
+fifth character is the term of English (EES81QA is term 1, so grade 9;
+EES87QA is term 7, so grade 12).
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from app.scripts.programming.schedule_engine.engine import return_conflict_pairs_sharing
+from app.scripts.programming.schedule_engine.model import (
+    DAYS,
+    UNASSIGNED,
+    return_mask_periods,
+)
+
+## competition index (expected demand / seats) at which a period is flagged
+HIGH_COMPETITION_INDEX = 0.9
+## a course requested by this share of a grade is popular with it
+POPULAR_COURSE_SHARE = 0.25
+## fewest students a move or capacity recommendation must help
+MIN_STUDENTS_FOR_RECOMMENDATION = 5
+## seats per section to add before recommending a new section instead
+MAX_CAPACITY_INCREASE = 3
+
+
+def return_department(Course_Code):
+    return str(Course_Code)[:1]
+
+
+def return_grade_from_course_code(Course_Code):
+    Course_Code = str(Course_Code)
+    if Course_Code.startswith("E") and len(Course_Code) > 4 and Course_Code[4] in "12345678":
+        return 9 + (int(Course_Code[4]) - 1) // 2
+    return None
+
+
+def return_grades(model, requests_df):
+    """Grade per student, indexed like model.students; "Unknown" when it
+    cannot be inferred."""
+    if "Grade" in requests_df.columns:
+        grades = requests_df.drop_duplicates(subset=["Student_ID"]).set_index("Student_ID")["Grade"]
+        return pd.Series(model.students).map(grades).fillna("Unknown").tolist()
+
+    grades_df = pd.DataFrame(
+        {
+            "student": model.request_student,
+            "Grade": [return_grade_from_course_code(model.courses[course]) for course in model.request_course],
+        }
+    ).dropna()
+    grades = grades_df.groupby("student")["Grade"].agg(lambda x: int(x.mode().iloc[0]))
+    return [grades.get(student, "Unknown") for student in range(len(model.students))]
+
+
+def return_assignment_df(model):
+    sections = model.sections_df["Section"].to_numpy(dtype=object)
+    df = pd.DataFrame(
+        {
+            "Student_ID": np.asarray(model.students, dtype=object)[model.request_student],
+            "Course_Code": np.asarray(model.courses, dtype=object)[model.request_course],
+            "Section_Assignment": [
+                sections[section] if section != UNASSIGNED else "" for section in model.assignment
+            ],
+        }
+    )
+    return df.sort_values(by=["Student_ID", "Course_Code"], ignore_index=True)
+
+
+def return_sections_df(model):
+    df = model.sections_df[["Course_Code", "Section", "Teacher", "Room", "Period", "Cycle_Day", "Capacity"]].copy()
+    df["Enrolled"] = model.load
+    df["Utilization"] = (df["Enrolled"] / df["Capacity"]).round(3)
+    return df
+
+
+def return_course_utilization_df(model, results):
+    sections_df = return_sections_df(model)
+    unscheduled = pd.Series(
+        [model.courses[model.request_course[request]] for request in results["reasons"]], dtype=object
+    ).value_counts()
+    df = (
+        sections_df.groupby("Course_Code")
+        .agg(
+            Sections=("Section", "count"),
+            Capacity=("Capacity", "sum"),
+            Enrolled=("Enrolled", "sum"),
+            Section_Variance=("Enrolled", lambda x: x.var(ddof=0)),
+            Min_Section=("Enrolled", "min"),
+            Max_Section=("Enrolled", "max"),
+        )
+        .reindex(model.courses)
+    )
+    df["Requests"] = [len(requests) for requests in model.course_requests]
+    df["Unscheduled"] = unscheduled.reindex(df.index).fillna(0).astype(int)
+    df["Utilization"] = (df["Enrolled"] / df["Capacity"]).round(3)
+    df["Section_Variance"] = df["Section_Variance"].round(2)
+    df.insert(0, "Department", [return_department(course) for course in df.index])
+    df = df.reset_index(names="Course_Code")
+    return df[
+        [
+            "Course_Code",
+            "Department",
+            "Sections",
+            "Capacity",
+            "Requests",
+            "Enrolled",
+            "Unscheduled",
+            "Utilization",
+            "Section_Variance",
+            "Min_Section",
+            "Max_Section",
+        ]
+    ]
+
+
+def return_request_status_df(model, grades):
+    return pd.DataFrame(
+        {
+            "student": model.request_student,
+            "Grade": np.asarray(grades, dtype=object)[model.request_student],
+            "Scheduled": model.assignment != UNASSIGNED,
+        }
+    )
+
+
+def return_grade_breakdown_df(model, grades):
+    status_df = return_request_status_df(model, grades)
+    students_df = status_df.groupby("student").agg(Grade=("Grade", "first"), Complete=("Scheduled", "all"))
+    df = status_df.groupby("Grade").agg(Requests=("Scheduled", "size"), Scheduled=("Scheduled", "sum"))
+    df["Students"] = students_df.groupby("Grade").size()
+    df["Fully_Scheduled"] = students_df.groupby("Grade")["Complete"].sum()
+    df["Success_Rate"] = (100 * df["Scheduled"] / df["Requests"]).round(2)
+    df["Full_Schedule_Rate"] = (100 * df["Fully_Scheduled"] / df["Students"]).round(2)
+    df = df.reset_index()
+    return df[["Grade", "Students", "Requests", "Scheduled", "Success_Rate", "Fully_Scheduled", "Full_Schedule_Rate"]]
+
+
+def return_conflict_pairs_at_risk(model):
+    """Conflict pairs (a, b), a < b, who requested at least one course in
+    common, so could have been placed together."""
+    courses_by_student = [
+        {int(model.request_course[request]) for request in requests} for requests in model.student_requests
+    ]
+    return {
+        (student, partner)
+        for student, partners in enumerate(model.conflict_partners)
+        for partner in partners
+        if student < partner and courses_by_student[student] & courses_by_student[partner]
+    }
+
+
+def return_summary_df(model, results):
+    num_of_requests = model.num_of_requests
+    num_of_scheduled = int((model.assignment != UNASSIGNED).sum())
+    incomplete_students = {model.request_student[request] for request in results["reasons"]}
+    num_of_students = len(model.students)
+    fixed_types = results["fixed_time_courses_df"]["Type"].value_counts()
+
+    pairs_at_risk = return_conflict_pairs_at_risk(model)
+    pairs_sharing = return_conflict_pairs_sharing(model)
+    conflict_resolution_rate = (
+        100 * (len(pairs_at_risk) - len(pairs_sharing)) / len(pairs_at_risk) if pairs_at_risk else 100.0
+    )
+
+    rows = [
+        ("Students", num_of_students),
+        ("Course requests", num_of_requests),
+        ("Requests scheduled", num_of_scheduled),
+        ("Success rate (%)", round(100 * num_of_scheduled / num_of_requests, 2) if num_of_requests else 100.0),
+        ("Students fully scheduled", num_of_students - len(incomplete_students)),
+        (
+            "Full schedule rate (%)",
+            round(100 * (num_of_students - len(incomplete_students)) / num_of_students, 2) if num_of_students else 100.0,
+        ),
+        ("Locked assignments placed", int(model.locked.sum())),
+        ("Lock errors", len(results["lock_errors_df"])),
+        ("Singletons", int(fixed_types.get("Singleton", 0))),
+        ("Virtual singletons", int(fixed_types.get("Virtual Singleton", 0))),
+        ("Conflict pairs", sum(len(partners) for partners in model.conflict_partners) // 2),
+        ("Conflict pairs requesting a common course", len(pairs_at_risk)),
+        ("Conflict pairs sharing a section after placement", len(results["conflict_pairs_at_placement"])),
+        ("Conflict pairs sharing a section after optimization", len(pairs_sharing)),
+        ("Conflict resolution rate (%)", round(conflict_resolution_rate, 2)),
+    ]
+    rows.extend((f"Seconds: {phase}", round(seconds, 3)) for phase, seconds in results["timings"].items())
+    return pd.DataFrame(rows, columns=["Metric", "Value"], dtype=object)
+
+
+def return_period_demand_df(model):
+    """
+    Seats and expected demand per period and department. A course's requests
+    are spread over its sections in proportion to capacity, so demand in a
+    period is the requests that period's sections are expected to carry.
+    """
+    rows = []
+    for course, sections in enumerate(model.course_sections):
+        if not len(sections):
+            continue
+        capacity = model.capacity[sections]
+        shares = len(model.course_requests[course]) * capacity / capacity.sum()
+        for section, seats, demand in zip(sections, capacity, shares):
+            for period in return_mask_periods(model.section_mask[section]):
+                rows.append((return_department(model.courses[course]), period, seats, demand, course))
+    return pd.DataFrame(rows, columns=["Department", "Period", "Seats", "Demand", "course"])
+
+
+def return_competition_df(model):
+    """Competition index (expected demand / seats) per period, overall and
+    per department, with the periods at or above HIGH_COMPETITION_INDEX
+    flagged."""
+    demand_df = return_period_demand_df(model)
+    overall_df = demand_df.groupby("Period").agg(
+        Seats=("Seats", "sum"), Demand=("Demand", "sum"), Courses=("course", "nunique")
+    )
+    overall_df.insert(0, "Department", "All")
+    department_df = demand_df.groupby(["Department", "Period"]).agg(
+        Seats=("Seats", "sum"), Demand=("Demand", "sum"), Courses=("course", "nunique")
+    )
+    df = pd.concat([overall_df.reset_index(), department_df.reset_index()], ignore_index=True)
+    df["Demand"] = df["Demand"].round(1)
+    df["Competition_Index"] = (df["Demand"] / df["Seats"]).round(3)
+    df["High_Competition"] = df["Competition_Index"] >= HIGH_COMPETITION_INDEX
+    return df[["Department", "Period", "Courses", "Seats", "Demand", "Competition_Index", "High_Competition"]]
+
+
+def return_time_constraints(time_constraints_df):
+    """{Course_Code: (allowed periods or None, allowed day letters or None)}.
+    Allowed_Periods is a list such as "1,2,3"; Allowed_Days is MTWRF letters
+    or a 0/1 Cycle_Day string."""
+    time_constraints = {}
+    if time_constraints_df is None:
+        return time_constraints
+    for Course_Code, Allowed_Periods, Allowed_Days in time_constraints_df[
+        ["Course_Code", "Allowed_Periods", "Allowed_Days"]
+    ].itertuples(index=False):
+        periods = None
+        if pd.notna(Allowed_Periods) and str(Allowed_Periods).strip():
+            periods = {int(float(period)) for period in str(Allowed_Periods).replace(";", ",").split(",") if period.strip()}
+        days = None
+        if pd.notna(Allowed_Days) and str(Allowed_Days).strip():
+            days = str(Allowed_Days).strip().upper()
+            if set(days) <= {"0", "1"}:
+                days = "".join(day for day, meets in zip(DAYS, days.zfill(len(DAYS))) if meets == "1")
+        time_constraints[Course_Code] = (periods, days)
+    return time_constraints
+
+
+def return_clash_students(model, incidence, course, mask):
+    """Students requesting course who also request a course whose every
+    section overlaps mask."""
+    students = incidence.indices[incidence.indptr[course] : incidence.indptr[course + 1]]
+    clashing = []
+    for other, sections in enumerate(model.course_sections):
+        if other == course or not len(sections) or not (model.section_mask[sections] & mask).all():
+            continue
+        other_students = incidence.indices[incidence.indptr[other] : incidence.indptr[other + 1]]
+        clashing.append(np.intersect1d(students, other_students, assume_unique=True))
+    return np.unique(np.concatenate(clashing)) if clashing else np.zeros(0, dtype=np.int64)
+
+
+def return_move_recommendations(model, results, time_constraints):
+    """For each single-period singleton or virtual singleton with clashes,
+    the period that would clash with the fewest of its students."""
+    clashes_df = results["clashes_df"]
+    if clashes_df.empty:
+        return []
+    incidence = model.return_incidence_matrix().tocsc()
+    periods = sorted(set(model.sections_df["Period"].astype(int)))
+    rows = []
+    for course in clashes_df["course"].unique():
+        mask = int(model.section_mask[model.course_sections[course][0]])
+        mask_periods = return_mask_periods(mask)
+        if len(mask_periods) != 1:
+            continue
+        current_period = mask_periods[0]
+        day_bits = mask >> ((current_period - 1) * len(DAYS))
+        Course_Code = model.courses[course]
+        allowed_periods = time_constraints.get(Course_Code, (None, None))[0]
+
+        current = len(return_clash_students(model, incidence, course, np.uint64(mask)))
+        best_period, best = None, current
+        for period in periods:
+            if period == current_period or (allowed_periods and period not in allowed_periods):
+                continue
+            num_of_students = len(
+                return_clash_students(model, incidence, course, np.uint64(day_bits << ((period - 1) * len(DAYS))))
+            )
+            if num_of_students < best:
+                best_period, best = period, num_of_students
+        if best_period is not None and current - best >= MIN_STUDENTS_FOR_RECOMMENDATION:
+            rows.append(
+                {
+                    "Type": "Move",
+                    "Course_Code": Course_Code,
+                    "Period": current_period,
+                    "Students_Affected": current - best,
+                    "Recommendation": (
+                        f"Move {Course_Code} from Period {current_period} to Period {best_period} "
+                        f"to reduce conflicts ({current} -> {best} students with a clash)"
+                    ),
+                }
+            )
+    return rows
+
+
+def return_capacity_recommendations(model, results):
+    full_df = pd.DataFrame(
+        [
+            (model.courses[model.request_course[request]], reason)
+            for request, reason in results["reasons"].items()
+            if reason.startswith("All ") or reason == "Course not in master schedule"
+        ],
+        columns=["Course_Code", "Reason"],
+    )
+    rows = []
+    for (Course_Code, reason), num_of_students in full_df.value_counts().items():
+        if num_of_students < MIN_STUDENTS_FOR_RECOMMENDATION and reason.startswith("All "):
+            continue
+        sections = model.course_sections[model.course_index[Course_Code]]
+        if not len(sections):
+            recommendation = f"Add section of {Course_Code}: {num_of_students} requests and no sections offered"
+        elif num_of_students <= MAX_CAPACITY_INCREASE * len(sections):
+            seats = math.ceil(num_of_students / len(sections))
+            recommendation = (
+                f"Increase capacity of existing sections of {Course_Code} by {seats} "
+                f"({num_of_students} students unscheduled with all sections full)"
+            )
+        else:
+            num_of_new_sections = math.ceil(num_of_students / model.capacity[sections].mean())
+            recommendation = (
+                f"Add {num_of_new_sections} section(s) of {Course_Code} "
+                f"({num_of_students} students unscheduled with all sections full)"
+            )
+        rows.append(
+            {
+                "Type": "Capacity",
+                "Course_Code": Course_Code,
+                "Period": None,
+                "Students_Affected": int(num_of_students),
+                "Recommendation": recommendation,
+            }
+        )
+    return rows
+
+
+def return_general_recommendations(model, results, grades):
+    rows = []
+    competition_df = return_competition_df(model)
+    for Period, Competition_Index, Courses in competition_df[
+        (competition_df["Department"] == "All") & competition_df["High_Competition"]
+    ][["Period", "Competition_Index", "Courses"]].itertuples(index=False):
+        rows.append(
+            {
+                "Type": "General",
+                "Course_Code": None,
+                "Period": Period,
+                "Students_Affected": None,
+                "Recommendation": (
+                    f"Period {Period} has high demand for its offerings "
+                    f"(competition index {Competition_Index:.2f} across {Courses} courses)"
+                ),
+            }
+        )
+
+    ## popular courses a grade can only take in the same period
+    status_df = return_request_status_df(model, grades)
+    status_df["course"] = model.request_course
+    fixed_df = results["fixed_time_courses_df"]
+    fixed_periods = {
+        course: return_mask_periods(model.section_mask[model.course_sections[course][0]])
+        for course in fixed_df["course"]
+    }
+    for Grade, grade_df in status_df.groupby("Grade"):
+        num_of_students = grade_df["student"].nunique()
+        requests = grade_df["course"].value_counts()
+        popular = requests[requests >= POPULAR_COURSE_SHARE * num_of_students].index
+        courses_by_period = {}
+        for course in popular:
+            for period in fixed_periods.get(course, []):
+                courses_by_period.setdefault(period, []).append(model.courses[course])
+        for period, courses in sorted(courses_by_period.items()):
+            if len(courses) > 1:
+                rows.append(
+                    {
+                        "Type": "General",
+                        "Course_Code": ", ".join(sorted(courses)),
+                        "Period": period,
+                        "Students_Affected": int(requests[[model.course_index[course] for course in courses]].sum()),
+                        "Recommendation": (
+                            f"Grade {Grade} has too many popular courses in Period {period} "
+                            f"({', '.join(sorted(courses))} are only offered then)"
+                        ),
+                    }
+                )
+
+    cross_df = results["clashes_df"][results["clashes_df"]["Cross_Department"]]
+    for row in cross_df.head(10).itertuples(index=False):
+        if row.Students_Affected < MIN_STUDENTS_FOR_RECOMMENDATION:
+            break
+        rows.append(
+            {
+                "Type": "Cross-Department",
+                "Course_Code": f"{row.Course_Code}, {row.Clashing_Course}",
+                "Period": None,
+                "Students_Affected": row.Students_Affected,
+                "Recommendation": (
+                    f"{row.Course_Code} ({row.Type}, {row.Time}) clashes with every section of "
+                    f"{row.Clashing_Course} for {row.Students_Affected} students"
+                ),
+            }
+        )
+    return rows
+
+
+def return_time_constraint_violations(model, time_constraints):
+    rows = []
+    for Course_Code, (allowed_periods, allowed_days) in time_constraints.items():
+        course = model.course_index.get(Course_Code)
+        if course is None:
+            continue
+        for section in model.course_sections[course]:
+            row = model.sections_df.iloc[section]
+            periods = return_mask_periods(model.section_mask[section])
+            days = "".join(day for day, meets in zip(DAYS, row["Cycle_Day"]) if meets == "1")
+            outside_periods = allowed_periods and not set(periods) <= allowed_periods
+            outside_days = allowed_days and not set(days) <= set(allowed_days)
+            if outside_periods or outside_days:
+                rows.append(
+                    {
+                        "Type": "Time Constraint",
+                        "Course_Code": Course_Code,
+                        "Period": periods[0],
+                        "Students_Affected": int(model.load[section]),
+                        "Recommendation": (
+                            f"{Course_Code}-{row['Section']} meets {', '.join(f'P{period}' for period in periods)} "
+                            f"{days} outside its allowed times"
+                        ),
+                    }
+                )
+    return rows
+
+
+def return_recommendations_df(model, results, grades, time_constraints_df=None):
+    time_constraints = return_time_constraints(time_constraints_df)
+    rows = (
+        return_general_recommendations(model, results, grades)
+        + return_move_recommendations(model, results, time_constraints)
+        + return_capacity_recommendations(model, results)
+        + return_time_constraint_violations(model, time_constraints)
+    )
+    return pd.DataFrame(rows, columns=["Type", "Course_Code", "Period", "Students_Affected", "Recommendation"])
+
+
+def return_problematic_students_df(model, results, grades):
+    """Students with an unscheduled request or a conflict partner in one of
+    their sections, most unscheduled courses first."""
+    unscheduled = {}
+    for request, reason in results["reasons"].items():
+        unscheduled.setdefault(model.request_student[request], []).append(
+            (model.courses[model.request_course[request]], reason)
+        )
+    conflicts = {}
+    for student, partner in return_conflict_pairs_sharing(model):
+        conflicts[student] = conflicts.get(student, 0) + 1
+        conflicts[partner] = conflicts.get(partner, 0) + 1
+
+    difficulty_df = results["difficulty_df"]
+    rows = []
+    for student in sorted(set(unscheduled) | set(conflicts)):
+        courses = sorted(unscheduled.get(student, []))
+        rows.append(
+            {
+                "Student_ID": model.students[student],
+                "Grade": grades[student],
+                "Difficulty": difficulty_df["Difficulty"].iat[student],
+                "Requests": len(model.student_requests[student]),
+                "Unscheduled": len(courses),
+                "Unscheduled_Courses": ", ".join(course for course, _ in courses),
+                "Reasons": "; ".join(f"{course}: {reason}" for course, reason in courses),
+                "Singleton_Clashes": difficulty_df["Singleton_Clashes"].iat[student],
+                "Conflicts_Sharing_Section": conflicts.get(student, 0),
+            }
+        )
+    cols = [
+        "Student_ID",
+        "Grade",
+        "Difficulty",
+        "Requests",
+        "Unscheduled",
+        "Unscheduled_Courses",
+        "Reasons",
+        "Singleton_Clashes",
+        "Conflicts_Sharing_Section",
+    ]
+    df = pd.DataFrame(rows, columns=cols)
+    return df.sort_values(
+        by=["Unscheduled", "Conflicts_Sharing_Section", "Difficulty"], ascending=False, ignore_index=True
+    )
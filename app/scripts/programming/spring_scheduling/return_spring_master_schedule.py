@@ -1,6 +1,6 @@
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 import os
 from io import BytesIO
@@ -9,6 +9,7 @@ from flask import current_app, session
 
 def main():
 
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
@@ -4,7 +4,7 @@ from io import BytesIO
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 credit_areas = [
     "Total Credits earned",
@@ -74,6 +74,7 @@ def return_spreadsheet(processed_1_68_df):
 
 
 def process_1_68():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
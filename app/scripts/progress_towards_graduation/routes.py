@@ -10,7 +10,7 @@ from werkzeug.utils import secure_filename
 import app.scripts.utils as utils
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.progress_towards_graduation.forms import PlaceholderForm
 
@@ -39,6 +39,7 @@ def return_progress_towards_graduation_reports():
 
 @scripts.route("/progress_towards_graduation/<report_function>", methods=['GET','POST'])
 def return_progress_towards_graduation_report(report_function):
+    files_df = utils.return_files_df()
     if request.method == 'GET':
         flash(f"Resubmit form to run {report_function}", category="warning")
         return redirect(url_for('scripts.return_progress_towards_graduation_reports'))
@@ -0,0 +1,143 @@
+"""
+Report Registry
+
+In-memory index of the reports saved under app/data/<year-sem>/<report>/.
+Replaces the per-lookup glob in utils.return_most_recent_report* with
+dictionary lookups keyed by report and (report, year_and_semester).
+
+The index is rebuilt when it is explicitly invalidated (after an upload or a
+Jupiter SFTP pull) or when the modification time of any data directory
+changes, checked at most once every POLL_INTERVAL seconds.
+"""
+
+import os
+import threading
+import time
+
+DATA_DIRECTORY = "app/data"
+POLL_INTERVAL = 2.0
+
+
+def return_data_directory_signature(data_directory=DATA_DIRECTORY):
+    """Returns the mtimes of the <year-sem> and <year-sem>/<report> directories.
+
+    Adding a file to a report directory bumps that directory's mtime and adding
+    a new report directory bumps its semester directory's mtime, so stat-ing the
+    two directory levels detects every change return_dataframe_of_files sees.
+    """
+    signature = []
+    try:
+        semester_entries = list(os.scandir(data_directory))
+    except FileNotFoundError:
+        return tuple()
+    for semester_entry in semester_entries:
+        if not semester_entry.is_dir() or semester_entry.name.startswith("."):
+            continue
+        signature.append((semester_entry.path, semester_entry.stat().st_mtime_ns))
+        for report_entry in os.scandir(semester_entry.path):
+            if report_entry.is_dir():
+                signature.append((report_entry.path, report_entry.stat().st_mtime_ns))
+    return tuple(sorted(signature))
+
+
+class ReportRegistry:
+    def __init__(self, loader, data_directory=DATA_DIRECTORY, poll_interval=POLL_INTERVAL):
+        self.loader = loader
+        self.data_directory = data_directory
+        self.poll_interval = poll_interval
+
+        self._lock = threading.RLock()
+        self._files_df = None
+        self._signature = None
+        self._last_checked = 0.0
+
+        self._most_recent = {}
+        self._most_recent_by_semester = {}
+        self._first_per_semester = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._files_df = None
+            self._signature = None
+
+    def refresh(self):
+        with self._lock:
+            signature = return_data_directory_signature(self.data_directory)
+            files_df = self.loader()
+            self._build_index(files_df)
+            self._files_df = files_df
+            self._signature = signature
+            self._last_checked = time.monotonic()
+        return files_df
+
+    def _is_stale(self):
+        if self._files_df is None:
+            return True
+        now = time.monotonic()
+        if now - self._last_checked < self.poll_interval:
+            return False
+        self._last_checked = now
+        return return_data_directory_signature(self.data_directory) != self._signature
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if self._is_stale():
+                self.refresh()
+
+    def _build_index(self, files_df):
+        most_recent = {}
+        most_recent_by_semester = {}
+        first_per_semester = {}
+
+        if len(files_df) > 0:
+            records = files_df[["filename", "download_date", "report", "year_and_semester"]]
+            for filename, download_date, report, year_and_semester in records.itertuples(
+                index=False, name=None
+            ):
+                current = most_recent.get(report)
+                if current is None or download_date >= current[0]:
+                    most_recent[report] = (download_date, filename)
+
+                key = (report, year_and_semester)
+                current = most_recent_by_semester.get(key)
+                if current is None or download_date >= current[0]:
+                    most_recent_by_semester[key] = (download_date, filename)
+
+                current = first_per_semester.get(key)
+                if current is None or download_date < current[0]:
+                    first_per_semester[key] = (download_date, filename)
+
+        per_semester = {}
+        for (report, year_and_semester), (download_date, filename) in first_per_semester.items():
+            per_semester.setdefault(report, []).append((download_date, filename))
+        for report, lst in per_semester.items():
+            lst.sort(key=lambda x: x[0])
+            per_semester[report] = [filename for download_date, filename in lst]
+
+        self._most_recent = most_recent
+        self._most_recent_by_semester = most_recent_by_semester
+        self._first_per_semester = per_semester
+
+    def return_files_df(self):
+        self._ensure_fresh()
+        return self._files_df
+
+    def return_most_recent_report(self, report):
+        self._ensure_fresh()
+        try:
+            return self._most_recent[report][1]
+        except KeyError:
+            raise IndexError(f"No files found for report {report}")
+
+    def return_most_recent_report_by_semester(self, report, year_and_semester):
+        self._ensure_fresh()
+        try:
+            return self._most_recent_by_semester[(report, year_and_semester)][1]
+        except KeyError:
+            raise IndexError(
+                f"No files found for report {report} in {year_and_semester}"
+            )
+
+    def return_most_recent_report_per_semester(self, report):
+        self._ensure_fresh()
+        return list(self._first_per_semester.get(report, []))
@@ -0,0 +1,176 @@
+"""
+Report Sidecars
+
+Typed Parquet copies of the raw .xlsx/.csv reports saved under
+app/data/<year-sem>/<report>/. Sidecars live in app/data/.sidecars/ (a hidden
+directory, so return_dataframe_of_files never lists them) and are written when
+a report is uploaded or first read.
+
+Columns are coerced once at ingest so every reader sees the same dtypes:
+Course is a stripped string, and StudentID, Section and Period are int64
+when every value is a whole number, or float64 with NaN when some are
+blank, the dtypes read_excel/read_csv give them. Readers .fillna('') and
+compare these columns row by row, which a nullable Int64 would break. A
+column with a value that is not a number is left as read. Parquet cannot hold a column
+that mixes numbers and strings, so a report with one gets no sidecar and is
+always read from the raw file.
+"""
+
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+SIDECAR_DIRECTORY = ".sidecars"
+## bumped when the coercion changes, so sidecars written under the old
+## rules are rebuilt instead of read as fresh
+SIDECAR_EXTENSION = ".v3.parquet"
+RAW_EXTENSIONS = (".xlsx", ".csv", ".CSV")
+
+
+def is_sidecar_available():
+    return pq is not None
+
+
+def return_sidecar_path(filename):
+    report_directory = os.path.dirname(filename)
+    semester_directory = os.path.dirname(report_directory)
+    data_directory = os.path.dirname(semester_directory)
+    return os.path.join(
+        data_directory,
+        SIDECAR_DIRECTORY,
+        os.path.basename(semester_directory),
+        os.path.basename(report_directory),
+        os.path.basename(filename) + SIDECAR_EXTENSION,
+    )
+
+
+def is_sidecar_fresh(filename):
+    sidecar_path = return_sidecar_path(filename)
+    try:
+        return os.stat(sidecar_path).st_mtime_ns >= os.stat(filename).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def is_sidecar_eligible(filename, kwargs):
+    """Sidecars hold the default read of the file, so only column selection
+    by name can be served from them."""
+    if not is_sidecar_available() or not filename.endswith(RAW_EXTENSIONS):
+        return False
+    if set(kwargs) - {"usecols"}:
+        return False
+    usecols = kwargs.get("usecols")
+    if usecols is None:
+        return True
+    return isinstance(usecols, (list, tuple)) and all(
+        isinstance(col, str) for col in usecols
+    )
+
+
+def _coerce_integer(series):
+    """series as int64, or float64 if it has blanks, when every value is a
+    whole number; otherwise series unchanged."""
+    numeric = pd.to_numeric(series, errors="coerce")
+    is_missing = series.isna()
+    if numeric[~is_missing].isna().any() or (numeric[~is_missing] % 1 != 0).any():
+        return series
+    if is_missing.any():
+        return numeric.astype("float64")
+    return numeric.astype("int64")
+
+
+def _coerce_str(series):
+    return series.where(series.isna(), series.astype(str).str.strip())
+
+
+def coerce_report_dtypes(df):
+    df = df.copy()
+    for col in df.columns:
+        if col == "Course":
+            df[col] = _coerce_str(df[col])
+        elif col in ["StudentID", "Section", "Period"]:
+            df[col] = _coerce_integer(df[col])
+    return df
+
+
+def return_mixed_columns(df):
+    """Object columns holding more than one type of value."""
+    return [
+        col
+        for col in df.columns
+        if df[col].dtype == object and df[col].dropna().map(type).nunique() > 1
+    ]
+
+
+def write_sidecar(filename, df=None):
+    """Writes the typed sidecar for filename and returns the coerced frame.
+    Returns None when the file cannot be converted."""
+    if not is_sidecar_available() or not filename.endswith(RAW_EXTENSIONS):
+        return None
+    try:
+        if df is None:
+            if filename.endswith(".xlsx"):
+                df = pd.read_excel(filename)
+            else:
+                df = pd.read_csv(filename)
+        if not all(isinstance(col, str) for col in df.columns):
+            return None
+        df = coerce_report_dtypes(df)
+        ## stringifying these would change how readers compare them
+        if return_mixed_columns(df):
+            return None
+
+        sidecar_path = return_sidecar_path(filename)
+        os.makedirs(os.path.dirname(sidecar_path), exist_ok=True)
+        temp_path = sidecar_path + ".tmp"
+        df.to_parquet(temp_path, index=False)
+        os.replace(temp_path, sidecar_path)
+    except Exception as e:
+        print(f"Unable to write sidecar for {filename}: {e}")
+        return None
+    return df
+
+
+def _return_projected_columns(file_columns, usecols):
+    ## match pd.read_csv/read_excel, which return usecols in file order
+    missing_cols = set(usecols) - set(file_columns)
+    if missing_cols:
+        raise ValueError(
+            f"Usecols do not match columns, columns expected but not found: {sorted(missing_cols)}"
+        )
+    return [col for col in file_columns if col in usecols]
+
+
+def read_sidecar(filename, usecols=None):
+    sidecar_path = return_sidecar_path(filename)
+    if usecols is None:
+        return pd.read_parquet(sidecar_path)
+    file_columns = pq.read_schema(sidecar_path).names
+    columns = _return_projected_columns(file_columns, usecols)
+    return pd.read_parquet(sidecar_path, columns=columns)
+
+
+def return_file_as_df(filename, **kwargs):
+    """Reads filename through its sidecar, writing the sidecar first if it is
+    missing or older than the raw file. Returns None when the read kwargs
+    cannot be served from a sidecar, so the caller parses the raw file."""
+    if not is_sidecar_eligible(filename, kwargs):
+        return None
+    usecols = kwargs.get("usecols")
+    if is_sidecar_fresh(filename):
+        return read_sidecar(filename, usecols=usecols)
+    if filename.endswith(".xlsx"):
+        df = pd.read_excel(filename)
+    else:
+        df = pd.read_csv(filename)
+    coerced_df = write_sidecar(filename, df=df)
+    if coerced_df is not None:
+        df = coerced_df
+    if usecols is not None:
+        return df[_return_projected_columns(list(df.columns), usecols)]
+    return df
@@ -0,0 +1,225 @@
+"""
+ReportLab Charts
+
+Native ReportLab-graphics versions of the stacked attendance bars on the report
+cards and progress reports. They replace plotly figures rasterized through
+kaleido, which started a browser render for every student.
+
+A chart depends only on its values, and many students share the same
+attendance summary, so drawings are memoized on those values. Callers get a
+ChartFlowable for the memoized Drawing, which writes the drawing into the PDF
+once as a form XObject and places that form on every page that shows the same
+chart. return_drawings_by_key builds the charts for a whole summary frame in
+one pass.
+"""
+
+import functools
+import hashlib
+import math
+
+from reportlab.graphics import renderPDF
+from reportlab.graphics.shapes import Drawing, Rect, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable
+
+ATTENDANCE_COLORS = ["#32CD32", "#FAFA33", "#FF3131"]
+BAR_STROKE_COLOR = colors.grey
+FONT_NAME = "Helvetica"
+BOLD_FONT_NAME = "Helvetica-Bold"
+
+
+def _draw_centered_string(drawing, x, y, text, font_name, font_size):
+    drawing.add(
+        String(x, y, text, fontName=font_name, fontSize=font_size, textAnchor="middle")
+    )
+
+
+def _draw_legend(drawing, y, legend_title, labels, bar_colors, font_size):
+    swatch = font_size * 0.9
+    gap = font_size * 0.4
+    spacing = font_size * 1.2
+
+    entries = [
+        (label, stringWidth(str(label), FONT_NAME, font_size))
+        for label in labels
+    ]
+    title_width = stringWidth(legend_title, FONT_NAME, font_size) if legend_title else 0
+    total_width = (title_width + spacing if legend_title else 0) + sum(
+        swatch + gap + label_width for label, label_width in entries
+    ) + spacing * (len(entries) - 1)
+
+    x = (drawing.width - total_width) / 2
+    if legend_title:
+        drawing.add(String(x, y, legend_title, fontName=FONT_NAME, fontSize=font_size))
+        x += title_width + spacing
+    for (label, label_width), bar_color in zip(entries, bar_colors):
+        drawing.add(
+            Rect(
+                x,
+                y - font_size * 0.1,
+                swatch,
+                swatch,
+                fillColor=colors.HexColor(bar_color),
+                strokeColor=None,
+            )
+        )
+        x += swatch + gap
+        drawing.add(String(x, y, str(label), fontName=FONT_NAME, fontSize=font_size))
+        x += label_width + spacing
+
+
+@functools.lru_cache(maxsize=4096)
+def _return_stacked_bar_drawing(
+    values,
+    labels,
+    width,
+    height,
+    title="",
+    subtitle="",
+    legend_title="",
+    bar_colors=tuple(ATTENDANCE_COLORS),
+    title_font_size=12,
+    text_font_size=12,
+    legend_font_size=8,
+    bar_height_fraction=0.3,
+):
+    """
+    Single horizontal stacked bar with the title above and the legend below.
+    Each segment is labeled with its value when the label fits inside it.
+
+    Arguments must be hashable (tuples, not lists).
+    """
+    drawing = Drawing(width, height)
+
+    y = height - title_font_size
+    if title:
+        _draw_centered_string(drawing, width / 2, y, title, BOLD_FONT_NAME, title_font_size)
+        y -= title_font_size * 0.9
+    if subtitle:
+        _draw_centered_string(drawing, width / 2, y, subtitle, FONT_NAME, title_font_size * 0.6)
+
+    legend_y = legend_font_size * 0.3
+    bar_height = height * bar_height_fraction
+    bar_y = legend_y + legend_font_size * 1.6
+
+    values = [0 if value is None or math.isnan(value) else value for value in values]
+    total = sum(values)
+    if total > 0:
+        x = 0
+        for value, bar_color in zip(values, bar_colors):
+            if value <= 0:
+                continue
+            segment_width = width * value / total
+            drawing.add(
+                Rect(
+                    x,
+                    bar_y,
+                    segment_width,
+                    bar_height,
+                    fillColor=colors.HexColor(bar_color),
+                    strokeColor=BAR_STROKE_COLOR,
+                    strokeWidth=1,
+                )
+            )
+            text = f"{value:.0f}"
+            if stringWidth(text, FONT_NAME, text_font_size) < segment_width - 2:
+                _draw_centered_string(
+                    drawing,
+                    x + segment_width / 2,
+                    bar_y + (bar_height - text_font_size * 0.7) / 2,
+                    text,
+                    FONT_NAME,
+                    text_font_size,
+                )
+            x += segment_width
+
+    _draw_legend(drawing, legend_y, legend_title, labels, bar_colors, legend_font_size)
+    return drawing
+
+
+class ChartFlowable(Flowable):
+    """Places a memoized Drawing. Platypus keeps layout state on each
+    flowable, so every page gets its own ChartFlowable around the shared
+    Drawing."""
+
+    def __init__(self, drawing, form_name):
+        Flowable.__init__(self)
+        self.drawing = drawing
+        self.form_name = form_name
+        self.width = drawing.width
+        self.height = drawing.height
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        forms_drawn = canv.__dict__.setdefault("_chart_forms_drawn", set())
+        if self.form_name not in forms_drawn:
+            canv.beginForm(self.form_name, 0, 0, self.width, self.height)
+            renderPDF.draw(self.drawing, canv, 0, 0)
+            canv.endForm()
+            forms_drawn.add(self.form_name)
+        canv.doForm(self.form_name)
+
+
+def return_stacked_bar_drawing(*args, **kwargs):
+    """ChartFlowable for _return_stacked_bar_drawing(*args, **kwargs)."""
+    drawing = _return_stacked_bar_drawing(*args, **kwargs)
+    key = repr((args, sorted(kwargs.items())))
+    form_name = "chart_" + hashlib.md5(key.encode()).hexdigest()
+    return ChartFlowable(drawing, form_name)
+
+
+def return_daily_attendance_drawing(P, L, A):
+    width = 4 * inch
+    return return_stacked_bar_drawing(
+        (float(P), float(L), float(A)),
+        ("Days Present", "Days Late", "Days Absent"),
+        width,
+        200 / 600 * width,
+        title="Overall Daily Attendance",
+        subtitle="Based on p3 attendance",
+        legend_title="# of Days",
+        title_font_size=12,
+        text_font_size=14,
+        legend_font_size=8,
+        bar_height_fraction=0.3,
+    )
+
+
+def return_period_attendance_drawing(present, late, absent):
+    width = 2.1 * inch
+    return return_stacked_bar_drawing(
+        (float(present), float(late), float(absent)),
+        ("present", "late", "absent"),
+        width,
+        190 / 600 * width,
+        title="Period Attendance",
+        legend_title="# of Periods",
+        title_font_size=7,
+        text_font_size=8,
+        legend_font_size=5,
+        bar_height_fraction=0.3,
+    )
+
+
+def return_drawings_by_key(df, key_cols, value_cols, drawing_function):
+    """
+    Returns {key: ChartFlowable} for the first row of every key in df from
+    drawing_function(*values). Missing value columns count as zero.
+    """
+    if isinstance(key_cols, str):
+        key_cols = [key_cols]
+    df = df.reindex(columns=list(key_cols) + list(value_cols)).drop_duplicates(
+        subset=key_cols
+    )
+    df[value_cols] = df[value_cols].fillna(0)
+
+    drawings = {}
+    for row in df.itertuples(index=False, name=None):
+        key = row[0] if len(key_cols) == 1 else row[: len(key_cols)]
+        drawings[key] = drawing_function(*row[len(key_cols) :])
+    return drawings
@@ -1,13 +1,14 @@
 from flask import session
 
 import pandas as pd
-from sklearn.linear_model import LinearRegression
+import app.scripts.trends as trends
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -95,8 +96,7 @@ def main():
 
     metric = "z-score"
     grade_point_trajectory_df = (
-        student_stats_by_term.groupby(["StudentID"])[metric]
-        .apply(determine_weighted_slope)
+        trends.return_weighted_slopes(student_stats_by_term, "StudentID", metric)
         .reset_index()
         .rename(columns={metric: f"{metric}_net_gain"})
     )
@@ -126,17 +126,6 @@ def main():
     return grade_point_trajectory_df[output_cols]
 
 
-def determine_weighted_slope(data):
-    df = pd.DataFrame(list(data), columns=["Metric"])
-    df["X"] = df.index + 1
-    df["sample_weights"] = df.index + 1
-
-    regr = LinearRegression()
-    regr.fit(df[["X"]], df[["Metric"]], df["sample_weights"])
-
-    return regr.coef_[0][0]
-
-
 def calculate_z_score(student_row):
     class_mean = student_row["mean"]
     class_std = student_row["std"]
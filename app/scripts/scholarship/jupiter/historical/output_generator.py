@@ -9,11 +9,28 @@ import pandas as pd
 import numpy as np
 from io import BytesIO
 from typing import Tuple
-from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.chart import BarChart, ScatterChart, Reference, Series
-from openpyxl.formatting.rule import ColorScaleRule, DataBarRule
+
+import app.scripts.xlsx_export as xlsx_export
+
+## cells are (row, col, value, format) with rows and columns counted from 0
+TITLE_FORMAT = {'size': 14, 'bold': True}
+SECTION_FORMAT = {'size': 12, 'bold': True}
+HEADER_FORMAT = xlsx_export.HEADER_FORMAT
+MIN_WIDTH = 10
+
+# Color scale: red (negative) -> white (zero) -> green (positive)
+IMPACT_COLOR_SCALE = {
+    'type': '3_color_scale',
+    'min_type': 'num', 'min_value': -10, 'min_color': '#F8696B',
+    'mid_type': 'num', 'mid_value': 0, 'mid_color': '#FFFFFF',
+    'max_type': 'num', 'max_value': 10, 'max_color': '#63BE7B',
+}
+# Z-scores typically range from -3 to +3 (3 standard deviations)
+Z_SCORE_COLOR_SCALE = {
+    **IMPACT_COLOR_SCALE,
+    'min_value': -3,
+    'max_value': 3,
+}
 
 
 def generate_excel_output(
@@ -52,22 +69,20 @@ def generate_excel_output(
     teacher_summary, teacher_detail, teacher_diagnostics = teacher_analysis
     student_summary, student_term_detail = student_analysis
     
-    # Create workbook
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove default sheet
+    sheets = []
     
     # DIAGNOSTICS SHEET (FIRST!)
-    _create_teacher_diagnostics_sheet(wb, teacher_diagnostics)
+    _create_teacher_diagnostics_sheet(sheets, teacher_diagnostics)
     
     # TEACHER ANALYSIS BLOCK
-    _create_teacher_summary_sheet(wb, teacher_summary)
-    _create_teacher_detail_sheet(wb, teacher_detail)
-    _create_teacher_visualization_sheet(wb, teacher_summary)
+    _create_teacher_summary_sheet(sheets, teacher_summary)
+    _create_teacher_detail_sheet(sheets, teacher_detail)
+    _create_teacher_visualization_sheet(sheets, teacher_summary)
     
     # STUDENT ANALYSIS BLOCK (ALL STUDENTS)
-    _create_student_summary_sheet(wb, student_summary)
-    _create_student_term_detail_sheet(wb, student_term_detail)
-    _create_student_visualization_sheet(wb, student_summary, student_term_detail)
+    _create_student_summary_sheet(sheets, student_summary)
+    _create_student_term_detail_sheet(sheets, student_term_detail)
+    _create_student_visualization_sheet(sheets, student_summary, student_term_detail)
     
     # CURRENT STUDENTS ANALYSIS (if enrollment data available)
     if 'still_enrolled' in student_summary.columns:
@@ -76,82 +91,53 @@ def generate_excel_output(
             student_term_detail['StudentID'].isin(current_students['StudentID'])
         ].copy()
         
-        _create_current_students_summary_sheet(wb, current_students)
-        _create_top_10_by_cohort_sheet(wb, current_students)
-        _create_current_students_visualization_sheet(wb, current_students)
-    
-    # Save to BytesIO
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
+        _create_current_students_summary_sheet(sheets, current_students)
+        _create_top_10_by_cohort_sheet(sheets, current_students)
+        _create_current_students_visualization_sheet(sheets, current_students)
     
-    return output
+    # Stream the sheets to BytesIO
+    return xlsx_export.return_workbook(sheets)
 
 
-def _create_teacher_diagnostics_sheet(wb: Workbook, diagnostics_df: pd.DataFrame):
+def _create_teacher_diagnostics_sheet(sheets: list, diagnostics_df: pd.DataFrame):
     """Creates diagnostic sheet to help debug teacher impact calculation issues."""
-    ws = wb.create_sheet("DIAGNOSTICS - Teacher Impact", 0)  # Make it first sheet
-    
     # Title and instructions
-    ws['A1'] = "TEACHER IMPACT DIAGNOSTICS"
-    ws['A1'].font = Font(size=14, bold=True, color="FF0000")
-    ws.merge_cells('A1:F1')
-    
-    ws['A2'] = "Copy the summary statistics below and share with your analyst to debug negative impact issues"
-    ws['A2'].font = Font(size=10, italic=True)
-    ws.merge_cells('A2:F2')
-    
-    # Overall Statistics
-    ws['A4'] = "=== OVERALL STATISTICS ==="
-    ws['A4'].font = Font(size=12, bold=True)
+    cells = [
+        (0, 0, "TEACHER IMPACT DIAGNOSTICS", {'size': 14, 'bold': True, 'font_color': '#FF0000'}),
+        (1, 0, "Copy the summary statistics below and share with your analyst to debug negative impact issues",
+         {'size': 10, 'italic': True}),
+        # Overall Statistics
+        (3, 0, "=== OVERALL STATISTICS ===", SECTION_FORMAT),
+    ]
+    merges = {(0, 0): 5, (1, 0): 5}
     
     if not diagnostics_df.empty:
-        ws['A5'] = "Total Teacher-Student Pairs Analyzed:"
-        ws['B5'] = len(diagnostics_df)
-        
-        ws['A6'] = "Average Baseline Z-Score:"
-        ws['B6'] = round(diagnostics_df['BaselineZScore'].mean(), 4)
-        
-        ws['A7'] = "Average Post-Teacher Z-Score:"
-        ws['B7'] = round(diagnostics_df['PostTeacherZScore'].mean(), 4)
-        
-        ws['A8'] = "Average Impact:"
-        ws['B8'] = round(diagnostics_df['Impact'].mean(), 4)
-        
-        ws['A9'] = "Median Impact:"
-        ws['B9'] = round(diagnostics_df['Impact'].median(), 4)
-        
-        ws['A10'] = "% Negative Impacts:"
-        ws['B10'] = f"{(diagnostics_df['Impact'] < 0).sum() / len(diagnostics_df) * 100:.1f}%"
-        
-        ws['A11'] = "% Positive Impacts:"
-        ws['B11'] = f"{(diagnostics_df['Impact'] > 0).sum() / len(diagnostics_df) * 100:.1f}%"
+        overall_stats = [
+            ("Total Teacher-Student Pairs Analyzed:", len(diagnostics_df)),
+            ("Average Baseline Z-Score:", round(diagnostics_df['BaselineZScore'].mean(), 4)),
+            ("Average Post-Teacher Z-Score:", round(diagnostics_df['PostTeacherZScore'].mean(), 4)),
+            ("Average Impact:", round(diagnostics_df['Impact'].mean(), 4)),
+            ("Median Impact:", round(diagnostics_df['Impact'].median(), 4)),
+            ("% Negative Impacts:", f"{(diagnostics_df['Impact'] < 0).sum() / len(diagnostics_df) * 100:.1f}%"),
+            ("% Positive Impacts:", f"{(diagnostics_df['Impact'] > 0).sum() / len(diagnostics_df) * 100:.1f}%"),
+        ]
+        cells += _return_label_cells(4, 0, overall_stats)
         
         # Sample size analysis
-        ws['A13'] = "=== SAMPLE SIZE ANALYSIS ==="
-        ws['A13'].font = Font(size=12, bold=True)
-        
-        ws['A14'] = "Average Baseline Courses Count:"
-        ws['B14'] = round(diagnostics_df['BaselineCoursesCount'].mean(), 2)
-        
-        ws['A15'] = "Average Post-Teacher Courses Count:"
-        ws['B15'] = round(diagnostics_df['PostCoursesCount'].mean(), 2)
-        
-        ws['A16'] = "Average Terms After Teacher:"
-        ws['B16'] = round(diagnostics_df['TermsAfter'].mean(), 2)
+        cells.append((12, 0, "=== SAMPLE SIZE ANALYSIS ===", SECTION_FORMAT))
+        sample_size_stats = [
+            ("Average Baseline Courses Count:", round(diagnostics_df['BaselineCoursesCount'].mean(), 2)),
+            ("Average Post-Teacher Courses Count:", round(diagnostics_df['PostCoursesCount'].mean(), 2)),
+            ("Average Terms After Teacher:", round(diagnostics_df['TermsAfter'].mean(), 2)),
+        ]
+        cells += _return_label_cells(13, 0, sample_size_stats)
         
         # Distribution by baseline courses
-        ws['A18'] = "=== IMPACT BY BASELINE SAMPLE SIZE ==="
-        ws['A18'].font = Font(size=12, bold=True)
-        
-        ws['A19'] = "Baseline Courses"
-        ws['B19'] = "Count"
-        ws['C19'] = "Avg Impact"
-        ws['D19'] = "% Negative"
-        _format_header_row(ws, start_row=19)
+        cells.append((17, 0, "=== IMPACT BY BASELINE SAMPLE SIZE ===", SECTION_FORMAT))
+        cells += _return_header_cells(18, 0, ["Baseline Courses", "Count", "Avg Impact", "% Negative"])
         
         # Group by baseline course count
-        for i, baseline_count in enumerate([1, 2, 3, 4, 5, '6-10', '11+'], start=20):
+        for i, baseline_count in enumerate([1, 2, 3, 4, 5, '6-10', '11+'], start=19):
             if baseline_count == '6-10':
                 subset = diagnostics_df[(diagnostics_df['BaselineCoursesCount'] >= 6) & 
                                        (diagnostics_df['BaselineCoursesCount'] <= 10)]
@@ -161,60 +147,52 @@ def _create_teacher_diagnostics_sheet(wb: Workbook, diagnostics_df: pd.DataFrame
                 subset = diagnostics_df[diagnostics_df['BaselineCoursesCount'] == baseline_count]
             
             if len(subset) > 0:
-                ws[f'A{i}'] = str(baseline_count)
-                ws[f'B{i}'] = len(subset)
-                ws[f'C{i}'] = round(subset['Impact'].mean(), 4)
-                ws[f'D{i}'] = f"{(subset['Impact'] < 0).sum() / len(subset) * 100:.1f}%"
+                cells += _return_row_cells(i, 0, [
+                    str(baseline_count),
+                    len(subset),
+                    round(subset['Impact'].mean(), 4),
+                    f"{(subset['Impact'] < 0).sum() / len(subset) * 100:.1f}%",
+                ])
         
         # Distribution by teacher term
-        ws['A29'] = "=== IMPACT BY TEACHER TERM ==="
-        ws['A29'].font = Font(size=12, bold=True)
-        
-        ws['A30'] = "Teacher Term"
-        ws['B30'] = "Count"
-        ws['C30'] = "Avg Impact"
-        ws['D30'] = "% Negative"
-        _format_header_row(ws, start_row=30)
+        cells.append((28, 0, "=== IMPACT BY TEACHER TERM ===", SECTION_FORMAT))
+        cells += _return_header_cells(29, 0, ["Teacher Term", "Count", "Avg Impact", "% Negative"])
         
         term_groups = diagnostics_df.groupby('TeacherTerm')['Impact'].agg(['count', 'mean', lambda x: (x < 0).sum() / len(x) * 100]).reset_index()
         term_groups.columns = ['TeacherTerm', 'Count', 'AvgImpact', 'PctNegative']
         term_groups = term_groups.sort_values('TeacherTerm')
         
-        for i, (_, row) in enumerate(term_groups.head(20).iterrows(), start=31):  # Show first 20 terms
-            ws[f'A{i}'] = row['TeacherTerm']
-            ws[f'B{i}'] = row['Count']
-            ws[f'C{i}'] = round(row['AvgImpact'], 4)
-            ws[f'D{i}'] = f"{row['PctNegative']:.1f}%"
+        for i, row in enumerate(term_groups.head(20).itertuples(index=False), start=30):  # Show first 20 terms
+            cells += _return_row_cells(i, 0, [
+                row.TeacherTerm, row.Count, round(row.AvgImpact, 4), f"{row.PctNegative:.1f}%"
+            ])
         
         # Sample records for detailed inspection
-        ws['F4'] = "=== SAMPLE RECORDS (First 20) ==="
-        ws['F4'].font = Font(size=12, bold=True)
+        cells.append((3, 5, "=== SAMPLE RECORDS (First 20) ===", SECTION_FORMAT))
         
         sample_cols = ['Teacher', 'StudentID', 'TeacherTerm', 'BaselineZScore', 
                        'PostTeacherZScore', 'Impact', 'BaselineCoursesCount', 'PostCoursesCount']
+        cells += _return_header_cells(4, 5, sample_cols)  # Start at column F
         
-        for col_idx, col in enumerate(sample_cols, start=6):  # Start at column F
-            ws.cell(row=5, column=col_idx, value=col)
-        _format_header_row(ws, start_row=5, start_col=6)
-        
-        for row_idx, (_, record) in enumerate(diagnostics_df.head(20).iterrows(), start=6):
-            for col_idx, col in enumerate(sample_cols, start=6):
-                value = record[col]
-                if isinstance(value, (int, float)) and col in ['BaselineZScore', 'PostTeacherZScore', 'Impact']:
-                    value = round(value, 4)
-                ws.cell(row=row_idx, column=col_idx, value=value)
+        sample_df = diagnostics_df.head(20)[sample_cols].copy()
+        for col in ['BaselineZScore', 'PostTeacherZScore', 'Impact']:
+            sample_df[col] = pd.to_numeric(sample_df[col]).round(4)
+        for row_idx, record in enumerate(sample_df.itertuples(index=False), start=5):
+            cells += _return_row_cells(row_idx, 5, record)
     
     else:
-        ws['A5'] = "No diagnostic data available"
+        cells.append((4, 0, "No diagnostic data available", None))
     
-    # Auto-size columns
-    _auto_size_columns(ws)
+    sheets.append({
+        'name': "DIAGNOSTICS - Teacher Impact",
+        'cells': cells,
+        'merges': merges,
+        'min_width': MIN_WIDTH,
+    })
 
 
-def _create_teacher_summary_sheet(wb: Workbook, teacher_summary: pd.DataFrame):
+def _create_teacher_summary_sheet(sheets: list, teacher_summary: pd.DataFrame):
     """Creates Teacher Impact Summary sheet with peer comparison data."""
-    ws = wb.create_sheet("Teacher Impact Summary")
-    
     # Prepare display columns
     display_cols = [
         'Teacher', 'TotalStudents', 'AvgBaselineZScore', 'AvgPostTeacherZScore',
@@ -231,36 +209,15 @@ def _create_teacher_summary_sheet(wb: Workbook, teacher_summary: pd.DataFrame):
         if col in display_df.columns:
             display_df[col] = display_df[col].round(3)
     
-    # Write data
-    for r_idx, row in enumerate(dataframe_to_rows(display_df, index=False, header=True), 1):
-        ws.append(row)
-    
-    # Format header
-    _format_header_row(ws)
-    
     # Apply conditional formatting to impact columns (z-score scale)
-    if len(display_df) > 0:
-        from openpyxl.utils import get_column_letter
-        impact_cols = ['OverallImpact', 'SameContentImpact', 'CrossContentImpact']
-        for col in impact_cols:
-            if col in display_cols:
-                col_letter = get_column_letter(display_cols.index(col) + 1)
-                _apply_z_score_conditional_formatting(ws, col_letter, 2, len(display_df) + 1)
-    
-    # Auto-size columns
-    _auto_size_columns(ws)
+    impact_cols = ['OverallImpact', 'SameContentImpact', 'CrossContentImpact']
+    conditional_formats = [{'columns': impact_cols, 'options': Z_SCORE_COLOR_SCALE}]
     
-    # Freeze panes
-    ws.freeze_panes = 'A2'
-    
-    # Enable filters
-    ws.auto_filter.ref = ws.dimensions
+    sheets.append(_return_table_sheet("Teacher Impact Summary", display_df, conditional_formats))
 
 
-def _create_teacher_detail_sheet(wb: Workbook, teacher_detail: pd.DataFrame):
+def _create_teacher_detail_sheet(sheets: list, teacher_detail: pd.DataFrame):
     """Creates Teacher Detail sheet with student-level peer comparison data."""
-    ws = wb.create_sheet("Teacher Detail")
-    
     # Prepare display columns
     base_cols = [
         'Teacher', 'StudentID', 'TeacherTerm', 'ContentArea',
@@ -285,125 +242,90 @@ def _create_teacher_detail_sheet(wb: Workbook, teacher_detail: pd.DataFrame):
         if col in display_df.columns:
             display_df[col] = display_df[col].round(3)
     
-    # Write data
-    for r_idx, row in enumerate(dataframe_to_rows(display_df, index=False, header=True), 1):
-        ws.append(row)
-    
-    # Format header
-    _format_header_row(ws)
-    
     # Apply conditional formatting to impact columns
-    if len(display_df) > 0:
-        from openpyxl.utils import get_column_letter
-        impact_cols = ['OverallImpact', 'SameContentImpact', 'CrossContentImpact']
-        for col in impact_cols:
-            if col in display_cols:
-                col_letter = get_column_letter(display_cols.index(col) + 1)
-                _apply_z_score_conditional_formatting(ws, col_letter, 2, len(display_df) + 1)
-    
-    # Auto-size columns
-    _auto_size_columns(ws)
-    
-    # Freeze panes
-    ws.freeze_panes = 'A2'
+    impact_cols = ['OverallImpact', 'SameContentImpact', 'CrossContentImpact']
+    conditional_formats = [{'columns': impact_cols, 'options': Z_SCORE_COLOR_SCALE}]
     
-    # Enable filters
-    ws.auto_filter.ref = ws.dimensions
+    sheets.append(_return_table_sheet("Teacher Detail", display_df, conditional_formats))
 
 
-def _create_teacher_visualization_sheet(wb: Workbook, teacher_summary: pd.DataFrame):
+def _create_teacher_visualization_sheet(sheets: list, teacher_summary: pd.DataFrame):
     """Creates Teacher Impact Visualization sheet with charts."""
-    ws = wb.create_sheet("Teacher Impact Viz")
+    sheet = {'name': "Teacher Impact Viz", 'cells': [], 'merges': {}}
+    sheets.append(sheet)
     
     if teacher_summary.empty or len(teacher_summary) == 0:
-        ws['A1'] = "Insufficient data for visualization"
+        sheet['cells'].append((0, 0, "Insufficient data for visualization", None))
         return
     
     # Add title
-    ws['A1'] = "Teacher Impact Analysis - Z-Score Based Performance"
-    ws['A1'].font = Font(size=14, bold=True)
-    
-    # Top 10 teachers by overall impact
-    ws['A3'] = "Top 10 Teachers by Overall Z-Score Impact"
-    ws['A3'].font = Font(size=12, bold=True)
+    cells = [
+        (0, 0, "Teacher Impact Analysis - Z-Score Based Performance", TITLE_FORMAT),
+        # Top 10 teachers by overall impact
+        (2, 0, "Top 10 Teachers by Overall Z-Score Impact", SECTION_FORMAT),
+    ]
+    sheet['merges'] = {(0, 0): 7, (2, 0): 1}
     
     top_10 = teacher_summary.nlargest(10, 'OverallImpact')[['Teacher', 'OverallImpact']].copy()
     
     # Write top 10 data
-    ws['A4'] = "Teacher"
-    ws['B4'] = "Overall Impact (Z-Score)"
-    _format_header_row(ws, start_row=4)
-    
-    for idx, (_, row) in enumerate(top_10.iterrows(), start=5):
-        ws[f'A{idx}'] = row['Teacher']
-        ws[f'B{idx}'] = round(row['OverallImpact'], 3) if pd.notna(row['OverallImpact']) else 0
+    cells += _return_header_cells(3, 0, ["Teacher", "Overall Impact (Z-Score)"])
+    for idx, row in enumerate(top_10.itertuples(index=False), start=4):
+        cells += _return_row_cells(idx, 0, [
+            row.Teacher, round(row.OverallImpact, 3) if pd.notna(row.OverallImpact) else 0
+        ])
     
     # Create bar chart
-    chart = BarChart()
-    chart.title = "Top 10 Teachers by Overall Z-Score Impact"
-    chart.x_axis.title = "Teacher"
-    chart.y_axis.title = "Impact (Z-Score Change)"
-    
-    data = Reference(ws, min_col=2, min_row=4, max_row=4 + len(top_10))
-    cats = Reference(ws, min_col=1, min_row=5, max_row=4 + len(top_10))
-    chart.add_data(data, titles_from_data=True)
-    chart.set_categories(cats)
-    
-    ws.add_chart(chart, "D4")
+    sheet['charts'] = [("D4", {
+        'type': 'column',
+        'series': [{
+            'name': (3, 1),
+            'categories': (4, 0, 3 + len(top_10), 0),
+            'values': (4, 1, 3 + len(top_10), 1),
+        }],
+        'title': {'name': "Top 10 Teachers by Overall Z-Score Impact"},
+        'x_axis': {'name': "Teacher"},
+        'y_axis': {'name': "Impact (Z-Score Change)"},
+    })]
     
     # Impact distribution
-    ws['A20'] = "Z-Score Impact Distribution"
-    ws['A20'].font = Font(size=12, bold=True)
-    
-    ws['A21'] = "Metric"
-    ws['B21'] = "Mean"
-    ws['C21'] = "Median"
-    ws['D21'] = "Std Dev"
-    _format_header_row(ws, start_row=21)
-    
-    ws['A22'] = "Overall Impact"
-    ws['B22'] = round(teacher_summary['OverallImpact'].mean(), 3)
-    ws['C22'] = round(teacher_summary['OverallImpact'].median(), 3)
-    ws['D22'] = round(teacher_summary['OverallImpact'].std(), 3)
-    
-    ws['A23'] = "Same Content Impact"
-    ws['B23'] = round(teacher_summary['SameContentImpact'].mean(), 3) if teacher_summary['SameContentImpact'].notna().any() else 0
-    ws['C23'] = round(teacher_summary['SameContentImpact'].median(), 3) if teacher_summary['SameContentImpact'].notna().any() else 0
-    ws['D23'] = round(teacher_summary['SameContentImpact'].std(), 3) if teacher_summary['SameContentImpact'].notna().any() else 0
-    
-    ws['A24'] = "Cross Content Impact"
-    ws['B24'] = round(teacher_summary['CrossContentImpact'].mean(), 3) if teacher_summary['CrossContentImpact'].notna().any() else 0
-    ws['C24'] = round(teacher_summary['CrossContentImpact'].median(), 3) if teacher_summary['CrossContentImpact'].notna().any() else 0
-    ws['D24'] = round(teacher_summary['CrossContentImpact'].std(), 3) if teacher_summary['CrossContentImpact'].notna().any() else 0
+    cells.append((19, 0, "Z-Score Impact Distribution", SECTION_FORMAT))
+    sheet['merges'][(19, 0)] = 3
+    cells += _return_header_cells(20, 0, ["Metric", "Mean", "Median", "Std Dev"])
+    
+    cells += _return_row_cells(21, 0, [
+        "Overall Impact",
+        round(teacher_summary['OverallImpact'].mean(), 3),
+        round(teacher_summary['OverallImpact'].median(), 3),
+        round(teacher_summary['OverallImpact'].std(), 3),
+    ])
+    for row, (label, col) in enumerate(
+        [("Same Content Impact", 'SameContentImpact'), ("Cross Content Impact", 'CrossContentImpact')], start=22
+    ):
+        has_values = teacher_summary[col].notna().any()
+        cells += _return_row_cells(row, 0, [
+            label,
+            round(teacher_summary[col].mean(), 3) if has_values else 0,
+            round(teacher_summary[col].median(), 3) if has_values else 0,
+            round(teacher_summary[col].std(), 3) if has_values else 0,
+        ])
     
     # Interpretation guide
-    ws['A27'] = "Z-Score Impact Interpretation Guide"
-    ws['A27'].font = Font(size=11, bold=True)
-    
-    ws['A28'] = "Impact Range"
-    ws['B28'] = "Interpretation"
-    _format_header_row(ws, start_row=28)
-    
-    ws['A29'] = "+0.5 or higher"
-    ws['B29'] = "Strong positive impact - students improve significantly"
-    
-    ws['A30'] = "+0.2 to +0.5"
-    ws['B30'] = "Moderate positive impact"
-    
-    ws['A31'] = "-0.2 to +0.2"
-    ws['B31'] = "Neutral impact (within normal variation)"
-    
-    ws['A32'] = "-0.5 to -0.2"
-    ws['B32'] = "Moderate negative impact"
-    
-    ws['A33'] = "-0.5 or lower"
-    ws['B33'] = "Strong negative impact - students decline after course"
-
-
-def _create_student_summary_sheet(wb: Workbook, student_summary: pd.DataFrame):
+    cells.append((26, 0, "Z-Score Impact Interpretation Guide", {'size': 11, 'bold': True}))
+    sheet['merges'][(26, 0)] = 1
+    cells += _return_header_cells(27, 0, ["Impact Range", "Interpretation"])
+    cells += _return_label_cells(28, 0, [
+        ("+0.5 or higher", "Strong positive impact - students improve significantly"),
+        ("+0.2 to +0.5", "Moderate positive impact"),
+        ("-0.2 to +0.2", "Neutral impact (within normal variation)"),
+        ("-0.5 to -0.2", "Moderate negative impact"),
+        ("-0.5 or lower", "Strong negative impact - students decline after course"),
+    ])
+    sheet['cells'] = cells
+
+
+def _create_student_summary_sheet(sheets: list, student_summary: pd.DataFrame):
     """Creates Student Trajectory Summary sheet with z-score metrics."""
-    ws = wb.create_sheet("Student Trajectory Summary")
-    
     # Prepare display columns
     base_cols = [
         'StudentID', 'FirstTerm', 'LastTerm', 'TermsAnalyzed',
@@ -427,40 +349,14 @@ def _create_student_summary_sheet(wb: Workbook, student_summary: pd.DataFrame):
         if col in display_df.columns:
             display_df[col] = display_df[col].round(3)  # Z-scores need more precision
     
-    # Write data
-    for r_idx, row in enumerate(dataframe_to_rows(display_df, index=False, header=True), 1):
-        ws.append(row)
-    
-    # Format header
-    _format_header_row(ws)
-    
     # Apply conditional formatting
-    if len(display_df) > 0:
-        from openpyxl.utils import get_column_letter
-        if 'TrajectorySlope' in display_cols:
-            slope_col = get_column_letter(display_cols.index('TrajectorySlope') + 1)
-            _apply_impact_conditional_formatting(ws, slope_col, 2, len(display_df) + 1)
-        if 'AvgZScore' in display_cols:
-            avg_col = get_column_letter(display_cols.index('AvgZScore') + 1)
-            _apply_impact_conditional_formatting(ws, avg_col, 2, len(display_df) + 1)
-        if 'MostRecentZScore' in display_cols:
-            recent_col = get_column_letter(display_cols.index('MostRecentZScore') + 1)
-            _apply_impact_conditional_formatting(ws, recent_col, 2, len(display_df) + 1)
+    conditional_formats = [{'columns': numeric_cols, 'options': IMPACT_COLOR_SCALE}]
     
-    # Auto-size columns
-    _auto_size_columns(ws)
-    
-    # Freeze panes
-    ws.freeze_panes = 'A2'
-    
-    # Enable filters
-    ws.auto_filter.ref = ws.dimensions
+    sheets.append(_return_table_sheet("Student Trajectory Summary", display_df, conditional_formats))
 
 
-def _create_student_term_detail_sheet(wb: Workbook, student_term_detail: pd.DataFrame):
+def _create_student_term_detail_sheet(sheets: list, student_term_detail: pd.DataFrame):
     """Creates Student Term Detail sheet with z-score data."""
-    ws = wb.create_sheet("Student Term Detail")
-    
     # Prepare display columns
     base_cols = [
         'StudentID', 'Year', 'TermNum', 'Term', 'AvgZScore'
@@ -480,192 +376,113 @@ def _create_student_term_detail_sheet(wb: Workbook, student_term_detail: pd.Data
     if 'AvgZScore' in display_df.columns:
         display_df['AvgZScore'] = display_df['AvgZScore'].round(3)  # Z-scores need precision
     
-    # Write data
-    for r_idx, row in enumerate(dataframe_to_rows(display_df, index=False, header=True), 1):
-        ws.append(row)
-    
-    # Format header
-    _format_header_row(ws)
-    
     # Apply conditional formatting to z-score
-    if len(display_df) > 0:
-        from openpyxl.utils import get_column_letter
-        if 'AvgZScore' in display_cols:
-            z_col = get_column_letter(display_cols.index('AvgZScore') + 1)
-            _apply_z_score_conditional_formatting(ws, z_col, 2, len(display_df) + 1)
-    
-    # Auto-size columns
-    _auto_size_columns(ws)
+    conditional_formats = [{'columns': ['AvgZScore'], 'options': Z_SCORE_COLOR_SCALE}]
     
-    # Freeze panes
-    ws.freeze_panes = 'A2'
-    
-    # Enable filters
-    ws.auto_filter.ref = ws.dimensions
+    sheets.append(_return_table_sheet("Student Term Detail", display_df, conditional_formats))
 
 
-def _create_student_visualization_sheet(wb: Workbook, student_summary: pd.DataFrame, 
+def _create_student_visualization_sheet(sheets: list, student_summary: pd.DataFrame, 
                                        student_term_detail: pd.DataFrame):
     """Creates Student Trajectory Visualization sheet with z-score analysis."""
-    ws = wb.create_sheet("Student Trajectory Viz")
+    sheet = {'name': "Student Trajectory Viz", 'cells': [], 'merges': {}}
+    sheets.append(sheet)
     
     if student_summary.empty or len(student_summary) == 0:
-        ws['A1'] = "Insufficient data for visualization"
+        sheet['cells'].append((0, 0, "Insufficient data for visualization", None))
         return
     
     # Add title
-    ws['A1'] = "Student Trajectory Analysis - Z-Score Performance"
-    ws['A1'].font = Font(size=14, bold=True)
-    
-    # Top improvers by trajectory slope
-    ws['A3'] = "Top 10 Improving Students (by Trajectory Slope)"
-    ws['A3'].font = Font(size=12, bold=True)
+    cells = [
+        (0, 0, "Student Trajectory Analysis - Z-Score Performance", TITLE_FORMAT),
+        # Top improvers by trajectory slope
+        (2, 0, "Top 10 Improving Students (by Trajectory Slope)", SECTION_FORMAT),
+    ]
+    sheet['merges'] = {(0, 0): 6, (2, 0): 2}
     
     top_10 = student_summary.nlargest(10, 'TrajectorySlope')[['StudentID', 'TrajectorySlope', 'AvgZScore']].copy()
     
-    ws['A4'] = "Student ID"
-    ws['B4'] = "Trajectory Slope"
-    ws['C4'] = "Avg Z-Score"
-    _format_header_row(ws, start_row=4)
-    
-    for idx, (_, row) in enumerate(top_10.iterrows(), start=5):
-        ws[f'A{idx}'] = row['StudentID']
-        ws[f'B{idx}'] = round(row['TrajectorySlope'], 3) if pd.notna(row['TrajectorySlope']) else 0
-        ws[f'C{idx}'] = round(row['AvgZScore'], 3) if pd.notna(row['AvgZScore']) else 0
+    cells += _return_header_cells(3, 0, ["Student ID", "Trajectory Slope", "Avg Z-Score"])
+    cells += _return_students_cells(4, top_10)
     
     # Bottom performers (declining)
-    ws['A17'] = "Top 10 Declining Students (by Trajectory Slope)"
-    ws['A17'].font = Font(size=12, bold=True)
+    cells.append((16, 0, "Top 10 Declining Students (by Trajectory Slope)", SECTION_FORMAT))
+    sheet['merges'][(16, 0)] = 2
     
     bottom_10 = student_summary.nsmallest(10, 'TrajectorySlope')[['StudentID', 'TrajectorySlope', 'AvgZScore']].copy()
     
-    ws['A18'] = "Student ID"
-    ws['B18'] = "Trajectory Slope"
-    ws['C18'] = "Avg Z-Score"
-    _format_header_row(ws, start_row=18)
-    
-    for idx, (_, row) in enumerate(bottom_10.iterrows(), start=19):
-        ws[f'A{idx}'] = row['StudentID']
-        ws[f'B{idx}'] = round(row['TrajectorySlope'], 3) if pd.notna(row['TrajectorySlope']) else 0
-        ws[f'C{idx}'] = round(row['AvgZScore'], 3) if pd.notna(row['AvgZScore']) else 0
+    cells += _return_header_cells(17, 0, ["Student ID", "Trajectory Slope", "Avg Z-Score"])
+    cells += _return_students_cells(18, bottom_10)
     
     # Trend distribution
-    ws['E3'] = "Trend Distribution"
-    ws['E3'].font = Font(size=12, bold=True)
-    
-    ws['E4'] = "Trend"
-    ws['F4'] = "Count"
-    ws['G4'] = "Percentage"
-    _format_header_row(ws, start_row=4, start_col=5)
+    cells.append((2, 4, "Trend Distribution", SECTION_FORMAT))
+    cells += _return_header_cells(3, 4, ["Trend", "Count", "Percentage"])
     
     trend_counts = student_summary['Trend'].value_counts()
     total = len(student_summary)
     
-    for idx, (trend, count) in enumerate(trend_counts.items(), start=5):
-        ws[f'E{idx}'] = trend
-        ws[f'F{idx}'] = count
-        ws[f'G{idx}'] = f"{(count/total*100):.1f}%"
+    for idx, (trend, count) in enumerate(trend_counts.items(), start=4):
+        cells += _return_row_cells(idx, 4, [trend, count, f"{(count/total*100):.1f}%"])
     
     # Z-Score distribution statistics
-    ws['E15'] = "Z-Score Performance Statistics"
-    ws['E15'].font = Font(size=12, bold=True)
-    
-    ws['E16'] = "Metric"
-    ws['F16'] = "Value"
-    _format_header_row(ws, start_row=16, start_col=5)
-    
-    ws['E17'] = "Avg Trajectory Slope"
-    ws['F17'] = round(student_summary['TrajectorySlope'].mean(), 3)
-    
-    ws['E18'] = "Median Trajectory Slope"
-    ws['F18'] = round(student_summary['TrajectorySlope'].median(), 3)
-    
-    ws['E19'] = "Avg Z-Score (All Students)"
-    ws['F19'] = round(student_summary['AvgZScore'].mean(), 3)
-    
-    ws['E20'] = "Students Above Avg (Z > 0)"
-    ws['F20'] = len(student_summary[student_summary['AvgZScore'] > 0])
-    
-    ws['E21'] = "Students Below Avg (Z < 0)"
-    ws['F21'] = len(student_summary[student_summary['AvgZScore'] < 0])
-
-
-def _format_header_row(ws, start_row=1, start_col=1):
-    """Applies formatting to header row."""
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    
-    for cell in ws[start_row]:
-        if cell.column >= start_col:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-
-
-def _apply_impact_conditional_formatting(ws, column, start_row, end_row):
-    """Applies color scale conditional formatting to impact columns."""
-    # Color scale: red (negative) -> white (zero) -> green (positive)
-    color_scale = ColorScaleRule(
-        start_type='num', start_value=-10, start_color='F8696B',
-        mid_type='num', mid_value=0, mid_color='FFFFFF',
-        end_type='num', end_value=10, end_color='63BE7B'
-    )
-    
-    ws.conditional_formatting.add(
-        f'{column}{start_row}:{column}{end_row}',
-        color_scale
-    )
-
-
-def _apply_z_score_conditional_formatting(ws, column, start_row, end_row):
-    """Applies color scale conditional formatting specifically for z-scores."""
-    # Z-score color scale: red (-3) -> white (0) -> green (+3)
-    # Z-scores typically range from -3 to +3 (3 standard deviations)
-    color_scale = ColorScaleRule(
-        start_type='num', start_value=-3, start_color='F8696B',
-        mid_type='num', mid_value=0, mid_color='FFFFFF',
-        end_type='num', end_value=3, end_color='63BE7B'
-    )
-    
-    ws.conditional_formatting.add(
-        f'{column}{start_row}:{column}{end_row}',
-        color_scale
-    )
-
-
-def _auto_size_columns(ws, min_width=10, max_width=50):
-    """Auto-sizes columns based on content."""
-    from openpyxl.cell.cell import MergedCell
-    
-    for column in ws.columns:
-        max_length = 0
-        column_letter = None
-        
-        for cell in column:
-            # Skip merged cells
-            if isinstance(cell, MergedCell):
-                continue
-            
-            # Get column letter from first non-merged cell
-            if column_letter is None:
-                column_letter = cell.column_letter
-            
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except:
-                pass
-        
-        # Only adjust if we found a valid column letter
-        if column_letter:
-            adjusted_width = min(max(max_length + 2, min_width), max_width)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-
-def _create_current_students_summary_sheet(wb: Workbook, current_students: pd.DataFrame):
+    cells.append((14, 4, "Z-Score Performance Statistics", SECTION_FORMAT))
+    sheet['merges'][(14, 4)] = 5
+    cells += _return_header_cells(15, 4, ["Metric", "Value"])
+    cells += _return_label_cells(16, 4, [
+        ("Avg Trajectory Slope", round(student_summary['TrajectorySlope'].mean(), 3)),
+        ("Median Trajectory Slope", round(student_summary['TrajectorySlope'].median(), 3)),
+        ("Avg Z-Score (All Students)", round(student_summary['AvgZScore'].mean(), 3)),
+        ("Students Above Avg (Z > 0)", len(student_summary[student_summary['AvgZScore'] > 0])),
+        ("Students Below Avg (Z < 0)", len(student_summary[student_summary['AvgZScore'] < 0])),
+    ])
+    sheet['cells'] = cells
+
+
+def _return_table_sheet(name, display_df, conditional_formats):
+    """Sheet spec for a filtered table with a frozen header row."""
+    return {
+        'name': name,
+        'df': display_df,
+        'header_format': HEADER_FORMAT,
+        'conditional_formats': conditional_formats,
+        'min_width': MIN_WIDTH,
+        'freeze_panes': (1, 0),
+        'autofilter': True,
+    }
+
+
+def _return_header_cells(row, start_col, headers):
+    """Header row cells for a small table at (row, start_col)."""
+    return [(row, col, header, HEADER_FORMAT) for col, header in enumerate(headers, start=start_col)]
+
+
+def _return_row_cells(row, start_col, values):
+    """Unformatted cells for one row of values from (row, start_col)."""
+    return [(row, col, value, None) for col, value in enumerate(values, start=start_col)]
+
+
+def _return_label_cells(start_row, col, label_value_pairs):
+    """Label in col, value to its right, one pair per row."""
+    cells = []
+    for row, (label, value) in enumerate(label_value_pairs, start=start_row):
+        cells += _return_row_cells(row, col, [label, value])
+    return cells
+
+
+def _return_students_cells(start_row, students_df):
+    """StudentID, TrajectorySlope and AvgZScore rows with missing values as 0."""
+    cells = []
+    for row, student in enumerate(students_df.itertuples(index=False), start=start_row):
+        cells += _return_row_cells(row, 0, [
+            student.StudentID,
+            round(student.TrajectorySlope, 3) if pd.notna(student.TrajectorySlope) else 0,
+            round(student.AvgZScore, 3) if pd.notna(student.AvgZScore) else 0,
+        ])
+    return cells
+
+
+def _create_current_students_summary_sheet(sheets: list, current_students: pd.DataFrame):
     """Creates summary sheet for currently enrolled students only."""
-    ws = wb.create_sheet("Current Students Summary")
-    
     # Prepare display columns
     display_cols = [
         'StudentID', 'LastName', 'FirstName', 'GEC', 'FirstTerm', 'LastTerm',
@@ -683,53 +500,34 @@ def _create_current_students_summary_sheet(wb: Workbook, current_students: pd.Da
         if col in display_df.columns:
             display_df[col] = display_df[col].round(3)
     
-    # Write data
-    for r_idx, row in enumerate(dataframe_to_rows(display_df, index=False, header=True), 1):
-        ws.append(row)
-    
-    # Format header
-    _format_header_row(ws)
-    
     # Apply conditional formatting
-    if len(display_df) > 0:
-        from openpyxl.utils import get_column_letter
-        if 'TrajectorySlope' in display_cols:
-            slope_col = get_column_letter(display_cols.index('TrajectorySlope') + 1)
-            _apply_impact_conditional_formatting(ws, slope_col, 2, len(display_df) + 1)
-        if 'AvgZScore' in display_cols:
-            avg_col = get_column_letter(display_cols.index('AvgZScore') + 1)
-            _apply_z_score_conditional_formatting(ws, avg_col, 2, len(display_df) + 1)
-        if 'MostRecentZScore' in display_cols:
-            recent_col = get_column_letter(display_cols.index('MostRecentZScore') + 1)
-            _apply_z_score_conditional_formatting(ws, recent_col, 2, len(display_df) + 1)
-    
-    # Auto-size columns
-    _auto_size_columns(ws)
-    
-    # Freeze panes
-    ws.freeze_panes = 'A2'
+    conditional_formats = [
+        {'columns': ['TrajectorySlope'], 'options': IMPACT_COLOR_SCALE},
+        {'columns': ['AvgZScore', 'MostRecentZScore'], 'options': Z_SCORE_COLOR_SCALE},
+    ]
     
-    # Enable filters
-    ws.auto_filter.ref = ws.dimensions
+    sheets.append(_return_table_sheet("Current Students Summary", display_df, conditional_formats))
 
 
-def _create_top_10_by_cohort_sheet(wb: Workbook, current_students: pd.DataFrame):
+def _create_top_10_by_cohort_sheet(sheets: list, current_students: pd.DataFrame):
     """Creates sheet showing top 10 performers by cohort (GEC)."""
-    ws = wb.create_sheet("Top 10 by Cohort")
+    sheet = {'name': "Top 10 by Cohort", 'cells': [], 'merges': {}, 'min_width': MIN_WIDTH}
+    sheets.append(sheet)
     
     if current_students.empty or 'GEC' not in current_students.columns:
-        ws['A1'] = "Insufficient data for cohort analysis"
+        sheet['cells'].append((0, 0, "Insufficient data for cohort analysis", None))
         return
     
     # Add title
-    ws['A1'] = "Top 10 Improving Students by Cohort (by Trajectory Slope)"
-    ws['A1'].font = Font(size=14, bold=True)
-    ws.merge_cells('A1:I1')
+    cells = [(0, 0, "Top 10 Improving Students by Cohort (by Trajectory Slope)", TITLE_FORMAT)]
+    merges = {(0, 0): 8}
     
     # Get unique cohorts and sort
     cohorts = sorted(current_students['GEC'].dropna().unique())
     
-    current_row = 3
+    headers = ['Rank', 'StudentID', 'LastName', 'FirstName', 'TrajectorySlope', 
+               'AvgZScore', 'MostRecentZScore', 'TermsAnalyzed', 'Trend']
+    current_row = 2
     
     for cohort in cohorts:
         # Filter to this cohort
@@ -742,115 +540,104 @@ def _create_top_10_by_cohort_sheet(wb: Workbook, current_students: pd.DataFrame)
             continue
         
         # Add cohort header
-        ws[f'A{current_row}'] = f"Cohort {cohort}"
-        ws[f'A{current_row}'].font = Font(size=12, bold=True)
-        ws.merge_cells(f'A{current_row}:I{current_row}')
+        cells.append((current_row, 0, f"Cohort {cohort}", SECTION_FORMAT))
+        merges[(current_row, 0)] = 8
         current_row += 1
         
         # Add column headers
-        headers = ['Rank', 'StudentID', 'LastName', 'FirstName', 'TrajectorySlope', 
-                   'AvgZScore', 'MostRecentZScore', 'TermsAnalyzed', 'Trend']
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=current_row, column=col_idx, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.font = Font(color="FFFFFF", bold=True)
+        cells += _return_header_cells(current_row, 0, headers)
         current_row += 1
         
         # Add top 10 data
         for rank, (_, student) in enumerate(top_10.iterrows(), start=1):
-            ws.cell(row=current_row, column=1, value=rank)
-            ws.cell(row=current_row, column=2, value=student['StudentID'])
-            ws.cell(row=current_row, column=3, value=student.get('LastName', ''))
-            ws.cell(row=current_row, column=4, value=student.get('FirstName', ''))
-            ws.cell(row=current_row, column=5, value=round(student['TrajectorySlope'], 3) if pd.notna(student['TrajectorySlope']) else '')
-            ws.cell(row=current_row, column=6, value=round(student['AvgZScore'], 3) if pd.notna(student['AvgZScore']) else '')
-            ws.cell(row=current_row, column=7, value=round(student['MostRecentZScore'], 3) if pd.notna(student['MostRecentZScore']) else '')
-            ws.cell(row=current_row, column=8, value=student.get('TermsAnalyzed', ''))
-            ws.cell(row=current_row, column=9, value=student.get('Trend', ''))
+            cells += _return_row_cells(current_row, 0, [
+                rank,
+                student['StudentID'],
+                student.get('LastName', ''),
+                student.get('FirstName', ''),
+                round(student['TrajectorySlope'], 3) if pd.notna(student['TrajectorySlope']) else '',
+                round(student['AvgZScore'], 3) if pd.notna(student['AvgZScore']) else '',
+                round(student['MostRecentZScore'], 3) if pd.notna(student['MostRecentZScore']) else '',
+                student.get('TermsAnalyzed', ''),
+                student.get('Trend', ''),
+            ])
             current_row += 1
         
         # Add spacing between cohorts
         current_row += 2
     
-    # Auto-size columns
-    _auto_size_columns(ws)
+    sheet['cells'] = cells
+    sheet['merges'] = merges
 
 
-def _create_current_students_visualization_sheet(wb: Workbook, current_students: pd.DataFrame):
+def _create_current_students_visualization_sheet(sheets: list, current_students: pd.DataFrame):
     """Creates visualization sheet for currently enrolled students."""
-    ws = wb.create_sheet("Current Students Viz")
+    sheet = {'name': "Current Students Viz", 'cells': [], 'merges': {}}
+    sheets.append(sheet)
     
     if current_students.empty:
-        ws['A1'] = "Insufficient data for visualization"
+        sheet['cells'].append((0, 0, "Insufficient data for visualization", None))
         return
     
     # Add title
-    ws['A1'] = "Current Students Analysis - Z-Score Performance"
-    ws['A1'].font = Font(size=14, bold=True)
+    cells = [(0, 0, "Current Students Analysis - Z-Score Performance", TITLE_FORMAT)]
+    merges = {(0, 0): 7}
     
     # Cohort performance comparison
     if 'GEC' in current_students.columns:
-        ws['A3'] = "Average Trajectory Slope by Cohort"
-        ws['A3'].font = Font(size=12, bold=True)
+        cells.append((2, 0, "Average Trajectory Slope by Cohort", SECTION_FORMAT))
+        merges[(2, 0)] = 3
         
         cohort_avg = current_students.groupby('GEC')['TrajectorySlope'].mean().reset_index()
         cohort_avg = cohort_avg.sort_values('GEC')
         
-        ws['A4'] = "Cohort"
-        ws['B4'] = "Avg Trajectory Slope"
-        ws['C4'] = "Avg Z-Score"
-        ws['D4'] = "Student Count"
-        _format_header_row(ws, start_row=4)
+        cells += _return_header_cells(3, 0, ["Cohort", "Avg Trajectory Slope", "Avg Z-Score", "Student Count"])
         
         cohort_counts = current_students.groupby('GEC').size().to_dict()
         cohort_z_scores = current_students.groupby('GEC')['AvgZScore'].mean().to_dict()
         
-        for idx, (_, row) in enumerate(cohort_avg.iterrows(), start=5):
-            cohort = row['GEC']
-            ws[f'A{idx}'] = cohort
-            ws[f'B{idx}'] = round(row['TrajectorySlope'], 3) if pd.notna(row['TrajectorySlope']) else 0
-            ws[f'C{idx}'] = round(cohort_z_scores.get(cohort, 0), 3)
-            ws[f'D{idx}'] = cohort_counts.get(cohort, 0)
+        for idx, row in enumerate(cohort_avg.itertuples(index=False), start=4):
+            cohort = row.GEC
+            cells += _return_row_cells(idx, 0, [
+                cohort,
+                round(row.TrajectorySlope, 3) if pd.notna(row.TrajectorySlope) else 0,
+                round(cohort_z_scores.get(cohort, 0), 3),
+                cohort_counts.get(cohort, 0),
+            ])
     
     # Trend distribution
-    ws['F3'] = "Trend Distribution (Current Students)"
-    ws['F3'].font = Font(size=12, bold=True)
-    
-    ws['F4'] = "Trend"
-    ws['G4'] = "Count"
-    ws['H4'] = "Percentage"
-    _format_header_row(ws, start_row=4, start_col=6)
+    cells.append((2, 5, "Trend Distribution (Current Students)", SECTION_FORMAT))
+    merges[(2, 5)] = 7
+    cells += _return_header_cells(3, 5, ["Trend", "Count", "Percentage"])
     
     trend_counts = current_students['Trend'].value_counts()
     total_students = len(current_students)
     
-    for idx, (trend, count) in enumerate(trend_counts.items(), start=5):
-        ws[f'F{idx}'] = trend
-        ws[f'G{idx}'] = count
-        ws[f'H{idx}'] = f"{(count/total_students*100):.1f}%"
+    for idx, (trend, count) in enumerate(trend_counts.items(), start=4):
+        cells += _return_row_cells(idx, 5, [trend, count, f"{(count/total_students*100):.1f}%"])
     
     # Top performers
-    row_offset = len(trend_counts) + 7
-    ws[f'F{row_offset}'] = "Top 10 Current Students (by Trajectory Slope)"
-    ws[f'F{row_offset}'].font = Font(size=12, bold=True)
+    row_offset = len(trend_counts) + 6
+    cells.append((row_offset, 5, "Top 10 Current Students (by Trajectory Slope)", SECTION_FORMAT))
+    merges[(row_offset, 5)] = 10
     
     top_10_overall = current_students.nlargest(10, 'TrajectorySlope')[
         ['StudentID', 'LastName', 'FirstName', 'GEC', 'TrajectorySlope', 'AvgZScore']
     ].copy()
     
-    ws[f'F{row_offset + 1}'] = "Student ID"
-    ws[f'G{row_offset + 1}'] = "Last Name"
-    ws[f'H{row_offset + 1}'] = "First Name"
-    ws[f'I{row_offset + 1}'] = "Cohort"
-    ws[f'J{row_offset + 1}'] = "Trajectory Slope"
-    ws[f'K{row_offset + 1}'] = "Avg Z-Score"
-    _format_header_row(ws, start_row=row_offset + 1, start_col=6)
+    cells += _return_header_cells(row_offset + 1, 5, [
+        "Student ID", "Last Name", "First Name", "Cohort", "Trajectory Slope", "Avg Z-Score"
+    ])
     
     for idx, (_, student) in enumerate(top_10_overall.iterrows(), start=row_offset + 2):
-        ws[f'F{idx}'] = student['StudentID']
-        ws[f'G{idx}'] = student.get('LastName', '')
-        ws[f'H{idx}'] = student.get('FirstName', '')
-        ws[f'I{idx}'] = student.get('GEC', '')
-        ws[f'J{idx}'] = round(student['TrajectorySlope'], 3) if pd.notna(student['TrajectorySlope']) else 0
-        ws[f'K{idx}'] = round(student['AvgZScore'], 3) if pd.notna(student['AvgZScore']) else 0
\ No newline at end of file
+        cells += _return_row_cells(idx, 5, [
+            student['StudentID'],
+            student.get('LastName', ''),
+            student.get('FirstName', ''),
+            student.get('GEC', ''),
+            round(student['TrajectorySlope'], 3) if pd.notna(student['TrajectorySlope']) else 0,
+            round(student['AvgZScore'], 3) if pd.notna(student['AvgZScore']) else 0,
+        ])
+    
+    sheet['cells'] = cells
+    sheet['merges'] = merges
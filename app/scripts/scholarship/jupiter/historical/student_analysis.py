@@ -8,7 +8,7 @@ and weighted linear regression to emphasize recent performance.
 import pandas as pd
 import numpy as np
 from typing import Tuple
-from sklearn.linear_model import LinearRegression
+import app.scripts.trends as trends
 
 
 def analyze_student_trajectories(grades_df: pd.DataFrame, students_df: pd.DataFrame = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -167,6 +167,11 @@ def _calculate_student_summary(student_term_zscores: pd.DataFrame, students_df:
         DataFrame with summary metrics per student
     """
     summary_stats = []
+
+    # Weighted trajectory (slope) for every student at once, terms in time order
+    trajectory_slopes = trends.return_weighted_slopes(
+        student_term_zscores.sort_values(['StudentID', 'Year', 'TermNum']), 'StudentID', 'z_score'
+    )
     
     for student_id in student_term_zscores['StudentID'].unique():
         student_data = student_term_zscores[student_term_zscores['StudentID'] == student_id].copy()
@@ -178,8 +183,7 @@ def _calculate_student_summary(student_term_zscores: pd.DataFrame, students_df:
         if len(z_score_list) == 0:
             continue
         
-        # Calculate weighted trajectory (slope) using linear regression
-        trajectory_slope = _determine_weighted_slope(z_score_list)
+        trajectory_slope = trajectory_slopes[student_id]
         
         # Calculate overall average z-score
         avg_z_score = np.mean(z_score_list)
@@ -232,31 +236,6 @@ def _calculate_student_summary(student_term_zscores: pd.DataFrame, students_df:
     return summary_df
 
 
-def _determine_weighted_slope(z_score_list: list) -> float:
-    """
-    Calculates weighted linear regression slope with recent terms weighted more heavily.
-    
-    Args:
-        z_score_list: Time-ordered list of z-scores
-    
-    Returns:
-        Slope coefficient (rate of change per term)
-    """
-    if len(z_score_list) < 2:
-        return 0.0
-    
-    # Create DataFrame for regression
-    df = pd.DataFrame({'ZScore': z_score_list})
-    df['X'] = df.index + 1  # Time sequence (1, 2, 3, ...)
-    df['sample_weights'] = df.index + 1  # Weight increases with time (recent terms matter more)
-    
-    # Fit weighted linear regression
-    regr = LinearRegression()
-    regr.fit(df[['X']], df[['ZScore']], sample_weight=df['sample_weights'])
-    
-    return regr.coef_[0][0]
-
-
 def _determine_trend(slope: float, z_score_list: list) -> str:
     """
     Determines overall trend category based on slope and z-scores.
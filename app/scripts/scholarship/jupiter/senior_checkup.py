@@ -1,12 +1,12 @@
 from flask import session
 
 import pandas as pd 
-from sklearn.linear_model import LinearRegression
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
 
@@ -7,6 +7,7 @@ from wtforms import (
     StringField,
     SelectMultipleField,
     BooleanField,
+    HiddenField,
 )
 from wtforms.validators import DataRequired, Regexp, InputRequired
 from wtforms.widgets import TextArea
@@ -21,4 +22,6 @@ class EnhancedReportCardForm(FlaskForm):
             ("3", "MP3"),
         ],
         validators=[InputRequired()],
-    )
\ No newline at end of file
+    )
+    ## set by the form page so it can poll /api/pdf_jobs/<job_id>
+    job_id = HiddenField()
@@ -19,9 +19,9 @@ from reportlab.platypus import SimpleDocTemplate
 
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.io as pio
-import plotly.graph_objects as go
+from app.scripts.lazy import lazy_import
+pio = lazy_import("plotly.io")
+go = lazy_import("plotly.graph_objects")
 
 from io import BytesIO
 
@@ -41,8 +41,9 @@ from io import BytesIO
 from flask import session, current_app
 
 
+import app.scripts.reportlab_charts as reportlab_charts
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.programming.jupiter.return_master_schedule import (
     return_jupiter_course,
@@ -79,6 +80,7 @@ def main():
 
 
 def return_students_df():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -127,6 +129,19 @@ def return_dfs_dict():
         "attd_benchmark_df": return_overall_attd_benchmark(),
         "smartpass_df": return_total_time_per_period_by_student(smartpass_df),
     }
+    ## render every student's attendance charts once up front
+    dfs_dict["daily_attd_charts"] = reportlab_charts.return_drawings_by_key(
+        dfs_dict["RATR_Summary_df"],
+        "StudentID",
+        ["P", "L", "A"],
+        reportlab_charts.return_daily_attendance_drawing,
+    )
+    dfs_dict["jupiter_attd_charts"] = reportlab_charts.return_drawings_by_key(
+        dfs_dict["jupiter_attd_summary_df"],
+        ["StudentID", "Course"],
+        ["present", "late", "absent"],
+        reportlab_charts.return_period_attendance_drawing,
+    )
 
     return dfs_dict
 
@@ -214,6 +229,7 @@ def swap_attd_marks_on_jupiter(attd_mark):
 
 
 def return_student_grades():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -256,6 +272,7 @@ def return_student_grades():
 
 
 def return_counselors_df():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -308,6 +325,7 @@ def determine_honor_roll_flag(student):
 
 
 def return_df_by_title(title, year_and_semester):
+    files_df = utils.return_files_df()
     filename = utils.return_most_recent_report_by_semester(
         files_df, title, year_and_semester=year_and_semester
     )
@@ -448,17 +466,7 @@ def return_class_flowables(student_row, dfs_dict, marking_period):
         performance_str = f"Missing {num_of_missing_performance:.0f} of {total_performance:.0f} performance assignments"
 
     ## jupiter attendance
-    jupiter_attd_summary_df = dfs_dict["jupiter_attd_summary_df"]
-    jupiter_attd_summary_df = jupiter_attd_summary_df[
-        jupiter_attd_summary_df["StudentID"] == StudentID
-    ]
-    jupiter_attd_summary_df = jupiter_attd_summary_df[
-        jupiter_attd_summary_df["Course"] == JupiterCourseCode
-    ]
-    if len(jupiter_attd_summary_df) > 0:
-        I = return_jupiter_attd_summary_graph(jupiter_attd_summary_df)
-    else:
-        I = ""
+    I = dfs_dict["jupiter_attd_charts"].get((StudentID, JupiterCourseCode), "")
     try:
         if int(mark) >= 65:
             mark_fontname = "Helvetica"
@@ -559,11 +567,8 @@ def return_left_flowables(student_row, dfs_dict, marking_period):
     student_RATR_df = dfs_dict["RATR_df"]
     student_RATR_df = student_RATR_df[student_RATR_df["StudentID"] == StudentID]
 
-    RATR_Summary_df = dfs_dict["RATR_Summary_df"]
-    student_RATR_summary_df = RATR_Summary_df[RATR_Summary_df["StudentID"] == StudentID]
-
-    if len(student_RATR_summary_df) > 0:
-        I = return_daily_attd_summary_graph(student_RATR_summary_df)
+    I = dfs_dict["daily_attd_charts"].get(StudentID)
+    if I is not None:
         flowables.append(I)
 
     paragraphs = return_attendance_sentence_paragraphs(student_RATR_df)
@@ -696,139 +701,21 @@ def return_attendance_sentence_paragraphs(student_RATR_df):
     return paragraphs
 
 
-color_discrete_sequence = ["#32CD32", "#FAFA33", "#FF3131"]
-
-
 def return_daily_attd_summary_graph(RATR_Summary_df):
-    y_aspect = 200
-    x_aspect = 600
-    scale = 0.75
-
-    attd_marks = ["Present", "Late", "Absent"]
-    labels_dict = {"P": "Days Present", "L": "Days Late", "A": "Days Absent"}
-    fig = px.bar(
-        RATR_Summary_df,
-        y=RATR_Summary_df.index,
-        x=["P", "L", "A"],
-        labels=labels_dict,
-        title="Overall Daily Attendance<br><sup>Based on p3 attendance</sup>",
-        text_auto="%{x:$.0f Days",
-        # pattern_shape_sequence=[".", "x", "+"],
-        orientation="h",
-        # color="ATTD",
-        color_discrete_sequence=color_discrete_sequence,
-        barmode="stack",
+    student_row = RATR_Summary_df.iloc[0]
+    return reportlab_charts.return_daily_attendance_drawing(
+        student_row.get("P", 0), student_row.get("L", 0), student_row.get("A", 0)
     )
 
-    fig.update_layout(
-        template="simple_white",
-        margin=dict(l=0, r=0, t=50, b=0),
-        height=scale * y_aspect,
-        width=scale * x_aspect,
-        # xaxis_tickmode="array",
-        yaxis_visible=False,
-        yaxis_showticklabels=False,
-        xaxis_visible=False,
-        xaxis_showticklabels=False,
-        title=dict(
-            x=0.5,  # Center the title horizontally (0 is left, 1 is right)
-            y=0.7,  # Adjust vertical position (0 is bottom, 1 is top)
-            xanchor="center",  # Anchor horizontally to the center
-            # yanchor="top",  # Anchor vertically to the top
-            font=dict(size=20),  # Adjust the font size
-        ),
-        legend_title_text="# of Days",
-        legend=dict(
-            orientation="h",  # Make the legend horizontal
-            y=0.2,  # Adjust the vertical position to place it below the chart
-            xanchor="center",  # Center the legend horizontally
-            x=0.5,  # Center the legend horizontally
-        ),
-    )
-    fig.update_traces(
-        textfont_size=28,
-        textangle=0,
-        textposition="auto",
-        cliponaxis=False,
-        marker_line_width=2,
-        marker_line_color="grey",
-        width=0.55,
-    )
-
-    buffer = BytesIO()
-    pio.write_image(fig, buffer)
-
-    I = Image(buffer)
-    width = 4 * inch
-    I.drawHeight = y_aspect / x_aspect * width
-    I.drawWidth = x_aspect / x_aspect * width
-
-    return I
-
 
 def return_jupiter_attd_summary_graph(df):
-    y_aspect = 190
-    x_aspect = 600
-    scale = 0.7
-
-    fig = px.bar(
-        df,
-        y=df.index,
-        x=["present", "late", "absent"],
-        title="<br>Period Attendance",
-        text_auto=True,
-        # pattern_shape_sequence=[".", "x", "+"],
-        orientation="h",
-        # color="ATTD",
-        color_discrete_sequence=color_discrete_sequence,
-        barmode="stack",
-    )
-
-    fig.update_layout(
-        template="simple_white",
-        margin=dict(l=0, r=0, t=5, b=5),
-        height=scale * y_aspect,
-        width=scale * x_aspect,
-        # xaxis_tickmode="array",
-        yaxis_visible=False,
-        yaxis_showticklabels=False,
-        xaxis_visible=False,
-        xaxis_showticklabels=False,
-        legend_title_text="# of Periods",
-        title=dict(
-            x=0.5,  # Center the title horizontally (0 is left, 1 is right)
-            y=0.9,  # Adjust vertical position (0 is bottom, 1 is top)
-            xanchor="center",  # Anchor horizontally to the center
-            # yanchor="top",  # Anchor vertically to the top
-            # font=dict(size=20),  # Adjust the font size
-        ),
-        legend=dict(
-            orientation="h",  # Make the legend horizontal
-            y=0.275,  # Adjust the vertical position to place it below the chart
-            xanchor="center",  # Center the legend horizontally
-            x=0.5,  # Center the legend horizontally
-        ),
-    )
-    fig.update_traces(
-        textfont_size=26,
-        textangle=0,
-        textposition="auto",
-        cliponaxis=False,
-        marker_line_width=2,
-        marker_line_color="grey",
-        width=0.4,
+    student_row = df.iloc[0]
+    return reportlab_charts.return_period_attendance_drawing(
+        student_row.get("present", 0),
+        student_row.get("late", 0),
+        student_row.get("absent", 0),
     )
 
-    buffer = BytesIO()
-    pio.write_image(fig, buffer)
-
-    I = Image(buffer)
-    width = 2.1 * inch
-    I.drawHeight = y_aspect / x_aspect * width
-    I.drawWidth = x_aspect / x_aspect * width
-
-    return I
-
 
 from datetime import timedelta
 
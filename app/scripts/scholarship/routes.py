@@ -4,7 +4,7 @@ from io import BytesIO
 from flask import render_template, request, send_file
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 import app.scripts.scholarship.grade_point_trajectory as grade_point_trajectory
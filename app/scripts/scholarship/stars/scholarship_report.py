@@ -2,12 +2,13 @@ import pandas as pd
 from flask import session
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from io import BytesIO
 
 
 def return_teacher_df():
+    files_df = utils.return_files_df()
     filenames = utils.return_most_recent_report_per_semester(files_df, "6_42")
     df_lst = [utils.return_file_as_df(x) for x in filenames]
     df = pd.concat(df_lst)
@@ -101,6 +102,7 @@ def main(form, request):
 
 
 def return_combined_df_by_report(report_str):
+    files_df = utils.return_files_df()
     filenames = utils.return_most_recent_report_per_semester(files_df, report_str)
 
     df_lst = []
@@ -0,0 +1,286 @@
+"""
+Sharded PDF Builds
+
+Renders a large ReportLab document as independent shards (one per teacher,
+class or block of students) in a process pool, then concatenates the shard
+PDFs page by page or returns them as a ZIP of PDFs. SimpleDocTemplate.build
+is single-threaded, so a full-school class list or report card run otherwise
+runs on one core.
+
+A build is described by a module-level function
+build_shard_flowables(*shard_args, *shared_args) that returns the flowables
+for one shard. shard_args differ per shard (usually that shard's rows).
+shared_args are the same for every shard (lookup frames, marking period, ...)
+and are pickled once per build rather than once per shard. Neither may depend
+on the Flask request: workers have no session.
+
+Each shard is laid out on its own, so shards should end on a page boundary
+(the generators already end every teacher or student with a PageBreak) and
+page numbers restart per shard.
+
+Progress is kept per job_id in-process and served by the api blueprint at
+/api/pdf_jobs/<job_id>, so the form page can poll it while the download
+request is running.
+"""
+
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from PyPDF2 import PdfMerger
+from reportlab.platypus import SimpleDocTemplate
+
+MAX_WORKERS = max((os.cpu_count() or 1) - 1, 1)
+## fewer shards than this are built in the request process; starting the pool
+## costs more than it saves on a single teacher's class list
+MIN_SHARDS_FOR_POOL = 4
+## workers import the app package fresh instead of forking the threaded
+## Flask server
+MP_START_METHOD = "spawn"
+JOB_TTL_SECONDS = 60 * 60
+
+_executor = None
+_executor_lock = threading.Lock()
+
+jobs = {}
+jobs_lock = threading.Lock()
+
+
+def update_progress(job_id, completed, total, status="running"):
+    if job_id is None:
+        return
+    now = time.time()
+    with jobs_lock:
+        for stale_job_id in [
+            key for key, job in jobs.items() if now - job["updated"] > JOB_TTL_SECONDS
+        ]:
+            del jobs[stale_job_id]
+        jobs[job_id] = {
+            "completed": completed,
+            "total": total,
+            "status": status,
+            "updated": now,
+        }
+
+
+def return_progress(job_id):
+    with jobs_lock:
+        job = jobs.get(job_id)
+        return None if job is None else dict(job)
+
+
+def return_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context(MP_START_METHOD),
+            )
+        return _executor
+
+
+def reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+## per-worker copy of the most recent build's shared_args
+_shared_args_cache = {}
+
+
+def _return_shared_args(shared_args_path):
+    if shared_args_path not in _shared_args_cache:
+        with open(shared_args_path, "rb") as f:
+            shared_args = pickle.load(f)
+        _shared_args_cache.clear()
+        _shared_args_cache[shared_args_path] = shared_args
+    return _shared_args_cache[shared_args_path]
+
+
+def render_shard(build_shard_flowables, shard_args, shared_args, doc_kwargs):
+    f = BytesIO()
+    flowables = build_shard_flowables(*shard_args, *shared_args)
+    SimpleDocTemplate(f, **doc_kwargs).build(flowables)
+    return f.getvalue()
+
+
+def _render_shard_in_worker(build_shard_flowables, shard_args, shared_args_path, doc_kwargs):
+    shared_args = _return_shared_args(shared_args_path)
+    return render_shard(build_shard_flowables, shard_args, shared_args, doc_kwargs)
+
+
+def iter_rendered_shards(
+    shards,
+    build_shard_flowables,
+    doc_kwargs,
+    shared_args=(),
+    job_id=None,
+    use_pool=None,
+):
+    """
+    Yields (name, pdf_bytes) for every (name, shard_args) in shards as each
+    shard finishes, which is not necessarily the order of shards.
+    """
+    shards = list(shards)
+    total = len(shards)
+    update_progress(job_id, 0, total)
+    if use_pool is None:
+        use_pool = MAX_WORKERS > 1 and total >= MIN_SHARDS_FOR_POOL
+
+    if not use_pool:
+        for completed, (name, shard_args) in enumerate(shards, start=1):
+            pdf_bytes = render_shard(build_shard_flowables, shard_args, shared_args, doc_kwargs)
+            update_progress(job_id, completed, total)
+            yield name, pdf_bytes
+        update_progress(job_id, total, total, status="done")
+        return
+
+    fd, shared_args_path = tempfile.mkstemp(suffix=".pkl")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(tuple(shared_args), f, protocol=pickle.HIGHEST_PROTOCOL)
+        executor = return_executor()
+        futures = {
+            executor.submit(
+                _render_shard_in_worker,
+                build_shard_flowables,
+                shard_args,
+                shared_args_path,
+                doc_kwargs,
+            ): name
+            for name, shard_args in shards
+        }
+        for completed, future in enumerate(as_completed(futures), start=1):
+            pdf_bytes = future.result()
+            update_progress(job_id, completed, total)
+            yield futures[future], pdf_bytes
+        update_progress(job_id, total, total, status="done")
+    except BrokenProcessPool:
+        reset_executor()
+        update_progress(job_id, 0, total, status="failed")
+        raise
+    except BaseException:
+        update_progress(job_id, 0, total, status="failed")
+        raise
+    finally:
+        os.remove(shared_args_path)
+
+
+def return_merged_pdf(named_pdfs, names):
+    """Concatenates the PDFs of named_pdfs ({name: pdf_bytes}) in the order of
+    names."""
+    merger = PdfMerger()
+    for name in names:
+        merger.append(BytesIO(named_pdfs[name]))
+    f = BytesIO()
+    merger.write(f)
+    merger.close()
+    f.seek(0)
+    return f
+
+
+class _ZipStream:
+    """Write-only file for ZipFile whose bytes are drained by iter_zip."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_zip(named_pdfs):
+    """Yields the bytes of a ZIP archive holding <name>.pdf for every
+    (name, pdf_bytes) in named_pdfs, one member at a time, for a streamed
+    Flask Response."""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, pdf_bytes in named_pdfs:
+            zf.writestr(f"{name}.pdf", pdf_bytes)
+            yield stream.drain()
+    yield stream.drain()
+
+
+def build_sharded_pdf(
+    shards,
+    build_shard_flowables,
+    doc_kwargs,
+    shared_args=(),
+    job_id=None,
+    use_pool=None,
+):
+    """
+    Renders every (name, shard_args) in shards and returns a BytesIO of the
+    shard PDFs concatenated in the order of shards.
+    """
+    shards = list(shards)
+    named_pdfs = dict(
+        iter_rendered_shards(
+            shards,
+            build_shard_flowables,
+            doc_kwargs,
+            shared_args=shared_args,
+            job_id=job_id,
+            use_pool=use_pool,
+        )
+    )
+    return return_merged_pdf(named_pdfs, [name for name, shard_args in shards])
+
+
+def iter_sharded_zip(
+    shards,
+    build_shard_flowables,
+    doc_kwargs,
+    shared_args=(),
+    job_id=None,
+    use_pool=None,
+):
+    """ZIP bytes of one <name>.pdf per shard, streamed as shards finish."""
+    return iter_zip(
+        iter_rendered_shards(
+            shards,
+            build_shard_flowables,
+            doc_kwargs,
+            shared_args=shared_args,
+            job_id=job_id,
+            use_pool=use_pool,
+        )
+    )
+
+
+def return_shards_by_chunks(df, num_of_shards=None, min_rows=25):
+    """Splits df into at most num_of_shards contiguous (name, (chunk_df,))
+    shards of at least min_rows rows, keeping the row order."""
+    if num_of_shards is None:
+        num_of_shards = MAX_WORKERS * 4
+    num_of_shards = max(min(num_of_shards, len(df) // min_rows), 1)
+    bounds = [round(n * len(df) / num_of_shards) for n in range(num_of_shards + 1)]
+    return [
+        (f"{n + 1:03}", (df.iloc[start:end],))
+        for n, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]))
+    ]
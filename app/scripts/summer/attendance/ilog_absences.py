@@ -1,4 +1,5 @@
-import pyautogui
+from app.scripts.lazy import lazy_import
+pyautogui = lazy_import("pyautogui")
 import time
 import pandas as pd
 
@@ -5,7 +5,7 @@ from io import BytesIO
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import current_app, session, redirect, url_for
 
@@ -25,6 +25,7 @@ def main(form, request):
 
 def process_rdal_csv_and_save(filename, class_date):
 
+    files_df = utils.return_files_df()
     rdal_df = pd.read_csv(filename, skiprows=3)
     rdal_df["Date"] = class_date
 
@@ -1,4 +1,4 @@
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 from dotenv import load_dotenv
 from flask import current_app, session
 from io import BytesIO
@@ -11,7 +11,7 @@ import pygsheets
 
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def main():
@@ -20,6 +20,7 @@ def main():
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
 
+    files_df = utils.return_files_df()
     RDAL_files = files_df[
         (files_df["report"] == "RDAL")
         & (files_df["year_and_semester"] == year_and_semester)
@@ -6,7 +6,7 @@ import os
 from flask import render_template, request, send_file, session, current_app
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 
@@ -49,8 +49,7 @@ import app.scripts.summer.attendance.update_RDAL_spreadsheets as update_rdal_spr
 
 @scripts.route("/summer/attendance/update_rdal_spreadsheets")
 def return_summer_school_update_rdal_spreadsheets():
-    update_rdal_spreadsheets.main()
-    return ""
+    return update_rdal_spreadsheets.main()
 
 
 
@@ -1,7 +1,8 @@
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 from dotenv import load_dotenv
 from flask import current_app, session
 from io import BytesIO
+import app.scripts.fan_out as fan_out
 import app.scripts.utils as utils
 from app.scripts.summer.programming import programming_utils
 import numpy as np
@@ -11,7 +12,7 @@ import pygsheets
 
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def main():
@@ -20,6 +21,7 @@ def main():
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
 
+    files_df = utils.return_files_df()
     RDAL_files = files_df[
         (files_df["report"] == "RDAL")
         & (files_df["year_and_semester"] == year_and_semester)
@@ -116,75 +118,26 @@ def main():
     students_df = students_df.merge(rdal_pvt, on=["StudentID"], how="left").fillna("P")
 
     summer_school_attendance_hub_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "summer_school_attendance_hub", year_and_semester
+        utils.return_gsheets_df(), "summer_school_attendance_hub", year_and_semester
     )
 
-    sh = gc.open_by_url(summer_school_attendance_hub_url)
     df = students_df.sort_values(
         by=["consecutive_absences", "total_absences"], ascending=[False, False]
     )
-    sheet_name = "Overall"
-    try:
-        wks = sh.worksheet_by_title(sheet_name)
-    except:
-        wks = sh.add_worksheet(sheet_name)
-    wks.clear()
-    wks.set_dataframe(df, "A1")
-    wks.frozen_rows = 1
-    wks.frozen_cols = 3
-    wks.adjust_column_width(1, 14)
+    sync_and_format(df, summer_school_attendance_hub_url, "Overall", 14, nan="NaN")
 
     summer_school_attendance_hub_df = utils.return_google_sheet_as_dataframe(
         summer_school_attendance_hub_url
     )
 
+    targets = []
     for index, sending_school in summer_school_attendance_hub_df.iterrows():
         gsheet_url = sending_school["URL"]
-        sh = gc.open_by_url(gsheet_url)
         sending_school = sending_school["Sending school"]
 
         df = students_df[students_df["Sending school"] == sending_school]
-        
-        df = df.sort_values(
-            by=["consecutive_absences", "total_absences"], ascending=[False, False]
-        )
-        sheet_name = "Overall"
-        try:
-            wks = sh.worksheet_by_title(sheet_name)
-        except:
-            wks = sh.add_worksheet(sheet_name)
-        wks.clear()
-        wks.set_dataframe(df, "A1")
-        wks.frozen_rows = 1
-        wks.frozen_cols = 3
-        wks.adjust_column_width(1, 14)
-
-        for attd_date in list_of_dates:
-            sheet_name = attd_date
-            cols = [
-                "StudentID",
-                "LastName",
-                "FirstName",
-                "Sending school",
-                "Student DOE Email",
-                "ParentLN",
-                "ParentFN",
-                "Phone",
-                "total_absences",
-                attd_date,
-            ]
-            dff = df[cols]
-            dff = dff[dff[attd_date] == "A"]
-            dff = dff.sort_values(by="total_absences", ascending=False)
-            try:
-                wks = sh.worksheet_by_title(sheet_name)
-            except:
-                wks = sh.add_worksheet(sheet_name)
-            wks.clear()
-            wks.set_dataframe(dff.fillna(""), "A1")
-            wks.frozen_rows = 1
-            wks.frozen_cols = 3
-            wks.adjust_column_width(1, 10)
+        targets.append((index, (gsheet_url, df, list_of_dates)))
+    sending_schools_summary_df = fan_out.run_fan_out(update_sending_school_sheets, targets)
 
     ## put updated attendance on each teacher's spreadsheet
 
@@ -233,7 +186,7 @@ def main():
     )
 
     summer_school_gradebooks_hub_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "summer_school_gradebooks_hub", year_and_semester
+        utils.return_gsheets_df(), "summer_school_gradebooks_hub", year_and_semester
     )
     summer_school_gradebooks_hub_df = utils.return_google_sheet_as_dataframe(
         summer_school_gradebooks_hub_url
@@ -256,6 +209,7 @@ def main():
     ]
 
     sheet_name = "OverallAttendance"
+    targets = []
     for index, gradebook in summer_school_gradebooks_hub_df.iterrows():
         gradebook_url = gradebook["Gradebook URL"]
         teacher_name = gradebook["TeacherName"]
@@ -277,18 +231,60 @@ def main():
         )
         students_by_teacher_df = students_by_teacher_df.sort_values(by=["Period", "Cycle", "LastName", "FirstName"])
 
-        sh = gc.open_by_url(gradebook_url)
-        try:
-            wks = sh.worksheet_by_title(sheet_name)
-        except:
-            wks = sh.add_worksheet(sheet_name)
-        wks.clear()
-        wks.set_dataframe(students_by_teacher_df, "A1")
+        targets.append(
+            (index, (students_by_teacher_df, gradebook_url, sheet_name, 14, "NaN"))
+        )
+    gradebooks_summary_df = fan_out.run_fan_out(sync_and_format, targets)
+
+    sending_schools_summary_df = summer_school_attendance_hub_df[["Sending school"]].join(
+        sending_schools_summary_df.drop(columns=["result"])
+    )
+    gradebooks_summary_df = summer_school_gradebooks_hub_df[["TeacherName"]].join(
+        gradebooks_summary_df
+    )
+    gradebooks_summary_df["result"] = gradebooks_summary_df["result"].str.get("cells_changed")
+    gradebooks_summary_df = gradebooks_summary_df.rename(columns={"result": "cells_changed"})
+    return sending_schools_summary_df.to_html() + gradebooks_summary_df.to_html()
+
+
+def update_sending_school_sheets(gsheet_url, df, list_of_dates):
+    """Overall sheet plus one sheet of absent students per date for one
+    sending school."""
+    df = df.sort_values(
+        by=["consecutive_absences", "total_absences"], ascending=[False, False]
+    )
+    sync_and_format(df, gsheet_url, "Overall", 14, nan="NaN")
+
+    for attd_date in list_of_dates:
+        sheet_name = attd_date
+        cols = [
+            "StudentID",
+            "LastName",
+            "FirstName",
+            "Sending school",
+            "Student DOE Email",
+            "ParentLN",
+            "ParentFN",
+            "Phone",
+            "total_absences",
+            attd_date,
+        ]
+        dff = df[cols]
+        dff = dff[dff[attd_date] == "A"]
+        dff = dff.sort_values(by="total_absences", ascending=False)
+        sync_and_format(dff, gsheet_url, sheet_name, 10)
+
+
+def sync_and_format(df, gsheet_url, sheet_name, num_of_cols_to_fit, nan=""):
+    """Writes only the changed cells of sheet_name; the header is frozen and
+    the columns refit only when something was written."""
+    summary = utils.sync_df_to_sheet(df, gsheet_url, sheet=sheet_name, nan=nan)
+    if summary["mode"] != "unchanged":
+        wks = utils.gsheets_gateway.gateway.return_worksheet(gsheet_url, sheet_name)
         wks.frozen_rows = 1
         wks.frozen_cols = 3
-        wks.adjust_column_width(1, 14)
-
-    return True
+        wks.adjust_column_width(1, num_of_cols_to_fit)
+    return summary
 
 
 def return_consective_absences(absences_lst):
@@ -1,6 +1,6 @@
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileField, FileRequired
-from wtforms import DateField, SelectField, StringField, IntegerField
+from wtforms import DateField, SelectField, StringField, IntegerField, HiddenField
 from wtforms.validators import DataRequired, Regexp, InputRequired
 from wtforms.widgets import NumberInput
 
@@ -13,6 +13,16 @@ class TeacherSelectForm(FlaskForm):
     teacher = SelectField()
 
 
+class ClassListWithPhotosForm(TeacherSelectForm):
+    output = SelectField(
+        "Output",
+        choices=[("pdf", "Single PDF"), ("zip", "ZIP of PDFs by teacher")],
+        default="pdf",
+    )
+    ## set by the form page so it can poll /api/pdf_jobs/<job_id>
+    job_id = HiddenField()
+
+
 class ZippedPhotosForm(FlaskForm):
     mapping_file = FileField(
         "Upload SmartPass Mapping File",
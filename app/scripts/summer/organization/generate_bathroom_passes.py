@@ -12,10 +12,11 @@ from reportlab.platypus import Paragraph, PageBreak, Spacer, Image, Table, Table
 from reportlab.platypus import SimpleDocTemplate
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
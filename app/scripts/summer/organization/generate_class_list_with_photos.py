@@ -16,7 +16,9 @@ from reportlab.platypus import SimpleDocTemplate
 from reportlab.platypus.flowables import BalancedColumns
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+import app.scripts.sharded_pdf as sharded_pdf
+from app.scripts import scripts
 from app.scripts.summer import utils as summer_utils
 
 styles = getSampleStyleSheet()
@@ -39,8 +41,17 @@ styles.add(
         )
     )
 
+DOC_KWARGS = dict(
+    pagesize=letter,
+    topMargin=0.25 * inch,
+    leftMargin=0.5 * inch,
+    rightMargin=0.5 * inch,
+    bottomMargin=0.25 * inch,
+)
+
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -54,35 +65,41 @@ def main(form, request):
     
 
 
-    f = BytesIO()
-    my_doc = SimpleDocTemplate(
-        f,
-        pagesize=letter,
-        topMargin=0.25 * inch,
-        leftMargin=0.5 * inch,
-        rightMargin=0.5 * inch,
-        bottomMargin=0.25 * inch,
-    )
-
-
     student_programs_df = summer_utils.return_summer_class_lists()
 
     
     TEACHER_NAME = form.teacher.data
     if TEACHER_NAME == "ALL":
-        download_name = f"Summer{school_year+1}_ClassList_With_Photos.pdf"
+        download_name = f"Summer{school_year+1}_ClassList_With_Photos"
     else:
-        download_name = f"Summer{school_year+1}_ClassList_With_Photos_{TEACHER_NAME}.pdf"
+        download_name = f"Summer{school_year+1}_ClassList_With_Photos_{TEACHER_NAME}"
         student_programs_df = student_programs_df[
             student_programs_df["Teacher1"] == TEACHER_NAME
         ]
 
-    flowables = []
-    cols = ['StudentID','LastName','FirstName','photo_filename',"school_name"]
-    cols_header = ['StudentID','Last Name', 'First Name', 'Photo', 'Sending School']
-    colwidths = [1*inch,1.5*inch,1.5*inch,0.75*inch,2.25*inch]
+    ## one shard per teacher, built in parallel by sharded_pdf
+    shards = [
+        (teacher, (teacher_df,))
+        for teacher, teacher_df in student_programs_df.groupby("Teacher1")
+    ]
+    shared_args = (school_year, generated_string)
+    job_id = form.job_id.data or None
+
+    if form.output.data == "zip":
+        f = sharded_pdf.iter_sharded_zip(
+            shards, return_teacher_flowables, DOC_KWARGS, shared_args, job_id=job_id
+        )
+        return f, f"{download_name}.zip"
 
-    for (teacher,period,cycle), class_list_df in student_programs_df.groupby(["Teacher1","Period","Cycle"]):
+    f = sharded_pdf.build_sharded_pdf(
+        shards, return_teacher_flowables, DOC_KWARGS, shared_args, job_id=job_id
+    )
+    return f, f"{download_name}.pdf"
+
+
+def return_teacher_flowables(teacher_df, school_year, generated_string):
+    flowables = []
+    for (teacher,period,cycle), class_list_df in teacher_df.groupby(["Teacher1","Period","Cycle"]):
         course = class_list_df.iloc[0]["Course Name"]
         paragraph = Paragraph(
             f"Summer School {int(school_year)+1} at HSFI --- {generated_string}", styles["Heading2"]
@@ -98,12 +115,7 @@ def main(form, request):
 
         flowables.append(PageBreak())
 
-    my_doc.build(flowables)
-
-    f.seek(0)
-
-    
-    return f, download_name
+    return flowables
 
 def return_balanced_grid_of_class_list(class_list_df):
     
@@ -116,7 +128,7 @@ def return_balanced_grid_of_class_list(class_list_df):
         StudentID = student['StudentID']
         
         try:
-            I = Image(photo_path)
+            I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, 1.2))
             I.drawHeight = 1.2 * inch
             I.drawWidth = 1.2 * inch
             I.hAlign = "CENTER"
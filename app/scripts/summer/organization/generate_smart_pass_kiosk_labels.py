@@ -1,4 +1,4 @@
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 from flask import current_app, session
 from io import BytesIO
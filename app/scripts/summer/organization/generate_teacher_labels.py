@@ -1,4 +1,4 @@
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 from flask import current_app, session
 from io import BytesIO
@@ -41,6 +41,7 @@ specs = labels.Specification(
 )
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
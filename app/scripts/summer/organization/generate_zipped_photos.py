@@ -5,7 +5,7 @@ import zipfile
 from io import BytesIO
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 from flask import current_app, session
 
@@ -20,7 +20,7 @@ def main(form, request):
 
     students_lst = mapping_df["StudentID"]
 
-    df = photos_df[photos_df["StudentID"].isin(students_lst)]
+    df = utils.return_photos_df()[utils.return_photos_df()["StudentID"].isin(students_lst)]
     df = df.drop_duplicates(subset=["StudentID"])
 
     batch_size = form.batch_size.data
@@ -1,5 +1,5 @@
 
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 from dotenv import load_dotenv
 from flask import current_app, session
 from io import BytesIO
@@ -18,6 +18,7 @@ from werkzeug.utils import secure_filename
 from zipfile import ZipFile
 
 
+import app.scripts.pdf_page_index as pdf_page_index
 import app.scripts.utils as utils
 import datetime as dt
 import numpy as np
@@ -28,13 +29,14 @@ import pygsheets
 import PyPDF2
 import re
 
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 load_dotenv()
 
 
 from app.scripts.summer.programming import programming_utils
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -43,30 +45,9 @@ def main(form, request):
     orientation_flag = form.student_records_pdf_orientation.data
     distribution_mode_flag = form.distribution_mode.data
 
-    StudentID_Regex = r"\d{9}"
-    StudentIDRegex = re.compile(StudentID_Regex)
-
-
-
-    pdfReader = PyPDF2.PdfReader(PDF)
-    num_of_pages = pdfReader.pages
-
-    StudentID_dict = {}
-
-    for page_num, page in enumerate(num_of_pages):
-        page_text = page.extract_text()
-        page_text = page_text.replace(" ", "")
-
-        mo = StudentIDRegex.search(page_text)
-
-        if mo:
-            StudentID = mo.group()
-            StudentID = int(StudentID)
-
-            if StudentID_dict.get(StudentID):
-                StudentID_dict[StudentID].append(page_num)
-            else:
-                StudentID_dict[StudentID] = [page_num]
+    pdf_bytes = pdf_page_index.return_pdf_bytes(PDF)
+    pdfReader = pdf_page_index.return_pdf_reader(pdf_bytes)
+    StudentID_dict = pdf_page_index.return_StudentID_dict(pdf_bytes, pdfReader=pdfReader)
 
     
     school_year = session["school_year"]
@@ -4,9 +4,10 @@ from io import BytesIO
 import os
 
 from flask import render_template, request, send_file, session, current_app
+from flask import Response, stream_with_context
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 
@@ -103,10 +104,13 @@ def return_summer_school_teacher_labels():
 import app.scripts.summer.organization.generate_class_list_with_photos as generate_class_list_with_photos
 
 
+from app.scripts.summer.organization.forms import ClassListWithPhotosForm
+
+
 @scripts.route("/summer/organization/class_list_with_photos", methods=["GET", "POST"])
 def return_summer_school_class_list_with_photos():
     if request.method == "GET":
-        form = TeacherSelectForm()
+        form = ClassListWithPhotosForm()
         teachers = json.loads(api.teachers.return_teachers().get_data().decode("utf-8"))
         form.teacher.choices = [(i, i) for i in teachers]
         form.teacher.choices.insert(0, ("ALL", "ALL"))
@@ -115,10 +119,16 @@ def return_summer_school_class_list_with_photos():
             form=form,
         )
     else:
-        form = TeacherSelectForm(request.form)
+        form = ClassListWithPhotosForm(request.form)
         school_year = session["school_year"]
         f, download_name = generate_class_list_with_photos.main(form, request)
 
+        if download_name.endswith(".zip"):
+            return Response(
+                stream_with_context(f),
+                mimetype="application/zip",
+                headers={"Content-Disposition": f"attachment;filename={download_name}"},
+            )
         return send_file(
             f,
             as_attachment=True,
@@ -5,7 +5,7 @@ from io import BytesIO
 from zipfile import ZipFile
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 from flask import current_app, session
 
@@ -38,6 +38,7 @@ specs = labels.Specification(
 
 
 def main():
+    files_df = utils.return_files_df()
     flowables_dict = {}
 
     school_year = session["school_year"]
@@ -106,7 +107,7 @@ def main():
 
     student_classes_df = cr_1_01_df.merge(cr_s_01_df, on=["StudentID"], how="left")
     student_classes_df = student_classes_df.merge(
-        photos_df, on=["StudentID"], how="left"
+        utils.return_photos_df(), on=["StudentID"], how="left"
     )
     group_by_cols = ["LastName", "FirstName", "StudentID"]
 
@@ -5,7 +5,8 @@ from io import BytesIO
 from zipfile import ZipFile
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+from app.scripts import scripts
 
 from flask import current_app, session
 
@@ -49,6 +50,7 @@ styles.add(
 
 
 def main(lst_of_students=[]):
+    files_df = utils.return_files_df()
     flowables_dict = {}
 
     school_year = session["school_year"]
@@ -122,7 +124,7 @@ def main(lst_of_students=[]):
 
     student_classes_df = cr_1_01_df.merge(cr_s_01_df, on=["StudentID"], how="left")
     student_classes_df = student_classes_df.merge(
-        photos_df, on=["StudentID"], how="left"
+        utils.return_photos_df(), on=["StudentID"], how="left"
     )
     group_by_cols = ["Sending school", "LastName", "FirstName", "StudentID"]
 
@@ -247,7 +249,7 @@ def return_student_program_flowables(classes_df, flowables_dict):
     flowables.append(paragraph)
 
     try:
-        I = Image(photo_path)
+        I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, 2.75))
         I.drawHeight = 2.75 * inch
         I.drawWidth = 2.75 * inch
         I.hAlign = "CENTER"
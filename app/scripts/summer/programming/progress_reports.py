@@ -16,10 +16,10 @@ from flask import current_app, session
 from dotenv import load_dotenv
 import app.scripts.utils as utils
 import pygsheets
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def main(form, request):
@@ -29,12 +29,13 @@ def main(form, request):
     sending_school = form.data["sending_school"]
 
     summer_school_gradebooks_hub_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "summer_school_gradebooks_hub", year_and_semester
+        utils.return_gsheets_df(), "summer_school_gradebooks_hub", year_and_semester
     )
 
-    gradebook_df = utils.return_google_sheet_as_dataframe(
-        summer_school_gradebooks_hub_url, sheet="AllStudentsBySchool"
+    dfs = utils.return_google_sheets_as_dataframes(
+        summer_school_gradebooks_hub_url, ["AllStudentsBySchool", "AllStudentsAttendance"]
     )
+    gradebook_df = dfs["AllStudentsBySchool"]
     gradebook_df = gradebook_df.dropna(subset="FinalMark")
 
     path = os.path.join(current_app.root_path, f"data/DOE_High_School_Directory.csv")
@@ -52,9 +53,7 @@ def main(form, request):
     if sending_school != "ALL":
         gradebook_df = gradebook_df[gradebook_df["Sending school"] == sending_school]
 
-    attendance_df = utils.return_google_sheet_as_dataframe(
-        summer_school_gradebooks_hub_url, sheet="AllStudentsAttendance"
-    )
+    attendance_df = dfs["AllStudentsAttendance"]
 
     student_cols = [
         "StudentID",
@@ -10,16 +10,18 @@ import os
 import numpy as np
 
 import datetime as dt
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
+import app.scripts.fan_out as fan_out
 import app.scripts.utils as utils
 
 from app.scripts.summer.programming import programming_utils
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -114,7 +116,7 @@ def main():
     ## get gsheet
 
     summer_school_gradebooks_hub_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "summer_school_gradebooks_hub", year_and_semester
+        utils.return_gsheets_df(), "summer_school_gradebooks_hub", year_and_semester
     )
 
     summer_school_gradebooks_hub_df = utils.return_google_sheet_as_dataframe(
@@ -122,26 +124,29 @@ def main():
     )
 
 
+    targets = []
     for index, gradebook in summer_school_gradebooks_hub_df.iterrows():
         gradebook_url = gradebook["Gradebook URL"]
         teacher_name = gradebook["TeacherName"]
         df = cr_1_01_df[cr_1_01_df["Teacher1"] == teacher_name]
         df = df[teacher_cols]
         df = df.sort_values(by=["Period", "Cycle", "LastName", "FirstName"])
+        targets.append((index, (gradebook_url, df)))
 
-        sh = gc.open_by_url(gradebook_url)
-        try:
-            wks = sh.worksheet_by_title('RecommendedPrograms')
-        except:
-            wks = sh.add_worksheet('RecommendedPrograms')
-        wks.clear()
-        wks.set_dataframe(df.fillna(""), "A1")
-        wks.frozen_rows = 1
-        wks.frozen_cols = 3
-
-        wks.adjust_column_width(1, 18)
+    summary_df = fan_out.run_fan_out(update_recommended_programs_sheet, targets)
+    summer_school_gradebooks_hub_df["Status"] = summary_df["status"]
+    summer_school_gradebooks_hub_df["CellsChanged"] = summary_df["result"]
+    summer_school_gradebooks_hub_df["Error"] = summary_df["error"]
 
+    return summer_school_gradebooks_hub_df.to_html()
 
 
+def update_recommended_programs_sheet(gradebook_url, df):
+    summary = utils.sync_df_to_sheet(df, gradebook_url, sheet='RecommendedPrograms')
+    if summary["mode"] != "unchanged":
+        wks = utils.gsheets_gateway.gateway.return_worksheet(gradebook_url, 'RecommendedPrograms')
+        wks.frozen_rows = 1
+        wks.frozen_cols = 3
 
-    return summer_school_gradebooks_hub_df.to_html()
+        wks.adjust_column_width(1, 18)
+    return summary["cells_changed"]
@@ -10,16 +10,17 @@ import os
 import numpy as np
 
 import datetime as dt
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.summer.programming import programming_utils
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -101,7 +102,7 @@ def main():
     ## get gsheet
 
     summer_school_gradebooks_hub_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "summer_school_gradebooks_hub", year_and_semester
+        utils.return_gsheets_df(), "summer_school_gradebooks_hub", year_and_semester
     )
 
     summer_school_gradebooks_hub_df = utils.return_google_sheet_as_dataframe(
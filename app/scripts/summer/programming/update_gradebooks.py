@@ -10,16 +10,18 @@ import os
 import numpy as np
 
 import datetime as dt
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
+import app.scripts.fan_out as fan_out
 import app.scripts.utils as utils
 
 from app.scripts.summer.programming import programming_utils
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -76,7 +78,7 @@ def main(form, request):
     ## get gsheet
 
     summer_school_gradebooks_hub_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "summer_school_gradebooks_hub", year_and_semester
+        utils.return_gsheets_df(), "summer_school_gradebooks_hub", year_and_semester
     )
 
     summer_school_gradebooks_hub_df = utils.return_google_sheet_as_dataframe(
@@ -116,6 +118,9 @@ def main(form, request):
         "Phone",
         "DailyGrade",
     ]
+    ## the gradebooks are updated concurrently; only the cells that differ
+    ## from what is already in each one are written
+    targets = []
     for index, gradebook in summer_school_gradebooks_hub_df.iterrows():
         
         gradebook_url = gradebook["Gradebook URL"]
@@ -125,15 +130,48 @@ def main(form, request):
         df = cr_1_01_df[cr_1_01_df["Teacher1"] == teacher_name]
         df = df[teacher_cols]
         df = df.sort_values(by=["Period", "Cycle", "LastName", "FirstName"])
+        targets.append((index, (gradebook_url, sheet_name, df)))
 
-        sh = gc.open_by_url(gradebook_url)
-        try:
-            wks = sh.worksheet_by_title(sheet_name)
-        except:
-            wks = sh.add_worksheet(sheet_name)
-        print(sh)
-        wks.clear()
-        wks.set_dataframe(df.fillna(""), "A1")
+    summary_df = fan_out.run_fan_out(update_teacher_gradebook, targets)
+    summer_school_gradebooks_hub_df["Status"] = summary_df["status"]
+    summer_school_gradebooks_hub_df["Mode"] = summary_df["result"].str.get("mode")
+    summer_school_gradebooks_hub_df["CellsChanged"] = summary_df["result"].str.get(
+        "cells_changed"
+    )
+    summer_school_gradebooks_hub_df["Error"] = summary_df["error"]
+
+    ## all students
+    df = cr_1_01_df
+    df = df[df["Course"].str[0] != "Z"]
+    df = df[df["Period"].isin([1, 2, 3])]
+
+    df = df.sort_values(by=["school_name", "LastName", "FirstName", "Period"])
+    summary = utils.sync_df_to_sheet(
+        df[combined_cols].drop(columns=["DailyGrade"]),
+        summer_school_gradebooks_hub_url,
+        sheet="AllStudentsBySchool",
+        clear_extra_columns=False,
+    )
+    if summary["mode"] != "unchanged":
+        wks = utils.gsheets_gateway.gateway.return_worksheet(
+            summer_school_gradebooks_hub_url, "AllStudentsBySchool"
+        )
+        wks.adjust_column_width(1, 13)
+        wks.frozen_rows = 1
+        wks.frozen_cols = 7
+
+    return summer_school_gradebooks_hub_df.to_html()
+
+
+def update_teacher_gradebook(gradebook_url, sheet_name, df):
+    """Writes the day's sheet and the current roster (the first worksheet) of
+    one teacher's gradebook. Returns how the day's sheet was synced (full,
+    diff or unchanged) and the number of cells changed across both sheets.
+    Formatting is applied to new worksheets and refreshed on change."""
+    gateway = utils.gsheets_gateway.gateway
+    summary = utils.sync_df_to_sheet(df, gradebook_url, sheet=sheet_name)
+    if summary["mode"] == "full":
+        wks = gateway.return_worksheet(gradebook_url, sheet_name)
         wks.frozen_rows = 1
         wks.frozen_cols = 3
         wks.set_data_validation(
@@ -146,27 +184,20 @@ def main(form, request):
             showCustomUi=True,
         )
         wks.adjust_column_width(1, 14)
-
-        # update current roster
-        wks = sh.worksheet(0)
-        wks.clear("A1", "M1000")
-        wks.set_dataframe(df.drop(columns=["DailyGrade"]).fillna(""), "A1")
+    mode = summary["mode"]
+    cells_changed = summary["cells_changed"]
+
+    # update current roster, leaving columns past M alone
+    roster_sheet = gateway.return_sheet_titles(gradebook_url)[0]
+    summary = utils.sync_df_to_sheet(
+        df.drop(columns=["DailyGrade"]),
+        gradebook_url,
+        sheet=roster_sheet,
+        clear_extra_columns=False,
+    )
+    if summary["mode"] != "unchanged":
+        wks = gateway.return_worksheet(gradebook_url, roster_sheet)
         wks.adjust_column_width(1, 13)
         wks.frozen_rows = 1
         wks.frozen_cols = 3
-
-    ## all students
-    sh = gc.open_by_url(summer_school_gradebooks_hub_url)
-    df = cr_1_01_df
-    df = df[df["Course"].str[0] != "Z"]
-    df = df[df["Period"].isin([1, 2, 3])]
-
-    df = df.sort_values(by=["school_name", "LastName", "FirstName", "Period"])
-    wks = sh.worksheet_by_title("AllStudentsBySchool")
-    wks.clear("A1", "M4000")
-    wks.set_dataframe(df[combined_cols].drop(columns=["DailyGrade"]).fillna(""), "A1")
-    wks.adjust_column_width(1, 13)
-    wks.frozen_rows = 1
-    wks.frozen_cols = 7
-
-    return summer_school_gradebooks_hub_df.to_html()
+    return {"mode": mode, "cells_changed": cells_changed + summary["cells_changed"]}
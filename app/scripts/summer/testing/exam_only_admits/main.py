@@ -1,14 +1,13 @@
-import pyautogui
+from app.scripts.lazy import lazy_import
+pyautogui = lazy_import("pyautogui")
 import time
 import pandas as pd
 
-screen_width, screen_height = pyautogui.size()
 
-# Common regions:
-top_half = (0, 0, screen_width, screen_height // 2)
-bottom_half = (0, screen_height // 2, screen_width, screen_height // 2)
-left_half = (0, 0, screen_width // 2, screen_height)
-right_half = (screen_width // 2, 0, screen_width // 2, screen_height)
+def return_right_half():
+    screen_width, screen_height = pyautogui.size()
+    return (screen_width // 2, 0, screen_width // 2, screen_height)
+
 
 def main(form, request):    # Extract form data
     
@@ -68,13 +67,13 @@ def traf_atsum(StudentID):
     ## check if already admitted to a summer program and if admitted elsewhere, press F3 to quit and move on to the next student
     ## search for TRAF_warning.png on the screen
     try:
-        pyautogui.locateOnScreen(COURT_ORDER_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(COURT_ORDER_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         pyautogui.press("f5")
     except pyautogui.ImageNotFoundException:
         pass
     
     try:
-        pyautogui.locateOnScreen(TRAF_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(TRAF_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
 
         # transition to the SIAD screen
         pyautogui.press("f3")
@@ -82,7 +81,7 @@ def traf_atsum(StudentID):
         pyautogui.press("enter")
         
         try:
-            pyautogui.locateOnScreen(ALREADY_SHARED_INSTRUCTION_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+            pyautogui.locateOnScreen(ALREADY_SHARED_INSTRUCTION_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
             print('hi')
             status_dict['Status'] = 'Already Admitted via SIAD'
             return status_dict
@@ -101,7 +100,7 @@ def traf_atsum(StudentID):
         pass
     ## check if already transferred into summer school by looking for the TRAF_ALREADY_TRANSFERRED_IMG_PATH and moving on to the the next student by returning ''
     try:
-        pyautogui.locateOnScreen(TRAF_ALREADY_TRANSFERRED_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(TRAF_ALREADY_TRANSFERRED_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         print(f"Student {StudentID} has already been transferred into summer school.")
         status_dict['Status'] = 'Already Transferred into this summer school'
         return status_dict
@@ -109,7 +108,7 @@ def traf_atsum(StudentID):
         pass
     ## check if screen displays STUDENT NOT FOUND image               
     try:
-        pyautogui.locateOnScreen(STUDENT_NOT_FOUND_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(STUDENT_NOT_FOUND_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         
         status_dict['Status'] = 'Student Not Found with this StudentID number'
         return status_dict
@@ -118,7 +117,7 @@ def traf_atsum(StudentID):
     ## check if pending discharge
     try:
         PENDING_DISCHARGE_IMG_PATH = "app/scripts/summer/testing/exam_only_admits/images/PENDING_DISCHARGE.png"
-        pyautogui.locateOnScreen(PENDING_DISCHARGE_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(PENDING_DISCHARGE_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         # pyautogui.type("5")
         # pyautogui.press("enter")
         status_dict['Status'] = 'Pending Discharge'
@@ -130,7 +129,7 @@ def traf_atsum(StudentID):
     ## determine number of fields to tab through
     num_of_tabs = 21
     try:
-        pyautogui.locateOnScreen(ETHNIC_STATUS_FIELD_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(ETHNIC_STATUS_FIELD_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         num_of_tabs = 22
     except pyautogui.ImageNotFoundException:
         pass    
@@ -145,7 +144,7 @@ def traf_atsum(StudentID):
         pyautogui.press("tab")
     ### check if student is a rising 9th grader, and if so, type "190" then "09"
     try:
-        pyautogui.locateOnScreen(RISING_9TH_GRADER_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(RISING_9TH_GRADER_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         pyautogui.write("190")
         pyautogui.write("09")
     except pyautogui.ImageNotFoundException:
@@ -157,7 +156,7 @@ def traf_atsum(StudentID):
 
     ### check to see if proof of age is required, and if so, type "1" and press f2"
     try:
-        pyautogui.locateOnScreen(PROOF_OF_AGE_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(PROOF_OF_AGE_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         # type the proof of age
         pyautogui.write("1")
         # press f2 to save
@@ -167,7 +166,7 @@ def traf_atsum(StudentID):
 
     ### check to see if place of birth is required, and if so, type "88" and press f2"
     try:
-        pyautogui.locateOnScreen(PLACE_OF_BIRTH_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(PLACE_OF_BIRTH_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         # type the place of birth
         pyautogui.write("88")
         # press f2 to save
@@ -177,7 +176,7 @@ def traf_atsum(StudentID):
 
     ### check to see if GEO CODE is required, and if so, type "88" and press f2"
     try:
-        pyautogui.locateOnScreen(GEOGRAPHY_CODE_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(GEOGRAPHY_CODE_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         # type the GEO CODE
         pyautogui.write("88")
         # press f2 to save
@@ -187,7 +186,7 @@ def traf_atsum(StudentID):
 
     ### check to see if HOME LANG is required, and if so, type "NO" and press f2"
     try:
-        pyautogui.locateOnScreen(HOME_LANG_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(HOME_LANG_NOT_VALID_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         # type the HOME LANG
         pyautogui.write("NO")
         # press f2 to save
@@ -197,7 +196,7 @@ def traf_atsum(StudentID):
 
     ### check to see if DBN is required, and if so, type the DBN number and press f2
     try:
-        pyautogui.locateOnScreen(DBN_REQUIRED_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(DBN_REQUIRED_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         print(f"DBN is required for Student {StudentID}.")
         # type the DBN number
         pyautogui.write("02M600")  # Replace with actual DBN if needed
@@ -215,7 +214,7 @@ def traf_atsum(StudentID):
 
     ### check to see if NON_DOE CODE REQUIRED is required, and if so, type the 99999 and press f2
     try:
-        pyautogui.locateOnScreen(NON_DOE_CODE_REQUIRED_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(NON_DOE_CODE_REQUIRED_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         print(f"NON_DOE_CODE is required for Student {StudentID}.")
         # type the NON_DOE_CODE
         pyautogui.write("99999")  # Replace with actual NON_DOE_CODE if needed
@@ -226,7 +225,7 @@ def traf_atsum(StudentID):
 
     ### check to see if a TRAF_PROG_CODE_ERROR, and if so, correct it by pressing the delete key twice and pressing f2
     try:
-        pyautogui.locateOnScreen(TRAF_PROG_CODE_ERROR_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(TRAF_PROG_CODE_ERROR_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         pyautogui.press("delete")
         pyautogui.press("delete")
         pyautogui.press("f2")
@@ -235,7 +234,7 @@ def traf_atsum(StudentID):
     
     ## check if there was an issue with a field that lead to typing over the DBN field and just abort
     try:
-        pyautogui.locateOnScreen(INVALID_DBN_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(INVALID_DBN_WARNING_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         pyautogui.press("f3")
         return status_dict
     except pyautogui.ImageNotFoundException:
@@ -243,7 +242,7 @@ def traf_atsum(StudentID):
 
     ## check if admit was successful based on pyautogui.locateonscreen to the TRAF_success.png file 
     try:
-        pyautogui.locateOnScreen(TRAF_SUCCESS_IMG_PATH,grayscale=True,confidence=0.80,region=right_half)
+        pyautogui.locateOnScreen(TRAF_SUCCESS_IMG_PATH,grayscale=True,confidence=0.80,region=return_right_half())
         print(f"Student {StudentID} admitted successfully.")
         status_dict['Status'] = 'Student Admitted Successfully'
         return status_dict
@@ -10,7 +10,7 @@ from werkzeug.utils import secure_filename
 import app.scripts.utils as utils
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.summer.testing.exam_only_admits.forms import ExamOnlyAdmitForm
 from app.scripts.summer.testing.exam_only_admits import main as exam_only_admits_main
@@ -10,13 +10,14 @@ from reportlab.platypus import SimpleDocTemplate
 
 import pandas as pd
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 import os
 from io import BytesIO
 from flask import current_app, session
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
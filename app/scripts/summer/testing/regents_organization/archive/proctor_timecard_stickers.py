@@ -1,6 +1,6 @@
 from flask import session, current_app
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 import pandas as pd
 import os
@@ -15,7 +15,7 @@ from reportlab.platypus import SimpleDocTemplate
 from reportlab.platypus.flowables import BalancedColumns
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 from app.scripts.summer import utils as summer_utils
 
 styles = getSampleStyleSheet()
@@ -14,7 +14,7 @@ from flask import (
 )
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.summer.testing.regents_organization.forms import *
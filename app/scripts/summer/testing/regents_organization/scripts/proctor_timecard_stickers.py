@@ -1,6 +1,6 @@
 from flask import session, current_app
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 
 import pandas as pd
 import os
@@ -48,7 +48,7 @@ def main():
         month = "August"
 
 
-    proctors_google_sheet = utils.return_gsheet_url_by_title(gsheets_df,'regents_exam_book',year_and_semester=year_and_semester)
+    proctors_google_sheet = utils.return_gsheet_url_by_title(utils.return_gsheets_df(),'regents_exam_book',year_and_semester=year_and_semester)
 
     proctors_df = utils.return_google_sheet_as_dataframe(proctors_google_sheet, sheet='Proctors')
     proctors_df = proctors_df.fillna('')
@@ -1,6 +1,7 @@
 from flask import session, current_app
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+from app.scripts import scripts
 
 import pandas as pd
 import os
@@ -233,7 +234,7 @@ def return_balanced_grid_of_class_list(class_list_df,header_info):
             sending_school = student['Sending school']
 
             try:
-                I = Image(photo_path)
+                I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, 1))
                 I.drawHeight = 1 * inch
                 I.drawWidth = 1 * inch
                 I.hAlign = "CENTER"
@@ -9,13 +9,13 @@ import numpy as np
 from io import BytesIO
 
 import datetime as dt
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.summer.programming import programming_utils
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 from reportlab.graphics import shapes
@@ -53,7 +53,7 @@ def main():
         month = "August"
 
 
-    proctors_google_sheet = utils.return_gsheet_url_by_title(gsheets_df,'regents_exam_book',year_and_semester=year_and_semester)
+    proctors_google_sheet = utils.return_gsheet_url_by_title(utils.return_gsheets_df(),'regents_exam_book',year_and_semester=year_and_semester)
 
     proctors_df = utils.return_google_sheet_as_dataframe(proctors_google_sheet, sheet='Proctors')
     proctors_df = proctors_df.fillna('')
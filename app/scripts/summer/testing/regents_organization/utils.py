@@ -1,6 +1,6 @@
 from flask import session, current_app
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 
 import pandas as pd
 import os
@@ -20,6 +20,7 @@ def return_hub_location(section_row):
 
 
 def return_processed_registrations():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -76,7 +77,7 @@ def return_processed_registrations():
     cr_1_08_df = cr_1_08_df.merge(cr_s_01_df, on=["StudentID"], how="left").fillna({"Sending school":'X'})
 
     ## attach photos
-    cr_1_08_df = cr_1_08_df.merge(photos_df[['StudentID','photo_filename']], on=["StudentID"], how="left")
+    cr_1_08_df = cr_1_08_df.merge(utils.return_photos_df()[['StudentID','photo_filename']], on=["StudentID"], how="left")
 
     cr_1_08_df = cr_1_08_df.drop_duplicates(subset=['StudentID','Course'])
     return cr_1_08_df
@@ -10,7 +10,7 @@ import os
 import numpy as np
 
 import datetime as dt
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.summer.programming import programming_utils
@@ -18,6 +18,7 @@ from app.scripts.summer.programming import programming_utils
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -2,7 +2,7 @@ import pandas as pd
 import glob
 from flask import session, current_app
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 import app.scripts.summer.testing.regents_scheduling.utils as regents_utils
 import pandas as pd
 import os
@@ -62,6 +62,7 @@ styles.add(
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -23,12 +23,14 @@ from flask import session, current_app
 
 from app.scripts.reportlab_utils import reportlab_letter_head, reportlab_closing
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+from app.scripts import scripts
 
 styles = getSampleStyleSheet()
 
 
 def main(form, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -56,7 +58,7 @@ def main(form, request):
         regents_calendar_df, left_on=["Course"], right_on=["CourseCode"], how="left"
     )
     cr_1_08_df = cr_1_08_df.merge(section_properties_df, on=["Section"], how="left")
-    cr_1_08_df = cr_1_08_df.merge(photos_df, on=["StudentID"], how="left")
+    cr_1_08_df = cr_1_08_df.merge(utils.return_photos_df(), on=["StudentID"], how="left")
 
     ## attach DBN
     filename = utils.return_most_recent_report_by_semester(
@@ -199,7 +201,7 @@ def generate_student_letter(exams_df):
     try:
 
         photo_path = exams_df.iloc[0, :]["photo_filename"]
-        I = Image(photo_path)
+        I = Image(photo_thumbnails.return_thumbnail_filename(photo_path, 2.75))
         I.drawHeight = 2.75 * inch
         I.drawWidth = 2.75 * inch
         I.hAlign = "CENTER"
@@ -6,7 +6,7 @@ import os
 from flask import render_template, request, send_file, session, current_app
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 import app.scripts.summer.utils as summer_utils
 
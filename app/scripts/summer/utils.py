@@ -8,16 +8,17 @@ import os
 import numpy as np
 
 import datetime as dt
-from app.scripts import scripts, files_df, photos_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.summer.programming import programming_utils
 
 load_dotenv()
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
+gc = utils.gc
 
 
 def return_summer_class_lists():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -66,7 +67,7 @@ def return_summer_class_lists():
     cr_1_01_df = cr_1_01_df.merge(
         cr_s_01_df[["StudentID", "school_name"]], on=["StudentID"], how="left"
     )
-    cr_1_01_df = cr_1_01_df.merge(photos_df, on=["StudentID"], how="left")
+    cr_1_01_df = cr_1_01_df.merge(utils.return_photos_df(), on=["StudentID"], how="left")
 
     cr_1_01_df = cr_1_01_df.drop_duplicates(subset=["StudentID", "Course"])
     cr_1_01_df = cr_1_01_df[cr_1_01_df["Course"].str[0] != "Z"]
@@ -74,6 +75,7 @@ def return_summer_class_lists():
 
 
 def return_sending_school_list():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -4,9 +4,8 @@ from io import BytesIO
 
 import app.scripts.utils as utils
 
-files_df = utils.return_dataframe_of_files()
-
 def connect_google_survey_with_class_lists(data):
+    files_df = utils.return_files_df()
     year_and_semester = data['year_and_semester']
     gsheet_url = data['gsheet_url']
     student_id_columns = data["student_id_columns"]
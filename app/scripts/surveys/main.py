@@ -4,13 +4,14 @@ UPDATED VERSION with set cover optimization integrated
 """
 import pandas as pd
 import numpy as np
-from io import BytesIO
-from openpyxl import load_workbook
-from openpyxl.chart import BarChart, Reference
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.worksheet.datavalidation import DataValidation
-from collections import defaultdict
+
+import app.scripts.xlsx_export as xlsx_export
+
+from .set_cover_optimization import (
+    calculate_set_cover_recommendations,
+    add_recommendations_to_section_analysis,
+    create_coverage_summary
+)
 
 from .utils import (
     identify_missing_students,
@@ -119,52 +120,41 @@ def analyze_survey(
     working_df = calculate_dimension_subscores(working_df, config)
     
     # Generate Excel workbook
-    output = BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Sheet 1: Raw analyzed data
-        working_df.to_excel(writer, sheet_name='Analysis', index=False)
-        
-        # Sheet 2: Missing students
-        if not missing_students_df.empty:
-            missing_students_df.to_excel(writer, sheet_name='Missing Responses', index=False)
-        
-        # Sheet 3-5: Tier lists
-        create_tier_sheets(writer, working_df, config)
-        
-        # Sheet 6+: Visualization data (by year_in_hs and counselor only)
-        viz_sheets = create_visualization_sheets(
-            writer, 
-            working_df, 
-            all_bio_columns, 
-            config,
-            question_text_map
-        )
-        
-        # Sheet: Section Analysis by Dimension
-        if rosters_df is not None and master_schedule_df is not None:
-            create_section_analysis_sheet(
-                writer, 
-                working_df, 
-                missing_students_df_with_scores,
-                rosters_df, 
-                master_schedule_df, 
-                config
-            )
+    sheets = []
     
-    # Reload workbook to add formatting
-    output.seek(0)
-    wb = load_workbook(output)
+    # Sheet 1: Raw analyzed data
+    sheets.append({'name': 'Analysis', 'df': working_df})
     
-    # Format all sheets
-    format_workbook(wb)
+    # Sheet 2: Missing students
+    if not missing_students_df.empty:
+        sheets.append({'name': 'Missing Responses', 'df': missing_students_df})
+    
+    # Sheet 3-5: Tier lists
+    create_tier_sheets(sheets, working_df, config)
+    
+    # Sheet 6+: Visualization data (by year_in_hs and counselor only)
+    viz_sheets = create_visualization_sheets(
+        sheets, 
+        working_df, 
+        all_bio_columns, 
+        config,
+        question_text_map
+    )
     
-    # Save back to BytesIO
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
+    # Sheet: Section Analysis by Dimension
+    if rosters_df is not None and master_schedule_df is not None:
+        create_section_analysis_sheet(
+            sheets, 
+            working_df, 
+            missing_students_df_with_scores,
+            rosters_df, 
+            master_schedule_df, 
+            config
+        )
     
-    return output
+    # Format all sheets and stream them to the workbook
+    format_sheets(sheets)
+    return xlsx_export.return_workbook(sheets)
 
 
 def calculate_dimension_subscores(df, config):
@@ -178,7 +168,7 @@ def calculate_dimension_subscores(df, config):
     return df
 
 
-def create_tier_sheets(writer, df, config):
+def create_tier_sheets(sheets, df, config):
     """Create separate sheets for each tier with full student details."""
     tiers = ['Tier 3', 'Tier 2', 'Tier 1']
     
@@ -218,17 +208,17 @@ def create_tier_sheets(writer, df, config):
             )
             display_cols.append('Suggested_Interventions')
             
-            tier_df[display_cols].to_excel(writer, sheet_name=tier, index=False)
+            sheets.append({'name': tier, 'df': tier_df[display_cols]})
 
 
-def create_visualization_sheets(writer, df, bio_columns, config, question_text_map):
+def create_visualization_sheets(sheets, df, bio_columns, config, question_text_map):
     """Create sheets with diverging bar chart data for year_in_hs and counselor only."""
     question_cols = config.get_question_columns()
     viz_sheets = []
     
     # Overall diverging bar data for each question
     overall_data = create_diverging_bar_data(df, question_cols, question_text_map)
-    overall_data.to_excel(writer, sheet_name='Overall Distribution', index=False)
+    sheets.append({'name': 'Overall Distribution', 'df': overall_data})
     viz_sheets.append(('Overall Distribution', 'overall'))
     
     # By year_in_hs and Counselor only
@@ -248,21 +238,21 @@ def create_visualization_sheets(writer, df, bio_columns, config, question_text_m
             if bio_data:
                 combined_bio_data = pd.concat(bio_data, ignore_index=True)
                 sheet_name = f'By {bio_col}'[:31]  # Excel sheet name limit
-                combined_bio_data.to_excel(writer, sheet_name=sheet_name, index=False)
+                sheets.append({'name': sheet_name, 'df': combined_bio_data})
                 viz_sheets.append((sheet_name, bio_col))
     
     return viz_sheets
 
 
-def create_section_analysis_sheet(writer, survey_df, missing_students_df, rosters_df, master_schedule_df, config):
+def create_section_analysis_sheet(sheets, survey_df, missing_students_df, rosters_df, master_schedule_df, config):
     """
     Create sheet analyzing class sections by dimension for Tier 2 intervention targeting.
     Now includes set cover optimization for intervention recommendations.
     
     Parameters:
     -----------
-    writer : pd.ExcelWriter
-        Excel writer object
+    sheets : list
+        Sheets for xlsx_export, appended to
     survey_df : pd.DataFrame
         Students who completed survey with dimension scores
     missing_students_df : pd.DataFrame
@@ -392,335 +382,27 @@ def create_section_analysis_sheet(writer, survey_df, missing_students_df, roster
     # ===== END SET COVER CODE =====
     
     # Write to Excel
-    results_df.to_excel(writer, sheet_name='Section Analysis', index=False)
+    sheets.append({'name': 'Section Analysis', 'df': results_df})
     
     # Create composite priority sheet - sections with highest overall need
-    create_composite_priority_sheet(writer, dimension_priorities, analysis_df)
+    create_composite_priority_sheet(sheets, dimension_priorities, analysis_df)
     
     # ===== CREATE COVERAGE SUMMARY SHEET =====
     coverage_summary = create_coverage_summary(analysis_df, recommendations, config, threshold=2.0)
     if not coverage_summary.empty:
-        coverage_summary.to_excel(writer, sheet_name='Coverage Summary', index=False)
+        sheets.append({'name': 'Coverage Summary', 'df': coverage_summary})
     # ===== END COVERAGE SUMMARY =====
 
 
-# ===== SET COVER OPTIMIZATION FUNCTIONS =====
-
-def calculate_set_cover_recommendations(analysis_df, config, threshold=2.0):
-    """
-    Use weighted greedy set cover to identify top 10 sections per dimension
-    that maximize coverage of at-risk students while minimizing redundancy.
-    
-    Parameters:
-    -----------
-    analysis_df : pd.DataFrame
-        Student-section data with dimension scores
-    config : object
-        Survey configuration
-    threshold : float
-        Threshold for "at-risk" status (dimension avg <= threshold)
-        
-    Returns:
-    --------
-    dict
-        Mapping of (dimension, section_id) -> recommendation_rank (1-10)
-    """
-
-    # exclude courses that start with the letter P or Z
-    excluded_courses = ['P', 'Z']
-    analysis_df = analysis_df[~analysis_df['Course'].str.startswith(tuple(excluded_courses))]
-
-    recommendations = {}
-    
-    # Only process the named dimensions from config
-    if not hasattr(config, 'dimension_groups'):
-        return recommendations
-    
-    dimension_groups = config.dimension_groups
-    
-    for dimension_name, questions in dimension_groups.items():
-        # Calculate dimension average for each student
-        dim_cols = [f'Q{q}' for q in questions if f'Q{q}' in analysis_df.columns]
-        if not dim_cols:
-            continue
-        
-        # Get dimension average (should already exist from main analysis)
-        dim_avg_col = f'{dimension_name}_dim_avg'
-        if dim_avg_col not in analysis_df.columns:
-            numeric_cols = analysis_df[dim_cols].apply(pd.to_numeric, errors='coerce')
-            analysis_df[dim_avg_col] = numeric_cols.mean(axis=1)
-        
-        # Identify at-risk students for this dimension
-        at_risk_df = analysis_df[
-            pd.to_numeric(analysis_df[dim_avg_col], errors='coerce') <= threshold
-        ].copy()
-        
-        if at_risk_df.empty:
-            continue
-        
-        at_risk_students = set(at_risk_df['StudentID'].unique())
-        
-        # Build section -> student mapping
-        section_students = defaultdict(set)
-        section_priority = {}  # Store priority scores for tie-breaking
-        
-        for section_id in analysis_df['Section_ID'].unique():
-            section_df = analysis_df[analysis_df['Section_ID'] == section_id]
-            
-            # Get at-risk students in this section
-            section_at_risk = set(section_df['StudentID']) & at_risk_students
-            
-            if section_at_risk:
-                section_students[section_id] = section_at_risk
-                
-                # Calculate priority score for this section-dimension combo
-                # (will be used for tie-breaking)
-                section_at_risk_df = section_df[
-                    section_df['StudentID'].isin(section_at_risk)
-                ]
-                
-                if len(section_at_risk_df) > 0:
-                    scores = pd.to_numeric(
-                        section_at_risk_df[dim_avg_col], 
-                        errors='coerce'
-                    ).dropna()
-                    
-                    if len(scores) > 0:
-                        # Priority based on: number of at-risk students + severity
-                        n_at_risk = len(section_at_risk)
-                        avg_severity = (threshold - scores.mean()) / threshold
-                        section_priority[section_id] = n_at_risk + avg_severity
-                    else:
-                        section_priority[section_id] = len(section_at_risk)
-        
-        # Run weighted greedy set cover to select top 10 sections
-        selected_sections = weighted_greedy_set_cover(
-            section_students,
-            section_priority,
-            max_sections=10
-        )
-        
-        # Store recommendations with ranks
-        for rank, section_id in enumerate(selected_sections, 1):
-            recommendations[(dimension_name, section_id)] = rank
-    
-    return recommendations
-
-
-def weighted_greedy_set_cover(section_students, section_priority, max_sections=10):
-    """
-    Weighted greedy set cover algorithm with partial credit for overlap.
-    
-    Parameters:
-    -----------
-    section_students : dict
-        Mapping of section_id -> set of student IDs
-    section_priority : dict
-        Mapping of section_id -> priority score (for tie-breaking)
-    max_sections : int
-        Maximum number of sections to select
-        
-    Returns:
-    --------
-    list
-        Ordered list of selected section IDs (ranked 1 to max_sections)
-    """
-    if not section_students:
-        return []
-    
-    selected = []
-    student_coverage_count = defaultdict(int)  # Track how many times each student is covered
-    
-    for _ in range(max_sections):
-        if not section_students:
-            break
-        
-        best_section = None
-        best_score = (-1, -1)  # Initialize as tuple to match composite_score format
-        
-        for section_id, students in section_students.items():
-            if section_id in selected:
-                continue
-            
-            # Calculate weighted coverage score
-            # Give full credit for uncovered students, partial credit for already-covered
-            coverage_score = 0
-            for student in students:
-                if student_coverage_count[student] == 0:
-                    coverage_score += 1.0  # Full credit for new coverage
-                else:
-                    # Diminishing returns: 1/(n+1) where n is current coverage count
-                    coverage_score += 1.0 / (student_coverage_count[student] + 1)
-            
-            # Break ties using priority score
-            composite_score = (coverage_score, section_priority.get(section_id, 0))
-            
-            if composite_score > best_score:
-                best_score = composite_score
-                best_section = section_id
-        
-        if best_section is None:
-            break
-        
-        # Select this section
-        selected.append(best_section)
-        
-        # Update coverage counts
-        for student in section_students[best_section]:
-            student_coverage_count[student] += 1
-    
-    return selected
-
-
-def add_recommendations_to_section_analysis(section_analysis_df, recommendations, config):
-    """
-    Add recommendation ranks to the section analysis dataframe.
-    
-    Parameters:
-    -----------
-    section_analysis_df : pd.DataFrame
-        Section analysis results
-    recommendations : dict
-        Mapping of (dimension, section_id) -> rank
-    config : object
-        Survey configuration (used to get dimension names)
-        
-    Returns:
-    --------
-    pd.DataFrame
-        Updated dataframe with Recommendation_Rank column
-    """
-    section_analysis_df = section_analysis_df.copy()
-    
-    # Create Section_ID if it doesn't exist
-    if 'Section_ID' not in section_analysis_df.columns:
-        section_analysis_df['Section_ID'] = (
-            section_analysis_df['Course'] + ' - ' + section_analysis_df['Section']
-        )
-    
-    # Build dimension mapping from config
-    dimension_map = {}
-    if hasattr(config, 'dimension_groups'):
-        for internal_name in config.dimension_groups.keys():
-            display_name = internal_name.replace('_', ' ')
-            dimension_map[display_name] = internal_name
-    
-    # Add recommendation rank
-    def get_recommendation_rank(row):
-        dimension = row['Dimension']
-        section_id = row.get('Section_ID', '')
-        
-        # Convert dimension display name back to internal name
-        internal_dimension = dimension_map.get(dimension, dimension)
-        rank = recommendations.get((internal_dimension, section_id), None)
-        
-        return rank if rank is not None else ''
-    
-    section_analysis_df['Recommendation_Rank'] = section_analysis_df.apply(
-        get_recommendation_rank, 
-        axis=1
-    )
-    
-    return section_analysis_df
-
-
-def create_coverage_summary(analysis_df, recommendations, config, threshold=2.0):
-    """
-    Create a summary showing coverage statistics for the recommended sections.
-    
-    Parameters:
-    -----------
-    analysis_df : pd.DataFrame
-        Student-section data
-    recommendations : dict
-        Recommendation mappings
-    config : object
-        Survey configuration
-    threshold : float
-        At-risk threshold
-        
-    Returns:
-    --------
-    pd.DataFrame
-        Summary statistics per dimension
-    """
-    summary_data = []
-    
-    if not hasattr(config, 'dimension_groups'):
-        return pd.DataFrame()
-    
-    for dimension_name, questions in config.dimension_groups.items():
-        dim_cols = [f'Q{q}' for q in questions if f'Q{q}' in analysis_df.columns]
-        if not dim_cols:
-            continue
-        
-        dim_avg_col = f'{dimension_name}_dim_avg'
-        if dim_avg_col not in analysis_df.columns:
-            continue
-        
-        # Get at-risk students
-        at_risk_df = analysis_df[
-            pd.to_numeric(analysis_df[dim_avg_col], errors='coerce') <= threshold
-        ]
-        total_at_risk = len(at_risk_df['StudentID'].unique())
-        
-        if total_at_risk == 0:
-            continue
-        
-        # Get recommended sections for this dimension
-        recommended_sections = [
-            section_id for (dim, section_id), rank in recommendations.items()
-            if dim == dimension_name
-        ]
-        
-        if not recommended_sections:
-            continue
-        
-        # Calculate coverage
-        covered_students = set()
-        duplicate_coverage_count = 0
-        
-        for section_id in recommended_sections:
-            section_students = set(
-                analysis_df[
-                    (analysis_df['Section_ID'] == section_id) &
-                    (analysis_df['StudentID'].isin(at_risk_df['StudentID']))
-                ]['StudentID']
-            )
-            
-            # Track duplicates
-            already_covered = covered_students & section_students
-            duplicate_coverage_count += len(already_covered)
-            
-            covered_students.update(section_students)
-        
-        coverage_pct = (len(covered_students) / total_at_risk * 100) if total_at_risk > 0 else 0
-        avg_coverage_per_student = (len(covered_students) + duplicate_coverage_count) / len(covered_students) if len(covered_students) > 0 else 0
-        
-        summary_data.append({
-            'Dimension': dimension_name.replace('_', ' '),
-            'Total_At_Risk_Students': total_at_risk,
-            'Students_Covered': len(covered_students),
-            'Coverage_Pct': round(coverage_pct, 1),
-            'Recommended_Sections': len(recommended_sections),
-            'Avg_Coverage_Per_Student': round(avg_coverage_per_student, 2),
-            'Total_Student_Interventions': len(covered_students) + duplicate_coverage_count
-        })
-    
-    return pd.DataFrame(summary_data)
-
-# ===== END SET COVER OPTIMIZATION FUNCTIONS =====
-
-
-def create_composite_priority_sheet(writer, dimension_priorities, analysis_df):
+def create_composite_priority_sheet(sheets, dimension_priorities, analysis_df):
     """
     Create a sheet showing sections ranked by composite priority across ALL dimensions.
     This identifies the highest-leverage classrooms for Tier 2 interventions.
     
     Parameters:
     -----------
-    writer : pd.ExcelWriter
-        Excel writer object
+    sheets : list
+        Sheets for xlsx_export, appended to
     dimension_priorities : dict
         Dictionary mapping dimension_name -> {section_id: priority_score}
     analysis_df : pd.DataFrame
@@ -809,7 +491,7 @@ def create_composite_priority_sheet(writer, dimension_priorities, analysis_df):
     composite_df = composite_df[cols]
     
     # Write to Excel
-    composite_df.to_excel(writer, sheet_name='Composite Priority', index=False)
+    sheets.append({'name': 'Composite Priority', 'df': composite_df})
 
 
 def calculate_section_stats(df, section_col, score_col, invert_score=False, threshold=2.0):
@@ -903,230 +585,125 @@ def calculate_section_stats(df, section_col, score_col, invert_score=False, thre
     return results_df
 
 
-def format_workbook(wb):
-    """Apply formatting to all sheets in workbook."""
-    
-    # Define styles
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    
-    tier3_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    tier2_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-    tier1_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    
-    high_priority_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        
-        # Format headers
-        if ws.max_row > 0:
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                cell.border = border
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+HEADER_FORMAT = {**xlsx_export.HEADER_FORMAT, 'text_wrap': True, 'border': 1}
+
+TIER_COLORS = {'Tier 3': '#FFC7CE', 'Tier 2': '#FFEB9C', 'Tier 1': '#C6EFCE'}
+
+HIGH_PRIORITY_COLOR = '#FFC7CE'
+MEDIUM_PRIORITY_COLOR = '#FFEB9C'
+LOW_MEDIUM_PRIORITY_COLOR = '#FFFF99'
+RECOMMENDED_COLOR = '#C6EFCE'
+TOP_RECOMMENDED_COLOR = '#92D050'
+
+
+def format_sheets(sheets):
+    """Declare the formatting of every sheet for xlsx_export."""
+    for sheet in sheets:
+        sheet['header_format'] = HEADER_FORMAT
+        sheet_name = sheet['name']
         
         # Add conditional formatting for tier sheets
-        if sheet_name in ['Tier 3', 'Tier 2', 'Tier 1']:
-            format_tier_sheet(ws, sheet_name)
+        if sheet_name in TIER_COLORS:
+            format_tier_sheet(sheet)
         
         # Format Section Analysis sheet
         if sheet_name == 'Section Analysis':
-            format_section_analysis_sheet(ws)
+            format_section_analysis_sheet(sheet)
         
         # Format Composite Priority sheet
         if sheet_name == 'Composite Priority':
-            format_composite_priority_sheet(ws)
+            format_composite_priority_sheet(sheet)
         
         # Format Coverage Summary sheet
         if sheet_name == 'Coverage Summary':
-            format_coverage_summary_sheet(ws)
+            format_coverage_summary_sheet(sheet)
 
 
-def format_tier_sheet(ws, tier_name):
-    """Apply tier-specific formatting."""
-    if tier_name == 'Tier 3':
-        fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    elif tier_name == 'Tier 2':
-        fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-    else:
-        fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    
-    # Highlight rank column
-    if ws.max_row > 1:
-        for row in range(2, ws.max_row + 1):
-            ws.cell(row=row, column=1).fill = fill
-            ws.cell(row=row, column=1).font = Font(bold=True)
+def return_row_rule(criteria, color, span, bold=False):
+    """Conditional format filling the span of a row where criteria holds."""
+    cell_format = {'bg_color': color}
+    if bold:
+        cell_format['bold'] = True
+    return {
+        'span': span,
+        'options': {'type': 'formula', 'criteria': criteria, 'format': cell_format},
+    }
 
 
-def format_section_analysis_sheet(ws):
-    """Format section analysis sheet with highlighting for recommended sections."""
-    
-    if ws.max_row < 2:
-        return
-    
-    # Find columns
-    rank_col = None
-    rec_rank_col = None
-    
-    for idx, cell in enumerate(ws[1], 1):
-        if cell.value == 'Rank':
-            rank_col = idx
-        elif cell.value == 'Recommendation_Rank':
-            rec_rank_col = idx
-    
-    if rank_col is None:
+def format_tier_sheet(sheet):
+    """Highlight the rank column in the tier's color."""
+    df = sheet['df']
+    sheet['conditional_formats'] = [
+        return_row_rule('=TRUE', TIER_COLORS[sheet['name']], (df.columns[0], df.columns[0]), bold=True)
+    ]
+
+
+def format_section_analysis_sheet(sheet):
+    """Highlight recommended sections, and the top ranked sections where
+    there is no recommendation."""
+    df = sheet['df']
+    if 'Rank' not in df.columns:
         return
     
-    # Define fills
-    high_priority_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    medium_priority_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-    recommended_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    top_recommended_fill = PatternFill(start_color="92D050", end_color="92D050", fill_type="solid")
+    first_column, last_column = df.columns[0], df.columns[-1]
+    rules = []
+    no_recommendation = 'TRUE'
+    if 'Recommendation_Rank' in df.columns:
+        recommended = '{Recommendation_Rank}<>""'
+        no_recommendation = '{Recommendation_Rank}=""'
+        rules += [
+            # Top 3 recommendations - bright green
+            return_row_rule(f'=AND({recommended},{{Recommendation_Rank}}<=3)', TOP_RECOMMENDED_COLOR, (first_column, last_column)),
+            # Recommendations 4-10 - light green
+            return_row_rule(f'=AND({recommended},{{Recommendation_Rank}}<=10)', RECOMMENDED_COLOR, (first_column, last_column)),
+            {
+                'columns': ['Recommendation_Rank'],
+                'options': {
+                    'type': 'formula',
+                    'criteria': f'=AND({recommended},{{Recommendation_Rank}}<=10)',
+                    'format': {'bold': True},
+                },
+            },
+        ]
     
-    current_dimension = None
-    for row in range(2, ws.max_row + 1):
-        dimension_cell = ws.cell(row=row, column=1)
-        rank_cell = ws.cell(row=row, column=rank_col)
-        
-        # Track dimension changes
-        if dimension_cell.value != current_dimension:
-            current_dimension = dimension_cell.value
-        
-        # Highlight based on recommendation rank (if present)
-        if rec_rank_col:
-            rec_rank_cell = ws.cell(row=row, column=rec_rank_col)
-            
-            if rec_rank_cell.value and rec_rank_cell.value != '':
-                try:
-                    rec_rank = int(rec_rank_cell.value)
-                    
-                    if rec_rank <= 3:
-                        # Top 3 recommendations - bright green
-                        for col in range(1, ws.max_column + 1):
-                            ws.cell(row=row, column=col).fill = top_recommended_fill
-                        rec_rank_cell.font = Font(bold=True, size=12)
-                    elif rec_rank <= 10:
-                        # Recommendations 4-10 - light green
-                        for col in range(1, ws.max_column + 1):
-                            ws.cell(row=row, column=col).fill = recommended_fill
-                        rec_rank_cell.font = Font(bold=True)
-                except (ValueError, TypeError):
-                    pass
-                continue
-        
-        # If no recommendation rank, fall back to old ranking system
-        if rank_cell.value and isinstance(rank_cell.value, (int, float)):
-            if rank_cell.value <= 3:
-                for col in range(1, rank_col + 1):
-                    ws.cell(row=row, column=col).fill = high_priority_fill
-            elif rank_cell.value <= 5:
-                for col in range(1, rank_col + 1):
-                    ws.cell(row=row, column=col).fill = medium_priority_fill
+    # If no recommendation rank, fall back to old ranking system
+    rules += [
+        return_row_rule(f'=AND({no_recommendation},{{Rank}}<>"",{{Rank}}<=3)', HIGH_PRIORITY_COLOR, (first_column, 'Rank')),
+        return_row_rule(f'=AND({no_recommendation},{{Rank}}<>"",{{Rank}}<=5)', MEDIUM_PRIORITY_COLOR, (first_column, 'Rank')),
+    ]
+    sheet['conditional_formats'] = rules
     
     # Format percentage column
-    pct_col = None
-    for idx, cell in enumerate(ws[1], 1):
-        if cell.value == 'Pct_Struggling':
-            pct_col = idx
-            break
-    
-    if pct_col:
-        for row in range(2, ws.max_row + 1):
-            cell = ws.cell(row=row, column=pct_col)
-            if cell.value and isinstance(cell.value, (int, float)):
-                cell.number_format = '0.0'
+    sheet['column_formats'] = {'Pct_Struggling': {'num_format': '0.0'}}
 
 
-def format_composite_priority_sheet(ws):
-    """Format composite priority sheet with highlighting for highest-leverage classrooms."""
-    
-    if ws.max_row < 2:
+def format_composite_priority_sheet(sheet):
+    """Highlight the highest-leverage classrooms."""
+    df = sheet['df']
+    if 'Overall_Rank' not in df.columns:
         return
     
-    # Find the Overall_Rank column
-    rank_col = None
-    for idx, cell in enumerate(ws[1], 1):
-        if cell.value == 'Overall_Rank':
-            rank_col = idx
-            break
-    
-    if rank_col is None:
-        return
-    
-    # Highlight top sections
-    high_priority_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    medium_priority_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-    low_medium_priority_fill = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
-    
-    for row in range(2, ws.max_row + 1):
-        rank_cell = ws.cell(row=row, column=rank_col)
-        
-        # Highlight based on overall rank
-        if rank_cell.value and isinstance(rank_cell.value, (int, float)):
-            if rank_cell.value <= 5:
-                # Top 5: High priority (RED)
-                for col in range(1, ws.max_column + 1):
-                    ws.cell(row=row, column=col).fill = high_priority_fill
-                    if col == rank_col:
-                        ws.cell(row=row, column=col).font = Font(bold=True, size=12)
-            elif rank_cell.value <= 10:
-                # 6-10: Medium-high priority (ORANGE)
-                for col in range(1, ws.max_column + 1):
-                    ws.cell(row=row, column=col).fill = medium_priority_fill
-            elif rank_cell.value <= 15:
-                # 11-15: Medium priority (YELLOW)
-                for col in range(1, ws.max_column + 1):
-                    ws.cell(row=row, column=col).fill = low_medium_priority_fill
+    span = (df.columns[0], df.columns[-1])
+    sheet['conditional_formats'] = [
+        # Top 5: High priority (RED)
+        return_row_rule('=AND({Overall_Rank}<>"",{Overall_Rank}<=5)', HIGH_PRIORITY_COLOR, span),
+        # 6-10: Medium-high priority (ORANGE)
+        return_row_rule('=AND({Overall_Rank}<>"",{Overall_Rank}<=10)', MEDIUM_PRIORITY_COLOR, span),
+        # 11-15: Medium priority (YELLOW)
+        return_row_rule('=AND({Overall_Rank}<>"",{Overall_Rank}<=15)', LOW_MEDIUM_PRIORITY_COLOR, span),
+        {
+            'columns': ['Overall_Rank'],
+            'options': {'type': 'cell', 'criteria': '<=', 'value': 5, 'format': {'bold': True}},
+        },
+    ]
     
     # Format Composite_Priority column as decimal
-    comp_priority_col = None
-    for idx, cell in enumerate(ws[1], 1):
-        if cell.value == 'Composite_Priority':
-            comp_priority_col = idx
-            break
-    
-    if comp_priority_col:
-        for row in range(2, ws.max_row + 1):
-            cell = ws.cell(row=row, column=comp_priority_col)
-            if cell.value and isinstance(cell.value, (int, float)):
-                cell.number_format = '0.000'
+    sheet['column_formats'] = {'Composite_Priority': {'num_format': '0.000'}}
 
 
-def format_coverage_summary_sheet(ws):
+def format_coverage_summary_sheet(sheet):
     """Format coverage summary sheet."""
-    
-    if ws.max_row < 2:
-        return
-    
-    # Format percentage column
-    for idx, cell in enumerate(ws[1], 1):
-        if cell.value == 'Coverage_Pct':
-            for row in range(2, ws.max_row + 1):
-                ws.cell(row=row, column=idx).number_format = '0.0"%"'
-        elif cell.value == 'Avg_Coverage_Per_Student':
-            for row in range(2, ws.max_row + 1):
-                ws.cell(row=row, column=idx).number_format = '0.00'
\ No newline at end of file
+    sheet['column_formats'] = {
+        'Coverage_Pct': {'num_format': '0.0"%"'},
+        'Avg_Coverage_Per_Student': {'num_format': '0.00'},
+    }
@@ -3,7 +3,7 @@ from flask import render_template, request, send_file, session
 
 
 from app.scripts import utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import Flask, request, send_file, jsonify
 import pandas as pd
@@ -30,6 +30,7 @@ def analyze_belongingness_survey():
     Returns:
     - Excel file with analysis results
     """
+    files_df = utils.return_files_df()
     if request.method == 'GET':
         form = SurveyUploadForm()
         return render_template('surveys/templates/form.html', form=form)    
@@ -1,16 +1,47 @@
 """
 Set cover optimization for selecting high-leverage class sections
+
+The student-section rows become one CSR matrix with a row per section and a
+column per student, built once. Every dimension's at-risk students are a
+subset of its columns, so all the dimensions come out of the same matrix and
+one groupby for the section priorities.
+
+Greedy picks, up to MAX_SECTIONS times, the section that adds the most
+coverage credit: a point for each at-risk student not yet covered and
+1/(n+1) for one already covered n times, ties going to the section priority
+(at-risk students plus severity) and then to the first section in the data.
+A section's credit only goes down as others are picked, so lazy greedy keeps
+the sections in a heap on their last computed credit and recomputes only the
+one on top, picking it once its credit is current. Credits are rounded to
+GAIN_DECIMALS, so sections with the same credit tie on it whatever order
+their students were summed in, and the priority decides.
+
+The credit greedy adds up is the sum over students of 1 + 1/2 + ... + 1/n,
+n the picked sections holding them. exact_set_cover maximizes the same sum
+with milp for instances up to MAX_EXACT_SECTIONS sections, so
+return_greedy_gap_df can measure how far greedy is from the best choice.
 """
-import pandas as pd
+
+import heapq
+
 import numpy as np
-from collections import defaultdict
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+MAX_SECTIONS = 10
+## sections of courses starting with these are never recommended
+EXCLUDED_COURSE_PREFIXES = ('P', 'Z')
+MAX_EXACT_SECTIONS = 200
+EXACT_TIME_LIMIT = 60
+GAIN_DECIMALS = 9
 
 
-def calculate_set_cover_recommendations(analysis_df, config, threshold=2.0):
+def calculate_set_cover_recommendations(analysis_df, config, threshold=2.0, max_sections=MAX_SECTIONS):
     """
     Use weighted greedy set cover to identify top 10 sections per dimension
     that maximize coverage of at-risk students while minimizing redundancy.
-    
+
     Parameters:
     -----------
     analysis_df : pd.DataFrame
@@ -19,160 +50,225 @@ def calculate_set_cover_recommendations(analysis_df, config, threshold=2.0):
         Survey configuration
     threshold : float
         Threshold for "at-risk" status (dimension avg <= threshold)
-        
+    max_sections : int
+        Sections to recommend per dimension
+
     Returns:
     --------
     dict
         Mapping of (dimension, section_id) -> recommendation_rank (1-10)
     """
-
-    print(analysis_df)
     recommendations = {}
-    
-    # Only process the 5 named dimensions
+    instances = return_dimension_instances(analysis_df, config, threshold)
+    for dimension_name, (matrix, section_ids, priorities) in instances.items():
+        selected_rows = lazy_greedy_set_cover(matrix, priorities, max_sections)
+        for rank, row in enumerate(selected_rows, 1):
+            recommendations[(dimension_name, section_ids[row])] = rank
+    return recommendations
+
+
+def return_dimension_instances(analysis_df, config, threshold=2.0):
+    """
+    Set cover instance for each dimension with at-risk students.
+
+    Returns:
+    --------
+    dict
+        Mapping of dimension -> (matrix, section_ids, priorities): a binary
+        CSR matrix of the sections holding at-risk students by those
+        students, the Section_ID of each row and its priority score
+    """
     if not hasattr(config, 'dimension_groups'):
-        return recommendations
-    
-    dimension_groups = config.dimension_groups
-    
-    for dimension_name, questions in dimension_groups.items():
-        # Calculate dimension average for each student
+        return {}
+
+    analysis_df = analysis_df[
+        ~analysis_df['Course'].str.startswith(EXCLUDED_COURSE_PREFIXES, na=False)
+    ]
+
+    dimension_avgs = {}
+    for dimension_name, questions in config.dimension_groups.items():
         dim_cols = [f'Q{q}' for q in questions if f'Q{q}' in analysis_df.columns]
         if not dim_cols:
             continue
-        
-        # Get dimension average (should already exist from main analysis)
+        # Dimension average should already exist from main analysis
         dim_avg_col = f'{dimension_name}_dim_avg'
-        if dim_avg_col not in analysis_df.columns:
+        if dim_avg_col in analysis_df.columns:
+            dimension_avgs[dimension_name] = pd.to_numeric(analysis_df[dim_avg_col], errors='coerce')
+        else:
             numeric_cols = analysis_df[dim_cols].apply(pd.to_numeric, errors='coerce')
-            analysis_df[dim_avg_col] = numeric_cols.mean(axis=1)
-        
-        # Identify at-risk students for this dimension
-        at_risk_df = analysis_df[
-            pd.to_numeric(analysis_df[dim_avg_col], errors='coerce') <= threshold
-        ].copy()
-        
-        if at_risk_df.empty:
+            dimension_avgs[dimension_name] = numeric_cols.mean(axis=1)
+    if not dimension_avgs:
+        return {}
+    avgs_df = pd.DataFrame(dimension_avgs)
+
+    section_codes, section_ids = pd.factorize(analysis_df['Section_ID'])
+    student_codes, student_ids = pd.factorize(analysis_df['StudentID'])
+    has_ids = (section_codes >= 0) & (student_codes >= 0)
+    section_codes, student_codes = section_codes[has_ids], student_codes[has_ids]
+    avgs_df = avgs_df[has_ids]
+
+    incidence = sparse.csr_matrix(
+        (np.ones(len(section_codes)), (section_codes, student_codes)),
+        shape=(len(section_ids), len(student_ids)),
+    )
+    ## repeated student-section rows sum up; membership is all that counts
+    incidence.data[:] = 1
+
+    ## a student is at risk in a dimension if any of their rows is
+    is_at_risk = (avgs_df <= threshold).groupby(student_codes).any()
+    is_at_risk = is_at_risk.reindex(range(len(student_ids)), fill_value=False).to_numpy()
+
+    # Priority based on: number of at-risk students + severity
+    n_at_risk = incidence @ is_at_risk.astype(float)
+    mean_scores = (
+        avgs_df.where(is_at_risk[student_codes])
+        .groupby(section_codes)
+        .mean()
+        .reindex(range(len(section_ids)))
+        .to_numpy()
+    )
+    severity = np.nan_to_num((threshold - mean_scores) / threshold)
+    priorities = n_at_risk + severity
+
+    instances = {}
+    for d, dimension_name in enumerate(avgs_df.columns):
+        at_risk_students = np.flatnonzero(is_at_risk[:, d])
+        if not len(at_risk_students):
             continue
-        
-        at_risk_students = set(at_risk_df['StudentID'].unique())
-        
-        # Build section -> student mapping
-        section_students = defaultdict(set)
-        section_priority = {}  # Store priority scores for tie-breaking
-        
-        for section_id in analysis_df['Section_ID'].unique():
-            section_df = analysis_df[analysis_df['Section_ID'] == section_id]
-            
-            # Get at-risk students in this section
-            section_at_risk = set(section_df['StudentID']) & at_risk_students
-            
-            if section_at_risk:
-                section_students[section_id] = section_at_risk
-                
-                # Calculate priority score for this section-dimension combo
-                # (will be used for tie-breaking)
-                section_at_risk_df = section_df[
-                    section_df['StudentID'].isin(section_at_risk)
-                ]
-                
-                if len(section_at_risk_df) > 0:
-                    scores = pd.to_numeric(
-                        section_at_risk_df[dim_avg_col], 
-                        errors='coerce'
-                    ).dropna()
-                    
-                    if len(scores) > 0:
-                        # Priority based on: number of at-risk students + severity
-                        n_at_risk = len(section_at_risk)
-                        avg_severity = (threshold - scores.mean()) / threshold
-                        section_priority[section_id] = n_at_risk + avg_severity
-                    else:
-                        section_priority[section_id] = len(section_at_risk)
-        
-        # Run weighted greedy set cover to select top 10 sections
-        selected_sections = weighted_greedy_set_cover(
-            section_students,
-            section_priority,
-            max_sections=10
-        )
-        
-        # Store recommendations with ranks
-        for rank, section_id in enumerate(selected_sections, 1):
-            recommendations[(dimension_name, section_id)] = rank
-    
-    return recommendations
+        matrix = incidence[:, at_risk_students]
+        rows = np.flatnonzero(matrix.getnnz(axis=1))
+        instances[dimension_name] = (matrix[rows], section_ids[rows], priorities[rows, d])
+    return instances
 
 
-def weighted_greedy_set_cover(section_students, section_priority, max_sections=10):
+def lazy_greedy_set_cover(matrix, priorities, max_sections=MAX_SECTIONS):
     """
-    Weighted greedy set cover algorithm with partial credit for overlap.
-    
+    Weighted greedy set cover with partial credit for overlap.
+
     Parameters:
     -----------
-    section_students : dict
-        Mapping of section_id -> set of student IDs
-    section_priority : dict
-        Mapping of section_id -> priority score (for tie-breaking)
+    matrix : scipy.sparse.csr_matrix
+        Binary sections by students
+    priorities : array-like
+        Priority score of each section (for tie-breaking)
     max_sections : int
         Maximum number of sections to select
-        
+
     Returns:
     --------
     list
-        Ordered list of selected section IDs (ranked 1 to max_sections)
+        Ordered list of selected rows (ranked 1 to max_sections)
     """
-    if not section_students:
-        return []
-    
+    coverage_counts = np.zeros(matrix.shape[1])
+    ## with nothing covered yet a section's credit is its student count
+    gains = np.diff(matrix.indptr).astype(float)
+    heap = [
+        (-gain, -priority, row, 0)
+        for row, (gain, priority) in enumerate(zip(gains, priorities))
+    ]
+    heapq.heapify(heap)
+
     selected = []
-    student_coverage_count = defaultdict(int)  # Track how many times each student is covered
-    
-    for _ in range(max_sections):
-        if not section_students:
-            break
-        
-        best_section = None
-        best_score = -1
-        
-        for section_id, students in section_students.items():
-            if section_id in selected:
-                continue
-            
-            # Calculate weighted coverage score
-            # Give full credit for uncovered students, partial credit for already-covered
-            coverage_score = 0
-            for student in students:
-                if student_coverage_count[student] == 0:
-                    coverage_score += 1.0  # Full credit for new coverage
-                else:
-                    # Diminishing returns: 1/(n+1) where n is current coverage count
-                    coverage_score += 1.0 / (student_coverage_count[student] + 1)
-            
-            # Break ties using priority score
-            composite_score = (coverage_score, section_priority.get(section_id, 0))
-            
-            if composite_score > best_score:
-                best_score = composite_score
-                best_section = section_id
-        
-        if best_section is None:
-            break
-        
-        # Select this section
-        selected.append(best_section)
-        
-        # Update coverage counts
-        for student in section_students[best_section]:
-            student_coverage_count[student] += 1
-    
+    while heap and len(selected) < max_sections:
+        neg_gain, neg_priority, row, picks = heapq.heappop(heap)
+        if picks < len(selected):
+            ## stale: some of its students were covered since
+            gain = return_gain(matrix, row, coverage_counts)
+            heapq.heappush(heap, (-gain, neg_priority, row, len(selected)))
+            continue
+        selected.append(row)
+        coverage_counts[matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]] += 1
     return selected
 
 
+def return_gain(matrix, row, coverage_counts):
+    students = matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+    return round(float((1.0 / (coverage_counts[students] + 1)).sum()), GAIN_DECIMALS)
+
+
+def return_coverage_value(matrix, rows):
+    """Sum over students of 1 + 1/2 + ... + 1/n, n the rows holding them."""
+    counts = np.asarray(matrix[list(rows)].sum(axis=0)).ravel().astype(int)
+    harmonic = np.concatenate([[0], np.cumsum(1 / np.arange(1, len(rows) + 1))])
+    return float(harmonic[counts].sum())
+
+
+def exact_set_cover(matrix, max_sections=MAX_SECTIONS, time_limit=EXACT_TIME_LIMIT):
+    """
+    Rows maximizing return_coverage_value with at most max_sections rows,
+    solved with milp. None if the instance has more than MAX_EXACT_SECTIONS
+    rows or the solver stops before proving an optimum.
+
+    Each student s gets one variable y[s, j] per possible coverage level j;
+    their sum is held to the number of picked rows holding s and y[s, j] is
+    worth 1/j, so the levels fill from 1 up and add to 1 + 1/2 + ... + 1/n.
+    """
+    num_of_sections, num_of_students = matrix.shape
+    if num_of_sections > MAX_EXACT_SECTIONS:
+        return None
+    max_sections = min(max_sections, num_of_sections)
+
+    degrees = np.asarray(matrix.sum(axis=0)).ravel().astype(int)
+    levels = np.minimum(degrees, max_sections)
+    level_students = np.repeat(np.arange(num_of_students), levels)
+    level_offsets = np.repeat(np.cumsum(levels) - levels, levels)
+    level_numbers = np.arange(len(level_students)) - level_offsets + 1
+    num_of_levels = len(level_students)
+
+    c = np.concatenate([np.zeros(num_of_sections), -1.0 / level_numbers])
+    levels_matrix = sparse.csr_matrix(
+        (np.ones(num_of_levels), (level_students, np.arange(num_of_levels))),
+        shape=(num_of_students, num_of_levels),
+    )
+    coverage = LinearConstraint(sparse.hstack([-matrix.T, levels_matrix]), -np.inf, 0)
+    budget = LinearConstraint(
+        np.concatenate([np.ones(num_of_sections), np.zeros(num_of_levels)])[np.newaxis],
+        -np.inf,
+        max_sections,
+    )
+    integrality = np.concatenate([np.ones(num_of_sections), np.zeros(num_of_levels)])
+
+    result = milp(
+        c,
+        constraints=[coverage, budget],
+        integrality=integrality,
+        bounds=Bounds(0, 1),
+        options={'time_limit': time_limit},
+    )
+    if result.status != 0:
+        return None
+    return np.flatnonzero(result.x[:num_of_sections] > 0.5).tolist()
+
+
+def return_greedy_gap_df(analysis_df, config, threshold=2.0, max_sections=MAX_SECTIONS):
+    """
+    Greedy's coverage credit against the exact optimum for each dimension.
+    Exact_Value and Gap_Pct are blank where the instance is too big for
+    exact_set_cover.
+    """
+    rows = []
+    instances = return_dimension_instances(analysis_df, config, threshold)
+    for dimension_name, (matrix, section_ids, priorities) in instances.items():
+        greedy_value = return_coverage_value(
+            matrix, lazy_greedy_set_cover(matrix, priorities, max_sections)
+        )
+        exact_rows = exact_set_cover(matrix, max_sections)
+        exact_value = None if exact_rows is None else return_coverage_value(matrix, exact_rows)
+        rows.append({
+            'Dimension': dimension_name.replace('_', ' '),
+            'Sections': matrix.shape[0],
+            'At_Risk_Students': matrix.shape[1],
+            'Greedy_Value': round(greedy_value, 3),
+            'Exact_Value': None if exact_value is None else round(exact_value, 3),
+            'Gap_Pct': None if exact_value is None else round((exact_value - greedy_value) / exact_value * 100, 2),
+        })
+    return pd.DataFrame(rows)
+
+
 def add_recommendations_to_section_analysis(section_analysis_df, recommendations, config):
     """
     Add recommendation ranks to the section analysis dataframe.
-    
+
     Parameters:
     -----------
     section_analysis_df : pd.DataFrame
@@ -181,50 +277,43 @@ def add_recommendations_to_section_analysis(section_analysis_df, recommendations
         Mapping of (dimension, section_id) -> rank
     config : object
         Survey configuration (used to get dimension names)
-        
+
     Returns:
     --------
     pd.DataFrame
         Updated dataframe with Recommendation_Rank column
     """
     section_analysis_df = section_analysis_df.copy()
-    
+
     # Create Section_ID if it doesn't exist
     if 'Section_ID' not in section_analysis_df.columns:
         section_analysis_df['Section_ID'] = (
             section_analysis_df['Course'] + ' - ' + section_analysis_df['Section']
         )
-    
+
     # Build dimension mapping from config
     dimension_map = {}
     if hasattr(config, 'dimension_groups'):
         for internal_name in config.dimension_groups.keys():
             display_name = internal_name.replace('_', ' ')
             dimension_map[display_name] = internal_name
-    
-    # Add recommendation rank
-    def get_recommendation_rank(row):
-        dimension = row['Dimension']
-        section_id = row.get('Section_ID', '')
-        
-        # Convert dimension display name back to internal name
-        internal_dimension = dimension_map.get(dimension, dimension)
-        rank = recommendations.get((internal_dimension, section_id), None)
-        
-        return rank if rank is not None else ''
-    
-    section_analysis_df['Recommendation_Rank'] = section_analysis_df.apply(
-        get_recommendation_rank, 
-        axis=1
-    )
-    
+
+    # Convert dimension display names back to internal names
+    internal_dimensions = [
+        dimension_map.get(dimension, dimension) for dimension in section_analysis_df['Dimension']
+    ]
+    section_analysis_df['Recommendation_Rank'] = [
+        recommendations.get(key, '')
+        for key in zip(internal_dimensions, section_analysis_df['Section_ID'])
+    ]
+
     return section_analysis_df
 
 
 def create_coverage_summary(analysis_df, recommendations, config, threshold=2.0):
     """
     Create a summary showing coverage statistics for the recommended sections.
-    
+
     Parameters:
     -----------
     analysis_df : pd.DataFrame
@@ -235,73 +324,66 @@ def create_coverage_summary(analysis_df, recommendations, config, threshold=2.0)
         Survey configuration
     threshold : float
         At-risk threshold
-        
+
     Returns:
     --------
     pd.DataFrame
         Summary statistics per dimension
     """
     summary_data = []
-    
+
     if not hasattr(config, 'dimension_groups'):
         return pd.DataFrame()
-    
+
+    student_sections_df = analysis_df[['Section_ID', 'StudentID']].drop_duplicates()
+
     for dimension_name, questions in config.dimension_groups.items():
         dim_cols = [f'Q{q}' for q in questions if f'Q{q}' in analysis_df.columns]
         if not dim_cols:
             continue
-        
+
         dim_avg_col = f'{dimension_name}_dim_avg'
         if dim_avg_col not in analysis_df.columns:
             continue
-        
+
         # Get at-risk students
-        at_risk_df = analysis_df[
-            pd.to_numeric(analysis_df[dim_avg_col], errors='coerce') <= threshold
-        ]
-        total_at_risk = len(at_risk_df['StudentID'].unique())
-        
+        at_risk_students = analysis_df.loc[
+            pd.to_numeric(analysis_df[dim_avg_col], errors='coerce') <= threshold,
+            'StudentID'
+        ].unique()
+        total_at_risk = len(at_risk_students)
+
         if total_at_risk == 0:
             continue
-        
+
         # Get recommended sections for this dimension
         recommended_sections = [
             section_id for (dim, section_id), rank in recommendations.items()
             if dim == dimension_name
         ]
-        
+
         if not recommended_sections:
             continue
-        
-        # Calculate coverage
-        covered_students = set()
-        duplicate_coverage_count = 0
-        
-        for section_id in recommended_sections:
-            section_students = set(
-                analysis_df[
-                    (analysis_df['Section_ID'] == section_id) &
-                    (analysis_df['StudentID'].isin(at_risk_df['StudentID']))
-                ]['StudentID']
-            )
-            
-            # Track duplicates
-            already_covered = covered_students & section_students
-            duplicate_coverage_count += len(already_covered)
-            
-            covered_students.update(section_students)
-        
-        coverage_pct = (len(covered_students) / total_at_risk * 100) if total_at_risk > 0 else 0
-        avg_coverage_per_student = (len(covered_students) + duplicate_coverage_count) / len(covered_students) if len(covered_students) > 0 else 0
-        
+
+        # One row per at-risk student per recommended section they are in
+        covered_df = student_sections_df[
+            student_sections_df['Section_ID'].isin(recommended_sections)
+            & student_sections_df['StudentID'].isin(at_risk_students)
+        ]
+        n_covered = covered_df['StudentID'].nunique()
+        total_interventions = len(covered_df)
+
+        coverage_pct = (n_covered / total_at_risk * 100) if total_at_risk > 0 else 0
+        avg_coverage_per_student = total_interventions / n_covered if n_covered > 0 else 0
+
         summary_data.append({
             'Dimension': dimension_name.replace('_', ' '),
             'Total_At_Risk_Students': total_at_risk,
-            'Students_Covered': len(covered_students),
+            'Students_Covered': n_covered,
             'Coverage_Pct': round(coverage_pct, 1),
             'Recommended_Sections': len(recommended_sections),
             'Avg_Coverage_Per_Student': round(avg_coverage_per_student, 2),
-            'Total_Student_Interventions': len(covered_students) + duplicate_coverage_count
+            'Total_Student_Interventions': total_interventions
         })
-    
-    return pd.DataFrame(summary_data)
\ No newline at end of file
+
+    return pd.DataFrame(summary_data)
@@ -25,8 +25,9 @@ from io import BytesIO
 from flask import session, current_app
 
 from app.scripts.reportlab_utils import reportlab_letter_head, reportlab_closing
-from app.scripts import scripts, files_df, photos_df
+from app.scripts import scripts
 import app.scripts.utils as utils
+import app.scripts.photo_thumbnails as photo_thumbnails
 
 styles = getSampleStyleSheet()
 
@@ -60,7 +61,7 @@ def main(form, request):
     df = df.fillna({"Room#": "202"})
     df["Session"] = df["Room"].str.extract(r"([AaPp][Mm])")
     df["ExamDate"] = df["Room"].apply(lambda x: exam_date)
-    df = df.merge(photos_df, on=["StudentID"], how="left")
+    df = df.merge(utils.return_photos_df(), on=["StudentID"], how="left")
 
     return generate_letters(df)
 
@@ -111,7 +112,7 @@ def generate_student_letter(student_row):
 
     try:
         photo_str = student_row["photo_filename"]
-        I = Image(photo_str)
+        I = Image(photo_thumbnails.return_thumbnail_filename(photo_str, 3.0))
         I.drawHeight = 3.0 * inch
         I.drawWidth = 3.0 * inch
         I.hAlign = "CENTER"
@@ -26,8 +26,10 @@ import os
 from io import BytesIO
 from flask import session, current_app
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
+import app.scripts.pdf_page_index as pdf_page_index
+import app.scripts.photo_thumbnails as photo_thumbnails
 
 styles = getSampleStyleSheet()
 
@@ -166,7 +168,7 @@ def generate_student_exam_ticket(student_row):
     try:
         path = os.path.join(current_app.root_path, f"data/StudentPhotos")
         photo_str = os.path.join(path, f"{int(StudentID)}.jpg")
-        I = Image(photo_str)
+        I = Image(photo_thumbnails.return_thumbnail_filename(photo_str, 3.0))
         I.drawHeight = 3.0 * inch
         I.drawWidth = 3.0 * inch
         I.hAlign = "CENTER"
@@ -245,6 +247,7 @@ def generate_student_exam_ticket(student_row):
 
 
 def process_exam_tickets(form, request):
+    files_df = utils.return_files_df()
     student_testing_assignments = request.files[form.student_testing_assignments.name]
     df = pd.read_csv(student_testing_assignments)
     df = df.dropna(subset=["StudentID"])
@@ -260,16 +263,9 @@ def process_exam_tickets(form, request):
 
     PDF = request.files[form.student_exam_tickets.name]
 
-    pdfReader = PyPDF2.PdfReader(PDF)
-    num_of_pages = pdfReader.pages
-
-    combined_txt = ""
-    for page_num, page in enumerate(num_of_pages):
-        if page_num == 0:
-            pass
-        else:
-            page_text = page.extract_text()
-            combined_txt += page_text
+    ## the first page is the cover sheet
+    page_texts = pdf_page_index.return_page_texts(PDF)[1:]
+    combined_txt = "".join(page_text or "" for page_text in page_texts)
 
     all_lines_of_text = combined_txt.splitlines()
     student_lst = []
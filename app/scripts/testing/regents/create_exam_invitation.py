@@ -26,7 +26,8 @@ from flask import session, current_app
 
 from app.scripts.reportlab_utils import reportlab_letter_head, reportlab_closing
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df, photos_df
+import app.scripts.photo_thumbnails as photo_thumbnails
+from app.scripts import scripts
 
 styles = getSampleStyleSheet()
 
@@ -48,6 +49,7 @@ styles.add(
 
 
 def main():
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -73,7 +75,7 @@ def main():
     cr_1_08_df = cr_1_08_df.merge(section_properties_df, on=["Section"], how="left")
 
     cr_1_08_df["Report Time"] = cr_1_08_df["Time"].apply(return_exam_report_time)
-    cr_1_08_df = cr_1_08_df.merge(photos_df, on=["StudentID"], how="left")
+    cr_1_08_df = cr_1_08_df.merge(utils.return_photos_df(), on=["StudentID"], how="left")
 
     # reformat_date
     cr_1_08_df["Day"] = pd.to_datetime(cr_1_08_df["Day"])
@@ -165,7 +167,7 @@ def generate_student_letter(exams_df):
     try:
         
         photo_str = exams_df.iloc[0, :]["photo_filename"]
-        I = Image(photo_str)
+        I = Image(photo_thumbnails.return_thumbnail_filename(photo_str, 2.75))
         I.drawHeight = 2.75 * inch
         I.drawWidth = 2.75 * inch
         I.hAlign = "CENTER"
@@ -1,6 +1,6 @@
 
 import pandas as pd
-from app.scripts import scripts, files_df, gsheets_df
+from app.scripts import scripts
 from flask import render_template, request, send_file, session, current_app
 from io import BytesIO
 from reportlab.graphics import shapes
@@ -64,6 +64,7 @@ styles.add(
 
 
 def main(course, request):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     term = session["term"]
     year_and_semester = f"{school_year}-{term}"
@@ -74,7 +75,7 @@ def main(course, request):
         administration = f"June {school_year+1}"
 
     gsheet_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "regents_exam_book", year_and_semester
+        utils.return_gsheets_df(), "regents_exam_book", year_and_semester
     )
 
     exam_book_df = utils.return_google_sheet_as_dataframe(gsheet_url, sheet="ExamBook")
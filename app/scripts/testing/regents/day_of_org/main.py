@@ -6,7 +6,7 @@ import os
 from flask import render_template, request, send_file, session, current_app
 
 
-from app.scripts import scripts, files_df, gsheets_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 
@@ -16,7 +16,7 @@ def return_exambook_for_index():
     year_and_semester = f"{school_year}-{term}"
 
     gsheet_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "regents_exam_book", year_and_semester
+        utils.return_gsheets_df(), "regents_exam_book", year_and_semester
     )
 
     exam_book_df = utils.return_google_sheet_as_dataframe(gsheet_url, sheet="ExamBook")
@@ -1,4 +1,4 @@
-from app.scripts import scripts, files_df, gsheets_df
+from app.scripts import scripts
 from flask import render_template, request, send_file, session, current_app
 
 from io import BytesIO
@@ -46,16 +46,15 @@ def main(course, request):
         administration = f"June {school_year+1}"
 
     gsheet_url = utils.return_gsheet_url_by_title(
-        gsheets_df, "regents_exam_book", year_and_semester
+        utils.return_gsheets_df(), "regents_exam_book", year_and_semester
     )
 
-    exam_book_df = utils.return_google_sheet_as_dataframe(gsheet_url, sheet="ExamBook")
-    proctor_assignments_df = utils.return_google_sheet_as_dataframe(
-        gsheet_url, sheet="ProctorAssignments"
-    )
-    proctor_schedule_df = utils.return_google_sheet_as_dataframe(
-        gsheet_url, sheet="ProctorSchedule"
+    dfs = utils.return_google_sheets_as_dataframes(
+        gsheet_url, ["ExamBook", "ProctorAssignments", "ProctorSchedule"]
     )
+    exam_book_df = dfs["ExamBook"]
+    proctor_assignments_df = dfs["ProctorAssignments"]
+    proctor_schedule_df = dfs["ProctorSchedule"]
 
     proctor_assignments_df = proctor_assignments_df.sort_values(by=["proctor#"])
     hall_proctors_df = proctor_assignments_df[
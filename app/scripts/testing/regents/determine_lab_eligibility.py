@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from flask import session
 
@@ -14,6 +14,7 @@ from flask import current_app
 
 
 def main():
+    files_df = utils.return_files_df()
     year = session["school_year"]
     term = session["term"]
 
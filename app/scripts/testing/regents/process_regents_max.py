@@ -5,9 +5,10 @@ import app.scripts.utils as utils
 
 from flask import session
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 def main():
+    files_df = utils.return_files_df()
     filename = utils.return_most_recent_report(files_df, "1_42")
     cr_1_42_df = utils.return_file_as_df(filename)
 
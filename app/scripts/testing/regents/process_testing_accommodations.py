@@ -4,10 +4,11 @@ import pandas as pd
 import datetime as dt
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 def main():
     
+    files_df = utils.return_files_df()
     filename = utils.return_most_recent_report(files_df, "TestingAccommodations")
     df = utils.return_file_as_df(filename,skiprows=1)
     
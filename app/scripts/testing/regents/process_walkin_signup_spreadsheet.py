@@ -2,7 +2,7 @@ import pandas as pd
 import numpy as np
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 from app.scripts.testing.regents import create_walkin_signup_spreadsheet
 
@@ -10,6 +10,7 @@ from flask import current_app, session
 import os
 
 def main(form, request):
+    files_df = utils.return_files_df()
     walkin_spreadsheet_file = request.files[form.walkin_spreadsheet_file.name]
 
     updated_df = pd.read_excel(walkin_spreadsheet_file, sheet_name=0, skiprows=1)
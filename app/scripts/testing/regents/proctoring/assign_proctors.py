@@ -1,12 +1,43 @@
+"""
+Assign Proctors
+
+Fills every proctoring slot from process_proctors_needed with a proctor
+available that day, at most one slot per proctor per day, AM slots from the
+Early session and PM slots from the Late session (a second proctor may come
+from the other session when no one else is left).
+
+Two methods:
+
+- "flow" (default): one min-cost flow over the whole week. Identical slots
+  (same day, time, second-proctor flag, difficulty and priority) share a
+  node, each proctor's k-th assignment costs more than the one before, so
+  assignments spread over everyone available, and a slot is left open only
+  when no eligible proctor is free, the lowest priorities first. A swap pass
+  then trades slots between proctors on the same day to even out difficulty,
+  which a flow of whole assignments cannot weigh. The result does not depend
+  on the order of the input rows.
+- "greedy": the day-by-day loop, busiest day first, each slot going to the
+  least loaded eligible proctor. It is the fallback if the flow fails.
+"""
+
 import pandas as pd
 import numpy as np
 
+from app.scripts.lazy import lazy_import
+
+nx = lazy_import("networkx")
+
+METHODS = ["flow", "greedy"]
+## the flow needs integer costs; loads are counted in quarter difficulty points
+DIFFICULTY_UNITS = 4
+LOAD_COST = 100
+SESSION_MISMATCH_COST = 1_000_000
+## divided by the slot's priority, so priority 1 slots are the last left open
+UNFILLED_COST = 1_000_000_000
+MAX_SWAP_ROUNDS = 10
 
-def main(proctor_assignments_df, proctor_availability_df):
-    assignments_days_in_order = (
-        proctor_assignments_df["Day"].value_counts().index.to_list()
-    )
 
+def main(proctor_assignments_df, proctor_availability_df, method="flow"):
     proctor_availability_df["dept_code"] = proctor_availability_df["Dept"].apply(
         convert_dept_to_code
     )
@@ -16,6 +47,33 @@ def main(proctor_assignments_df, proctor_availability_df):
 
     proctor_assignments_df['priority'] = proctor_assignments_df.apply(return_priority, axis=1)
 
+    if method == "flow":
+        try:
+            proctor_assignments_list = assign_proctors_by_flow(
+                proctor_assignments_df, proctor_availability_df
+            )
+            return return_proctor_assignments_output_df(
+                proctor_assignments_list, preferred_session_df
+            )
+        except Exception as e:
+            print(f"Min-cost flow proctor assignment failed with error: {e}")
+            print("Falling back to greedy assignment...")
+    elif method != "greedy":
+        raise ValueError(f"Unknown method: {method}")
+
+    proctor_assignments_list = assign_proctors_greedy(
+        proctor_assignments_df, proctor_availability_df
+    )
+    return return_proctor_assignments_output_df(
+        proctor_assignments_list, preferred_session_df
+    )
+
+
+def assign_proctors_greedy(proctor_assignments_df, proctor_availability_df):
+    assignments_days_in_order = (
+        proctor_assignments_df["Day"].value_counts().index.to_list()
+    )
+
     proctors_dict = {}
     assigned_proctors_by_day = {}
     proctor_assignments_list = []
@@ -132,9 +190,183 @@ def main(proctor_assignments_df, proctor_availability_df):
                 cumulative_difficulty
             )
 
+    return proctor_assignments_list
+
+
+def return_session_cost(session, time, proctor_type):
+    """Cost of a proctor from session on a slot at time; None if not
+    eligible. Only a second proctor may come from the other session."""
+    if (time, session) in [("AM", "Early"), ("PM", "Late")]:
+        return 0
+    if proctor_type == 2 and (time, session) in [("AM", "Late"), ("PM", "Early")]:
+        return SESSION_MISMATCH_COST
+    return None
+
+
+def return_load_units(difficulty):
+    return int(round(difficulty * DIFFICULTY_UNITS))
+
+
+def assign_proctors_by_flow(proctor_assignments_df, proctor_availability_df):
+    """
+    The proctor_assignments_list for every slot, from one min-cost flow over
+    the week followed by difficulty-balancing swaps. Slots no eligible
+    proctor can take get Proctor None.
+
+    Flow runs source -> slot class -> (day, session) -> proctor -> sink.
+    Every proctor of a session is eligible for the same slot classes at the
+    same session cost, so a class only needs an edge to the one or two
+    session nodes of its day, and the flow into a session node can be split
+    among its proctors in any order afterwards.
+    """
+    slots_df = proctor_assignments_df.sort_values(
+        by=["Day", "Time", "priority", "Course", "Room", "proctor#"], kind="stable"
+    ).reset_index(drop=True)
+    slots_df["is_second"] = slots_df["proctor#"] == 2
+    class_cols = ["Day", "Time", "is_second", "assignment_difficulty", "priority"]
+    slot_classes = slots_df.groupby(class_cols, sort=True).indices
+
+    ## the greedy's pick order (total_difficulty, #_of_proctor_days) breaks ties
+    proctors_df = proctor_availability_df.reset_index(drop=True).sort_values(
+        by=["total_difficulty", "#_of_proctor_days", "Name"], kind="stable"
+    )
+    proctor_sessions = dict(zip(proctors_df["Name"], proctors_df["Session"]))
+    proctor_ranks = {proctor: rank for rank, proctor in enumerate(proctors_df["Name"])}
+    prior_units = {
+        proctor: return_load_units(total_difficulty)
+        for proctor, total_difficulty in zip(proctors_df["Name"], proctors_df["total_difficulty"])
+    }
+    days = sorted(slots_df["Day"].unique().tolist())
+    sessions = ["Early", "Late"]
+
+    G = nx.DiGraph()
+    G.add_node("source", demand=-len(slots_df))
+    G.add_node("sink", demand=len(slots_df))
+    for slot_class, indices in slot_classes.items():
+        day, time, is_second, _, priority = slot_class
+        G.add_edge("source", slot_class, capacity=len(indices), weight=0)
+        G.add_edge(
+            slot_class,
+            "sink",
+            capacity=len(indices),
+            weight=UNFILLED_COST // max(int(np.ceil(priority)), 1),
+        )
+        for session in sessions:
+            session_cost = return_session_cost(session, time, 2 if is_second else 1)
+            if session_cost is not None:
+                G.add_edge(slot_class, (day, session), capacity=len(indices), weight=session_cost)
+
+    ## one slot per proctor per day, and each further assignment of a
+    ## proctor costs more than the last (a convex cost on their load)
+    for proctor, proctor_row in zip(proctors_df["Name"], proctors_df[days].to_numpy()):
+        session = proctor_sessions[proctor]
+        if session not in sessions:
+            continue
+        proctor_days = [day for day, assignment in zip(days, proctor_row) if assignment == "Proctor"]
+        for day in proctor_days:
+            G.add_edge((day, session), proctor, capacity=1, weight=proctor_ranks[proctor])
+        prior = prior_units[proctor]
+        for k in range(1, len(proctor_days) + 1):
+            load = prior + k * DIFFICULTY_UNITS
+            previous_load = prior + (k - 1) * DIFFICULTY_UNITS
+            G.add_edge(
+                proctor,
+                (proctor, "load", k),
+                capacity=1,
+                weight=LOAD_COST * (load**2 - previous_load**2),
+            )
+            G.add_edge((proctor, "load", k), "sink", capacity=1, weight=0)
+
+    flow_dict = nx.min_cost_flow(G)
+
+    ## split each session node's proctors among the classes feeding it,
+    ## first proctors (by rank) to the first slots
+    slot_proctors = [None] * len(slots_df)
+    for day in days:
+        for session in sessions:
+            if (day, session) not in flow_dict:
+                continue
+            proctors = sorted(
+                (proctor for proctor, flow in flow_dict[(day, session)].items() if flow > 0),
+                key=lambda proctor: proctor_ranks[proctor],
+            )
+            for slot_class, indices in slot_classes.items():
+                num_of_slots = flow_dict[slot_class].get((day, session), 0)
+                open_indices = [index for index in indices if slot_proctors[index] is None]
+                for index in open_indices[:num_of_slots]:
+                    slot_proctors[index] = proctors.pop(0)
+    slots_df["Proctor"] = slot_proctors
+
+    balance_difficulty_by_swaps(slots_df, proctor_sessions, prior_units)
+
+    return [
+        {
+            "Course": slot["Course"],
+            "Time": slot["Time"],
+            "Day": slot["Day"],
+            "Room": slot["Room"],
+            "proctor#": slot["proctor#"],
+            "Proctor": slot["Proctor"],
+            "assignment_difficulty": slot["assignment_difficulty"],
+            "priority": slot["priority"],
+        }
+        for slot in slots_df.to_dict("records")
+    ]
+
+
+def balance_difficulty_by_swaps(slots_df, proctor_sessions, prior_units):
+    """
+    Trades slots of different difficulty between two proctors on the same
+    day when that narrows the gap between their loads without moving either
+    to a worse session. Days and counts per proctor stay the same.
+    """
+    proctors = slots_df["Proctor"].to_list()
+    units = [return_load_units(difficulty) for difficulty in slots_df["assignment_difficulty"]]
+    times = slots_df["Time"].to_list()
+    proctor_types = slots_df["proctor#"].to_list()
+    loads = dict(prior_units)
+    for proctor, slot_units in zip(proctors, units):
+        if proctor is not None:
+            loads[proctor] += slot_units
+
+    def return_cost(proctor, index):
+        return return_session_cost(proctor_sessions[proctor], times[index], proctor_types[index])
+
+    indices_by_day = [
+        [index for index in indices if proctors[index] is not None]
+        for indices in slots_df.groupby("Day", sort=True).indices.values()
+    ]
+    for _ in range(MAX_SWAP_ROUNDS):
+        num_of_swaps = 0
+        for indices in indices_by_day:
+            for a_num, a in enumerate(indices):
+                for b in indices[a_num + 1 :]:
+                    if units[a] == units[b]:
+                        continue
+                    a_proctor, b_proctor = proctors[a], proctors[b]
+                    a_load = loads[a_proctor] - units[a] + units[b]
+                    b_load = loads[b_proctor] - units[b] + units[a]
+                    if abs(a_load - b_load) >= abs(loads[a_proctor] - loads[b_proctor]):
+                        continue
+                    swapped_costs = [return_cost(a_proctor, b), return_cost(b_proctor, a)]
+                    if None in swapped_costs or sum(swapped_costs) > return_cost(a_proctor, a) + return_cost(
+                        b_proctor, b
+                    ):
+                        continue
+                    proctors[a], proctors[b] = b_proctor, a_proctor
+                    loads[a_proctor], loads[b_proctor] = a_load, b_load
+                    num_of_swaps += 1
+        if not num_of_swaps:
+            break
+    slots_df["Proctor"] = proctors
+
+
+def return_proctor_assignments_output_df(proctor_assignments_list, preferred_session_df):
     proctor_assignments_dff = pd.DataFrame(proctor_assignments_list)
-    total_assignment_difficulty_df = pd.DataFrame(
-        proctors_dict.items(), columns=["Proctor", "total_assignment_difficulty"]
+    total_assignment_difficulty_df = (
+        proctor_assignments_dff.groupby("Proctor", dropna=False)["assignment_difficulty"]
+        .sum()
+        .reset_index(name="total_assignment_difficulty")
     )
 
     proctor_assignments_dff = proctor_assignments_dff.merge(
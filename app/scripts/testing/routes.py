@@ -6,7 +6,7 @@ import os
 from flask import render_template, request, send_file, session, current_app
 
 
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 import app.scripts.utils as utils
 
 from app.scripts.testing.forms import (
@@ -64,6 +64,7 @@ def return_sat_reports():
 @scripts.route("/testing/college_board/signup_letters")
 def return_college_board_signup_letters():
 
+    files_df = utils.return_files_df()
     cr_3_07_filename = utils.return_most_recent_report(files_df, "3_07")
     cr_3_07_df = utils.return_file_as_df(cr_3_07_filename)
     f = college_board_signup_letter.generate_letters(cr_3_07_df)
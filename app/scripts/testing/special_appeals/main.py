@@ -7,10 +7,11 @@ import app.scripts.programming.requests.process_transcript as process_transcript
 from app.scripts.testing.regents import process_regents_max
 
 import app.scripts.utils as utils
-from app.scripts import scripts, files_df
+from app.scripts import scripts
 
 
 def main():
+    files_df = utils.return_files_df()
     cr_1_14_filename = utils.return_most_recent_report(files_df, "1_14")
     cr_1_14_df = utils.return_file_as_df(cr_1_14_filename)
     student_credits_by_curriculum_df = process_transcript(cr_1_14_df)
@@ -0,0 +1,39 @@
+"""
+Weighted Trends
+
+Per-student trend slopes (absence % by month, z-score by term) weighted so
+the most recent points count most: the i-th point of a group has x = i and
+weight = i. This is the weighted least-squares fit LinearRegression gave
+with sample_weight, but every group is solved at once from five grouped sums
+
+    slope = (Σw·Σwxy - Σwx·Σwy) / (Σw·Σwx² - (Σwx)²)
+
+instead of building a DataFrame and an estimator per student. Groups with a
+single point get a slope of 0.
+
+Points are taken in the order they appear in the frame, as groupby().apply()
+did, so sort by date or term first.
+"""
+
+import pandas as pd
+
+
+def return_weighted_slopes(df, by, value_col):
+    """Series of slopes indexed by the `by` groups."""
+    x = df.groupby(by, sort=False).cumcount().to_numpy() + 1
+    w = x
+    y = df[value_col].to_numpy(dtype=float)
+
+    sums_df = pd.DataFrame(
+        {"w": w, "wx": w * x, "wy": w * y, "wxx": w * x * x, "wxy": w * x * y},
+        index=df.index,
+    )
+    keys = [df[col] for col in by] if isinstance(by, list) else df[by]
+    sums_df = sums_df.groupby(keys).sum()
+
+    numerator = sums_df["w"] * sums_df["wxy"] - sums_df["wx"] * sums_df["wy"]
+    denominator = sums_df["w"] * sums_df["wxx"] - sums_df["wx"] ** 2
+    ## x and w are small integers, so the denominator is exact and only 0
+    ## for a single point
+    slopes = numerator / denominator.where(denominator != 0)
+    return slopes.where(denominator != 0, 0.0).rename(value_col)
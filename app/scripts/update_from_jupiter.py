@@ -6,6 +6,9 @@ import pandas as pd
 import datetime as dt
 from flask import render_template, request, Blueprint, redirect, url_for, flash, current_app, session
 
+import app.scripts.utils as utils
+import app.scripts.report_sidecars as report_sidecars
+
 JUPITER_SFTP_HOSTNAME = os.getenv("JUPITER_SFTP_HOSTNAME")
 JUPITER_SFTP_USERNAME = os.getenv("JUPITER_SFTP_USERNAME")
 JUPITER_SFTP_PASSWORD = os.getenv("JUPITER_SFTP_PASSWORD")
@@ -36,4 +39,7 @@ def main(report,year_and_semester):
 
         sftp.get(jupiter_filename, local_filename)
 
+    report_sidecars.write_sidecar(local_filename)
+    utils.invalidate_report_registry()
+
     return ''
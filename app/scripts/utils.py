@@ -7,15 +7,17 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
-import pygsheets
-
-gc = pygsheets.authorize(service_account_env_var="GDRIVE_API_CREDENTIALS")
-
-
 from flask import current_app
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle
 
+import app.scripts.gsheets_gateway as gsheets_gateway
+import app.scripts.report_sidecars as report_sidecars
+from app.scripts.dataframe_cache import DataFrameCache
+from app.scripts.lazy import LazyValue
+from app.scripts.report_registry import ReportRegistry
+from app.scripts.gsheets_gateway import authorize_google_client, gc
+
 
 period_regex = re.compile(r"\d{1,2}")
 
@@ -86,29 +88,45 @@ def return_dataframe_of_files():
     return files_df
 
 
+report_registry = ReportRegistry(return_dataframe_of_files)
+photos_registry = LazyValue(return_dataframe_of_photos)
+gsheets_registry = LazyValue(return_dataframe_of_gsheets)
+
+
+def invalidate_report_registry():
+    report_registry.invalidate()
+
+
+def return_files_df():
+    return report_registry.return_files_df()
+
+
+def return_photos_df():
+    return photos_registry.get()
+
+
+def return_gsheets_df():
+    return gsheets_registry.get()
+
+
+def refresh_registries():
+    report_registry.refresh()
+    photos_registry.refresh()
+    gsheets_registry.refresh()
+
+
 def return_most_recent_report_per_semester(files_df, report):
-    files_df = return_dataframe_of_files()
-    files_df = files_df[files_df["report"] == report]
-    files_df = files_df.sort_values(by=["download_date"])
-    files_df = files_df.drop_duplicates(subset="year_and_semester")
-    return files_df["filename"].to_list()
+    return report_registry.return_most_recent_report_per_semester(report)
 
 
 def return_most_recent_report(files_df, report):
-    files_df = return_dataframe_of_files()
-    files_df = files_df[files_df["report"] == report]
-    files_df = files_df.sort_values(by=["download_date"])
-    filename = files_df.iloc[-1, :]["filename"]
-    return filename
+    return report_registry.return_most_recent_report(report)
 
 
 def return_most_recent_report_by_semester(files_df, report, year_and_semester):
-    files_df = return_dataframe_of_files()
-    files_df = files_df[files_df["year_and_semester"] == year_and_semester]
-    files_df = files_df[files_df["report"] == report]
-    files_df = files_df.sort_values(by=["download_date"])
-    filename = files_df.iloc[-1, :]["filename"]
-    return filename
+    return report_registry.return_most_recent_report_by_semester(
+        report, year_and_semester
+    )
 
 
 def return_gsheet_url_by_title(gsheet_df, title, year_and_semester=None):
@@ -118,7 +136,13 @@ def return_gsheet_url_by_title(gsheet_df, title, year_and_semester=None):
     return gsheet_url
 
 
-def return_file_as_df(filename, **kwargs):
+dataframe_cache = DataFrameCache()
+
+
+def read_file_as_df(filename, **kwargs):
+    df = report_sidecars.return_file_as_df(filename, **kwargs)
+    if df is not None:
+        return df
     if "xlsx" in filename:
         return pd.read_excel(filename, **kwargs)
     if "csv" in filename:
@@ -127,6 +151,10 @@ def return_file_as_df(filename, **kwargs):
         return pd.read_csv(filename, **kwargs)
 
 
+def return_file_as_df(filename, **kwargs):
+    return dataframe_cache.get_or_load(filename, read_file_as_df, **kwargs)
+
+
 def return_cohort_year(GEC):
     GEC_dict = {
         "6": 2026,
@@ -237,37 +265,30 @@ def save_report_to_file(f, report_name, year, term):
         os.makedirs(path)
 
     f.save(os.path.join(path, filename))
+    report_sidecars.write_sidecar(os.path.join(path, filename))
+    invalidate_report_registry()
 
     return True
 
 
 def return_google_sheet_as_dataframe(spreadsheet_id, sheet="Sheet1"):
-    if "https" in spreadsheet_id:
-        sh = gc.open_by_url(spreadsheet_id)
-    else:
-        sh = gc.open_by_key(spreadsheet_id)
-    try:
-        wks = sh.worksheet_by_title(sheet)
-    except pygsheets.exceptions.WorksheetNotFound:
-        wks = sh.sheet1
-    df = wks.get_as_df(include_tailing_empty=False)
-    if "Student ID" in df.columns:
-        df = df.rename(columns={"Student ID": "StudentID"})
-    return df
+    return gsheets_gateway.gateway.return_dataframe(spreadsheet_id, sheet=sheet)
+
+
+def return_google_sheets_as_dataframes(spreadsheet_id, sheets):
+    """{sheet: DataFrame} for several worksheets of one spreadsheet in a
+    single request."""
+    return gsheets_gateway.gateway.return_dataframes(spreadsheet_id, sheets)
 
 
 def set_df_to_dataframe(output_df, spreadsheet_id, sheet="Output"):
-    if "https" in spreadsheet_id:
-        sh = gc.open_by_url(spreadsheet_id)
-    else:
-        sh = gc.open_by_key(spreadsheet_id)
-    try:
-        wks = sh.worksheet_by_title(sheet)
-    except:
-        wks = sh.add_worksheet(sheet)
-    wks.clear()
-    wks.set_dataframe(output_df.fillna(""), "A1")
-    return True
+    return gsheets_gateway.gateway.set_dataframe(output_df, spreadsheet_id, sheet=sheet)
+
+
+def sync_df_to_sheet(output_df, spreadsheet_id, sheet="Output", **kwargs):
+    """Writes only the cells of sheet that differ from output_df and returns
+    the change summary; set_df_to_dataframe still rewrites the whole sheet."""
+    return gsheets_gateway.gateway.sync_dataframe(output_df, spreadsheet_id, sheet=sheet, **kwargs)
 
 
 def return_home_lang_code_table(files_df):
@@ -2,13 +2,13 @@ import pandas as pd
 import numpy as np
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from flask import session
 
 from functools import reduce
 
 def main(cr_1_42_df):
+    files_df = utils.return_files_df()
     school_year = session["school_year"]
     cr_1_42_df["year_in_hs"] = cr_1_42_df["GEC"].apply(
         utils.return_year_in_hs, args=(school_year,)
@@ -2,7 +2,6 @@ import pandas as pd
 import numpy as np
 
 import app.scripts.utils as utils
-from app.scripts import files_df
 
 from flask import session
 
@@ -12,6 +11,7 @@ from functools import reduce
 def main(cr_1_14_df):
 
     ## attach numeric equivalent
+    files_df = utils.return_files_df()
     cr_1_30_filename = utils.return_most_recent_report(files_df, "1_30")
     cr_1_30_df = utils.return_file_as_df(cr_1_30_filename)
     cr_1_14_df = cr_1_14_df.merge(
@@ -0,0 +1,208 @@
+"""
+Streaming Excel Export
+
+Writes report workbooks with xlsxwriter in constant_memory mode: a row is
+flushed as soon as the next one starts, so a long sheet costs about as
+much memory as one row. Each sheet's formatting is declared up front
+instead of styled cell by cell after openpyxl has loaded the whole
+workbook.
+
+A sheet is a dict:
+
+    name                 sheet name (cut to Excel's 31 characters)
+    df                   table written from startrow (default 0), header first
+    column_formats       {column: format options}, set once per column
+    header_format        format options for the header row (HEADER_FORMAT)
+    conditional_formats  list of {"columns": [...] or "span": (first, last),
+                         "options": xlsxwriter conditional format options}.
+                         "columns" applies the rule to each column's data
+                         rows, "span" to one block from first to last
+                         column. {Column} in a criteria formula becomes
+                         that column's cell in the first data row, so
+                         "={Rank}<=3" works row by row.
+    cells                free-form (row, col, value, format options) for
+                         titles and small side tables, written in row order
+                         with the table
+    merges               {(row, col): last_col} merging a cell to the right
+    charts               list of (cell, chart options); series ranges are
+                         (first_row, first_col, last_row, last_col) on
+                         the same sheet
+    widths               {column: width} overriding the computed widths
+    min_width            narrowest computed width (MIN_WIDTH)
+    freeze_panes         (row, col)
+    autofilter           True to filter the table
+
+Widths come from the longest header or value in each column, computed on
+the frame rather than by walking the cells.
+"""
+
+import re
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name
+
+HEADER_FORMAT = {
+    "bold": True,
+    "font_color": "#FFFFFF",
+    "bg_color": "#366092",
+    "align": "center",
+    "valign": "vcenter",
+}
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+MIN_WIDTH = 0
+MAX_WIDTH = 50
+PADDING = 2
+
+
+def return_workbook(sheets, constant_memory=True):
+    """BytesIO of the sheets, in order."""
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(
+        output,
+        {"constant_memory": constant_memory, "default_date_format": DATETIME_FORMAT},
+    )
+    formats = {}
+
+    def return_format(options):
+        if not options:
+            return None
+        key = tuple(sorted(options.items()))
+        if key not in formats:
+            formats[key] = workbook.add_format(options)
+        return formats[key]
+
+    for sheet in sheets:
+        write_sheet(workbook, sheet, return_format)
+    workbook.close()
+    output.seek(0)
+    return output
+
+
+def write_sheet(workbook, sheet, return_format):
+    worksheet = workbook.add_worksheet(sheet["name"][:31])
+    df = sheet.get("df")
+    startrow = sheet.get("startrow", 0)
+    cells = sorted(sheet.get("cells", []), key=lambda cell: (cell[0], cell[1]))
+    merges = sheet.get("merges", {})
+
+    min_width = sheet.get("min_width", MIN_WIDTH)
+    widths = return_cells_widths(cells, merges, min_width)
+    column_formats = {}
+    if df is not None:
+        for col, width in enumerate(return_column_widths(df, min_width)):
+            widths[col] = max(widths.get(col, 0), width)
+        for column, width in sheet.get("widths", {}).items():
+            widths[df.columns.get_loc(column)] = width
+        for col, column in enumerate(df.columns):
+            options = dict(sheet.get("column_formats", {}).get(column, {}))
+            if "num_format" not in options and pd.api.types.is_datetime64_any_dtype(df[column]):
+                options["num_format"] = DATETIME_FORMAT
+            column_formats[col] = return_format(options)
+    for col, width in sorted(widths.items()):
+        worksheet.set_column(col, col, width, column_formats.get(col))
+
+    ## cells above the table, the table, then whatever is left
+    cell_index = 0
+    if df is not None:
+        header_format = return_format(sheet.get("header_format", HEADER_FORMAT))
+        for row, values in enumerate(return_table_rows(df), start=startrow):
+            while cell_index < len(cells) and cells[cell_index][0] <= row:
+                write_cell(worksheet, cells[cell_index], merges, return_format)
+                cell_index += 1
+            if row == startrow:
+                worksheet.write_row(row, 0, values, header_format)
+            else:
+                worksheet.write_row(row, 0, values)
+    for cell in cells[cell_index:]:
+        write_cell(worksheet, cell, merges, return_format)
+
+    if df is not None and len(df):
+        for conditional_format in sheet.get("conditional_formats", []):
+            add_conditional_format(worksheet, df, startrow, conditional_format, return_format)
+        if sheet.get("autofilter"):
+            worksheet.autofilter(startrow, 0, startrow + len(df), len(df.columns) - 1)
+    for cell, options in sheet.get("charts", []):
+        worksheet.insert_chart(cell, return_chart(workbook, worksheet.name, options))
+    if sheet.get("freeze_panes"):
+        worksheet.freeze_panes(*sheet["freeze_panes"])
+    return worksheet
+
+
+def return_table_rows(df):
+    """Header, then each row as a list with missing values as None."""
+    yield [str(column) for column in df.columns]
+    values = df.to_numpy(dtype=object)
+    values[pd.isna(df).to_numpy()] = None
+    yield from values.tolist()
+
+
+def write_cell(worksheet, cell, merges, return_format):
+    row, col, value, options = cell
+    if np.ndim(value) == 0 and pd.isna(value):
+        value = None
+    if (row, col) in merges:
+        worksheet.merge_range(row, col, row, merges[(row, col)], value, return_format(options))
+    else:
+        worksheet.write(row, col, value, return_format(options))
+
+
+def return_column_widths(df, min_width=MIN_WIDTH, max_width=MAX_WIDTH, padding=PADDING):
+    """Width of each column of df from its longest header or value."""
+    widths = []
+    for col, column in enumerate(df.columns):
+        values = df.iloc[:, col]
+        length = values[values.notna()].astype(str).str.len().max() if len(values) else 0
+        length = max(0 if pd.isna(length) else int(length), len(str(column)))
+        widths.append(min(max(length + padding, min_width), max_width))
+    return widths
+
+
+def return_cells_widths(cells, merges, min_width=MIN_WIDTH, max_width=MAX_WIDTH, padding=PADDING):
+    """{col: width} for free-form cells; merged titles do not widen their
+    first column."""
+    cells = [cell for cell in cells if (cell[0], cell[1]) not in merges and cell[2] is not None]
+    if not cells:
+        return {}
+    cells_df = pd.DataFrame([(cell[1], cell[2]) for cell in cells], columns=["col", "value"])
+    lengths = cells_df["value"].astype(str).str.len().groupby(cells_df["col"]).max()
+    return (lengths + padding).clip(min_width, max_width).to_dict()
+
+
+def add_conditional_format(worksheet, df, startrow, conditional_format, return_format):
+    first_row, last_row = startrow + 1, startrow + len(df)
+    options = dict(conditional_format["options"])
+    if "format" in options:
+        options["format"] = return_format(options["format"])
+    if "criteria" in options and "{" in str(options["criteria"]):
+        options["criteria"] = re.sub(
+            r"\{([^}]+)\}",
+            lambda match: f"${xl_col_to_name(df.columns.get_loc(match.group(1)))}{first_row + 1}",
+            options["criteria"],
+        )
+
+    if "span" in conditional_format:
+        first, last = conditional_format["span"]
+        ranges = [(df.columns.get_loc(first), df.columns.get_loc(last))]
+    else:
+        columns = conditional_format.get("columns") or df.columns
+        ranges = [(df.columns.get_loc(column),) * 2 for column in columns if column in df.columns]
+    for first_col, last_col in ranges:
+        worksheet.conditional_format(first_row, first_col, last_row, last_col, options)
+
+
+def return_chart(workbook, sheet_name, options):
+    options = dict(options)
+    series = options.pop("series", [])
+    chart = workbook.add_chart({"type": options.pop("type", "column")})
+    for series_options in series:
+        series_options = dict(series_options)
+        for key in ["categories", "values", "name"]:
+            if isinstance(series_options.get(key), tuple):
+                series_options[key] = [sheet_name, *series_options[key]]
+        chart.add_series(series_options)
+    for key, value in options.items():
+        getattr(chart, f"set_{key}")(value)
+    return chart
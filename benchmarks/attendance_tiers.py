@@ -0,0 +1,205 @@
+"""
+Attendance tiers benchmark
+
+Builds a synthetic year of RATR rows (one row per student per school day
+from the 2025 school calendar, with runs of absences and some lates and
+I codes) and produces the month-by-month tiers sheets with
+attendance_tiers.return_output_dict, which reads every month from running
+totals. Checks each sheet against the per-month recomputation it replaced
+(every month filtered and pivoted from the start of the year, consecutive
+absences counted pair by pair) and times both.
+
+    python -m benchmarks.attendance_tiers [--students 500 2000] [--skip-reference]
+"""
+
+import argparse
+import time
+from itertools import pairwise
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.attendance.attendance_tiers as attendance_tiers
+from app.scripts.date_to_marking_period import return_mp_from_date
+
+SCHOOL_YEAR = 2025
+
+
+def return_synthetic_RATR_df(num_of_students, seed=0):
+    """RATR rows as main has them after clean and the calendar merge, and
+    the matching students_df."""
+    rng = np.random.default_rng(seed)
+    calendar_df = pd.read_excel("app/data/SchoolCalendar.xlsx", sheet_name=f"{SCHOOL_YEAR}")
+    calendar_df = calendar_df[calendar_df["SchoolDay?"]]
+    dates = calendar_df["Date"]
+
+    StudentIDs = rng.choice(np.arange(200000000, 240000000), size=num_of_students, replace=False)
+    ## each student has a base absence rate; absences come in short runs
+    absence_rates = rng.beta(1.2, 8, size=num_of_students)
+    rows = []
+    for StudentID, absence_rate in zip(StudentIDs, absence_rates):
+        start = rng.integers(0, 20)
+        is_absent = rng.random(len(dates)) < absence_rate
+        is_absent |= np.roll(is_absent, 1) & (rng.random(len(dates)) < 0.4)
+        ATTD = np.where(is_absent, "A", np.where(rng.random(len(dates)) < 0.08, "L", "P"))
+        ATTD[rng.random(len(dates)) < 0.01] = "I"
+        rows.append(pd.DataFrame({"StudentID": StudentID, "Date": dates.iloc[start:].values, "ATTD": ATTD[start:]}))
+    RATR_df = pd.concat(rows, ignore_index=True)
+
+    RATR_df["Weekday"] = RATR_df["Date"].dt.day_name()
+    RATR_df["Month"] = RATR_df["Date"].dt.strftime("%Y-%m")
+    terms = {date: return_mp_from_date(date, SCHOOL_YEAR) for date in dates}
+    RATR_df["Term"] = RATR_df["Date"].map(terms)
+    RATR_df["Attd"] = (RATR_df["ATTD"] == "A").astype(int)
+    RATR_df = RATR_df.merge(calendar_df, on="Date", how="left")
+
+    students_df = pd.DataFrame(
+        {
+            "StudentID": StudentIDs,
+            "LastName": [f"LAST{n % 97}" for n in range(num_of_students)],
+            "FirstName": [f"FIRST{n}" for n in range(num_of_students)],
+            "year_in_hs": rng.integers(1, 5, size=num_of_students),
+        }
+    )
+    return RATR_df, students_df
+
+
+## the per-month recomputation return_output_dict replaced
+
+
+def return_student_pvt_by_subcolumn(RATR_df, subcolumn):
+    pvt_tbl = pd.pivot_table(
+        RATR_df,
+        index=["StudentID", subcolumn],
+        columns="ATTD",
+        values="Date",
+        aggfunc="count",
+    ).fillna(0)
+    pvt_tbl["total"] = pvt_tbl.sum(axis=1)
+    pvt_tbl["absence_%"] = pvt_tbl["A"] / pvt_tbl["total"]
+    pvt_tbl = pvt_tbl.reset_index()
+
+    student_avg_and_std_dev = pd.pivot_table(
+        pvt_tbl,
+        index="StudentID",
+        values="absence_%",
+        aggfunc=["mean", "std"],
+    ).reset_index()
+    if len(student_avg_and_std_dev.columns) == 2:
+        student_avg_and_std_dev["Std"] = 0
+    student_avg_and_std_dev.columns = ["StudentID", "Avg", "Std"]
+
+    output_df = pvt_tbl[["StudentID", subcolumn, "absence_%"]].merge(
+        student_avg_and_std_dev, on=["StudentID"], how="left"
+    )
+    output_df["z_score"] = (output_df["absence_%"] - output_df["Avg"]) / output_df["Std"]
+    return output_df.drop(columns=["Avg", "Std"])
+
+
+def return_multiple_day_df(RATR_df):
+    df = RATR_df[["StudentID", "Date", "ATTD"]]
+    df = df[df["ATTD"] != "I"]
+
+    output_lst = []
+    for StudentID, student_attd_df in df.groupby("StudentID"):
+        consecutive_days_absent = 0
+        attd_list = student_attd_df["ATTD"].to_list()
+        total_days_absent = attd_list.count("A")
+        for i, j in pairwise(attd_list):
+            if i == "A" and j == "A":
+                consecutive_days_absent += 2 if consecutive_days_absent == 0 else 1
+
+        if total_days_absent == 0:
+            consecutive_days_absent_metric = 0
+        else:
+            consecutive_days_absent_metric = consecutive_days_absent / total_days_absent
+
+        if consecutive_days_absent_metric <= 0:
+            flag = "Single"
+        elif consecutive_days_absent_metric <= 0.25:
+            flag = "None"
+        else:
+            flag = "Multiple"
+        output_lst.append({"StudentID": StudentID, "consecutive_day_pattern": flag})
+    return pd.DataFrame(output_lst)
+
+
+def return_student_rolling_attd(df):
+    df = df[["StudentID", "Date", "Attd"]]
+    df = df.sort_values(by=["StudentID", "Date"])
+    df["rolling_20d_avg"] = df.groupby("StudentID")["Attd"].transform(
+        lambda x: x.rolling(window=20, min_periods=1).mean()
+    ).astype(str)
+    return attendance_tiers.return_rolling_attd_sparkline_df(df)
+
+
+def return_output_dict_from_scratch(RATR_df, students_df):
+    MONTHS_lst = RATR_df["Month"].unique().tolist()
+    MONTHS_lst.pop(0)
+    MONTHS_lst.insert(0, "ytd")
+
+    output_dict = {}
+    for month in MONTHS_lst:
+        RATR_dff = RATR_df if month == "ytd" else RATR_df[RATR_df["Month"] <= month]
+        student_attd_df = attendance_tiers.return_student_attd(RATR_dff)[["StudentID", "ytd_absence_%"]]
+        output_dict[month] = attendance_tiers.return_tiers_df(
+            students_df,
+            student_attd_df,
+            return_student_rolling_attd(RATR_dff),
+            attendance_tiers.return_student_correlation_to_overall(RATR_df),
+            return_student_pvt_by_subcolumn(RATR_dff, "Month"),
+            return_student_pvt_by_subcolumn(RATR_dff, "Term"),
+            return_student_pvt_by_subcolumn(RATR_dff, "Weekday"),
+            return_student_pvt_by_subcolumn(RATR_dff, "DaysBeforeBreak"),
+            return_student_pvt_by_subcolumn(RATR_dff, "DaysAfterBreak"),
+            return_multiple_day_df(RATR_dff),
+        )
+    return output_dict
+
+
+def check_output_dicts(output_dict, reference_dict):
+    assert list(output_dict) == list(reference_dict)
+    for month, df in output_dict.items():
+        reference_df = reference_dict[month]
+        assert list(df.columns) == list(reference_df.columns), f"{month} columns differ"
+        pd.testing.assert_frame_equal(
+            df.reset_index(drop=True), reference_df.reset_index(drop=True), check_dtype=False
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--skip-reference", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    for num_of_students in args.students:
+        RATR_df, students_df = return_synthetic_RATR_df(num_of_students)
+
+        start = time.perf_counter()
+        output_dict = attendance_tiers.return_output_dict(RATR_df.copy(), students_df)
+        seconds = time.perf_counter() - start
+        row = {
+            "Students": num_of_students,
+            "RATR rows": len(RATR_df),
+            "Sheets": len(output_dict),
+            "Running totals s": round(seconds, 2),
+        }
+
+        if not args.skip_reference:
+            start = time.perf_counter()
+            reference_dict = return_output_dict_from_scratch(RATR_df.copy(), students_df)
+            reference_seconds = time.perf_counter() - start
+            check_output_dicts(output_dict, reference_dict)
+            row["Per-month recompute s"] = round(reference_seconds, 2)
+            row["Speedup"] = round(reference_seconds / seconds, 1)
+        rows.append(row)
+
+    if not args.skip_reference:
+        print("every sheet matches the per-month recomputation")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Bell schedule benchmark
+
+Checks that bell_schedule.return_class_periods_df and is_in_first_n_minutes
+agree with the row-wise SmartPass helpers on random timestamps across every
+weekday, for the regular and summer schedules, and times both.
+
+    python -m benchmarks.bell_schedule [--rows 100000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.scripts import bell_schedule
+from app.scripts.pbis.smartpass import main as smartpass
+
+
+def return_synthetic_datetimes(num_of_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2025-09-01", periods=120)
+    seconds_into_day = rng.integers(7 * 3600, 17 * 3600, size=num_of_rows)
+    return pd.Series(
+        days[rng.integers(0, len(days), size=num_of_rows)]
+        + pd.to_timedelta(seconds_into_day, unit="s")
+    )
+
+
+def run_rowwise(df, term):
+    if term == 7:
+        class_period = df.apply(smartpass.return_summer_class_period, axis=1)
+        df = df.assign(class_period=class_period)
+        first_ten = df.apply(
+            lambda row: smartpass.is_in_first_ten_minutes(row, smartpass.SUMMER_SCHEDULE),
+            axis=1,
+        )
+    else:
+        class_period = df.apply(smartpass.return_class_period, axis=1)
+        df = df.assign(class_period=class_period)
+        first_ten = df.apply(
+            lambda row: smartpass.is_in_first_ten_minutes(
+                row,
+                smartpass.MONDAY_SCHEDULE
+                if row["datetime"].weekday() == 0
+                else smartpass.REGULAR_SCHEDULE,
+            ),
+            axis=1,
+        )
+    return class_period, first_ten
+
+
+def run_vectorized(df, term):
+    weekday_schedules = bell_schedule.return_weekday_schedules(term)
+    class_period = bell_schedule.return_class_period_column(df["datetime"], weekday_schedules)
+    first_ten = bell_schedule.is_in_first_n_minutes(df["datetime"], 10, weekday_schedules)
+    return class_period, first_ten
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    df = pd.DataFrame({"datetime": return_synthetic_datetimes(args.rows)})
+    for term in [1, 7]:
+        start = time.perf_counter()
+        expected_period, expected_first_ten = run_rowwise(df, term)
+        rowwise_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        class_period, first_ten = run_vectorized(df, term)
+        vectorized_time = time.perf_counter() - start
+
+        pd.testing.assert_series_equal(expected_period, class_period, check_names=False)
+        pd.testing.assert_series_equal(
+            expected_first_ten.astype(bool), first_ten, check_names=False
+        )
+        print(
+            f"term {term}: {args.rows:,} timestamps match "
+            f"(row-wise {rowwise_time:.2f}s, vectorized {vectorized_time:.3f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
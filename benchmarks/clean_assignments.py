@@ -0,0 +1,201 @@
+"""
+Clean assignments benchmark
+
+Builds a synthetic Jupiter assignments export (students with a handful of
+courses, assignments with one or more objectives, a mix of standard
+percents, 0! to 5! marks, not graded, excused and oddly typed marks) and
+cleans it with clean_assignments.return_clean_assignments, and with the
+row by row path assignments_analysis.py and teacher_analysis.py used
+before (filters, then convert_percentages, recompute_worth_points and
+return_department applied to every row). Checks both give the same
+counted rows, percents, worth points and departments, and times them,
+along with a second read of the same export from the in-process memo.
+
+    python -m benchmarks.clean_assignments [--rows 100000 500000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.assignments.clean_assignments as clean_assignments
+
+COURSES = ["EES88", "MRS22", "HGS44", "SCS22", "PPS88", "FSS62", "AKS21", "BKS11", "ALS21TP", "TQS11"]
+RAW_SCORES = (
+    ["100", "95", "85", "75", "65", "50", "45", "0", "72"]
+    + clean_assignments.SPECIAL_MARKS
+    + ["NG", "", "✓", "EX", "ex", "5!!", "41", "inc", "-"]
+)
+
+
+def return_synthetic_df(num_of_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    num_of_assignments = max(num_of_rows // 200, 1)
+    assignments_df = pd.DataFrame(
+        {
+            "Teacher": [f"TEACHER {n % 60:02}" for n in range(num_of_assignments)],
+            "Assignment": [f"Assignment {n}" for n in range(num_of_assignments)],
+            "Course": rng.choice(COURSES, size=num_of_assignments),
+            "DueDate": pd.Timestamp("2025-09-08") + pd.to_timedelta(rng.integers(0, 140, size=num_of_assignments), unit="D"),
+            "Category": rng.choice(["Performance", "Practice"], size=num_of_assignments),
+        }
+    )
+    assignment_index = rng.integers(0, num_of_assignments, size=num_of_rows)
+    df = assignments_df.iloc[assignment_index].reset_index(drop=True)
+    df["StudentID"] = rng.integers(200000000, 200000000 + num_of_rows // 20 + 1, size=num_of_rows)
+    ## most assignments have one objective, some have two worth different points
+    objective = rng.choice(["Content", "Reasoning", "Success Skills"], size=num_of_rows, p=[0.7, 0.2, 0.1])
+    df["Objective"] = objective
+    df["WorthPoints"] = np.where(objective == "Reasoning", 5, np.where(rng.random(num_of_rows) < 0.03, 0, 10))
+    raw_score = rng.choice(RAW_SCORES, size=num_of_rows)
+    df["RawScore"] = raw_score
+    percent_by_special_mark = {"0!": 0, "1!": 65, "2!": 75, "3!": 85, "4!": 95, "5!": 100}
+    df["Percent"] = [
+        int(score) if score.isdigit() else percent_by_special_mark.get(score, 10) for score in raw_score
+    ]
+    df.loc[rng.random(num_of_rows) < 0.01, "Course"] = ""
+    return df
+
+
+## the row by row path clean_assignments replaced
+
+
+def convert_percentages(row):
+    RawScore = row["RawScore"]
+    Percent = row["Percent"]
+    if Percent in clean_assignments.STANDARD_PERCENTS:
+        return Percent / 100
+    if Percent > 45 and Percent < 100:
+        return Percent / 100
+    if Percent == 0:
+        return 0.50
+    return clean_assignments.RAW_SCORE_PERCENTS[RawScore] / 100
+
+
+def recompute_worth_points(row):
+    if row["ObjectivesCount"] == 0:
+        return row["WorthPoints"]
+    if row["WorthPointsMin"] == row["WorthPointsMax"]:
+        return row["WorthPoints"] / row["ObjectivesCount"]
+    return row["WorthPoints"] / row["WorthPointsSum"]
+
+
+def return_department(course_code):
+    if course_code[1] == "K" and course_code[0] != "B":
+        return "CTE-SD"
+    if course_code[0:2] == "TQ":
+        return "CTE-SD"
+    if course_code[0] == "S":
+        return "Science"
+    if course_code[0] == "M":
+        return "Math"
+    if course_code[0] == "E":
+        return "ELA"
+    if course_code[0] == "F":
+        return "LOTE"
+    if course_code[0] == "H":
+        return "SS"
+    if course_code[0:2] == "PP":
+        return "PE"
+    if course_code[0:2] == "PH":
+        return "Health"
+    if course_code[0:2] == "AH":
+        return "SS"
+    if course_code[0:2] == "AF":
+        return "CTE-FD"
+    if course_code[0] == "B":
+        return "CTE-FMM"
+    if course_code[0:2] == "TU":
+        return "CTE-FMM"
+    if course_code[0:2] == "AC":
+        return "CTE-Photo"
+    if course_code == "ALS21TP":
+        return "CTE-Photo"
+    if course_code == "ABS11":
+        return "CTE-FMM"
+    if course_code[0] == "A":
+        return "CTE-AD"
+    return "check"
+
+
+def return_row_by_row_df(assignments_df):
+    df = assignments_df[assignments_df["Course"] != ""]
+    df = df.dropna(subset=["RawScore"])
+    df = df[df["WorthPoints"] != 0]
+    df = df[~df["RawScore"].isin(clean_assignments.NOT_GRADED_MARKS)]
+    df = df[~df["RawScore"].isin(clean_assignments.EXCUSED_MARKS)]
+    df = df.reset_index()
+
+    df["Percent%"] = df.apply(convert_percentages, axis=1)
+    group_by_cols = clean_assignments.ASSIGNMENT_COLS
+    stats_df = df.drop_duplicates(subset=group_by_cols + ["Objective"])
+    stats_df = (
+        stats_df.groupby(group_by_cols)[["Objective", "WorthPoints"]]
+        .agg({"WorthPoints": ["min", "max", "sum"], "Objective": "nunique"})
+        .reset_index()
+    )
+    stats_df.columns = group_by_cols + ["WorthPointsMin", "WorthPointsMax", "WorthPointsSum", "ObjectivesCount"]
+    df = df.merge(stats_df, on=group_by_cols, how="left")
+    df["AdjustedWorthPoints"] = df.apply(recompute_worth_points, axis=1)
+    df["Dept"] = df["Course"].apply(return_department)
+    return df.set_index("index")
+
+
+def check_clean_df(df, reference_df):
+    counted_df = df[df["IsCounted"]]
+    assert counted_df.index.equals(reference_df.index), "counted rows differ"
+    for column in ["Percent%", "AdjustedWorthPoints"]:
+        np.testing.assert_allclose(counted_df[column], reference_df[column], err_msg=column)
+    assert (counted_df["Dept"] == reference_df["Dept"]).all(), "departments differ"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 500000])
+    args = parser.parse_args()
+
+    rows = []
+    for num_of_rows in args.rows:
+        assignments_df = return_synthetic_df(num_of_rows)
+
+        start = time.perf_counter()
+        reference_df = return_row_by_row_df(assignments_df)
+        reference_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        df = clean_assignments.return_clean_assignments(assignments_df.copy())
+        seconds = time.perf_counter() - start
+        check_clean_df(df, reference_df)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "assignments.csv")
+            assignments_df.to_csv(filename, index=False)
+            start = time.perf_counter()
+            clean_assignments.return_clean_assignments_df(filename)
+            first_read_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            clean_assignments.return_clean_assignments_df(filename)
+            memo_seconds = time.perf_counter() - start
+
+        rows.append(
+            {
+                "Rows": num_of_rows,
+                "Counted": len(reference_df),
+                "Row by row s": round(reference_seconds, 2),
+                "Vectorized s": round(seconds, 3),
+                "Speedup": round(reference_seconds / seconds, 1),
+                "Read + clean s": round(first_read_seconds, 2),
+                "Memo hit s": round(memo_seconds, 3),
+            }
+        )
+
+    print("vectorized cleaning matches the row by row path")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Jupiter period attendance benchmark
+
+Builds a synthetic semester of jupiter_period_attendance rows, checks that
+the vectorized and row-wise versions of
+attendance.jupiter.process.process_attendance return identical frames, and
+times both. Then checks the processed-attendance fact table against a
+from-scratch run and times an incremental refresh after a new week of dates
+is appended to the export.
+
+    python -m benchmarks.jupiter_attendance [--students 2000] [--days 90]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.utils as utils
+from app.scripts.attendance.jupiter import fact_table
+from app.scripts.attendance.jupiter.process import process_attendance
+
+TYPES = ["present", "tardy", "excused", "unexcused"]
+TYPE_TO_ATTENDANCE = {"present": "P", "tardy": "L", "excused": "E", "unexcused": "A"}
+
+
+def return_synthetic_semester(num_of_students, num_of_days, seed=0):
+    rng = np.random.default_rng(seed)
+    StudentIDs = 200000000 + np.arange(num_of_students)
+    dates = pd.bdate_range("2025-09-08", periods=num_of_days).strftime("%Y-%m-%d")
+    periods = np.arange(1, 10)
+
+    StudentID, Date, Pd = np.meshgrid(StudentIDs, dates, periods, indexing="ij")
+    n = StudentID.size
+
+    ## students who are absent for the day are unexcused or excused every period
+    absent_for_day = rng.random((num_of_students, num_of_days)) < 0.08
+    absent_for_day = np.repeat(absent_for_day[:, :, np.newaxis], len(periods), axis=2).ravel()
+
+    Type = rng.choice(TYPES, size=n, p=[0.82, 0.06, 0.02, 0.10])
+    Type = np.where(absent_for_day, rng.choice(["excused", "unexcused"], size=n, p=[0.3, 0.7]), Type)
+
+    Attendance = pd.Series(Type).map(TYPE_TO_ATTENDANCE).to_numpy()
+    Attendance = np.where((Type == "unexcused") & (rng.random(n) < 0.2), "C", Attendance)
+
+    Course = np.array([f"C{p}" for p in range(1, 10)])[Pd.ravel() - 1]
+    Section = (StudentID.ravel() % 7) + 1
+
+    return pd.DataFrame(
+        {
+            "StudentID": StudentID.ravel(),
+            "Date": Date.ravel(),
+            "Period": [f"P{p}" for p in Pd.ravel()],
+            "Course": Course,
+            "Section": Section,
+            "Type": Type,
+            "Attendance": Attendance,
+        }
+    )
+
+
+def return_synthetic_students(jupiter_attd_df):
+    StudentIDs = jupiter_attd_df["StudentID"].unique()
+    students_df = pd.DataFrame(
+        {
+            "StudentID": StudentIDs,
+            "LastName": [f"Last{i}" for i in range(len(StudentIDs))],
+            "FirstName": [f"First{i}" for i in range(len(StudentIDs))],
+            "year_in_hs": (StudentIDs % 4) + 1,
+            "Counselor": "",
+        }
+    )
+    rosters_df = jupiter_attd_df[["StudentID", "Course", "Section"]].drop_duplicates()
+    rosters_df["ClassGrade"] = (rosters_df["StudentID"] % 50 + 50) / 100
+    return students_df, rosters_df
+
+
+def run(jupiter_attd_df, students_df, rosters_df, vectorized):
+    start = time.perf_counter()
+    df = process_attendance(
+        jupiter_attd_df.copy(), students_df, rosters_df, vectorized=vectorized
+    )
+    return df, time.perf_counter() - start
+
+
+def return_sorted(df):
+    return df.sort_values(by=["StudentID", "Date", "Pd", "Course"], ignore_index=True)
+
+
+def run_fact_table(num_of_students, num_of_days, new_days=5):
+    full_df = return_synthetic_semester(num_of_students, num_of_days + new_days)
+    dates = sorted(full_df["Date"].unique())
+    students_df, rosters_df = return_synthetic_students(full_df)
+
+    with tempfile.TemporaryDirectory() as data_directory:
+        report_directory = os.path.join(data_directory, "2025-1", "jupiter_period_attendance")
+        os.makedirs(report_directory)
+        filename = os.path.join(report_directory, "2025-1_9999-12-31_jupiter_period_attendance.csv")
+
+        full_df[full_df["Date"].isin(dates[:num_of_days])].to_csv(filename, index=False)
+        start = time.perf_counter()
+        fact_table.return_fact_table(filename)
+        print(f"fact table: initial build of {num_of_days} days {time.perf_counter() - start:.2f}s")
+
+        time.sleep(0.01)
+        full_df.to_csv(filename, index=False)
+        start = time.perf_counter()
+        table = fact_table.return_fact_table(filename)
+        print(
+            f"fact table: refresh after {new_days} new days "
+            f"({len(table.dates_processed_on_last_refresh)} dates processed) "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+
+        jupiter_attd_df = utils.return_file_as_df(filename)
+        week_number = table.facts_by_date[dates[-1]]["week_number"].iloc[0]
+        for kwargs in [{}, {"week_number": week_number}]:
+            start = time.perf_counter()
+            expected_df = process_attendance(
+                jupiter_attd_df.copy(), students_df, rosters_df, **kwargs
+            )
+            scratch_time = time.perf_counter() - start
+            start = time.perf_counter()
+            fact_df = fact_table.return_processed_attendance(
+                filename, students_df, rosters_df, **kwargs
+            )
+            fact_time = time.perf_counter() - start
+            pd.testing.assert_frame_equal(
+                return_sorted(expected_df), return_sorted(fact_df), check_dtype=False
+            )
+            print(
+                f"fact table matches from-scratch output {kwargs or '(semester)'}: "
+                f"from scratch {scratch_time:.2f}s, fact table {fact_time:.2f}s"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--golden-students", type=int, default=200)
+    parser.add_argument("--golden-days", type=int, default=10)
+    parser.add_argument(
+        "--full-rowwise",
+        action="store_true",
+        help="also time the row-wise version on the full semester (slow)",
+    )
+    args = parser.parse_args()
+
+    jupiter_attd_df = return_synthetic_semester(args.golden_students, args.golden_days)
+    students_df, rosters_df = return_synthetic_students(jupiter_attd_df)
+    rowwise_df, rowwise_time = run(jupiter_attd_df, students_df, rosters_df, False)
+    vectorized_df, vectorized_time = run(jupiter_attd_df, students_df, rosters_df, True)
+    pd.testing.assert_frame_equal(rowwise_df, vectorized_df)
+    print(
+        f"golden output matches on {len(jupiter_attd_df):,} rows "
+        f"(row-wise {rowwise_time:.2f}s, vectorized {vectorized_time:.2f}s)"
+    )
+
+    jupiter_attd_df = return_synthetic_semester(args.students, args.days)
+    students_df, rosters_df = return_synthetic_students(jupiter_attd_df)
+    vectorized_df, vectorized_time = run(jupiter_attd_df, students_df, rosters_df, True)
+    print(f"full semester: {len(jupiter_attd_df):,} rows, vectorized {vectorized_time:.2f}s")
+    if args.full_rowwise:
+        rowwise_df, rowwise_time = run(jupiter_attd_df, students_df, rosters_df, False)
+        pd.testing.assert_frame_equal(rowwise_df, vectorized_df)
+        print(f"full semester: row-wise {rowwise_time:.2f}s ({rowwise_time / vectorized_time:.0f}x)")
+
+    run_fact_table(args.students, args.days)
+
+
+if __name__ == "__main__":
+    main()
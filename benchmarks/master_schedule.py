@@ -0,0 +1,120 @@
+"""
+Master schedule assembly regression harness
+
+Builds a synthetic full-school master schedule output (co-taught sections,
+a few sections shared by three teachers, blank and mixed-type SectionIDs)
+and a RoomLookups grid. Runs the row-by-row co-teacher and room functions and
+the keyed groupby/join versions on it, checks that the outputs are identical,
+and times each.
+
+    python -m benchmarks.master_schedule [--teachers 150] [--replans 10]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.programming.master_schedule.utils as utils
+
+
+def return_synthetic_output_df(num_of_teachers, seed=0):
+    rng = np.random.default_rng(seed)
+    teacher_names = [f"TEACHER{n:03} {chr(65 + n % 26)}" for n in range(num_of_teachers)]
+    rows = []
+    for n, teacher_name in enumerate(teacher_names):
+        for PeriodID in rng.choice(np.arange(1, 10), size=5, replace=False):
+            rows.append(
+                {
+                    "CourseCode": f"{rng.choice(list('EMSHP'))}{rng.integers(10, 99)}QT",
+                    "SectionID": n * 10 + int(PeriodID),
+                    "PeriodID": int(PeriodID),
+                    "Room": str(rng.integers(200, 999)),
+                    "Teacher Name": teacher_name,
+                }
+            )
+    output_df = pd.DataFrame(rows)
+
+    ## co-teachers: a copy of a section under another teacher, and a few
+    ## sections with three teachers, which keep their own names
+    coteach_df = output_df.sample(frac=0.2, random_state=seed).copy()
+    coteach_df["Teacher Name"] = rng.choice(teacher_names, size=len(coteach_df))
+    three_df = coteach_df.sample(frac=0.1, random_state=seed).copy()
+    three_df["Teacher Name"] = rng.choice(teacher_names, size=len(three_df))
+    output_df = pd.concat([output_df, coteach_df, three_df], ignore_index=True)
+
+    ## invalid TeacherIDs leave a blank SectionID; mapped courses carry str
+    output_df.loc[output_df.sample(frac=0.01, random_state=seed).index, "SectionID"] = ""
+    mapped = output_df.sample(frac=0.05, random_state=seed + 1).index
+    output_df["SectionID"] = output_df["SectionID"].astype(object)
+    output_df.loc[mapped, "SectionID"] = output_df.loc[mapped, "SectionID"].astype(str)
+    return output_df.sort_values(by=["CourseCode", "SectionID"], key=lambda x: x.astype(str))
+
+
+def return_synthetic_room_grid_df(output_df, seed=0):
+    rng = np.random.default_rng(seed)
+    teacher_names = output_df["Teacher Name"].drop_duplicates()
+    room_grid_df = pd.DataFrame(
+        {
+            f"Period{i}": rng.choice(["", "", "301", "415", "GYM"], size=len(teacher_names))
+            for i in range(1, 10)
+        },
+        index=teacher_names.to_numpy(),
+    )
+    return room_grid_df.iloc[: len(room_grid_df) // 3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=150)
+    parser.add_argument("--replans", type=int, default=10)
+    args = parser.parse_args()
+
+    output_df = return_synthetic_output_df(args.teachers)
+    room_grid_df = return_synthetic_room_grid_df(output_df)
+    print(f"{len(output_df):,} section rows, {len(room_grid_df):,} teachers on the room grid")
+
+    start = time.perf_counter()
+    expected_teachers = output_df.apply(
+        utils.return_combined_teacher_names, args=(output_df,), axis=1
+    )
+    row_teachers_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.replans):
+        teachers = utils.return_combined_teacher_names_by_section(output_df)
+    groupby_teachers_time = (time.perf_counter() - start) / args.replans
+    assert teachers.equals(expected_teachers.astype(object))
+    num_of_combined = (teachers != output_df["Teacher Name"]).sum()
+    print(
+        f"co-teacher names: row by row {row_teachers_time:.2f}s, "
+        f"groupby {groupby_teachers_time * 1000:.1f}ms; "
+        f"{num_of_combined:,} rows combined, outputs match"
+    )
+
+    room_grid_dict = room_grid_df.to_dict("index")
+    start = time.perf_counter()
+    expected_rooms = output_df.apply(
+        utils.return_room_by_teacher_by_period, args=(room_grid_dict,), axis=1
+    )
+    row_rooms_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.replans):
+        rooms = utils.return_rooms_by_teacher_by_period(output_df, room_grid_df)
+    join_rooms_time = (time.perf_counter() - start) / args.replans
+    assert rooms.equals(expected_rooms.astype(object))
+    num_of_overridden = (rooms.fillna("") != output_df["Room"]).sum()
+    print(
+        f"room grid lookup: row by row {row_rooms_time:.3f}s, "
+        f"join {join_rooms_time * 1000:.1f}ms; "
+        f"{num_of_overridden:,} rooms overridden, outputs match"
+    )
+    print(
+        f"{args.replans} re-plans: row by row "
+        f"{(row_teachers_time + row_rooms_time) * args.replans:.1f}s, "
+        f"vectorized {(groupby_teachers_time + join_rooms_time) * args.replans:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+PDF page index benchmark
+
+Writes a synthetic ATS-style printout (one StudentID per page, some
+students with two pages) and re-sorts it by student the way the tools do:
+the page-by-page extract_text loop they used, pdf_page_index on a cold cache
+reading from the tool's own PdfReader, and pdf_page_index again on the warm
+cache. Each time covers building the StudentID -> pages index and writing
+the re-sorted PDF from one reader. Checks that all three indexes agree.
+
+    python -m benchmarks.pdf_page_index [--pages 3000] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from io import BytesIO
+
+import PyPDF2
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+import app.scripts.pdf_page_index as pdf_page_index
+import app.scripts.sharded_pdf as sharded_pdf
+
+
+def return_synthetic_pdf(num_of_pages, seed=0):
+    rng = random.Random(seed)
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    StudentID = 200000000
+    for page_num in range(num_of_pages):
+        ## about one student in five has a second page
+        if page_num == 0 or rng.random() > 0.2:
+            StudentID += rng.randint(1, 5000)
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(1 * inch, 10 * inch, "STUDENT PROGRAM CARD")
+        c.setFont("Helvetica", 10)
+        c.drawString(1 * inch, 9.6 * inch, f"ID: {' '.join(str(StudentID))}")
+        for line in range(30):
+            c.drawString(
+                1 * inch,
+                (9.2 - line * 0.25) * inch,
+                f"P{line % 10} M{rng.randint(1000, 9999)}-{rng.randint(1, 30):02} "
+                f"Room {rng.randint(100, 999)} Teacher {rng.choice('ABCDEFGH')}",
+            )
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def return_resorted_pdf(pdfReader, StudentID_dict):
+    StudentIDs = list(StudentID_dict)
+    random.Random(0).shuffle(StudentIDs)
+    pdfWriter = PyPDF2.PdfWriter()
+    for StudentID in StudentIDs:
+        for page_num in StudentID_dict[StudentID]:
+            pdfWriter.add_page(pdfReader.pages[page_num])
+    f = BytesIO()
+    pdfWriter.write(f)
+    return f
+
+
+def return_StudentID_dict_by_loop(pdfReader):
+    StudentIDRegex = re.compile(r"\d{9}")
+    StudentID_dict = {}
+    for page_num, page in enumerate(pdfReader.pages):
+        page_text = page.extract_text().replace(" ", "")
+        mo = StudentIDRegex.search(page_text)
+        if mo:
+            StudentID_dict.setdefault(int(mo.group()), []).append(page_num)
+    return StudentID_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    pdf_bytes = return_synthetic_pdf(args.pages)
+    print(f"{args.pages:,} pages, {len(pdf_bytes) / 1024**2:.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_page_index.INDEX_DIRECTORY = os.path.join(directory, ".pdf_index")
+        sharded_pdf.MAX_WORKERS = args.workers
+        use_pool = args.workers > 1
+
+        if use_pool:
+            ## start the pool outside the timing, as a running server would have it
+            pdf_page_index.return_page_texts(return_synthetic_pdf(10, seed=1), use_pool=True)
+
+        start = time.perf_counter()
+        pdfReader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+        expected = return_StudentID_dict_by_loop(pdfReader)
+        return_resorted_pdf(pdfReader, expected)
+        print(f"extract_text loop + re-sort: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        pdfReader = pdf_page_index.return_pdf_reader(pdf_bytes)
+        StudentID_dict = pdf_page_index.return_StudentID_dict(
+            pdf_bytes, use_pool=use_pool, pdfReader=pdfReader
+        )
+        return_resorted_pdf(pdfReader, StudentID_dict)
+        print(
+            f"cold index with {args.workers if use_pool else 1} worker(s) + re-sort: "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+        assert StudentID_dict == expected
+
+        start = time.perf_counter()
+        pdfReader = pdf_page_index.return_pdf_reader(pdf_bytes)
+        StudentID_dict = pdf_page_index.return_StudentID_dict(pdf_bytes, pdfReader=pdfReader)
+        return_resorted_pdf(pdfReader, StudentID_dict)
+        print(f"warm index (cache hit) + re-sort: {time.perf_counter() - start:.2f}s")
+        assert StudentID_dict == expected
+        print(f"{len(StudentID_dict):,} students, indexes match")
+    sharded_pdf.reset_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Student photo thumbnail benchmark
+
+Writes synthetic full-resolution student photos to a temporary directory,
+makes their thumbnails with photo_thumbnails.update_thumbnails, and builds
+the same photo roster PDF from the originals and from the thumbnails.
+
+    python -m benchmarks.photo_thumbnails [--students 20] [--width 2448] [--height 3264]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from PIL import Image as PILImage
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, SimpleDocTemplate, Table
+
+import app.scripts.photo_thumbnails as photo_thumbnails
+
+IMAGE_DIM = 1.2
+
+
+def write_synthetic_photos(directory, num_of_students, width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    photo_filenames = []
+    for n in range(num_of_students):
+        ## smooth gradient plus noise so the JPEGs are about camera-sized
+        gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+        pixels = gradient + rng.normal(0, 12, size=(height, width, 3))
+        photo_filename = os.path.join(directory, f"{200000000 + n}.jpg")
+        PILImage.fromarray(pixels.clip(0, 255).astype(np.uint8)).save(
+            photo_filename, quality=92
+        )
+        photo_filenames.append(photo_filename)
+    return pd.DataFrame({"photo_filename": photo_filenames})
+
+
+def return_roster_pdf_size(photo_filenames):
+    rows = []
+    for photo_filename in photo_filenames:
+        I = Image(photo_filename)
+        I.drawHeight = IMAGE_DIM * inch
+        I.drawWidth = IMAGE_DIM * inch
+        rows.append([I])
+    f = BytesIO()
+    SimpleDocTemplate(f, pagesize=letter).build([Table(rows, repeatRows=0)])
+    return len(f.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--width", type=int, default=2448)
+    parser.add_argument("--height", type=int, default=3264)
+    parser.add_argument("--max-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        photo_thumbnails.THUMBNAIL_DIRECTORY = os.path.join(directory, ".thumbnails")
+        photos_df = write_synthetic_photos(
+            directory, args.students, args.width, args.height
+        )
+        print(f"face detection: {'opencv' if photo_thumbnails.cv2 else 'off (top-biased crop)'}")
+
+        start = time.perf_counter()
+        num_of_written = photo_thumbnails.update_thumbnails(
+            photos_df, inches=(IMAGE_DIM,), max_workers=args.max_workers
+        )
+        print(f"{num_of_written:,} thumbnails written in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        assert photo_thumbnails.update_thumbnails(photos_df, inches=(IMAGE_DIM,)) == 0
+        print(f"up-to-date check: {time.perf_counter() - start:.3f}s")
+
+        for label, photo_filenames in [
+            ("originals", photos_df["photo_filename"]),
+            (
+                "thumbnails",
+                [
+                    photo_thumbnails.return_thumbnail_filename(photo_filename, IMAGE_DIM)
+                    for photo_filename in photos_df["photo_filename"]
+                ],
+            ),
+        ]:
+            start = time.perf_counter()
+            pdf_size = return_roster_pdf_size(photo_filenames)
+            print(
+                f"roster PDF from {label}: {time.perf_counter() - start:.2f}s, "
+                f"{pdf_size / 1024**2:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
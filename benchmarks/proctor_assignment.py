@@ -0,0 +1,142 @@
+"""
+Proctor assignment benchmark
+
+Builds a synthetic Regents week (exam book with general, extended time,
+ENL, QR and scribe rooms over AM and PM sessions, and a proctor availability
+sheet), expands it into proctoring slots with process_proctors_needed, then
+assigns proctors with the greedy day-by-day loop and with the min-cost flow.
+Checks that both respect availability and one slot per proctor per day, and
+compares runtime, open slots, cross-session placements and the spread of
+difficulty load. Each method is run again on shuffled input rows to show how
+much its result depends on their order.
+
+    python -m benchmarks.proctor_assignment [--proctors 160] [--rooms 14]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.testing.regents.proctoring.assign_proctors as assign_proctors
+import app.scripts.testing.regents.proctoring.process_proctors_needed as process_proctors_needed
+
+DAYS = ["Tuesday", "Wednesday", "Thursday", "Friday", "Monday"]
+DEPTS = ["ELA", "math", "science", "social studies", "spanish", "PE", "CTE", "admin"]
+TYPES = ["GEN", "GEN", "GEN", "1.5x", "2x", "enl", "QR", "SCRIBE"]
+
+
+def return_synthetic_week(num_of_proctors, rooms_per_session, seed=0):
+    """exam_book_df, proctor_availability_df"""
+    rng = np.random.default_rng(seed)
+    exam_rows = []
+    for day in DAYS:
+        for time_of_day in ["AM", "PM"]:
+            Course = f"{rng.choice(list('EMSH'))}XR{rng.choice(list('CGJUP'))}"
+            for room_num in range(rooms_per_session):
+                Type = rng.choice(TYPES)
+                exam_rows.append(
+                    {
+                        "Day": day,
+                        "Time": time_of_day,
+                        "Course Code": Course,
+                        "ExamTitle": f"{Course} Regents",
+                        "Room": int(rng.choice([2, 3, 4, 5, 6, 7, 8])) * 100 + room_num,
+                        "Section": room_num + 1,
+                        "Active": int(rng.integers(1, 3)) if Type == "SCRIBE" else int(rng.integers(5, 30)),
+                        "Type": Type,
+                    }
+                )
+    exam_book_df = pd.DataFrame(exam_rows)
+
+    availability_rows = []
+    for n in range(num_of_proctors):
+        row = {
+            "Name": f"TEACHER {n:03}",
+            "Dept": rng.choice(DEPTS),
+            "Session": rng.choice(["Early", "Late"]),
+            "total_difficulty": 0,
+        }
+        for day in DAYS:
+            row[day] = rng.choice(["Proctor", "Proctor", "Proctor", "SCORING", "SUB PROCTOR"])
+        row["#_of_proctor_days"] = sum(row[day] == "Proctor" for day in DAYS)
+        availability_rows.append(row)
+    proctor_availability_df = pd.DataFrame(availability_rows)
+    return exam_book_df, proctor_availability_df
+
+
+def run_method(method, proctor_assignments_df, proctor_availability_df):
+    proctor_availability_df = proctor_availability_df.set_index("Name", drop=False)
+    start = time.perf_counter()
+    output_df = assign_proctors.main(
+        proctor_assignments_df.copy(), proctor_availability_df, method=method
+    )
+    return output_df, time.perf_counter() - start
+
+
+def check_assignments(output_df, proctor_availability_df):
+    assigned_df = output_df[output_df["Proctor"].notna()]
+    assert not assigned_df.duplicated(subset=["Day", "Proctor"]).any(), "proctor assigned twice in a day"
+    availability = proctor_availability_df.set_index("Name")
+    for day, proctor in zip(assigned_df["Day"], assigned_df["Proctor"]):
+        assert availability.at[proctor, day] == "Proctor", f"{proctor} not available {day}"
+
+
+def return_summary(output_df, seconds, proctor_availability_df):
+    loads = output_df.groupby("Proctor")["assignment_difficulty"].sum()
+    available = proctor_availability_df.loc[proctor_availability_df["#_of_proctor_days"] > 0, "Name"]
+    loads = loads.reindex(available).fillna(0)
+    return {
+        "Seconds": round(seconds, 3),
+        "Slots": len(output_df),
+        "Open": int(output_df["Proctor"].isna().sum()),
+        "Cross-session": int((output_df["Alignment"].astype(str).isin(["Late on AM", "Early on PM"])).sum()),
+        "Proctors used": int((loads > 0).sum()),
+        "Load min": loads.min(),
+        "Load max": loads.max(),
+        "Load std": round(loads.std(), 3),
+    }
+
+
+def return_assignment_key(output_df):
+    return sorted(
+        zip(output_df["Day"], output_df["Time"], output_df["Room"].astype(str), output_df["Course"], output_df["proctor#"], output_df["Proctor"].astype(str))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--proctors", type=int, default=160)
+    parser.add_argument("--rooms", type=int, default=14)
+    args = parser.parse_args()
+
+    exam_book_df, proctor_availability_df = return_synthetic_week(args.proctors, args.rooms)
+    with contextlib.redirect_stdout(io.StringIO()):
+        proctor_assignments_df = process_proctors_needed.main(exam_book_df)
+    print(f"{len(proctor_assignments_df):,} proctoring slots, {len(proctor_availability_df)} proctors, {len(DAYS)} days")
+
+    ## networkx is imported lazily; load it outside the timing
+    nx_version = assign_proctors.nx.__version__
+    rows = {}
+    for method in assign_proctors.METHODS:
+        output_df, seconds = run_method(method, proctor_assignments_df, proctor_availability_df)
+        check_assignments(output_df, proctor_availability_df)
+        rows[method] = return_summary(output_df, seconds, proctor_availability_df)
+
+        shuffled_df, _ = run_method(
+            method,
+            proctor_assignments_df.sample(frac=1, random_state=1),
+            proctor_availability_df.sample(frac=1, random_state=1),
+        )
+        changed = len(set(return_assignment_key(output_df)) - set(return_assignment_key(shuffled_df)))
+        rows[method]["Changed when shuffled"] = changed
+
+    print(f"networkx {nx_version}")
+    print(pd.DataFrame(rows).T.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Report card chart benchmark
+
+Builds synthetic daily (RATR) and period (Jupiter) attendance summaries for a
+grade, renders every student's charts with reportlab_charts in one batch and
+builds a PDF with one page per student. When plotly and kaleido are
+installed, also times the previous per-student plotly rendering on a sample.
+
+    python -m benchmarks.report_card_charts [--students 600] [--courses 8]
+"""
+
+import argparse
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.platypus import PageBreak, SimpleDocTemplate
+
+import app.scripts.reportlab_charts as reportlab_charts
+
+
+def return_synthetic_summaries(num_of_students, num_of_courses, num_of_days=60, seed=0):
+    rng = np.random.default_rng(seed)
+    StudentIDs = 200000000 + np.arange(num_of_students)
+
+    L = rng.poisson(3, size=num_of_students)
+    A = rng.poisson(4, size=num_of_students)
+    RATR_Summary_df = pd.DataFrame(
+        {"StudentID": StudentIDs, "P": num_of_days - L - A, "L": L, "A": A}
+    )
+
+    StudentID = np.repeat(StudentIDs, num_of_courses)
+    late = rng.poisson(2, size=len(StudentID))
+    absent = rng.poisson(3, size=len(StudentID))
+    jupiter_attd_summary_df = pd.DataFrame(
+        {
+            "StudentID": StudentID,
+            "Course": np.tile([f"C{n}" for n in range(num_of_courses)], num_of_students),
+            "present": num_of_days - late - absent,
+            "late": late,
+            "absent": absent,
+        }
+    )
+    return RATR_Summary_df, jupiter_attd_summary_df
+
+
+def run_plotly_sample(RATR_Summary_df, sample_size):
+    import plotly.express as px
+    import plotly.io as pio
+
+    start = time.perf_counter()
+    for StudentID, df in RATR_Summary_df.head(sample_size).groupby("StudentID"):
+        fig = px.bar(df, y=df.index, x=["P", "L", "A"], orientation="h", barmode="stack")
+        pio.write_image(fig, BytesIO())
+    return (time.perf_counter() - start) / sample_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=600)
+    parser.add_argument("--courses", type=int, default=8)
+    parser.add_argument("--plotly-sample", type=int, default=10)
+    args = parser.parse_args()
+
+    RATR_Summary_df, jupiter_attd_summary_df = return_synthetic_summaries(
+        args.students, args.courses
+    )
+
+    start = time.perf_counter()
+    daily_attd_charts = reportlab_charts.return_drawings_by_key(
+        RATR_Summary_df,
+        "StudentID",
+        ["P", "L", "A"],
+        reportlab_charts.return_daily_attendance_drawing,
+    )
+    jupiter_attd_charts = reportlab_charts.return_drawings_by_key(
+        jupiter_attd_summary_df,
+        ["StudentID", "Course"],
+        ["present", "late", "absent"],
+        reportlab_charts.return_period_attendance_drawing,
+    )
+    render_time = time.perf_counter() - start
+    num_of_charts = len(daily_attd_charts) + len(jupiter_attd_charts)
+    num_of_distinct = reportlab_charts._return_stacked_bar_drawing.cache_info().currsize
+    print(
+        f"{num_of_charts:,} charts ({num_of_distinct:,} distinct) rendered in "
+        f"{render_time:.3f}s"
+    )
+
+    flowables = []
+    for StudentID in RATR_Summary_df["StudentID"]:
+        flowables.append(daily_attd_charts[StudentID])
+        for n in range(args.courses):
+            flowables.append(jupiter_attd_charts[(StudentID, f"C{n}")])
+        flowables.append(PageBreak())
+    start = time.perf_counter()
+    f = BytesIO()
+    SimpleDocTemplate(f, pagesize=landscape(letter)).build(flowables)
+    print(
+        f"PDF of {args.students:,} pages built in {time.perf_counter() - start:.2f}s "
+        f"({len(f.getvalue()) / 1024**2:.1f} MiB)"
+    )
+
+    try:
+        seconds_per_chart = run_plotly_sample(RATR_Summary_df, args.plotly_sample)
+    except (ImportError, ValueError, RuntimeError) as e:
+        print(f"plotly/kaleido comparison skipped: {e}")
+    else:
+        print(
+            f"plotly + kaleido: {seconds_per_chart:.2f}s per chart, "
+            f"~{seconds_per_chart * num_of_charts:.0f}s for {num_of_charts:,} charts"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Report sidecars benchmark
+
+Writes synthetic rosters as .xlsx and .csv under a temporary
+app/data-style tree: one with blank Period and Section cells, and one
+whose Section and Room mix numbers and codes ("A", "GYM"). Reads each
+through report_sidecars the way utils.return_file_as_df does, first
+building the sidecar and then from it. Checks the result filters the
+same as the raw read_excel/read_csv frame: Period >= 1 and == 3, Section
+== 1, and StudentID lookups, with the same dtypes. Checks the blank Period
+and Section report survives .fillna('') and row by row Period == 3, as
+readers use it. Also checks that a report the reader gives mixed columns
+for gets no sidecar and comes back exactly as read. Times the raw parse
+against the sidecar read.
+
+    python -m benchmarks.report_sidecars [--rows 5000 50000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.report_sidecars as report_sidecars
+
+COMPARISONS = [
+    ("Period", "ge", 1),
+    ("Period", "eq", 3),
+    ("Section", "eq", 1),
+    ("StudentID", "eq", 200000001),
+]
+
+
+def return_synthetic_df(num_of_rows, mixed, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "StudentID": rng.integers(200000000, 200000000 + num_of_rows // 8 + 2, size=num_of_rows),
+            "Course": rng.choice(["EES88 ", "MRS22", "HGS44", "SCS22"], size=num_of_rows),
+            "Section": rng.integers(1, 12, size=num_of_rows).astype(object),
+            "Period": rng.integers(1, 10, size=num_of_rows).astype(object),
+            "Room": rng.integers(100, 900, size=num_of_rows).astype(object),
+            "Teacher": [f"TEACHER {n % 90:02}" for n in range(num_of_rows)],
+        }
+    )
+    if mixed:
+        df.loc[rng.random(num_of_rows) < 0.05, "Section"] = "A"
+        df.loc[rng.random(num_of_rows) < 0.05, "Room"] = "GYM"
+    else:
+        df.loc[rng.random(num_of_rows) < 0.05, "Period"] = None
+        df.loc[rng.random(num_of_rows) < 0.05, "Section"] = None
+    return df
+
+
+def return_raw_df(filename):
+    if filename.endswith(".xlsx"):
+        return pd.read_excel(filename)
+    return pd.read_csv(filename)
+
+
+def return_mask(series, operator, value):
+    mask = getattr(series, operator)(value)
+    return mask.fillna(False).to_numpy(dtype=bool)
+
+
+def check_sidecar_df(df, raw_df, filename):
+    assert list(df.columns) == list(raw_df.columns)
+    for column in ["StudentID", "Section", "Period"]:
+        assert df[column].dtype == raw_df[column].dtype, (
+            f"{filename}: {column} is {df[column].dtype}, raw read gives {raw_df[column].dtype}"
+        )
+    for column, operator, value in COMPARISONS:
+        try:
+            raw_mask = return_mask(raw_df[column], operator, value)
+        except TypeError:
+            ## codes mixed into the column: the raw frame cannot be ordered
+            ## against a number either, so the sidecar must leave it as read
+            pd.testing.assert_series_equal(df[column], raw_df[column])
+            continue
+        mask = return_mask(df[column], operator, value)
+        assert (mask == raw_mask).all(), f"{filename}: {column} {operator} {value} differs"
+    for column in ["Room", "Teacher"]:
+        pd.testing.assert_series_equal(df[column], raw_df[column])
+
+
+def check_blanks_df(df, raw_df, filename):
+    ## the way readers such as api_1_0/classes.py use a report with blanks
+    filled_df = df.fillna("")
+    raw_filled_df = raw_df.fillna("")
+    is_period_3 = filled_df.apply(lambda row: row["Period"] == 3, axis=1)
+    raw_is_period_3 = raw_filled_df.apply(lambda row: row["Period"] == 3, axis=1)
+    assert (is_period_3 == raw_is_period_3).all(), f"{filename}: row by row Period == 3 differs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[5000, 50000])
+    args = parser.parse_args()
+
+    rows = []
+    for num_of_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            report_directory = os.path.join(tmp, "data", "2025-1", "1_01")
+            os.makedirs(report_directory)
+            for mixed in [False, True]:
+                synthetic_df = return_synthetic_df(num_of_rows, mixed)
+                for extension in [".xlsx", ".csv"]:
+                    filename = os.path.join(report_directory, f"{'mixed' if mixed else 'blanks'}{extension}")
+                    if extension == ".xlsx":
+                        synthetic_df.to_excel(filename, index=False)
+                    else:
+                        synthetic_df.to_csv(filename, index=False)
+
+                    start = time.perf_counter()
+                    raw_df = return_raw_df(filename)
+                    raw_seconds = time.perf_counter() - start
+
+                    check_sidecar_df(report_sidecars.return_file_as_df(filename), raw_df, filename)
+                    start = time.perf_counter()
+                    df = report_sidecars.return_file_as_df(filename)
+                    seconds = time.perf_counter() - start
+                    check_sidecar_df(df, raw_df, filename)
+
+                    has_sidecar = os.path.exists(report_sidecars.return_sidecar_path(filename))
+                    if mixed:
+                        ## read_csv gives the codes' columns as all strings,
+                        ## which a sidecar can hold
+                        if report_sidecars.return_mixed_columns(raw_df):
+                            assert not has_sidecar, f"{filename}: mixed report got a sidecar"
+                        expected_df = raw_df.copy()
+                        if has_sidecar:
+                            expected_df["Course"] = expected_df["Course"].str.strip()
+                        pd.testing.assert_frame_equal(df, expected_df)
+                    else:
+                        assert has_sidecar, f"{filename}: no sidecar written"
+                        check_blanks_df(df, raw_df, filename)
+                    rows.append(
+                        {
+                            "Rows": num_of_rows,
+                            "Report": os.path.basename(filename),
+                            "Sidecar": has_sidecar,
+                            "Period dtype": str(df["Period"].dtype),
+                            "Section dtype": str(df["Section"].dtype),
+                            "Raw read s": round(raw_seconds, 3),
+                            "Second read s": round(seconds, 3),
+                        }
+                    )
+
+    print("sidecar frames filter and fill the same as the raw reads")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
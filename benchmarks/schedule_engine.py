@@ -0,0 +1,175 @@
+"""
+Schedule engine benchmark
+
+Builds synthetic schools (grades 9-12, seven or eight requests per student,
+singleton AP and elective sections, MWF/TR alternating sections, locked
+students, a few stale locks and a conflict list) and runs the schedule
+engine on each. Checks that no student is double-booked and no section is
+over capacity (other than by locks), then reports placement rate, full
+schedule rate, conflict resolution rate and runtime per phase.
+
+    python -m benchmarks.schedule_engine [--students 500 1000 2500 5000] [--workers 1]
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.programming.schedule_engine.main as schedule_engine
+import app.scripts.sharded_pdf as sharded_pdf
+from app.scripts.programming.schedule_engine.model import UNASSIGNED
+
+PERIODS = range(1, 10)
+CAPACITY = 34
+
+
+def return_synthetic_school(num_of_students, seed=0):
+    """requests_df, master_schedule_df, locked_df, conflicts_df"""
+    rng = np.random.default_rng(seed)
+    StudentIDs = rng.choice(np.arange(200000000, 240000000), size=num_of_students, replace=False)
+    grades = rng.integers(9, 13, size=num_of_students)
+    electives = [f"A{n:02}QE" for n in range(12)] + [f"T{n:02}QE" for n in range(8)]
+    elective_weights = rng.dirichlet(np.ones(len(electives)) * 0.7)
+
+    rows = []
+    for StudentID, grade in zip(StudentIDs, grades):
+        term = 2 * (grade - 9) + 1
+        courses = [
+            f"EES8{term}QA",
+            f"M{'EGRC'[grade - 9]}S2{term}",
+            f"S{'LCPE'[grade - 9]}S2{term}",
+            f"H{'GGUV'[grade - 9]}S1{term}",
+            f"PPS8{term}" if rng.random() < 0.5 else f"PHS2{term}",
+            f"F{'SFC'[rng.integers(0, 3)]}S{grade - 8}",
+        ]
+        if grade >= 11 and rng.random() < 0.35:
+            courses.append(f"{'EMSH'[rng.integers(0, 4)]}AP{grade}X")
+        courses.extend(
+            rng.choice(electives, size=rng.integers(1, 3), replace=False, p=elective_weights).tolist()
+        )
+        rows.extend((StudentID, course) for course in courses)
+    requests_df = pd.DataFrame(rows, columns=["Student_ID", "Course_Code"]).drop_duplicates()
+
+    ## sections in proportion to demand, spread over the periods; AP and small
+    ## electives get one section, a few get two at the same time
+    master_rows = []
+    teacher_num = 0
+    for Course_Code, num_of_requests in requests_df["Course_Code"].value_counts().sort_index().items():
+        num_of_sections = max(1, math.ceil(num_of_requests * 1.08 / CAPACITY))
+        if Course_Code[1:3] == "AP":
+            num_of_sections = 1
+        capacity = max(CAPACITY, math.ceil(num_of_requests * 1.05 / num_of_sections))
+        if num_of_sections == 2 and rng.random() < 0.3:
+            periods = [rng.choice(PERIODS)] * 2
+        else:
+            periods = rng.choice(PERIODS, size=num_of_sections, replace=num_of_sections > len(PERIODS))
+        ## physical education sections come in MWF/TR pairs sharing a period
+        alternating = Course_Code.startswith("PPS")
+        for section, period in enumerate(periods, start=1):
+            cycle_days = ["10101", "01010"] if alternating else ["11111"]
+            for n, cycle_day in enumerate(cycle_days):
+                master_rows.append(
+                    {
+                        "Course_Code": Course_Code,
+                        "Section": 2 * section - 1 + n if alternating else section,
+                        "Teacher": f"TEACHER{teacher_num % 120:03}",
+                        "Room": str(200 + teacher_num % 300),
+                        "Capacity": capacity,
+                        "Period": int(period),
+                        "Cycle_Day": cycle_day,
+                    }
+                )
+            teacher_num += 1
+    master_schedule_df = pd.DataFrame(master_rows)
+
+    locked_df = requests_df.sample(frac=0.01, random_state=seed).merge(
+        master_schedule_df.drop_duplicates(subset=["Course_Code"])[["Course_Code", "Section"]], on="Course_Code"
+    )
+    stale_df = locked_df.head(max(1, len(locked_df) // 10)).copy()
+    stale_df["Section"] = 99
+    locked_df = pd.concat([locked_df, stale_df], ignore_index=True)
+
+    pairs = rng.choice(StudentIDs, size=(num_of_students // 20, 2), replace=True)
+    conflicts_df = pd.DataFrame(pairs[pairs[:, 0] != pairs[:, 1]], columns=["Student_A", "Student_B"])
+    return requests_df, master_schedule_df, locked_df, conflicts_df
+
+
+def check_schedule(model):
+    """No double-booked student, loads match members, capacity only
+    exceeded by locked students."""
+    busy = np.zeros(len(model.students), dtype=np.uint64)
+    for request in np.flatnonzero(model.assignment != UNASSIGNED):
+        student = model.request_student[request]
+        mask = model.section_mask[model.assignment[request]]
+        assert not busy[student] & mask, f"student {model.students[student]} double-booked"
+        busy[student] |= mask
+    assert (busy == model.busy).all()
+    load = np.bincount(model.assignment[model.assignment != UNASSIGNED], minlength=len(model.load))
+    assert (load == model.load).all()
+    assert all(len(members) == load for members, load in zip(model.section_members, model.load))
+    locked_load = np.bincount(
+        model.assignment[model.locked & (model.assignment != UNASSIGNED)], minlength=len(model.load)
+    )
+    assert (model.load <= np.maximum(model.capacity, locked_load)).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[500, 1000, 2500, 5000])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    sharded_pdf.MAX_WORKERS = max(args.workers, 1)
+
+    if args.workers > 1:
+        ## start the pool outside the timing, as a running server would have it
+        schedule_engine.engine.schedule_students(*return_synthetic_school(200, seed=1), max_workers=args.workers)
+
+    rows = []
+    for num_of_students in args.students:
+        requests_df, master_schedule_df, locked_df, conflicts_df = return_synthetic_school(num_of_students)
+
+        start = time.perf_counter()
+        results = schedule_engine.engine.schedule_students(
+            requests_df, master_schedule_df, locked_df, conflicts_df, max_workers=args.workers
+        )
+        engine_seconds = time.perf_counter() - start
+        check_schedule(results["model"])
+
+        start = time.perf_counter()
+        grades = schedule_engine.reports.return_grades(results["model"], requests_df)
+        summary = schedule_engine.reports.return_summary_df(results["model"], results).set_index("Metric")["Value"]
+        schedule_engine.reports.return_recommendations_df(results["model"], results, grades)
+        schedule_engine.reports.return_problematic_students_df(results["model"], results, grades)
+        reports_seconds = time.perf_counter() - start
+
+        timings = results["timings"]
+        rows.append(
+            {
+                "Students": num_of_students,
+                "Requests": int(summary["Course requests"]),
+                "Sections": len(results["model"].load),
+                "Placed %": summary["Success rate (%)"],
+                "Full %": summary["Full schedule rate (%)"],
+                "Conflicts %": summary["Conflict resolution rate (%)"],
+                "Constraints s": round(timings["constraint_processing"], 2),
+                "Placement s": round(timings["initial_assignment"], 2),
+                "Optimize s": round(timings["optimization"], 2),
+                "Reports s": round(reports_seconds, 2),
+                "Total s": round(engine_seconds + reports_seconds, 2),
+            }
+        )
+        print(
+            f"{num_of_students:,} students: {summary['Success rate (%)']}% of requests placed, "
+            f"{summary['Full schedule rate (%)']}% full schedules in {engine_seconds + reports_seconds:.2f}s"
+        )
+
+    print(f"\nschedules valid; {args.workers} worker(s) for the optimization passes")
+    print(pd.DataFrame(rows).to_string(index=False))
+    sharded_pdf.reset_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Sharded PDF build benchmark
+
+Builds synthetic summer class lists with generate_class_list_with_photos,
+once as a single SimpleDocTemplate.build and once through sharded_pdf with a
+process pool, checks that both have the same pages, and times each. Also
+times the streamed ZIP of per-teacher PDFs.
+
+    python -m benchmarks.sharded_pdf [--teachers 60] [--workers 4]
+"""
+
+import argparse
+import time
+import zipfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from PyPDF2 import PdfReader
+from reportlab.platypus import SimpleDocTemplate
+
+import app.scripts.sharded_pdf as sharded_pdf
+from app.scripts.summer.organization import generate_class_list_with_photos as class_lists
+
+
+def return_synthetic_class_lists(num_of_teachers, class_size=28, seed=0):
+    rng = np.random.default_rng(seed)
+    lst = []
+    for n in range(num_of_teachers):
+        for Period in (1, 2, 3):
+            lst.append(
+                pd.DataFrame(
+                    {
+                        "Teacher1": f"TEACHER{n:03}",
+                        "Period": Period,
+                        "Cycle": "AB",
+                        "Course Name": f"Course {n}-{Period}",
+                        "StudentID": rng.integers(200000000, 300000000, size=class_size),
+                        "LastName": "Lastname",
+                        "FirstName": "Firstname",
+                        "photo_filename": np.nan,
+                        "school_name": "Sending School",
+                    }
+                )
+            )
+    return pd.concat(lst, ignore_index=True)
+
+
+def return_page_texts(pdf_bytes):
+    return [page.extract_text() for page in PdfReader(BytesIO(pdf_bytes)).pages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teachers", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    student_programs_df = return_synthetic_class_lists(args.teachers)
+    shared_args = (2024, "Program generated: 2025-06-30")
+    shards = [
+        (teacher, (teacher_df,))
+        for teacher, teacher_df in student_programs_df.groupby("Teacher1")
+    ]
+
+    start = time.perf_counter()
+    f = BytesIO()
+    flowables = []
+    for teacher, (teacher_df,) in shards:
+        flowables.extend(class_lists.return_teacher_flowables(teacher_df, *shared_args))
+    SimpleDocTemplate(f, **class_lists.DOC_KWARGS).build(flowables)
+    single_time = time.perf_counter() - start
+    print(f"single build: {single_time:.2f}s")
+
+    sharded_pdf.MAX_WORKERS = args.workers
+    ## start the pool outside the timing, as a running server would have it
+    sharded_pdf.build_sharded_pdf(
+        shards[: args.workers],
+        class_lists.return_teacher_flowables,
+        class_lists.DOC_KWARGS,
+        shared_args,
+        use_pool=True,
+    )
+    start = time.perf_counter()
+    merged = sharded_pdf.build_sharded_pdf(
+        shards,
+        class_lists.return_teacher_flowables,
+        class_lists.DOC_KWARGS,
+        shared_args,
+        job_id="benchmark",
+        use_pool=True,
+    )
+    sharded_time = time.perf_counter() - start
+    assert return_page_texts(merged.getvalue()) == return_page_texts(f.getvalue())
+    print(
+        f"sharded build with {args.workers} workers: {sharded_time:.2f}s, "
+        f"{len(PdfReader(merged).pages):,} pages match "
+        f"({sharded_pdf.return_progress('benchmark')['completed']} shards)"
+    )
+
+    start = time.perf_counter()
+    zip_bytes = b"".join(
+        sharded_pdf.iter_sharded_zip(
+            shards,
+            class_lists.return_teacher_flowables,
+            class_lists.DOC_KWARGS,
+            shared_args,
+            use_pool=True,
+        )
+    )
+    with zipfile.ZipFile(BytesIO(zip_bytes)) as zf:
+        num_of_members = len(zf.namelist())
+    print(f"streamed ZIP of {num_of_members} teacher PDFs: {time.perf_counter() - start:.2f}s")
+    sharded_pdf.reset_executor()
+
+
+if __name__ == "__main__":
+    main()
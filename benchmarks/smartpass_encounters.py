@@ -0,0 +1,101 @@
+"""
+SmartPass possible-encounters benchmark
+
+Builds a synthetic SmartPass export spanning several months, checks that the
+sweep-line and pairwise iterrows versions of
+pbis.smartpass.main.return_possible_encounters return identical frames on a
+sample, and times the sweep-line version on the full export.
+
+    python -m benchmarks.smartpass_encounters [--passes 100000] [--days 100]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.scripts import bell_schedule
+from app.scripts.pbis.smartpass import main as smartpass
+
+DESTINATIONS = [
+    "9th Floor Girls",
+    "7th Floor Girls",
+    "6th Floor Girls",
+    "4th Floor Boys",
+    "Gender Neutral",
+    "4th Floor Girls",
+    "9th Floor Boys",
+    "5th Floor Boys",
+]
+
+
+def return_synthetic_passes(num_of_passes, num_of_days, num_of_students=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2025-09-08", periods=num_of_days)
+    StudentIDs = 200000000 + rng.integers(0, num_of_students, size=num_of_passes)
+
+    ## passes start between 8:05 and 15:30
+    day = dates[rng.integers(0, num_of_days, size=num_of_passes)]
+    seconds_into_day = rng.integers(8 * 3600 + 5 * 60, 15 * 3600 + 30 * 60, size=num_of_passes)
+    datetime = day + pd.to_timedelta(seconds_into_day, unit="s")
+
+    smartpass_df = pd.DataFrame(
+        {
+            "StudentID": StudentIDs,
+            "Student Name": [f"Student {StudentID}" for StudentID in StudentIDs],
+            "Grade": 9 + StudentIDs % 4,
+            "Origin": [f"Room {n}" for n in rng.integers(200, 260, size=num_of_passes)],
+            "Destination": rng.choice(DESTINATIONS, size=num_of_passes),
+            "Date": datetime.strftime("%m/%d/%Y"),
+            "Time": datetime.strftime("%I:%M:%S %p"),
+            "Duration (sec)": rng.integers(31, 900, size=num_of_passes),
+        }
+    )
+    smartpass_df["datetime"] = pd.to_datetime(
+        smartpass_df["Date"] + " " + smartpass_df["Time"], format="mixed"
+    )
+    smartpass_df["endtime"] = smartpass_df["datetime"] + pd.to_timedelta(
+        smartpass_df["Duration (sec)"], unit="s"
+    )
+    smartpass_df["class_period"] = bell_schedule.return_class_period_column(
+        smartpass_df["datetime"]
+    )
+    return smartpass_df
+
+
+def run(smartpass_df, vectorized):
+    start = time.perf_counter()
+    df = smartpass.return_possible_encounters(smartpass_df, vectorized=vectorized)
+    return df, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--passes", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=100)
+    parser.add_argument("--golden-passes", type=int, default=3000)
+    parser.add_argument("--golden-days", type=int, default=10)
+    args = parser.parse_args()
+
+    smartpass_df = return_synthetic_passes(args.golden_passes, args.golden_days)
+    rowwise_df, rowwise_time = run(smartpass_df, False)
+    vectorized_df, vectorized_time = run(smartpass_df, True)
+    pd.testing.assert_frame_equal(rowwise_df, vectorized_df)
+    print(
+        f"golden output matches on {len(smartpass_df):,} passes, "
+        f"{len(vectorized_df):,} student pairs "
+        f"(pairwise {rowwise_time:.2f}s, sweep-line {vectorized_time:.3f}s)"
+    )
+
+    smartpass_df = return_synthetic_passes(args.passes, args.days)
+    vectorized_df, vectorized_time = run(smartpass_df, True)
+    print(
+        f"full export: {len(smartpass_df):,} passes over "
+        f"{smartpass_df['datetime'].dt.normalize().nunique()} days, "
+        f"{len(vectorized_df):,} student pairs, sweep-line {vectorized_time:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
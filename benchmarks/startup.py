@@ -0,0 +1,130 @@
+"""
+Startup benchmark
+
+Runs create_app in a fresh interpreter with -X importtime and reports the
+cumulative import time of every blueprint module imported by
+app/scripts/__init__.py, plus the slowest third-party imports.
+
+Also runs create_app (without PRELOAD_DATA) watching for calls to the
+files_df, photos_df and gsheets_df loaders (return_dataframe_of_files and
+friends), and fails with the calling frames if any of them runs: the
+registries are built on the first request that asks for them, never while
+the app starts.
+
+    python -m benchmarks.startup [--top 25]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+SCRIPTS_INIT = "app/scripts/__init__.py"
+IMPORT_REGEX = re.compile(r"^from (app\.scripts[\w.]*) import (\w+)\s*$", re.M)
+
+## a profile hook rather than patching utils: importing app.scripts.utils
+## runs app/scripts/__init__.py, and with it every route module, first
+REGISTRY_CHECK = """
+import json
+import sys
+import traceback
+
+LOADERS = ["return_dataframe_of_files", "return_dataframe_of_photos", "return_dataframe_of_gsheets"]
+loads = []
+
+
+def record_loads(frame, event, arg):
+    code = frame.f_code
+    if event == "call" and code.co_name in LOADERS and code.co_filename.endswith("app/scripts/utils.py"):
+        frames = [line for line in traceback.format_stack(frame) if "/app/" in line]
+        loads.append({"loader": code.co_name, "frames": frames[-6:]})
+
+
+sys.setprofile(record_loads)
+from app import create_app
+
+create_app()
+sys.setprofile(None)
+print(json.dumps(loads))
+"""
+
+
+def return_blueprint_modules():
+    with open(SCRIPTS_INIT) as f:
+        source = f.read()
+    return [f"{package}.{name}" for package, name in IMPORT_REGEX.findall(source)]
+
+
+def return_import_times():
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from app import create_app; create_app()"],
+        capture_output=True,
+        text=True,
+    )
+    wall_time = time.perf_counter() - start
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr[-4000:])
+        raise SystemExit(completed.returncode)
+
+    import_times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        self_us, cumulative_us, module = int(fields[0]), int(fields[1]), fields[2].strip()
+        import_times[module] = (self_us, cumulative_us)
+    return wall_time, import_times
+
+
+def return_registry_loads():
+    """Registry loads made while create_app runs, with their frames."""
+    env = {key: value for key, value in os.environ.items() if key != "PRELOAD_DATA"}
+    completed = subprocess.run(
+        [sys.executable, "-c", REGISTRY_CHECK], capture_output=True, text=True, env=env
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr[-4000:])
+        raise SystemExit(completed.returncode)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    loads = return_registry_loads()
+    for load in loads:
+        print(f"{load['loader']} loaded during create_app:")
+        print("".join(load["frames"]))
+    if loads:
+        raise SystemExit("registries must not be built at startup")
+    print("create_app builds no registries\n")
+
+    wall_time, import_times = return_import_times()
+
+    print(f"create_app wall time: {wall_time:.2f}s\n")
+    print(f"{'blueprint module':<75} {'cumulative (ms)':>15}")
+    rows = []
+    for module in return_blueprint_modules():
+        _, cumulative_us = import_times.get(module, (0, 0))
+        rows.append((cumulative_us, module))
+    for cumulative_us, module in sorted(rows, reverse=True):
+        print(f"{module:<75} {cumulative_us / 1000:>15.1f}")
+
+    print(f"\n{'slowest third-party imports':<75} {'cumulative (ms)':>15}")
+    third_party = [
+        (cumulative_us, module)
+        for module, (_, cumulative_us) in import_times.items()
+        if not module.startswith("app") and "." not in module
+    ]
+    for cumulative_us, module in sorted(third_party, reverse=True)[: args.top]:
+        print(f"{module:<75} {cumulative_us / 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Student co-enrollment network benchmark
+
+Builds a synthetic 1_01 roster, checks that the sparse A·Aᵀ adjacency has the
+same edges and weights as a pairwise itertools build, and times both. Then
+compares k-pivot betweenness centrality against the exact value on the same
+graph.
+
+    python -m benchmarks.student_network [--students 2000] [--pivots 100 500]
+"""
+
+import argparse
+import itertools
+import time
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from app.scripts.pbis.student_network import co_enrollment
+
+
+def return_synthetic_roster(num_of_students, class_size=30, seed=0):
+    rng = np.random.default_rng(seed)
+    StudentIDs = 200000000 + np.arange(num_of_students)
+    lst = []
+    for Period in range(1, 10):
+        ## every student takes one section each period, with students of the
+        ## same grade more likely to share sections
+        grade = StudentIDs % 4
+        order = np.lexsort((rng.random(num_of_students), grade))
+        num_of_sections = -(-num_of_students // class_size)
+        Section = np.empty(num_of_students, dtype=int)
+        Section[order] = np.arange(num_of_students) // class_size + 1
+        Course = np.array([f"C{Period}{n % 5}" for n in range(num_of_sections + 1)])[Section]
+        lst.append(
+            pd.DataFrame(
+                {"StudentID": StudentIDs, "Course": Course, "Section": Section, "Period": Period}
+            )
+        )
+    return pd.concat(lst, ignore_index=True)
+
+
+def return_pairwise_graph(cr_1_01_df):
+    """The previous per-section loop: re-filter the roster for every section and
+    add each pair of classmates to the graph."""
+    df = co_enrollment.return_class_enrollment_df(cr_1_01_df)
+    G = nx.Graph()
+    for index, course_section in df[["Course", "Section"]].drop_duplicates().iterrows():
+        students_df = df[
+            (df["Course"] == course_section["Course"])
+            & (df["Section"] == course_section["Section"])
+        ]
+        students = students_df["StudentID"].to_list()
+        for student1, student2 in itertools.combinations(students, 2):
+            if G.has_edge(student1, student2):
+                G[student1][student2]["weight"] += 1
+            else:
+                G.add_edge(student1, student2, weight=1)
+    return G
+
+
+def return_edges(G):
+    return {(min(u, v), max(u, v)): weight for u, v, weight in G.edges(data="weight")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--pivots", type=int, nargs="+", default=[100, 500])
+    parser.add_argument(
+        "--exact-students",
+        type=int,
+        default=600,
+        help="roster size for the exact betweenness comparison",
+    )
+    args = parser.parse_args()
+
+    cr_1_01_df = return_synthetic_roster(args.students)
+    start = time.perf_counter()
+    G_pairwise = return_pairwise_graph(cr_1_01_df)
+    pairwise_time = time.perf_counter() - start
+    start = time.perf_counter()
+    network = co_enrollment.StudentNetwork.from_roster(cr_1_01_df)
+    sparse_time = time.perf_counter() - start
+    start = time.perf_counter()
+    G = network.graph
+    graph_time = time.perf_counter() - start
+    assert return_edges(G) == return_edges(G_pairwise)
+    print(
+        f"{G.number_of_nodes():,} students, {G.number_of_edges():,} edges match "
+        f"(pairwise {pairwise_time:.2f}s, sparse adjacency {sparse_time:.2f}s "
+        f"+ networkx graph {graph_time:.2f}s)"
+    )
+
+    for pivots in args.pivots:
+        start = time.perf_counter()
+        network.return_betweenness_centrality(pivots=pivots)
+        print(f"betweenness with {pivots} pivots: {time.perf_counter() - start:.2f}s")
+
+    network = co_enrollment.StudentNetwork.from_roster(
+        return_synthetic_roster(args.exact_students)
+    )
+    start = time.perf_counter()
+    exact = network.return_betweenness_centrality(pivots=None)
+    print(f"exact betweenness on {args.exact_students:,} students: {time.perf_counter() - start:.2f}s")
+    for pivots in args.pivots:
+        if pivots >= args.exact_students:
+            continue
+        start = time.perf_counter()
+        approximate = network.return_betweenness_centrality(pivots=pivots)
+        approximate_time = time.perf_counter() - start
+        error = (approximate - exact).abs().max() / exact.max()
+        rank_correlation = approximate.rank().corr(exact.rank())
+        print(
+            f"  {pivots} pivots: {approximate_time:.2f}s, max error {error:.1%} of the "
+            f"largest value, rank correlation {rank_correlation:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Survey set cover benchmark
+
+Builds a synthetic survey analysis_df (students in seven or eight sections
+each, five dimensions of Likert questions averaged per student, some P and
+Z courses) and picks the recommended sections with
+set_cover_optimization.calculate_set_cover_recommendations, which builds one
+sparse section by student matrix and runs lazy greedy on it, and with the
+loop it replaced (every section re-filtered for every dimension into Python
+sets, and every set rescanned on every pick). Checks both recommend the same
+sections in the same order and give the same coverage summary, and times
+them. For schools small enough for milp, also reports how far greedy's
+coverage credit is from the exact optimum.
+
+    python -m benchmarks.survey_set_cover [--students 1000 4000] [--exact-students 300 1000]
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+import app.scripts.surveys.set_cover_optimization as set_cover_optimization
+
+CONFIG = SimpleNamespace(
+    dimension_groups={
+        "Adult_Relationships": [1, 2, 3],
+        "Peer_Belonging": [4, 5, 6],
+        "Safety": [7, 8],
+        "Engagement": [9, 10, 11],
+        "Academic_Support": [12, 13],
+    }
+)
+COURSE_PREFIXES = ["EES", "MRS", "HGS", "SCS", "FSS", "AKS", "PPS", "ZLS"]
+
+
+def return_synthetic_analysis_df(num_of_students, seed=0):
+    rng = np.random.default_rng(seed)
+    num_of_sections = max(num_of_students // 25, 8)
+    sections_df = pd.DataFrame(
+        {
+            "Course": [f"{COURSE_PREFIXES[n % len(COURSE_PREFIXES)]}{n % 7 + 1}{n % 3}" for n in range(num_of_sections)],
+            "Section": [str(n // 50 + 1) for n in range(num_of_sections)],
+        }
+    )
+    sections_df["Section_ID"] = sections_df["Course"] + " - " + sections_df["Section"]
+
+    StudentIDs = np.arange(200000000, 200000000 + num_of_students)
+    sections_per_student = rng.integers(7, 9, size=num_of_students)
+    student_index = np.repeat(np.arange(num_of_students), sections_per_student)
+    section_index = rng.integers(0, num_of_sections, size=len(student_index))
+    df = sections_df.iloc[section_index].reset_index(drop=True)
+    df.insert(0, "StudentID", StudentIDs[student_index])
+
+    ## answers belong to the student, repeated on each of their rows
+    questions = [q for qs in CONFIG.dimension_groups.values() for q in qs]
+    answers = rng.integers(1, 5, size=(num_of_students, len(questions)))
+    for col, q in enumerate(questions):
+        df[f"Q{q}"] = answers[student_index, col]
+    for dimension_name, qs in CONFIG.dimension_groups.items():
+        df[f"{dimension_name}_dim_avg"] = df[[f"Q{q}" for q in qs]].mean(axis=1)
+    return df
+
+
+## the per-section loop calculate_set_cover_recommendations replaced
+
+
+def return_loop_recommendations(analysis_df, config, threshold=2.0):
+    analysis_df = analysis_df[~analysis_df["Course"].str.startswith(("P", "Z"))]
+    recommendations = {}
+    for dimension_name in config.dimension_groups:
+        dim_avg_col = f"{dimension_name}_dim_avg"
+        at_risk_df = analysis_df[pd.to_numeric(analysis_df[dim_avg_col], errors="coerce") <= threshold]
+        if at_risk_df.empty:
+            continue
+        at_risk_students = set(at_risk_df["StudentID"].unique())
+
+        section_students = defaultdict(set)
+        section_priority = {}
+        for section_id in analysis_df["Section_ID"].unique():
+            section_df = analysis_df[analysis_df["Section_ID"] == section_id]
+            section_at_risk = set(section_df["StudentID"]) & at_risk_students
+            if section_at_risk:
+                section_students[section_id] = section_at_risk
+                section_at_risk_df = section_df[section_df["StudentID"].isin(section_at_risk)]
+                scores = pd.to_numeric(section_at_risk_df[dim_avg_col], errors="coerce").dropna()
+                if len(scores) > 0:
+                    section_priority[section_id] = len(section_at_risk) + (threshold - scores.mean()) / threshold
+                else:
+                    section_priority[section_id] = len(section_at_risk)
+
+        selected_sections = weighted_greedy_set_cover(section_students, section_priority, max_sections=10)
+        for rank, section_id in enumerate(selected_sections, 1):
+            recommendations[(dimension_name, section_id)] = rank
+    return recommendations
+
+
+def weighted_greedy_set_cover(section_students, section_priority, max_sections=10):
+    selected = []
+    student_coverage_count = defaultdict(int)
+    for _ in range(max_sections):
+        best_section = None
+        best_score = (-1, -1)
+        for section_id, students in section_students.items():
+            if section_id in selected:
+                continue
+            coverage_score = 0
+            for student in students:
+                coverage_score += 1.0 / (student_coverage_count[student] + 1)
+            ## the loop compared raw float sums, so two sections with the
+            ## same credit could tie or not depending on set order
+            coverage_score = round(coverage_score, set_cover_optimization.GAIN_DECIMALS)
+            composite_score = (coverage_score, section_priority.get(section_id, 0))
+            if composite_score > best_score:
+                best_score = composite_score
+                best_section = section_id
+        if best_section is None:
+            break
+        selected.append(best_section)
+        for student in section_students[best_section]:
+            student_coverage_count[student] += 1
+    return selected
+
+
+def return_loop_coverage_summary(analysis_df, recommendations, config, threshold=2.0):
+    summary_data = []
+    for dimension_name in config.dimension_groups:
+        dim_avg_col = f"{dimension_name}_dim_avg"
+        at_risk_df = analysis_df[pd.to_numeric(analysis_df[dim_avg_col], errors="coerce") <= threshold]
+        total_at_risk = len(at_risk_df["StudentID"].unique())
+        recommended_sections = [section_id for (dim, section_id) in recommendations if dim == dimension_name]
+        if total_at_risk == 0 or not recommended_sections:
+            continue
+        covered_students = set()
+        duplicate_coverage_count = 0
+        for section_id in recommended_sections:
+            section_students = set(
+                analysis_df[
+                    (analysis_df["Section_ID"] == section_id)
+                    & (analysis_df["StudentID"].isin(at_risk_df["StudentID"]))
+                ]["StudentID"]
+            )
+            duplicate_coverage_count += len(covered_students & section_students)
+            covered_students.update(section_students)
+        summary_data.append({
+            "Dimension": dimension_name.replace("_", " "),
+            "Total_At_Risk_Students": total_at_risk,
+            "Students_Covered": len(covered_students),
+            "Coverage_Pct": round(len(covered_students) / total_at_risk * 100, 1),
+            "Recommended_Sections": len(recommended_sections),
+            "Avg_Coverage_Per_Student": round((len(covered_students) + duplicate_coverage_count) / len(covered_students), 2),
+            "Total_Student_Interventions": len(covered_students) + duplicate_coverage_count,
+        })
+    return pd.DataFrame(summary_data)
+
+
+def check_recommendations(recommendations, reference_recommendations):
+    for dimension_name in CONFIG.dimension_groups:
+        ranked = sorted((rank, section_id) for (dim, section_id), rank in recommendations.items() if dim == dimension_name)
+        reference_ranked = sorted(
+            (rank, section_id) for (dim, section_id), rank in reference_recommendations.items() if dim == dimension_name
+        )
+        assert ranked == reference_ranked, f"{dimension_name}: {ranked} != {reference_ranked}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 4000])
+    parser.add_argument("--exact-students", type=int, nargs="+", default=[300, 1000])
+    args = parser.parse_args()
+
+    rows = []
+    for num_of_students in args.students:
+        analysis_df = return_synthetic_analysis_df(num_of_students)
+
+        start = time.perf_counter()
+        reference_recommendations = return_loop_recommendations(analysis_df, CONFIG)
+        reference_summary_df = return_loop_coverage_summary(analysis_df, reference_recommendations, CONFIG)
+        reference_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recommendations = set_cover_optimization.calculate_set_cover_recommendations(analysis_df, CONFIG)
+        summary_df = set_cover_optimization.create_coverage_summary(analysis_df, recommendations, CONFIG)
+        seconds = time.perf_counter() - start
+
+        check_recommendations(recommendations, reference_recommendations)
+        pd.testing.assert_frame_equal(summary_df, reference_summary_df, check_dtype=False)
+        rows.append(
+            {
+                "Students": num_of_students,
+                "Rows": len(analysis_df),
+                "Sections": analysis_df["Section_ID"].nunique(),
+                "Loop s": round(reference_seconds, 2),
+                "Sparse lazy greedy s": round(seconds, 3),
+                "Speedup": round(reference_seconds / seconds, 1),
+            }
+        )
+    print("lazy greedy recommends the same sections as the loop")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+    gap_dfs = []
+    for num_of_students in args.exact_students:
+        analysis_df = return_synthetic_analysis_df(num_of_students, seed=1)
+        start = time.perf_counter()
+        gap_df = set_cover_optimization.return_greedy_gap_df(analysis_df, CONFIG)
+        gap_df.insert(0, "Students", num_of_students)
+        gap_df["Greedy + exact s"] = round(time.perf_counter() - start, 2)
+        assert (gap_df["Gap_Pct"].dropna() >= -1e-6).all(), "greedy beat the exact optimum"
+        gap_dfs.append(gap_df)
+    print()
+    print("greedy against the milp optimum")
+    print(pd.concat(gap_dfs).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Weighted trends benchmark
+
+Checks that trends.return_weighted_slopes matches the per-student
+LinearRegression fits it replaced (x = weight = 1..n per student) on random
+monthly absence % and termly z-scores, including students with a single
+point, and times both.
+
+    python -m benchmarks.weighted_trends [--students 1000 5000] [--points 10]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from app.scripts import trends
+
+
+def return_synthetic_df(num_of_students, max_points, seed=0):
+    rng = np.random.default_rng(seed)
+    num_of_points = rng.integers(1, max_points + 1, size=num_of_students)
+    StudentIDs = np.repeat(np.arange(200000000, 200000000 + num_of_students), num_of_points)
+    return pd.DataFrame({"StudentID": StudentIDs, "Metric": rng.normal(0, 1, size=len(StudentIDs))})
+
+
+def determine_weighted_slope(data):
+    df = pd.DataFrame(list(data), columns=["Metric"])
+    df["X"] = df.index + 1
+    df["sample_weights"] = df.index + 1
+
+    regr = LinearRegression()
+    regr.fit(df[["X"]], df[["Metric"]], df["sample_weights"])
+
+    return regr.coef_[0][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--points", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for num_of_students in args.students:
+        df = return_synthetic_df(num_of_students, args.points)
+
+        start = time.perf_counter()
+        sklearn_slopes = df.groupby(["StudentID"])["Metric"].apply(determine_weighted_slope)
+        sklearn_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        slopes = trends.return_weighted_slopes(df, "StudentID", "Metric")
+        seconds = time.perf_counter() - start
+
+        assert slopes.index.equals(sklearn_slopes.index)
+        max_difference = np.abs(slopes - sklearn_slopes).max()
+        assert max_difference < 1e-9, f"slopes differ by {max_difference}"
+        rows.append(
+            {
+                "Students": num_of_students,
+                "Rows": len(df),
+                "sklearn s": round(sklearn_seconds, 3),
+                "closed form s": round(seconds, 4),
+                "Speedup": round(sklearn_seconds / seconds),
+                "Max difference": f"{max_difference:.1e}",
+            }
+        )
+
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
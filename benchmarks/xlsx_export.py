@@ -0,0 +1,169 @@
+"""
+Excel export benchmark
+
+Writes a synthetic Composite Priority sheet (one row per section with
+text, integer and float columns) the way surveys/main.py used to, with
+pandas' openpyxl writer followed by load_workbook and a cell by cell pass
+for header styles, widths, rank fills and number formats, and with the
+streaming xlsx_export layer and the declarative formats surveys/main.py
+now uses. Checks that the streamed workbook holds the same values and that
+the widths computed from the frame match the cell by cell ones, and
+compares time and peak Python memory.
+
+    python -m benchmarks.xlsx_export [--rows 10000 50000] [--skip-memory]
+"""
+
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+import app.scripts.surveys.main as surveys
+import app.scripts.xlsx_export as xlsx_export
+
+SHEET_NAME = "Composite Priority"
+
+
+def return_synthetic_df(num_of_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "Overall_Rank": np.arange(1, num_of_rows + 1),
+            "Course": rng.choice(["EES88", "MRS22", "HGS44", "SCS22", "PPS88QA"], size=num_of_rows),
+            "Section": rng.integers(1, 40, size=num_of_rows).astype(str),
+            "Teacher": [f"TEACHER {n % 150:03}" for n in range(num_of_rows)],
+            "Period": rng.integers(1, 10, size=num_of_rows),
+            "Room": rng.integers(100, 900, size=num_of_rows),
+            "N_Completed": rng.integers(5, 35, size=num_of_rows),
+        }
+    )
+    for column in ["Composite_Priority", "Adult_Relationships", "Peer_Belonging", "Safety", "Engagement"]:
+        df[column] = rng.random(num_of_rows).round(3)
+    df["Dimensions_Flagged"] = rng.choice(["Safety", "Safety, Engagement", ""], size=num_of_rows)
+    return df
+
+
+def return_openpyxl_workbook(df):
+    """The load-and-format path surveys/main.py used before xlsx_export."""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        df.to_excel(writer, sheet_name=SHEET_NAME, index=False)
+    output.seek(0)
+    wb = load_workbook(output)
+    ws = wb[SHEET_NAME]
+
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    border = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cell.border = border
+
+    for column in ws.columns:
+        max_length = 0
+        for cell in column:
+            if cell.value:
+                max_length = max(max_length, len(str(cell.value)))
+        ws.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+
+    fills = [
+        (5, PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")),
+        (10, PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")),
+        (15, PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")),
+    ]
+    for row in range(2, ws.max_row + 1):
+        rank = ws.cell(row=row, column=1).value
+        for max_rank, fill in fills:
+            if rank <= max_rank:
+                for col in range(1, ws.max_column + 1):
+                    ws.cell(row=row, column=col).fill = fill
+                if max_rank == 5:
+                    ws.cell(row=row, column=1).font = Font(bold=True, size=12)
+                break
+
+    priority_col = list(df.columns).index("Composite_Priority") + 1
+    for row in range(2, ws.max_row + 1):
+        ws.cell(row=row, column=priority_col).number_format = "0.000"
+
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    return output
+
+
+def return_streamed_workbook(df):
+    sheets = [{"name": SHEET_NAME, "df": df}]
+    surveys.format_sheets(sheets)
+    return xlsx_export.return_workbook(sheets)
+
+
+def return_widths(output):
+    ws = load_workbook(output)[SHEET_NAME]
+    return [ws.column_dimensions[column[0].column_letter].width for column in ws.iter_cols(max_row=1)]
+
+
+def check_workbook(output, df, reference_widths):
+    ws = load_workbook(output, read_only=True)[SHEET_NAME]
+    rows = list(ws.iter_rows(values_only=True))
+    assert list(rows[0]) == list(df.columns)
+    read_df = pd.DataFrame(rows[1:], columns=df.columns)
+    read_df["Dimensions_Flagged"] = read_df["Dimensions_Flagged"].fillna("")
+    pd.testing.assert_frame_equal(read_df, df, check_dtype=False)
+    ## xlsxwriter stores padded widths and merges equal neighbours, so
+    ## compare the widths it was given
+    widths = xlsx_export.return_column_widths(df)
+    assert widths == reference_widths, f"widths differ: {widths} != {reference_widths}"
+
+
+def return_peak_mb(function, df):
+    tracemalloc.start()
+    function(df)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return round(peak / 2**20, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--skip-memory", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    for num_of_rows in args.rows:
+        df = return_synthetic_df(num_of_rows)
+
+        start = time.perf_counter()
+        reference_output = return_openpyxl_workbook(df)
+        reference_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        output = return_streamed_workbook(df)
+        seconds = time.perf_counter() - start
+
+        check_workbook(output, df, return_widths(reference_output))
+        row = {
+            "Rows": num_of_rows,
+            "Cells": df.size,
+            "openpyxl s": round(reference_seconds, 2),
+            "xlsx_export s": round(seconds, 2),
+            "Speedup": round(reference_seconds / seconds, 1),
+        }
+        if not args.skip_memory:
+            row["openpyxl peak MB"] = return_peak_mb(return_openpyxl_workbook, df)
+            row["xlsx_export peak MB"] = return_peak_mb(return_streamed_workbook, df)
+        rows.append(row)
+
+    print("streamed workbooks match the values and widths of the openpyxl path")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()